@@ -7,7 +7,6 @@ allowing it to be run as a module.
 
 import sys
 import os
-import uvicorn
 
 from .cli.commands import main as cli_main
 
@@ -27,6 +26,8 @@ def main():
         # Default values
         host = "127.0.0.1"
         port = 8000
+        workers = 1
+        preload = []
         
         # Process remaining arguments
         i = 1
@@ -43,10 +44,26 @@ def main():
                     print(f"Invalid port number: {sys.argv[i + 1]}")
                     sys.exit(1)
                 i += 2
+            elif arg == "--workers" and i + 1 < len(sys.argv):
+                try:
+                    workers = int(sys.argv[i + 1])
+                except ValueError:
+                    print(f"Invalid number of workers: {sys.argv[i + 1]}")
+                    sys.exit(1)
+                i += 2
+            elif arg == "--preload-model" and i + 1 < len(sys.argv):
+                preload.append(sys.argv[i + 1])
+                i += 2
             else:
                 i += 1
         
-        # Import the app only when needed to avoid unnecessary imports
+        if workers > 1 or preload:
+            # Preload models once and fork workers sharing their weights
+            from .cli.prefork import serve
+            sys.exit(serve(host=host, port=port, workers=max(1, workers), preload=preload))
+        
+        # Import the server and app only when needed to avoid unnecessary imports
+        import uvicorn
         from .web.api import app
         
         # Run the web server
@@ -11,13 +11,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from amr_predictor.api.amr_db_integration import router as amr_router
 from amr_predictor.auth.api import router as auth_router
 from amr_predictor.monitoring.api import router as monitoring_router
+from amr_predictor.monitoring.metrics import CorrelationIdFilter, correlation_id_middleware
+from amr_predictor.core.models import get_model_health
+from amr_predictor.core.shared_models import memory_report
 from amr_predictor.maintenance.scheduled_tasks import start_scheduled_tasks
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    format="%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] %(message)s",
 )
+for handler in logging.getLogger().handlers:
+    handler.addFilter(CorrelationIdFilter())
 logger = logging.getLogger("amr-api")
 
 # Initialize FastAPI app
@@ -36,6 +41,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Assign a correlation ID to every request for logs and metrics
+app.middleware("http")(correlation_id_middleware)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(amr_router)
@@ -73,4 +81,6 @@ async def health_check():
     return {
         "status": "healthy",
         "api_version": app.version,
+        "model": get_model_health(),
+        "memory": memory_report(),
     }
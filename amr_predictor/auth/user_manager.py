@@ -27,6 +27,37 @@ JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "development_secret_key")
 JWT_ALGORITHM = "HS256"
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 8  # 8 hours
 
+def decode_access_token(token: str) -> Optional[TokenData]:
+    """
+    Decode and validate a JWT access token without a database lookup.
+    
+    Args:
+        token: The JWT token
+        
+    Returns:
+        The token data or None if invalid
+    """
+    try:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        
+        # Extract data
+        user_id = payload.get("sub")
+        username = payload.get("username")
+        expires_at = payload.get("exp")
+        
+        if user_id is None or username is None:
+            return None
+            
+        return TokenData(
+            user_id=user_id,
+            username=username,
+            expires_at=expires_at
+        )
+        
+    except jwt.PyJWTError as e:
+        logger.warning(f"Token validation failed: {str(e)}")
+        return None
+
 class UserManagerError(Exception):
     """Base exception for user management errors"""
     pass
@@ -345,26 +376,7 @@ class UserManager:
         Returns:
             The token data or None if invalid
         """
-        try:
-            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-            
-            # Extract data
-            user_id = payload.get("sub")
-            username = payload.get("username")
-            expires_at = payload.get("exp")
-            
-            if user_id is None or username is None:
-                return None
-                
-            return TokenData(
-                user_id=user_id,
-                username=username,
-                expires_at=expires_at
-            )
-            
-        except jwt.PyJWTError as e:
-            logger.warning(f"Token validation failed: {str(e)}")
-            return None
+        return decode_access_token(token)
     
     def revoke_all_user_tokens(self, user_id: str) -> int:
         """
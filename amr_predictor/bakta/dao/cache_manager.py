@@ -13,6 +13,8 @@ from functools import wraps
 from threading import RLock
 from datetime import datetime, timedelta
 
+from amr_predictor.monitoring.telemetry import record_cache_access
+
 logger = logging.getLogger("bakta-cache")
 
 # Generic type for cached items
@@ -70,12 +72,15 @@ class CacheManager:
         with self._lock:
             item = self._cache.get(key)
             if item is None:
+                record_cache_access("bakta", hit=False)
                 return None
             
             if item.is_expired():
                 del self._cache[key]
+                record_cache_access("bakta", hit=False)
                 return None
             
+            record_cache_access("bakta", hit=True)
             return item.value
     
     def set(self, key: str, value: Any, ttl_seconds: int = 300) -> None:
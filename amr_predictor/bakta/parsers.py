@@ -24,6 +24,7 @@ from pathlib import Path
 from dataclasses import dataclass
 
 from amr_predictor.bakta.exceptions import BaktaParserError
+from amr_predictor.core.compression import open_maybe_compressed
 
 # Import all parser classes
 # This is needed to ensure all parsers are available for get_parser_for_format
@@ -116,6 +117,8 @@ class BaktaParser(ABC):
     def _get_file_handle(self) -> TextIO:
         """Get a file handle for the file path or content.
         
+        Compressed files (gzip, bgzip, zstd) are decompressed while read.
+        
         Returns:
             File-like object
             
@@ -124,7 +127,7 @@ class BaktaParser(ABC):
         """
         try:
             if isinstance(self.file_path, (str, Path)):
-                return open(self.file_path, 'r')
+                return open_maybe_compressed(self.file_path)
             elif self.file_path is not None:
                 return self.file_path
             else:
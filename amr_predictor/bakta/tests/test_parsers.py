@@ -480,6 +480,16 @@ class TestFASTAParser:
         assert 'ATGCATGCAT' in seq['sequence']
         assert len(seq['sequence']) > 0
     
+    def test_parse_gzipped_fasta(self, temp_dir):
+        """Test parsing a gzip-compressed FASTA file."""
+        import gzip
+        fasta_file = temp_dir / "sample.fna.gz"
+        with gzip.open(fasta_file, 'wt') as f:
+            f.write(SAMPLE_FASTA)
+        
+        data = FASTAParser(file_path=fasta_file).parse()
+        assert data == FASTAParser(content=SAMPLE_FASTA).parse()
+    
     def test_parse_fasta_from_content(self):
         """Test parsing FASTA from a string."""
         parser = FASTAParser(content=SAMPLE_FASTA)
@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Any, Union
 
 from amr_predictor.bakta.exceptions import BaktaValidationError
+from amr_predictor.core.compression import open_maybe_compressed
 
 def is_valid_fasta(sequence_or_file: Union[str, Path]) -> bool:
     """
@@ -27,7 +28,7 @@ def is_valid_fasta(sequence_or_file: Union[str, Path]) -> bool:
     # If it's a Path object or looks like a file path and exists, read the file
     if isinstance(sequence_or_file, Path) or (isinstance(sequence_or_file, str) and os.path.exists(sequence_or_file)):
         try:
-            with open(sequence_or_file, 'r') as f:
+            with open_maybe_compressed(sequence_or_file) as f:
                 sequence = f.read()
         except Exception:
             return False
@@ -90,7 +91,7 @@ def validate_fasta(sequence_or_file: Union[str, Path]) -> None:
                 raise BaktaValidationError(f"FASTA file does not exist: {sequence_or_file}")
             
         try:
-            with open(sequence_or_file, 'r') as f:
+            with open_maybe_compressed(sequence_or_file) as f:
                 sequence = f.read()
         except Exception as e:
             raise BaktaValidationError(f"Error reading FASTA file: {str(e)}")
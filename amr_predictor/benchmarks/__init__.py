@@ -0,0 +1,51 @@
+"""
+Benchmark suite for AMR Predictor.
+
+This package provides a synthetic genome generator, a deterministic stub
+model that runs offline on CPU, a harness that times each stage of the
+prediction pipeline and writes JSON results for regression comparison,
+import-time budget checks that keep the ML stack out of package imports, and
+an accuracy check of reduced inference precisions against fp32.
+"""
+
+from .synthetic import generate_synthetic_genome, write_fasta
+from .stub_model import StubModelManager, StubTokenizer
+from .pipeline import (
+    BenchmarkConfig,
+    StageResult,
+    run_pipeline_benchmark,
+    save_benchmark_results,
+    load_benchmark_results,
+    compare_benchmarks
+)
+from .importtime import (
+    ImportBudget,
+    ImportResult,
+    DEFAULT_IMPORT_BUDGETS,
+    check_import_budgets
+)
+from .precision import (
+    PrecisionResult,
+    check_precision_accuracy,
+    save_precision_report
+)
+
+__all__ = [
+    "generate_synthetic_genome",
+    "write_fasta",
+    "StubModelManager",
+    "StubTokenizer",
+    "BenchmarkConfig",
+    "StageResult",
+    "run_pipeline_benchmark",
+    "save_benchmark_results",
+    "load_benchmark_results",
+    "compare_benchmarks",
+    "ImportBudget",
+    "ImportResult",
+    "DEFAULT_IMPORT_BUDGETS",
+    "check_import_budgets",
+    "PrecisionResult",
+    "check_precision_accuracy",
+    "save_precision_report"
+]
@@ -0,0 +1,147 @@
+"""
+Import-time budget checks for AMR Predictor.
+
+This module imports package modules in fresh interpreters with
+``python -X importtime`` and checks each against a time budget and a list
+of heavy modules (torch, transformers, peft) that must not be imported
+until a model is actually loaded.
+"""
+
+import os
+import sys
+import subprocess
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..core.utils import logger
+
+# Modules that must only be imported when a model is loaded
+HEAVY_MODULES = ("torch", "transformers", "peft")
+
+
+@dataclass
+class ImportBudget:
+    """Import-time budget for one module."""
+    module: str
+    max_seconds: float
+    forbidden: Tuple[str, ...] = HEAVY_MODULES
+
+
+@dataclass
+class ImportResult:
+    """Measured import time of one module."""
+    module: str
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    forbidden_imported: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the import succeeded within budget without forbidden imports"""
+        return self.error is None and not self.forbidden_imported and self.seconds <= self.max_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        result = asdict(self)
+        result["ok"] = self.ok
+        return result
+
+
+# Entry points that must stay cheap to import. Budgets are generous so the
+# check is robust to slow machines; the forbidden-module check is exact.
+DEFAULT_IMPORT_BUDGETS = [
+    ImportBudget("amr_predictor", 0.5),
+    ImportBudget("amr_predictor.__main__", 3.0),
+    ImportBudget("amr_predictor.cli.commands", 3.0),
+    ImportBudget("amr_predictor.core.prediction", 3.0),
+    ImportBudget("amr_predictor.processing.aggregation", 3.0),
+    ImportBudget("amr_predictor.processing.sequence_processing", 3.0),
+    ImportBudget("amr_predictor.processing.visualization", 3.0),
+    ImportBudget("amr_predictor.bakta", 3.0),
+]
+
+
+def parse_importtime(output: str) -> Dict[str, float]:
+    """
+    Parse ``-X importtime`` output into cumulative import times.
+
+    Args:
+        output: Standard error of an interpreter run with ``-X importtime``
+
+    Returns:
+        Dictionary mapping module names to cumulative import time in seconds
+    """
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            # Header line
+            continue
+        times[parts[2].strip()] = cumulative_us / 1e6
+    return times
+
+
+def measure_import_time(module: str, python: Optional[str] = None) -> Tuple[float, List[str], Optional[str]]:
+    """
+    Import a module in a fresh interpreter and measure it.
+
+    Args:
+        module: Module to import
+        python: Interpreter to use (default: the current one)
+
+    Returns:
+        Tuple of (cumulative seconds, names of all imported modules, error message or None)
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [project_root, env.get("PYTHONPATH")]))
+
+    process = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=project_root, env=env
+    )
+    times = parse_importtime(process.stderr)
+
+    if process.returncode != 0:
+        error_lines = [line for line in process.stderr.splitlines() if not line.startswith("import time:")]
+        return 0.0, list(times), error_lines[-1] if error_lines else f"exit code {process.returncode}"
+    return times.get(module, 0.0), list(times), None
+
+
+def check_import_budgets(budgets: Optional[List[ImportBudget]] = None,
+                         python: Optional[str] = None) -> List[ImportResult]:
+    """
+    Check modules against their import-time budgets.
+
+    Args:
+        budgets: Budgets to check (default: DEFAULT_IMPORT_BUDGETS)
+        python: Interpreter to use (default: the current one)
+
+    Returns:
+        List of import results, one per budget
+    """
+    results = []
+    for budget in budgets or DEFAULT_IMPORT_BUDGETS:
+        seconds, imported, error = measure_import_time(budget.module, python)
+        forbidden = sorted(name for name in set(imported) if name.split(".")[0] in budget.forbidden)
+        top_level = sorted({name.split(".")[0] for name in forbidden})
+        result = ImportResult(
+            module=budget.module,
+            seconds=seconds,
+            max_seconds=budget.max_seconds,
+            forbidden_imported=top_level,
+            error=error
+        )
+        if not result.ok:
+            logger.warning(f"Import budget exceeded for {budget.module}: {seconds:.3f}s "
+                           f"(budget {budget.max_seconds:.3f}s), forbidden imports: {top_level}, "
+                           f"error: {error}")
+        results.append(result)
+    return results
@@ -0,0 +1,360 @@
+"""
+End-to-end benchmark suite for the AMR prediction pipeline.
+
+This module times each stage of the prediction path (FASTA loading,
+segmentation, tokenization, model inference, result writing, sequence-level
+aggregation and WIG export) against a synthetic genome and the stub model,
+records per-stage wall/CPU time and peak RSS, and writes JSON results that
+can be compared between commits.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import tempfile
+import threading
+import subprocess
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from ..core.utils import logger
+from ..core.sequence import load_fasta, split_sequence
+from ..core.prediction import PredictionPipeline
+from ..processing.sequence_aggregation import SequenceAggregator
+from ..processing.visualization import VisualizationGenerator
+from .synthetic import generate_synthetic_genome, write_fasta
+from .stub_model import StubModelManager
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+BENCHMARK_FORMAT_VERSION = 1
+
+
+@dataclass
+class BenchmarkConfig:
+    """Configuration for a pipeline benchmark run."""
+    num_contigs: int = 10
+    contig_length: int = 50000
+    gc_content: float = 0.5
+    seed: int = 0
+    segment_length: int = 6000
+    segment_overlap: int = 0
+    batch_size: int = 8
+    max_length: int = 1000
+    token_latency_ms: float = 0.0
+    prefetch_batches: int = 2
+    resistance_threshold: float = 0.5
+    step_size: int = 1200
+    repeat: int = 1
+    end_to_end: bool = True
+
+
+@dataclass
+class StageResult:
+    """Timing and memory measurements for one pipeline stage."""
+    name: str
+    seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rss_start_mb: float = 0.0
+    peak_rss_mb: float = 0.0
+    items: int = 0
+    items_per_second: float = 0.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def _current_rss_mb() -> float:
+    """Get the current resident set size in MB"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / (1024 ** 2)
+    return _max_rss_mb()
+
+
+def _max_rss_mb() -> float:
+    """Get the process-wide peak resident set size in MB"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    divisor = 1024 ** 2 if sys.platform == "darwin" else 1024
+    return max_rss / divisor
+
+
+class _RSSSampler:
+    """Background sampler that tracks peak RSS while a stage runs."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = _current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _current_rss_mb())
+
+    def __enter__(self):
+        if PSUTIL_AVAILABLE:
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        if PSUTIL_AVAILABLE:
+            self._thread.join()
+            self.peak = max(self.peak, _current_rss_mb())
+        else:
+            self.peak = _max_rss_mb()
+
+
+@contextmanager
+def measure_stage(name: str, stages: Dict[str, StageResult]):
+    """
+    Context manager for measuring a benchmark stage.
+
+    Args:
+        name: Name of the stage
+        stages: Dictionary to store the stage result in
+
+    Yields:
+        The StageResult, whose ``items`` and ``extra`` may be filled in by the caller
+    """
+    result = StageResult(name=name, rss_start_mb=_current_rss_mb())
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with _RSSSampler() as sampler:
+        yield result
+    result.seconds = time.perf_counter() - wall_start
+    result.cpu_seconds = time.process_time() - cpu_start
+    result.peak_rss_mb = sampler.peak
+    result.items_per_second = result.items / result.seconds if result.seconds > 0 else 0.0
+    stages[name] = result
+    logger.info(f"Benchmark - {name}: {result.seconds:.4f}s, peak RSS {result.peak_rss_mb:.1f} MB")
+
+
+def _run_once(config: BenchmarkConfig, work_dir: str) -> Dict[str, StageResult]:
+    """Run every pipeline stage once and return the stage measurements"""
+    stages: Dict[str, StageResult] = {}
+
+    fasta_path = os.path.join(work_dir, "synthetic_genome.fasta")
+    write_fasta(
+        generate_synthetic_genome(
+            num_contigs=config.num_contigs,
+            contig_length=config.contig_length,
+            gc_content=config.gc_content,
+            seed=config.seed
+        ),
+        fasta_path
+    )
+
+    manager = StubModelManager(token_latency_ms=config.token_latency_ms)
+    manager.prefetch_batches = config.prefetch_batches
+    manager.load()
+
+    with measure_stage("load_fasta", stages) as stage:
+        records = load_fasta(fasta_path)
+        stage.items = len(records)
+        stage.extra["bases"] = sum(len(seq) for _, seq in records)
+
+    with measure_stage("split_sequence", stages) as stage:
+        segment_ids = []
+        segments = []
+        for seq_id, sequence in records:
+            for segment_id, segment in split_sequence(seq_id, sequence, max_length=config.segment_length,
+                                                      overlap=config.segment_overlap):
+                segment_ids.append(segment_id)
+                segments.append(segment)
+        stage.items = len(segments)
+
+    with measure_stage("tokenize", stages) as stage:
+        tokens = 0
+        for i in range(0, len(segments), config.batch_size):
+            encoding = manager.tokenizer(segments[i:i + config.batch_size], return_tensors="pt",
+                                         padding=True, truncation=True, max_length=config.max_length)
+            tokens += int(encoding["attention_mask"].sum())
+        stage.items = len(segments)
+        stage.extra["tokens"] = tokens
+
+    with measure_stage("predict", stages) as stage:
+        predictions = manager.predict(segments, max_length=config.max_length, batch_size=config.batch_size)
+        stage.items = len(predictions)
+        stage.extra["tokens"] = tokens
+    stage.extra["tokens_per_second"] = tokens / stage.seconds if stage.seconds > 0 else 0.0
+
+    pipeline = PredictionPipeline(
+        batch_size=config.batch_size,
+        segment_length=config.segment_length,
+        segment_overlap=config.segment_overlap,
+        resistance_threshold=config.resistance_threshold,
+        model_manager=manager
+    )
+
+    prediction_file = os.path.join(work_dir, "predictions.csv")
+    with measure_stage("write_results", stages) as stage:
+        rows = [
+            {"Sequence_ID": seq_id, "Length": len(segment), **prediction}
+            for seq_id, segment, prediction in zip(segment_ids, segments, predictions)
+        ]
+        pipeline.write_results(rows, prediction_file)
+        stage.items = len(rows)
+
+    with measure_stage("sequence_aggregation", stages) as stage:
+        aggregator = SequenceAggregator(resistance_threshold=config.resistance_threshold)
+        aggregated = aggregator.process_prediction_file(
+            input_file=prediction_file,
+            output_file=os.path.join(work_dir, "predictions_aggregated.csv")
+        )
+        stage.items = len(aggregated)
+
+    with measure_stage("wig_export", stages) as stage:
+        generator = VisualizationGenerator(step_size=config.step_size, processing_dir=work_dir)
+        wig_file = generator.prediction_to_wig(
+            input_file=prediction_file,
+            output_wig=os.path.join(work_dir, "predictions.wig")
+        )
+        stage.items = len(rows) if wig_file else 0
+
+    if config.end_to_end:
+        with measure_stage("end_to_end", stages) as stage:
+            results = pipeline.process_fasta_file(fasta_path, os.path.join(work_dir, "end_to_end.csv"))
+            stage.items = results.get("total_segments", 0)
+
+    return stages
+
+
+def _git_revision() -> Optional[str]:
+    """Get the current git revision, if available"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _environment_info() -> Dict[str, Any]:
+    """Collect information about the benchmark environment"""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_revision": _git_revision()
+    }
+    try:
+        import torch
+        info["torch"] = torch.__version__
+        info["torch_threads"] = torch.get_num_threads()
+    except ImportError:
+        pass
+    return info
+
+
+def run_pipeline_benchmark(config: Optional[BenchmarkConfig] = None,
+                           work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the pipeline benchmark.
+
+    When ``config.repeat`` is greater than one, the fastest run of each stage
+    is reported.
+
+    Args:
+        config: Benchmark configuration
+        work_dir: Directory for intermediate files (default: a temporary directory)
+
+    Returns:
+        Dictionary with benchmark configuration, environment and per-stage results
+    """
+    config = config or BenchmarkConfig()
+    logger.info(f"Running pipeline benchmark: {config.num_contigs} contigs x {config.contig_length} bp")
+
+    runs: List[Dict[str, StageResult]] = []
+    start_time = time.perf_counter()
+    for _ in range(max(1, config.repeat)):
+        if work_dir:
+            os.makedirs(work_dir, exist_ok=True)
+            runs.append(_run_once(config, work_dir))
+        else:
+            with tempfile.TemporaryDirectory(prefix="amr_benchmark_") as temp_dir:
+                runs.append(_run_once(config, temp_dir))
+
+    stages = {}
+    for name in runs[0]:
+        best = min((run[name] for run in runs), key=lambda stage: stage.seconds)
+        stages[name] = asdict(best)
+
+    return {
+        "benchmark": "prediction_pipeline",
+        "format_version": BENCHMARK_FORMAT_VERSION,
+        "timestamp": datetime.now().isoformat(),
+        "config": asdict(config),
+        "environment": _environment_info(),
+        "stages": stages,
+        "total_seconds": time.perf_counter() - start_time
+    }
+
+
+def save_benchmark_results(results: Dict[str, Any], output_file: str) -> None:
+    """
+    Save benchmark results as JSON.
+
+    Args:
+        results: Benchmark results
+        output_file: Path to the JSON file
+    """
+    with open(output_file, "w") as handle:
+        json.dump(results, handle, indent=2)
+    logger.info(f"Benchmark results saved to {output_file}")
+
+
+def load_benchmark_results(input_file: str) -> Dict[str, Any]:
+    """
+    Load benchmark results from JSON.
+
+    Args:
+        input_file: Path to the JSON file
+
+    Returns:
+        Benchmark results
+    """
+    with open(input_file, "r") as handle:
+        return json.load(handle)
+
+
+def compare_benchmarks(baseline: Dict[str, Any], current: Dict[str, Any],
+                       tolerance: float = 0.10, metric: str = "seconds") -> Dict[str, Dict[str, Any]]:
+    """
+    Compare two benchmark results stage by stage.
+
+    Args:
+        baseline: Baseline benchmark results
+        current: Current benchmark results
+        tolerance: Allowed relative slowdown before a stage counts as a regression
+        metric: Stage metric to compare
+
+    Returns:
+        Dictionary mapping stage name to baseline/current values, relative change and regression flag
+    """
+    comparison = {}
+    for name, current_stage in current.get("stages", {}).items():
+        baseline_stage = baseline.get("stages", {}).get(name)
+        if baseline_stage is None:
+            continue
+
+        old = baseline_stage.get(metric, 0.0)
+        new = current_stage.get(metric, 0.0)
+        change = (new - old) / old if old > 0 else 0.0
+        comparison[name] = {
+            "baseline": old,
+            "current": new,
+            "change": change,
+            "regression": change > tolerance
+        }
+    return comparison
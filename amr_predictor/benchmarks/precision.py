@@ -0,0 +1,176 @@
+"""
+Accuracy check for reduced inference precisions.
+
+This module runs a model on a reference FASTA in fp32 and in reduced
+precisions (bf16 autocast, dynamic int8), and reports the deviation of the
+predicted probabilities from fp32, classification flips at the resistance
+threshold, and throughput, so a precision can be checked before it is
+enabled for a model in the model registry.
+"""
+
+import json
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Sequence
+
+from ..core.utils import logger
+from ..core.sequence import load_fasta, split_sequence
+from ..core.models import ModelManager
+
+REFERENCE_PRECISION = "fp32"
+
+
+@dataclass
+class PrecisionResult:
+    """Predictions of one precision compared with the fp32 reference."""
+    precision: str
+    num_sequences: int = 0
+    seconds: float = 0.0
+    sequences_per_second: float = 0.0
+    speedup: float = 1.0
+    max_abs_deviation: float = 0.0
+    mean_abs_deviation: float = 0.0
+    flips: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def flip_count(self) -> int:
+        """Number of sequences classified differently than in fp32"""
+        return len(self.flips)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        result = asdict(self)
+        result["flip_count"] = self.flip_count
+        return result
+
+
+def load_reference_sequences(fasta_file: str, segment_length: int = 6000,
+                             max_sequences: Optional[int] = None) -> List[tuple]:
+    """
+    Load and segment reference sequences the way the prediction pipeline does.
+
+    Args:
+        fasta_file: Reference FASTA file
+        segment_length: Maximum segment length, 0 to disable splitting
+        max_sequences: Optional limit on the number of segments
+
+    Returns:
+        List of (segment ID, sequence) tuples
+    """
+    segments = []
+    for seq_id, sequence in load_fasta(fasta_file):
+        if segment_length > 0 and len(sequence) > segment_length:
+            segments.extend(split_sequence(seq_id, sequence, max_length=segment_length))
+        else:
+            segments.append((seq_id, sequence))
+    return segments[:max_sequences] if max_sequences else segments
+
+
+def _timed_predict(manager: ModelManager, sequences: List[str], batch_size: int,
+                   max_length: int) -> tuple:
+    """Load a model, predict and return (predictions, seconds)"""
+    manager.load()
+    start = time.time()
+    predictions = manager.predict(sequences, max_length=max_length, batch_size=batch_size)
+    seconds = time.time() - start
+    manager.unload()
+    if len(predictions) != len(sequences):
+        raise RuntimeError(f"Prediction in {manager.precision} failed "
+                           f"({len(predictions)} of {len(sequences)} sequences predicted)")
+    return predictions, seconds
+
+
+def check_precision_accuracy(fasta_file: str,
+                             model_name: Optional[str] = None,
+                             precisions: Sequence[str] = ("bf16", "int8"),
+                             resistance_threshold: float = 0.5,
+                             segment_length: int = 6000,
+                             batch_size: int = 8,
+                             max_length: int = 1000,
+                             max_sequences: Optional[int] = None,
+                             manager_factory: Optional[Callable[..., ModelManager]] = None) -> Dict[str, Any]:
+    """
+    Compare reduced-precision predictions with fp32 on a reference FASTA.
+
+    Args:
+        fasta_file: Reference FASTA file
+        model_name: Model to check (default: ModelManager.DEFAULT_MODEL_NAME)
+        precisions: Precisions to compare with fp32
+        resistance_threshold: Threshold for resistance classification
+        segment_length: Maximum segment length, 0 to disable splitting
+        batch_size: Batch size for prediction
+        max_length: Maximum sequence length for tokenization
+        max_sequences: Optional limit on the number of segments
+        manager_factory: Callable creating a model manager from model_name, device and
+            precision keyword arguments (default: ModelManager)
+
+    Returns:
+        Report dictionary with the fp32 throughput and one result per precision
+    """
+    manager_factory = manager_factory or ModelManager
+    segments = load_reference_sequences(fasta_file, segment_length, max_sequences)
+    if not segments:
+        raise ValueError(f"No sequences found in {fasta_file}")
+    ids = [seq_id for seq_id, _ in segments]
+    sequences = [sequence for _, sequence in segments]
+    logger.info(f"Checking precisions {list(precisions)} against fp32 on {len(sequences)} sequences")
+
+    reference_manager = manager_factory(model_name=model_name, device="cpu", precision=REFERENCE_PRECISION)
+    reference, reference_seconds = _timed_predict(reference_manager, sequences, batch_size, max_length)
+    reference_result = PrecisionResult(
+        precision=REFERENCE_PRECISION,
+        num_sequences=len(sequences),
+        seconds=reference_seconds,
+        sequences_per_second=len(sequences) / reference_seconds if reference_seconds > 0 else 0.0
+    )
+
+    results = [reference_result]
+    for precision in precisions:
+        if precision == REFERENCE_PRECISION:
+            continue
+        manager = manager_factory(model_name=model_name, device="cpu", precision=precision)
+        predictions, seconds = _timed_predict(manager, sequences, batch_size, max_length)
+
+        deviations = [abs(p["Resistant"] - r["Resistant"]) for p, r in zip(predictions, reference)]
+        flips = [
+            {"sequence_id": seq_id, "fp32": r["Resistant"], precision: p["Resistant"]}
+            for seq_id, p, r in zip(ids, predictions, reference)
+            if (p["Resistant"] > resistance_threshold) != (r["Resistant"] > resistance_threshold)
+        ]
+        result = PrecisionResult(
+            precision=precision,
+            num_sequences=len(sequences),
+            seconds=seconds,
+            sequences_per_second=len(sequences) / seconds if seconds > 0 else 0.0,
+            speedup=reference_seconds / seconds if seconds > 0 else 0.0,
+            max_abs_deviation=max(deviations),
+            mean_abs_deviation=sum(deviations) / len(deviations),
+            flips=flips
+        )
+        logger.info(f"{precision}: max deviation {result.max_abs_deviation:.5f}, "
+                    f"{result.flip_count} flips, {result.speedup:.2f}x fp32 throughput")
+        results.append(result)
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "fasta_file": fasta_file,
+        "model_name": reference_manager.model_name,
+        "model": reference_manager.get_model_metadata(),
+        "resistance_threshold": resistance_threshold,
+        "num_sequences": len(sequences),
+        "results": [result.to_dict() for result in results]
+    }
+
+
+def save_precision_report(report: Dict[str, Any], output_file: str) -> None:
+    """
+    Save a precision report as JSON.
+
+    Args:
+        report: Report from check_precision_accuracy
+        output_file: Output JSON file
+    """
+    with open(output_file, "w") as handle:
+        json.dump(report, handle, indent=2)
+    logger.info(f"Precision report saved to {output_file}")
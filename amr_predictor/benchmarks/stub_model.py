@@ -0,0 +1,183 @@
+"""
+Deterministic stub model for benchmarking the AMR prediction pipeline.
+
+This module provides a tokenizer and sequence classifier that mimic the
+interface of the HuggingFace objects used by ModelManager, so the full
+prediction path can be exercised offline on CPU without downloading weights.
+"""
+
+import time
+import functools
+from typing import List, Optional
+from types import SimpleNamespace
+
+from ..core.utils import logger, LazyImport
+from ..core.models import ModelManager, TORCH_AVAILABLE
+from ..core.engines import TorchEngine
+
+torch = LazyImport("torch")
+
+
+class StubEncoding(dict):
+    """Tokenizer output that supports ``.to(device)`` like a BatchEncoding."""
+
+    def to(self, device: str) -> "StubEncoding":
+        """Move all tensors to the given device"""
+        return StubEncoding({key: value.to(device) for key, value in self.items()})
+
+
+class StubTokenizer:
+    """
+    Non-overlapping k-mer tokenizer with a fixed vocabulary.
+
+    Mirrors the 6-mer tokenization used by the nucleotide transformer models:
+    each k-mer of A/C/G/T maps to a fixed id, anything else maps to the
+    unknown token, and a CLS token is prepended to every sequence.
+    """
+
+    PAD_ID = 0
+    CLS_ID = 1
+    UNK_ID = 2
+    _OFFSET = 3
+    _BASES = {"A": 0, "C": 1, "G": 2, "T": 3}
+
+    def __init__(self, kmer: int = 6):
+        """
+        Initialize the stub tokenizer.
+
+        Args:
+            kmer: Number of nucleotides per token
+        """
+        self.kmer = kmer
+        self.vocab_size = 4 ** kmer + self._OFFSET
+
+    def encode(self, sequence: str, max_length: Optional[int] = None) -> List[int]:
+        """
+        Encode a single sequence into token ids.
+
+        Args:
+            sequence: Nucleotide sequence
+            max_length: Maximum number of tokens (including CLS)
+
+        Returns:
+            List of token ids
+        """
+        ids = [self.CLS_ID]
+        sequence = sequence.upper()
+        for i in range(0, len(sequence), self.kmer):
+            token = sequence[i:i + self.kmer]
+            value = 0
+            for base in token:
+                if base not in self._BASES:
+                    value = -1
+                    break
+                value = value * 4 + self._BASES[base]
+            ids.append(self.UNK_ID if value < 0 or len(token) < self.kmer else value + self._OFFSET)
+            if max_length is not None and len(ids) >= max_length:
+                break
+        return ids
+
+    def __call__(self, sequences: List[str], return_tensors: str = "pt", padding: bool = True,
+                 truncation: bool = True, max_length: Optional[int] = None) -> StubEncoding:
+        """
+        Tokenize a batch of sequences into padded tensors.
+
+        Args:
+            sequences: Batch of nucleotide sequences
+            return_tensors: Only "pt" is supported
+            padding: Pad to the longest sequence in the batch
+            truncation: Truncate to max_length tokens
+            max_length: Maximum number of tokens per sequence
+
+        Returns:
+            Encoding with input_ids and attention_mask tensors
+        """
+        encoded = [self.encode(seq, max_length if truncation else None) for seq in sequences]
+        width = max((len(ids) for ids in encoded), default=0)
+        input_ids = [ids + [self.PAD_ID] * (width - len(ids)) for ids in encoded]
+        attention_mask = [[1] * len(ids) + [0] * (width - len(ids)) for ids in encoded]
+        return StubEncoding({
+            "input_ids": torch.tensor(input_ids, dtype=torch.long),
+            "attention_mask": torch.tensor(attention_mask, dtype=torch.long)
+        })
+
+
+@functools.lru_cache(maxsize=None)
+def _stub_classifier_class() -> type:
+    """Define the stub classifier on first use, so torch is imported lazily"""
+
+    class StubSequenceClassifier(torch.nn.Module):
+        """
+        Deterministic two-class classifier with configurable per-token latency.
+
+        Each token id is hashed to a fixed score in [-0.5, 0.5); the masked mean
+        score is projected to Susceptible/Resistant logits. Results depend only
+        on the sequence, not on batch composition or padding.
+        """
+
+        def __init__(self, token_latency_ms: float = 0.0):
+            """
+            Initialize the stub classifier.
+
+            Args:
+                token_latency_ms: Simulated compute time per non-padding token
+            """
+            super().__init__()
+            self.token_latency_ms = token_latency_ms
+            self.classifier = torch.nn.Linear(1, 2)
+            with torch.no_grad():
+                self.classifier.weight.copy_(torch.tensor([[-8.0], [8.0]]))
+                self.classifier.bias.zero_()
+
+        def forward(self, input_ids: "torch.Tensor", attention_mask: "torch.Tensor") -> SimpleNamespace:
+            """Compute logits for a batch of token ids"""
+            scores = ((input_ids * 2654435761) % 1000).float() / 1000.0 - 0.5
+            mask = attention_mask.float()
+            pooled = (scores * mask).sum(dim=1, keepdim=True) / mask.sum(dim=1, keepdim=True).clamp(min=1.0)
+
+            if self.token_latency_ms > 0:
+                time.sleep(self.token_latency_ms * float(mask.sum()) / 1000.0)
+
+            return SimpleNamespace(logits=self.classifier(pooled))
+
+    return StubSequenceClassifier
+
+
+class StubModelManager(ModelManager):
+    """
+    ModelManager that loads the stub tokenizer and classifier.
+
+    Skips environment and HuggingFace Hub setup entirely.
+    """
+
+    def __init__(self, token_latency_ms: float = 0.0, kmer: int = 6, device: str = "cpu",
+                 progress_tracker=None):
+        """
+        Initialize the stub model manager.
+
+        Args:
+            token_latency_ms: Simulated compute time per token
+            kmer: Nucleotides per token
+            device: Device to run the stub on
+            progress_tracker: Optional progress tracker
+        """
+        super().__init__(model_name="stub/DraGNOME-stub", device=device, progress_tracker=progress_tracker,
+                         precision="fp32", engine="torch", load_environment=False)
+        self.token_latency_ms = token_latency_ms
+        self.kmer = kmer
+
+    def load(self):
+        """
+        Load the stub model and tokenizer.
+
+        Returns:
+            Tuple of (model, tokenizer)
+        """
+        if not TORCH_AVAILABLE:
+            raise ImportError("PyTorch is required for the stub model")
+
+        logger.debug(f"Loading stub model (token latency: {self.token_latency_ms} ms)")
+        self.model = _stub_classifier_class()(token_latency_ms=self.token_latency_ms).to(self.device)
+        self.tokenizer = StubTokenizer(kmer=self.kmer)
+        self.engine = TorchEngine(self.model, self.device)
+        return self.model, self.tokenizer
@@ -13,7 +13,12 @@ from typing import List, Dict, Optional, Any, Union
 from datetime import datetime
 
 from ..core.utils import logger, setup_logger, print_banner, ProgressTracker
-from ..core.prediction import PredictionPipeline
+from ..core.prediction import PredictionPipeline, DEFAULT_SCREENING_MODEL, DEFAULT_UNCERTAINTY_BAND
+from ..core.models import ModelManager
+from ..core.model_cache import ModelResolver, ModelNotCachedError, ModelIntegrityError, MANIFEST_FILE
+from ..core.engines import ENGINES, DEFAULT_OPSET
+from ..core.job_queue import DEFAULT_LEASE_SECONDS
+from ..config.model_registry import PRECISIONS
 from ..processing.aggregation import PredictionAggregator
 from ..processing.sequence_processing import SequenceProcessor
 from ..processing.visualization import VisualizationGenerator
@@ -63,16 +68,47 @@ def predict_command(args) -> int:
     # Initialize progress tracker
     progress_tracker = CLIProgressTracker(total_steps=100)
     
+    # Initialize model manager
+    model_manager = ModelManager(
+        model_name=args.model,
+        device=args.cpu and "cpu" or None,
+        progress_tracker=progress_tracker,
+        revision=args.revision,
+        cache_dir=args.model_cache_dir,
+        offline=args.offline or None,
+        precision=args.precision,
+        engine=args.engine,
+        intra_op_threads=args.intra_op_threads,
+        inter_op_threads=args.inter_op_threads
+    )
+    
+    # Initialize the screening model of the cascade, with its registry settings
+    screening_model_manager = None
+    if args.cascade:
+        screening_model_manager = ModelManager(
+            model_name=args.screening_model,
+            device=args.cpu and "cpu" or None,
+            progress_tracker=progress_tracker,
+            cache_dir=args.model_cache_dir,
+            offline=args.offline or None
+        )
+    
     # Initialize pipeline
     pipeline = PredictionPipeline(
-        model_name=args.model,
         batch_size=args.batch_size,
         segment_length=args.segment_length,
         segment_overlap=args.segment_overlap,
-        device=args.cpu and "cpu" or None,
         progress_tracker=progress_tracker,
         enable_sequence_aggregation=not args.no_aggregation,
-        resistance_threshold=args.threshold
+        resistance_threshold=args.threshold,
+        model_manager=model_manager,
+        num_workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        screening_model_manager=screening_model_manager,
+        uncertainty_band=tuple(args.uncertainty_band),
+        refinement_passes=args.refine_passes,
+        refinement_threshold=args.refine_threshold,
+        refinement_factor=args.refine_factor
     )
     
     # Process the FASTA file
@@ -121,7 +157,8 @@ def aggregate_command(args: argparse.Namespace) -> None:
         results = aggregator.process_prediction_files(
             input_files=args.input_files,
             output_dir=args.output,
-            model_suffix=args.model_suffix
+            model_suffix=args.model_suffix,
+            max_workers=args.workers
         )
         
         if results.empty:
@@ -238,6 +275,240 @@ def visualization_command(args) -> int:
     return 1
 
 
+def models_command(args) -> int:
+    """
+    Manage the local model snapshot cache.
+    
+    Args:
+        args: Command-line arguments
+        
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    # Set up logging
+    logger_instance = setup_logger(level=args.verbose and logging.DEBUG or logging.INFO)
+    
+    resolver = ModelResolver(cache_dir=args.model_cache_dir, offline=args.action != "pull",
+                             token=os.getenv("HF_TOKEN"))
+    
+    if args.action == "list":
+        snapshots = resolver.list_snapshots()
+        if not snapshots:
+            print(f"No models cached in {resolver.cache_dir}")
+        for snapshot in snapshots:
+            print(f"{snapshot['repo_id']:<45}{snapshot['revision']:<42}{snapshot['size_mb']:>10.1f} MB")
+        return 0
+    
+    if not args.model:
+        logger.error(f"A model name is required for '{args.action}'")
+        return 1
+    
+    if args.action in ("merge", "export-onnx"):
+        manager = ModelManager(model_name=args.model, revision=args.revision,
+                               cache_dir=args.model_cache_dir, offline=True)
+        try:
+            if args.action == "merge":
+                output_dir = manager.merge_adapter(args.output)
+            else:
+                output_dir = manager.export_onnx(args.output, opset=args.opset)
+        except (ModelNotCachedError, ModelIntegrityError, ImportError) as e:
+            logger.error(str(e))
+            return 1
+        print(f"{'merged' if args.action == 'merge' else 'onnx'}_path: {output_dir}")
+        return 0
+    
+    try:
+        resolved = resolver.resolve(args.model, args.revision)
+        if args.action == "verify":
+            # Re-hash every file rather than trusting the last verification
+            for path in (resolved.adapter_path, resolved.base_path):
+                if os.path.isfile(os.path.join(path, MANIFEST_FILE)):
+                    resolver.verify_snapshot(path, full=True)
+    except (ModelNotCachedError, ModelIntegrityError) as e:
+        logger.error(str(e))
+        return 1
+    
+    for key, value in resolved.to_metadata().items():
+        print(f"{key}: {value}")
+    print(f"adapter_path: {resolved.adapter_path}")
+    print(f"base_path: {resolved.base_path}")
+    return 0
+
+
+def benchmark_command(args) -> int:
+    """
+    Run the pipeline benchmark command.
+    
+    Args:
+        args: Command-line arguments
+        
+    Returns:
+        Exit code (0 for success, 1 if a regression or import budget violation was detected)
+    """
+    from ..benchmarks import (
+        BenchmarkConfig, run_pipeline_benchmark, save_benchmark_results,
+        load_benchmark_results, compare_benchmarks, check_import_budgets
+    )
+    
+    # Set up logging
+    logger_instance = setup_logger(level=args.verbose and logging.DEBUG or logging.INFO)
+    
+    # Print banner
+    print_banner("AMR Benchmark", "1.0.0")
+    
+    config = BenchmarkConfig(
+        num_contigs=args.contigs,
+        contig_length=args.contig_length,
+        seed=args.seed,
+        segment_length=args.segment_length,
+        segment_overlap=args.segment_overlap,
+        batch_size=args.batch_size,
+        token_latency_ms=args.token_latency_ms,
+        prefetch_batches=args.prefetch_batches,
+        repeat=args.repeat,
+        end_to_end=not args.skip_end_to_end
+    )
+    
+    results = run_pipeline_benchmark(config, work_dir=args.work_dir)
+    
+    import_failures = []
+    if args.check_imports:
+        import_results = check_import_budgets()
+        results["imports"] = {result.module: result.to_dict() for result in import_results}
+        import_failures = [result.module for result in import_results if not result.ok]
+    
+    if args.output:
+        save_benchmark_results(results, args.output)
+    
+    # Print a stage summary
+    print(f"\n{'Stage':<22}{'Seconds':>10}{'CPU s':>10}{'Peak MB':>10}{'Items/s':>12}")
+    for name, stage in results["stages"].items():
+        print(f"{name:<22}{stage['seconds']:>10.4f}{stage['cpu_seconds']:>10.4f}"
+              f"{stage['peak_rss_mb']:>10.1f}{stage['items_per_second']:>12.1f}")
+    
+    if args.check_imports:
+        print(f"\n{'Import':<46}{'Seconds':>10}{'Budget':>10}  Forbidden")
+        for module, result in results["imports"].items():
+            forbidden = ", ".join(result["forbidden_imported"]) or ("error" if result["error"] else "-")
+            marker = "" if result["ok"] else " OVER BUDGET"
+            print(f"{module:<46}{result['seconds']:>10.3f}{result['max_seconds']:>10.3f}  {forbidden}{marker}")
+        if import_failures:
+            logger.error(f"Import budget exceeded for: {', '.join(import_failures)}")
+    
+    if args.compare:
+        baseline = load_benchmark_results(args.compare)
+        comparison = compare_benchmarks(baseline, results, tolerance=args.tolerance)
+        regressions = [name for name, stage in comparison.items() if stage["regression"]]
+        
+        print(f"\nComparison with {args.compare} (tolerance {args.tolerance * 100:.0f}%):")
+        for name, stage in comparison.items():
+            marker = " REGRESSION" if stage["regression"] else ""
+            print(f"  {name:<22}{stage['baseline']:>10.4f} -> {stage['current']:>10.4f} "
+                  f"({stage['change'] * 100:+.1f}%){marker}")
+        
+        if regressions:
+            logger.error(f"Performance regression in: {', '.join(regressions)}")
+            return 1
+    
+    return 1 if import_failures else 0
+
+
+def accuracy_check_command(args) -> int:
+    """
+    Run the reduced-precision accuracy check command.
+    
+    Args:
+        args: Command-line arguments
+        
+    Returns:
+        Exit code (0 for success, 1 if a precision flipped a classification or failed)
+    """
+    from ..benchmarks import check_precision_accuracy, save_precision_report
+    
+    # Set up logging
+    logger_instance = setup_logger(level=args.verbose and logging.DEBUG or logging.INFO)
+    
+    # Print banner
+    print_banner("AMR Precision Check", "1.0.0")
+    
+    try:
+        report = check_precision_accuracy(
+            args.fasta,
+            model_name=args.model,
+            precisions=args.precisions,
+            resistance_threshold=args.threshold,
+            segment_length=args.segment_length,
+            batch_size=args.batch_size,
+            max_sequences=args.max_sequences
+        )
+    except Exception as e:
+        logger.error(f"Precision check failed: {str(e)}")
+        return 1
+    
+    if args.output:
+        save_precision_report(report, args.output)
+    
+    print(f"\n{report['num_sequences']} sequences, resistance threshold {report['resistance_threshold']}")
+    print(f"{'Precision':<12}{'Seq/s':>10}{'Speedup':>10}{'Max dev':>12}{'Mean dev':>12}{'Flips':>8}")
+    for result in report["results"]:
+        print(f"{result['precision']:<12}{result['sequences_per_second']:>10.2f}{result['speedup']:>10.2f}"
+              f"{result['max_abs_deviation']:>12.5f}{result['mean_abs_deviation']:>12.5f}{result['flip_count']:>8}")
+        for flip in result["flips"]:
+            print(f"    flip: {flip['sequence_id']} fp32={flip['fp32']:.4f} "
+                  f"{result['precision']}={flip[result['precision']]:.4f}")
+    
+    return 1 if any(result["flip_count"] for result in report["results"]) else 0
+
+
+def worker_command(args) -> int:
+    """
+    Run a worker processing jobs from the durable job queue.
+    
+    Args:
+        args: Command-line arguments
+        
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    import signal
+    from ..core.job_queue import get_job_queue
+    from ..core.job_worker import JobWorker
+    
+    # Set up logging
+    logger_instance = setup_logger(level=args.verbose and logging.DEBUG or logging.INFO)
+    
+    # Print banner
+    print_banner("AMR Queue Worker", "1.0.0")
+    
+    try:
+        # The web API's task functions run the jobs
+        from ..web.api import TASK_HANDLERS, record_queue_failure
+        queue = get_job_queue()
+    except Exception as e:
+        logger.error(f"Could not connect to the job queue: {str(e)}")
+        return 1
+    
+    handlers = TASK_HANDLERS
+    if args.tasks:
+        handlers = {task: handler for task, handler in TASK_HANDLERS.items() if task in args.tasks}
+    
+    worker = JobWorker(
+        queue,
+        handlers,
+        worker_id=args.worker_id,
+        lease_seconds=args.lease_seconds,
+        poll_interval=args.poll_interval,
+        on_failure=record_queue_failure
+    )
+    
+    # Finish the current job before stopping
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: worker.stop())
+    
+    worker.run(max_jobs=args.max_jobs)
+    return 0
+
+
 def create_parser() -> argparse.ArgumentParser:
     """
     Create the command-line argument parser.
@@ -282,8 +553,66 @@ def create_parser() -> argparse.ArgumentParser:
                             help="Resistance threshold for classification (default: 0.5)")
     predict_parser.add_argument("--no-aggregation", action="store_true",
                             help="Disable sequence-level aggregation")
+    predict_parser.add_argument("--revision",
+                            help="Model branch, tag or commit (default: main)")
+    predict_parser.add_argument("--model-cache-dir",
+                            help="Local model snapshot cache (default: $AMR_MODEL_CACHE_DIR or ~/.cache/amr_predictor/models)")
+    predict_parser.add_argument("--offline", action="store_true",
+                            help="Only load models from the local cache, never download")
+    predict_parser.add_argument("--precision", choices=PRECISIONS,
+                            help="Inference precision (default: from the model registry)")
+    predict_parser.add_argument("--engine", choices=ENGINES,
+                            help="Inference engine; 'onnx' needs 'models export-onnx' first (default: from the model registry)")
+    predict_parser.add_argument("--workers", type=int, default=1,
+                            help="Worker processes for CPU inference sharing one model copy, 0 to choose from available cores")
+    predict_parser.add_argument("--threads-per-worker", type=int,
+                            help="Intra-op threads per worker process (default: cores divided among workers)")
+    predict_parser.add_argument("--intra-op-threads", type=int,
+                            help="ONNX Runtime threads within an operator")
+    predict_parser.add_argument("--inter-op-threads", type=int,
+                            help="ONNX Runtime threads across independent operators")
+    predict_parser.add_argument("--cascade", action="store_true",
+                            help="Screen all segments with --screening-model and predict only uncertain ones with --model")
+    predict_parser.add_argument("--screening-model", default=DEFAULT_SCREENING_MODEL,
+                            help="Screening model of the cascade")
+    predict_parser.add_argument("--uncertainty-band", type=float, nargs=2, metavar=("LOW", "HIGH"),
+                            default=list(DEFAULT_UNCERTAINTY_BAND),
+                            help="Screening Resistant probabilities sent to --model in the cascade")
+    predict_parser.add_argument("--refine-passes", type=int, default=0,
+                            help="Adaptive segmentation: tile without overlap, then re-predict around resistant hits "
+                                 "with shorter overlapping windows for this many passes")
+    predict_parser.add_argument("--refine-threshold", type=float,
+                            help="Resistant probability of hits to refine (default: --threshold)")
+    predict_parser.add_argument("--refine-factor", type=int, default=2,
+                            help="Window shrink factor per refinement pass")
     predict_parser.set_defaults(func=predict_command)
     
+    # Create the models command parser
+    models_parser = subparsers.add_parser(
+        "models",
+        help="Manage the local model snapshot cache"
+    )
+    
+    # Models command arguments
+    models_parser.add_argument("action", choices=["pull", "verify", "list", "merge", "export-onnx"],
+                           help="pull: download a model and its base model into the cache; "
+                                "verify: re-hash cached snapshots; list: show cached snapshots; "
+                                "merge: merge the adapter into the base model weights; "
+                                "export-onnx: export the merged model for the ONNX Runtime engine")
+    models_parser.add_argument("model", nargs="?",
+                           help="HuggingFace model name of the adapter (for pull, verify, merge and export-onnx)")
+    models_parser.add_argument("--revision",
+                           help="Model branch, tag or commit (default: main)")
+    models_parser.add_argument("--output", "-o",
+                           help="Output directory for merge and export-onnx (default: the model cache)")
+    models_parser.add_argument("--opset", type=int, default=DEFAULT_OPSET,
+                           help="ONNX opset version for export-onnx")
+    models_parser.add_argument("--model-cache-dir",
+                           help="Local model snapshot cache (default: $AMR_MODEL_CACHE_DIR or ~/.cache/amr_predictor/models)")
+    models_parser.add_argument("--verbose", "-v", action="store_true",
+                           help="Enable verbose logging")
+    models_parser.set_defaults(func=models_command)
+    
     # Create the aggregate command parser
     aggregate_parser = subparsers.add_parser(
         "aggregate",
@@ -309,6 +638,8 @@ def create_parser() -> argparse.ArgumentParser:
                               help="Suffix to remove from filenames when extracting model names")
     aggregate_parser.add_argument("--threshold", "-t", type=float, default=0.5,
                               help="Resistance threshold for classification (default: 0.5)")
+    aggregate_parser.add_argument("--workers", "-j", type=int, default=None,
+                              help="Number of worker processes for parallel aggregation (default: one per CPU, 1 to run serially)")
     aggregate_parser.add_argument("--verbose", "-v", action="count", default=0,
                               help="Increase verbosity level (use -v for INFO, -vv for DEBUG)")
     aggregate_parser.set_defaults(func=aggregate_command)
@@ -351,6 +682,99 @@ def create_parser() -> argparse.ArgumentParser:
                         help="Enable verbose logging")
     viz_parser.set_defaults(func=visualization_command)
     
+    # Create the benchmark command parser
+    bench_parser = subparsers.add_parser(
+        "benchmark",
+        help="Benchmark the prediction pipeline on a synthetic genome with a stub model",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    
+    # Benchmark command arguments
+    bench_parser.add_argument("--contigs", type=int, default=10,
+                          help="Number of synthetic contigs")
+    bench_parser.add_argument("--contig-length", type=int, default=50000,
+                          help="Length of each synthetic contig in base pairs")
+    bench_parser.add_argument("--seed", type=int, default=0,
+                          help="Random seed for the synthetic genome")
+    bench_parser.add_argument("--segment-length", "-s", type=int, default=6000,
+                          help="Maximum segment length")
+    bench_parser.add_argument("--segment-overlap", "-o", type=int, default=0,
+                          help="Overlap between segments in nucleotides")
+    bench_parser.add_argument("--batch-size", "-b", type=int, default=8,
+                          help="Batch size for predictions")
+    bench_parser.add_argument("--prefetch-batches", type=int, default=2,
+                          help="Batches tokenized ahead while the model runs, 0 to disable")
+    bench_parser.add_argument("--token-latency-ms", type=float, default=0.0,
+                          help="Simulated stub model latency per token in milliseconds")
+    bench_parser.add_argument("--repeat", type=int, default=1,
+                          help="Number of runs; the fastest run of each stage is reported")
+    bench_parser.add_argument("--skip-end-to-end", action="store_true",
+                          help="Skip the end-to-end PredictionPipeline run")
+    bench_parser.add_argument("--work-dir",
+                          help="Directory for intermediate files (default: temporary directory)")
+    bench_parser.add_argument("--output",
+                          help="Path to save the benchmark results as JSON")
+    bench_parser.add_argument("--compare",
+                          help="Baseline JSON results to compare against")
+    bench_parser.add_argument("--tolerance", type=float, default=0.10,
+                          help="Allowed relative slowdown per stage before reporting a regression")
+    bench_parser.add_argument("--check-imports", action="store_true",
+                          help="Also check module import times against their budgets")
+    bench_parser.add_argument("--verbose", "-v", action="store_true",
+                          help="Enable verbose logging")
+    bench_parser.set_defaults(func=benchmark_command)
+    
+    # Create the accuracy-check command parser
+    accuracy_parser = subparsers.add_parser(
+        "accuracy-check",
+        help="Compare reduced inference precisions with fp32 on a reference FASTA",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    
+    # Accuracy check command arguments
+    accuracy_parser.add_argument("--fasta", "-f", required=True,
+                             help="Reference FASTA file")
+    accuracy_parser.add_argument("--model", "-m", default="alakob/DraGNOME-2.5b-v1",
+                             help="HuggingFace model name or path")
+    accuracy_parser.add_argument("--precisions", nargs="+", choices=[p for p in PRECISIONS if p != "fp32"],
+                             default=["bf16", "int8"],
+                             help="Precisions to compare with fp32")
+    accuracy_parser.add_argument("--threshold", "-t", type=float, default=0.5,
+                             help="Resistance threshold for classification flips")
+    accuracy_parser.add_argument("--segment-length", "-s", type=int, default=6000,
+                             help="Maximum segment length, 0 to disable splitting")
+    accuracy_parser.add_argument("--batch-size", "-b", type=int, default=8,
+                             help="Batch size for predictions")
+    accuracy_parser.add_argument("--max-sequences", type=int,
+                             help="Only check the first N segments")
+    accuracy_parser.add_argument("--output",
+                             help="Path to save the report as JSON")
+    accuracy_parser.add_argument("--verbose", "-v", action="store_true",
+                             help="Enable verbose logging")
+    accuracy_parser.set_defaults(func=accuracy_check_command)
+    
+    # Create the worker command parser
+    worker_parser = subparsers.add_parser(
+        "worker",
+        help="Process jobs from the PostgreSQL job queue (AMR_JOB_QUEUE=postgres)",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    
+    # Worker command arguments
+    worker_parser.add_argument("--tasks", nargs="+", choices=["predict", "aggregate", "sequence", "visualize"],
+                           help="Only process these tasks (default: all)")
+    worker_parser.add_argument("--worker-id",
+                           help="Worker ID recorded on claimed jobs (default: host name and PID)")
+    worker_parser.add_argument("--lease-seconds", type=int, default=DEFAULT_LEASE_SECONDS,
+                           help="Seconds before a job without heartbeats is reclaimed by another worker")
+    worker_parser.add_argument("--poll-interval", type=float, default=1.0,
+                           help="Seconds between polls of an empty queue")
+    worker_parser.add_argument("--max-jobs", type=int,
+                           help="Exit after processing this many jobs")
+    worker_parser.add_argument("--verbose", "-v", action="store_true",
+                           help="Enable verbose logging")
+    worker_parser.set_defaults(func=worker_command)
+    
     return parser
 
 
@@ -0,0 +1,128 @@
+"""
+Pre-forking server for the AMR Predictor web API.
+
+``uvicorn --workers`` starts each worker as a fresh interpreter, so every
+worker loads its own copy of the model. This server loads the models once
+in the parent process and then forks the workers, which share the weights
+copy-on-write and serve the API from a common listening socket.
+
+The web package is only imported in the workers, after the fork, so each
+worker opens its own database connections.
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+from typing import List, Optional
+
+from ..core.utils import logger
+from ..core.shared_models import preload_models
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    """Create the listening socket shared by all workers"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _cuda_initialized() -> bool:
+    """Check whether this process has initialized CUDA, which forked children cannot use"""
+    # CUDA cannot have been initialized if torch was never imported
+    torch = sys.modules.get("torch")
+    return torch is not None and torch.cuda.is_initialized()
+
+
+def _run_worker(app: str, sock: socket.socket) -> None:
+    """Serve the app from the shared socket in a forked worker"""
+    import uvicorn
+
+    # Workers exit on SIGTERM/SIGINT through uvicorn's own handlers
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    # The app (and its database connections) is created after the fork
+    server = uvicorn.Server(uvicorn.Config(app, lifespan="on"))
+    server.run(sockets=[sock])
+
+
+def serve(app: str = "amr_predictor.web.api:app", host: str = "127.0.0.1", port: int = 8000,
+          workers: int = 2, preload: Optional[List[str]] = None) -> int:
+    """
+    Preload models and serve the web API from forked workers.
+
+    Workers that exit unexpectedly are replaced; SIGINT or SIGTERM stops
+    all workers.
+
+    Args:
+        app: Import path of the ASGI app, imported in each worker
+        host: Host to bind to
+        port: Port to bind to
+        workers: Number of worker processes
+        preload: Models to load on the CPU before forking
+
+    Returns:
+        Exit code
+    """
+    if not hasattr(os, "fork"):
+        logger.error("The pre-forking server requires os.fork")
+        return 1
+
+    if preload:
+        preload_models(preload)
+    if _cuda_initialized():
+        logger.error("CUDA was initialized before forking; workers could not use it")
+        return 1
+
+    sock = _bind_socket(host, port)
+    logger.info(f"Serving {app} on http://{host}:{port} with {workers} workers")
+
+    children = set()
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _run_worker(app, sock)
+            finally:
+                os._exit(0)
+        children.add(pid)
+        logger.info(f"Started worker {pid}")
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            logger.warning(f"Worker {pid} exited with status {status}, restarting")
+            time.sleep(1)
+            spawn()
+
+    sock.close()
+    logger.info("All workers stopped")
+    return 0
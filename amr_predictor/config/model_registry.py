@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Model registry configuration.
+
+This module provides per-model inference settings: the numeric precision
+used when running a model on CPU and the inference engine (PyTorch or ONNX
+Runtime) with its thread counts.
+"""
+import os
+import copy
+import yaml
+import logging
+from typing import Dict, Any, Optional
+
+# Configure logging
+logger = logging.getLogger("model-registry")
+
+# Supported inference precisions:
+#   fp32: full precision (reference)
+#   bf16: bfloat16 autocast of matrix multiplications
+#   int8: dynamic int8 quantization of Linear layers (CPU only)
+PRECISIONS = ("fp32", "bf16", "int8")
+
+# Environment variable with the path of a registry file overriding the defaults
+MODEL_REGISTRY_ENV = "AMR_MODEL_REGISTRY"
+
+# Default configuration. Reduced precisions stay opt-in until checked against
+# fp32 on a reference FASTA (amr-predictor accuracy-check).
+DEFAULT_REGISTRY = {
+    "default": {
+        "precision": "fp32",
+        "engine": "torch",
+        "intra_op_threads": None,
+        "inter_op_threads": None
+    },
+    "models": {
+        "alakob/DraGNOME-2.5b-v1": {
+            "precision": "fp32"
+        },
+        "alakob/DraGNOME-50m-v1": {
+            "precision": "fp32"
+        }
+    }
+}
+
+
+class ModelRegistry:
+    """
+    Registry of per-model inference settings.
+
+    Settings for a model are its entry under "models" layered over the
+    "default" entry.
+    """
+
+    def __init__(self, config_path: Optional[str] = None):
+        """
+        Initialize the model registry.
+
+        Args:
+            config_path: Path to a registry file. If None, uses $AMR_MODEL_REGISTRY or the defaults.
+        """
+        self.config = copy.deepcopy(DEFAULT_REGISTRY)
+        config_path = config_path or os.getenv(MODEL_REGISTRY_ENV)
+
+        if config_path and os.path.exists(config_path):
+            try:
+                with open(config_path, 'r') as file:
+                    user_config = yaml.safe_load(file)
+
+                # Update default config with user values
+                if user_config:
+                    self._update_nested_dict(self.config, user_config)
+
+                logger.info(f"Loaded model registry from {config_path}")
+            except Exception as e:
+                logger.error(f"Error loading model registry from {config_path}: {str(e)}")
+
+    def _update_nested_dict(self, d: Dict[str, Any], u: Dict[str, Any]) -> Dict[str, Any]:
+        """Recursively update a nested dictionary"""
+        for k, v in u.items():
+            if isinstance(v, dict) and k in d and isinstance(d[k], dict):
+                self._update_nested_dict(d[k], v)
+            else:
+                d[k] = v
+        return d
+
+    def get_model_config(self, model_name: str) -> Dict[str, Any]:
+        """Get the settings for a model, falling back to the defaults"""
+        config = dict(self.config.get("default", {}))
+        config.update(self.config.get("models", {}).get(model_name, {}))
+        return config
+
+    def get_precision(self, model_name: str) -> str:
+        """Get the inference precision for a model"""
+        precision = self.get_model_config(model_name).get("precision", "fp32")
+        if precision not in PRECISIONS:
+            logger.warning(f"Unknown precision '{precision}' for {model_name}, using fp32")
+            return "fp32"
+        return precision
+
+    def set_model_config(self, model_name: str, **settings) -> None:
+        """Set settings for a model"""
+        self.config.setdefault("models", {}).setdefault(model_name, {}).update(settings)
+
+    @classmethod
+    def create_default_config_file(cls, output_path: str):
+        """
+        Create a default registry file.
+
+        Args:
+            output_path: Path to write the default registry
+        """
+        try:
+            with open(output_path, 'w') as file:
+                yaml.dump(DEFAULT_REGISTRY, file, default_flow_style=False)
+            logger.info(f"Created default model registry at {output_path}")
+        except Exception as e:
+            logger.error(f"Failed to create default model registry: {str(e)}")
+            raise
+
+
+# Global registry instance
+_model_registry = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Get the global model registry instance.
+
+    Returns:
+        ModelRegistry instance
+    """
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
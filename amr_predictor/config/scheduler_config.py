@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Job scheduler configuration.
+
+This module provides the fair-share settings of the durable job queue:
+per-user concurrency caps and weights, and the priority classes that let
+small interactive submissions run ahead of large batches.
+"""
+import os
+import copy
+import yaml
+import logging
+from typing import Dict, Any, Optional
+
+# Configure logging
+logger = logging.getLogger("scheduler-config")
+
+# Environment variable with the path of a scheduler file overriding the defaults
+SCHEDULER_CONFIG_ENV = "AMR_SCHEDULER_CONFIG"
+
+# Default configuration
+DEFAULT_SCHEDULER_CONFIG = {
+    "fair_share": {
+        "max_running_per_user": 2,   # Jobs of one user running at the same time while others wait
+        "default_weight": 1.0,       # Share of users without an entry in "users"
+        "usage_window_minutes": 60   # Recent usage that counts against a user's share
+    },
+    "priority_classes": {
+        # Claimed first: submissions up to max_input_bytes
+        "interactive": {"priority": 10, "max_input_bytes": 2 * 1024 * 1024},
+        "batch": {"priority": 0}
+    },
+    # Per-user overrides, e.g. {"alice": {"weight": 2.0, "max_running": 4}}
+    "users": {}
+}
+
+
+class SchedulerConfig:
+    """
+    Fair-share scheduling configuration.
+    """
+
+    def __init__(self, config_path: Optional[str] = None):
+        """
+        Initialize the scheduler configuration.
+
+        Args:
+            config_path: Path to a configuration file. If None, uses $AMR_SCHEDULER_CONFIG or the defaults.
+        """
+        self.config = copy.deepcopy(DEFAULT_SCHEDULER_CONFIG)
+        config_path = config_path or os.getenv(SCHEDULER_CONFIG_ENV)
+
+        if config_path and os.path.exists(config_path):
+            try:
+                with open(config_path, 'r') as file:
+                    user_config = yaml.safe_load(file)
+
+                # Update default config with user values
+                if user_config:
+                    self._update_nested_dict(self.config, user_config)
+
+                logger.info(f"Loaded scheduler config from {config_path}")
+            except Exception as e:
+                logger.error(f"Error loading scheduler config from {config_path}: {str(e)}")
+
+    def _update_nested_dict(self, d: Dict[str, Any], u: Dict[str, Any]) -> Dict[str, Any]:
+        """Recursively update a nested dictionary"""
+        for k, v in u.items():
+            if isinstance(v, dict) and k in d and isinstance(d[k], dict):
+                self._update_nested_dict(d[k], v)
+            else:
+                d[k] = v
+        return d
+
+    def get_user_weight(self, user: str) -> float:
+        """Get the fair-share weight of a user"""
+        weight = self.config["users"].get(user, {}).get("weight", self.config["fair_share"]["default_weight"])
+        return max(float(weight), 0.01)
+
+    def get_max_running(self, user: str) -> int:
+        """Get the number of jobs a user may run at the same time"""
+        return int(self.config["users"].get(user, {}).get(
+            "max_running", self.config["fair_share"]["max_running_per_user"]))
+
+    def get_usage_window_minutes(self) -> int:
+        """Get the window of recent usage counted against a user's share"""
+        return int(self.config["fair_share"]["usage_window_minutes"])
+
+    def get_priority(self, priority_class: str) -> int:
+        """Get the queue priority of a priority class"""
+        return int(self.config["priority_classes"].get(priority_class, {}).get("priority", 0))
+
+    def classify(self, input_bytes: Optional[int]) -> str:
+        """
+        Get the priority class of a submission.
+
+        Args:
+            input_bytes: Total size of the submitted input files
+
+        Returns:
+            "interactive" for small submissions, otherwise "batch"
+        """
+        max_bytes = self.config["priority_classes"].get("interactive", {}).get("max_input_bytes")
+        if input_bytes is not None and max_bytes is not None and input_bytes <= max_bytes:
+            return "interactive"
+        return "batch"
+
+    def get_user_overrides(self) -> Dict[str, Dict[str, float]]:
+        """Get the weight and concurrency cap of users with overrides"""
+        return {user: {"weight": self.get_user_weight(user), "max_running": self.get_max_running(user)}
+                for user in self.config["users"]}
+
+    @classmethod
+    def create_default_config_file(cls, output_path: str):
+        """
+        Create a default configuration file.
+
+        Args:
+            output_path: Path to write the default configuration
+        """
+        try:
+            with open(output_path, 'w') as file:
+                yaml.dump(DEFAULT_SCHEDULER_CONFIG, file, default_flow_style=False)
+            logger.info(f"Created default scheduler config at {output_path}")
+        except Exception as e:
+            logger.error(f"Failed to create default scheduler config: {str(e)}")
+            raise
+
+
+# Global configuration instance
+_scheduler_config = None
+
+
+def get_scheduler_config() -> SchedulerConfig:
+    """
+    Get the global scheduler configuration instance.
+
+    Returns:
+        SchedulerConfig instance
+    """
+    global _scheduler_config
+    if _scheduler_config is None:
+        _scheduler_config = SchedulerConfig()
+    return _scheduler_config
@@ -0,0 +1,323 @@
+"""
+Async data access for the AMR job tables.
+
+The FastAPI handlers are coroutines, so a blocking psycopg2 call made
+directly in one stalls every other request on the event loop. This module
+gives the job tables their own connection pool whose queries run on a
+dedicated thread per connection: a caller first waits (asynchronously,
+with a timeout) for a free connection slot, then the query runs in the
+pool's executor while the event loop keeps serving requests.
+
+The pool reports its utilisation (connections in use, callers waiting and
+the time spent waiting for a connection) to the telemetry registry.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable
+
+from psycopg2 import pool
+
+from .utils import logger
+from .database_manager import AMRDatabaseManager, connection_params
+from .repository import AMRJobRepository
+from ..monitoring.telemetry import record_db_pool_usage, observe_db_pool_acquire
+
+# Connections of the async pool
+ASYNC_POOL_SIZE = int(os.getenv("AMR_ASYNC_DB_POOL_SIZE", "10"))
+
+# Seconds a caller waits for a free connection before giving up
+ACQUIRE_TIMEOUT = float(os.getenv("AMR_DB_ACQUIRE_TIMEOUT", "5"))
+
+# Server-side limit on a single statement, in milliseconds
+STATEMENT_TIMEOUT_MS = int(os.getenv("AMR_DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+# Seconds allowed to open a new connection
+CONNECT_TIMEOUT = int(os.getenv("AMR_DB_CONNECT_TIMEOUT", "5"))
+
+
+class DatabasePoolTimeout(TimeoutError):
+    """No pooled connection became free within the acquire timeout."""
+
+
+class AsyncConnectionPool:
+    """
+    PostgreSQL connection pool for use from coroutines.
+
+    psycopg2's ThreadedConnectionPool raises instead of waiting when it is
+    exhausted, so callers queue on a semaphore with one slot per connection
+    and run their query in an executor with one thread per connection. A
+    caller cancelled while its query runs frees its slot early, but the
+    executor still never runs more queries than there are connections.
+    """
+
+    def __init__(self, size: int = ASYNC_POOL_SIZE, acquire_timeout: float = ACQUIRE_TIMEOUT,
+                 statement_timeout_ms: int = STATEMENT_TIMEOUT_MS, connect_timeout: int = CONNECT_TIMEOUT,
+                 name: str = "async", connection_factory: Optional[Callable[[], Any]] = None):
+        """
+        Initialize the pool. Connections are opened on first use.
+
+        Args:
+            size: Maximum number of connections
+            acquire_timeout: Seconds to wait for a free connection
+            statement_timeout_ms: Server-side statement timeout in milliseconds, 0 to disable
+            connect_timeout: Seconds allowed to open a connection
+            name: Pool name in the metrics
+            connection_factory: Callable creating the underlying psycopg2 pool (default:
+                a ThreadedConnectionPool on the environment's database)
+        """
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.statement_timeout_ms = statement_timeout_ms
+        self.connect_timeout = connect_timeout
+        self.name = name
+        self._connection_factory = connection_factory or self._create_pool
+        self._pool = None
+        self._lock = threading.Lock()
+        self._slots = asyncio.Semaphore(size)
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"amr-db-{name}")
+        self.in_use = 0
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.acquire_seconds_total = 0.0
+        self.acquire_seconds_max = 0.0
+
+    def _create_pool(self):
+        """Create the psycopg2 pool with the connection timeouts"""
+        options = f"-c statement_timeout={self.statement_timeout_ms}" if self.statement_timeout_ms else None
+        logger.info(f"Initializing async database pool '{self.name}' with {self.size} connections")
+        return pool.ThreadedConnectionPool(minconn=0, maxconn=self.size, connect_timeout=self.connect_timeout,
+                                           options=options, **connection_params())
+
+    def _publish(self) -> None:
+        """Report the pool utilisation to the telemetry registry"""
+        record_db_pool_usage(self.name, self.in_use, self.waiting, self.size)
+
+    def getconn(self):
+        """
+        Check out a connection. Only called from the pool's executor threads.
+
+        Returns:
+            A database connection
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._connection_factory()
+        conn = self._pool.getconn()
+        with self._lock:
+            self.in_use += 1
+        self._publish()
+        return conn
+
+    def putconn(self, conn) -> None:
+        """
+        Return a connection to the pool.
+
+        Args:
+            conn: Connection from getconn
+        """
+        try:
+            self._pool.putconn(conn)
+        except Exception as e:
+            logger.error(f"Error releasing connection to async pool: {str(e)}")
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._publish()
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking database function once a connection slot is free.
+
+        Args:
+            func: Function that checks out at most one connection at a time
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Return value of func
+
+        Raises:
+            DatabasePoolTimeout: If no connection became free within the acquire timeout
+        """
+        start = time.perf_counter()
+        self.waiting += 1
+        self._publish()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            observe_db_pool_acquire(self.name, time.perf_counter() - start, timed_out=True)
+            raise DatabasePoolTimeout(
+                f"No database connection free after {self.acquire_timeout:.1f}s "
+                f"({self.in_use}/{self.size} in use, {self.waiting - 1} waiting)"
+            )
+        finally:
+            self.waiting -= 1
+            self._publish()
+
+        waited = time.perf_counter() - start
+        self.acquired += 1
+        self.acquire_seconds_total += waited
+        self.acquire_seconds_max = max(self.acquire_seconds_max, waited)
+        observe_db_pool_acquire(self.name, waited)
+        try:
+            loop = asyncio.get_running_loop()
+            # Run in a copy of the caller's context, so the query keeps the
+            # request's correlation ID and counts towards its operation's DB time
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(self._executor, context.run,
+                                              functools.partial(func, *args, **kwargs))
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the utilisation of the pool.
+
+        Returns:
+            Dictionary with the pool size, connections in use, waiting callers,
+            acquisitions, timeouts and acquire latency
+        """
+        return {
+            "size": self.size,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "acquire_seconds_avg": round(self.acquire_seconds_total / self.acquired, 6) if self.acquired else 0.0,
+            "acquire_seconds_max": round(self.acquire_seconds_max, 6)
+        }
+
+    def close(self) -> None:
+        """Close all connections and stop the executor"""
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+        logger.info(f"Async database pool '{self.name}' closed")
+
+
+class PooledJobTables(AMRDatabaseManager):
+    """
+    The AMRDatabaseManager job queries on the connections of an async pool.
+
+    Unlike AMRDatabaseManager this is not a singleton: every instance is
+    bound to its own pool.
+    """
+
+    def __new__(cls, connection_pool: AsyncConnectionPool):
+        return object.__new__(cls)
+
+    def __init__(self, connection_pool: AsyncConnectionPool):
+        """
+        Initialize the job tables.
+
+        Args:
+            connection_pool: Pool providing the connections
+        """
+        self.connection_pool = connection_pool
+
+    def get_connection(self):
+        """Get a connection from the async pool"""
+        return self.connection_pool.getconn()
+
+    def release_connection(self, conn):
+        """Release a connection back to the async pool"""
+        self.connection_pool.putconn(conn)
+
+    def close(self):
+        """Close the async pool"""
+        self.connection_pool.close()
+
+
+class AsyncAMRJobRepository:
+    """
+    Async repository for AMR prediction jobs.
+
+    Runs AMRJobRepository, with its cache of finished jobs and its
+    conversions, on the connections of an AsyncConnectionPool.
+    """
+
+    def __init__(self, connection_pool: Optional[AsyncConnectionPool] = None):
+        """
+        Initialize the async repository.
+
+        Args:
+            connection_pool: Pool to run queries on (default: the global async pool)
+        """
+        self.pool = connection_pool or get_async_pool()
+        self.repository = AMRJobRepository(db_manager=PooledJobTables(self.pool))
+
+    async def create_job(self, job_id: str, initial_status: str = "Submitted",
+                         additional_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create a new job record, see AMRJobRepository.create_job"""
+        return await self.pool.run(self.repository.create_job, job_id, initial_status, additional_info)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID, see AMRJobRepository.get_job"""
+        # Finished jobs are served from memory without taking a connection slot
+        cached = self.repository.job_cache.get(job_id)
+        if cached is not None:
+            return cached
+        return await self.pool.run(self.repository.get_job, job_id)
+
+    async def find_completed_job(self, input_sha256: str,
+                                 parameters: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Find a completed job on the same input, see AMRJobRepository.find_completed_job"""
+        return await self.pool.run(self.repository.find_completed_job, input_sha256, parameters)
+
+    async def get_jobs(self, status: Optional[str] = None, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """List jobs by offset, see AMRJobRepository.get_jobs"""
+        return await self.pool.run(self.repository.get_jobs, status=status, limit=limit, offset=offset)
+
+    async def get_jobs_page(self, **kwargs) -> Dict[str, Any]:
+        """Get a page of jobs, see AMRJobRepository.get_jobs_page"""
+        return await self.pool.run(self.repository.get_jobs_page, **kwargs)
+
+    async def update_job_status(self, job_id: str, status: str, **kwargs) -> bool:
+        """Update the status of a job, see AMRJobRepository.update_job_status"""
+        return await self.pool.run(self.repository.update_job_status, job_id, status, **kwargs)
+
+    async def add_job_parameters(self, job_id: str, parameters: Dict[str, Any]) -> bool:
+        """Add parameters to a job, see AMRJobRepository.add_job_parameters"""
+        return await self.pool.run(self.repository.add_job_parameters, job_id, parameters)
+
+    async def archive_job(self, job_id: str) -> bool:
+        """Archive a finished job, see AMRJobRepository.archive_job"""
+        return await self.pool.run(self.repository.archive_job, job_id)
+
+    async def delete_job(self, job_id: str) -> bool:
+        """Delete a job, see AMRJobRepository.delete_job"""
+        return await self.pool.run(self.repository.delete_job, job_id)
+
+    def close(self) -> None:
+        """Close the async pool"""
+        self.pool.close()
+
+
+# Global async pool instance
+_async_pool = None
+_async_pool_lock = threading.Lock()
+
+
+def get_async_pool() -> AsyncConnectionPool:
+    """
+    Get the global async connection pool instance.
+
+    Returns:
+        AsyncConnectionPool instance
+    """
+    global _async_pool
+    if _async_pool is None:
+        with _async_pool_lock:
+            if _async_pool is None:
+                _async_pool = AsyncConnectionPool()
+    return _async_pool
@@ -0,0 +1,403 @@
+"""
+Transparent decompression of sequence files for AMR Predictor.
+
+FASTA files may arrive plain, gzip-compressed, BGZF-compressed (bgzip,
+a series of independent gzip blocks that readers can seek into) or
+zstd-compressed. The format is detected from the leading magic bytes, not
+from the file name, and the data is decompressed while it is read, so no
+decompressed copy is written to disk. zstd support needs the optional
+zstandard package.
+
+Uploads are stored as BGZF, which any gzip reader can read and which keeps
+random access to the data possible through a block index.
+"""
+
+import io
+import os
+import zlib
+import struct
+from typing import Any, BinaryIO, Callable, List, Optional, Tuple, Union
+
+# Try to import zstandard for zstd-compressed input
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# File name suffixes of compressed files
+COMPRESSED_SUFFIXES = (".gz", ".bgz", ".zst", ".zstd")
+
+# Largest piece of data decompressed at a time from a stream
+DECOMPRESSED_PIECE_SIZE = 64 * 1024
+
+# Uncompressed bytes per BGZF block (the bgzip default, leaving room for
+# incompressible data in the 64 KiB block limit)
+BGZF_BLOCK_SIZE = 0xff00
+
+# Empty block marking the end of a BGZF file
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+
+
+class CompressionError(ValueError):
+    """Raised when compressed data is corrupt or its format is not supported."""
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """
+    Detect the compression of data from its first bytes.
+
+    Args:
+        head: At least the first 16 bytes of the data (fewer if the data is shorter)
+
+    Returns:
+        "bgzip", "gzip", "zstd", or None for uncompressed data
+    """
+    if head.startswith(GZIP_MAGIC):
+        # BGZF blocks carry a "BC" extra subfield right after the header
+        if len(head) >= 14 and head[3] & 4 and head[12:14] == b"BC":
+            return "bgzip"
+        return "gzip"
+    if head.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def sniff_compression(path: Union[str, os.PathLike]) -> Optional[str]:
+    """
+    Detect the compression of a file.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        "bgzip", "gzip", "zstd", or None for an uncompressed file
+    """
+    with open(path, "rb") as handle:
+        return detect_compression(handle.read(16))
+
+
+def strip_compression_suffix(name: str) -> str:
+    """
+    Remove a compression suffix from a file name, e.g. "a.fa.gz" -> "a.fa".
+
+    Args:
+        name: File name or path
+
+    Returns:
+        Name without the compression suffix
+    """
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def _require_zstd() -> None:
+    if not ZSTD_AVAILABLE:
+        raise CompressionError("zstd-compressed input needs the zstandard package")
+
+
+def open_maybe_compressed(path: Union[str, os.PathLike], mode: str = "rt",
+                          encoding: str = "utf-8") -> Union[BinaryIO, io.TextIOBase]:
+    """
+    Open a file for reading, decompressing it on the fly if it is compressed.
+
+    Args:
+        path: Path to the file
+        mode: "rt" for text or "rb" for bytes
+        encoding: Text encoding in text mode
+
+    Returns:
+        File object reading the uncompressed data
+
+    Raises:
+        CompressionError: If the file is zstd-compressed and zstandard is not installed
+    """
+    if mode not in ("r", "rt", "rb"):
+        raise ValueError(f"Unsupported mode: {mode}")
+    compression = sniff_compression(path)
+    if compression in ("gzip", "bgzip"):
+        import gzip
+        raw = gzip.open(path, "rb")
+    elif compression == "zstd":
+        _require_zstd()
+        raw = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(
+            open(path, "rb"), read_across_frames=True, closefd=True))
+    elif mode == "rb":
+        return open(path, "rb")
+    else:
+        return open(path, "r", encoding=encoding)
+    return raw if mode == "rb" else io.TextIOWrapper(raw, encoding=encoding)
+
+
+def decompress_bytes(data: bytes) -> bytes:
+    """
+    Decompress data held in memory if it is compressed.
+
+    Args:
+        data: Possibly compressed data
+
+    Returns:
+        Uncompressed data (the input itself if it is not compressed)
+
+    Raises:
+        CompressionError: If the data is corrupt or zstandard is not installed for zstd data
+    """
+    if detect_compression(data[:16]) is None:
+        return data
+    decompressor = StreamDecompressor(detect_compression(data[:16]))
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+class _ZstdFrameTracker:
+    """
+    Follows the frame and block headers of zstd data, without decompressing it.
+
+    zstandard's streaming decompressors do not report whether the data ended
+    inside a frame, so the boundaries are tracked here to detect truncation.
+    """
+
+    def __init__(self):
+        """Initialize the tracker at the start of a frame"""
+        self._pending = b""
+        self._skip = 0
+        self._in_frame = False
+        self._checksum = False
+
+    @property
+    def at_boundary(self) -> bool:
+        """Whether the data so far ends between frames"""
+        return not (self._in_frame or self._skip or self._pending)
+
+    def feed(self, data: bytes) -> None:
+        """Follow the next compressed bytes"""
+        # Only a partial header is kept between calls
+        data = self._pending + data
+        position = 0
+        while True:
+            if self._skip:
+                step = min(self._skip, len(data) - position)
+                self._skip -= step
+                position += step
+                if self._skip:
+                    break
+            available = len(data) - position
+            if self._in_frame:
+                # Block header: last-block flag, block type and size
+                if available < 3:
+                    break
+                header = int.from_bytes(data[position:position + 3], "little")
+                block_type, block_size = (header >> 1) & 3, header >> 3
+                # RLE blocks hold a single byte, repeated block_size times
+                self._skip = 3 + (1 if block_type == 1 else block_size)
+                if header & 1:
+                    self._in_frame = False
+                    self._skip += 4 if self._checksum else 0
+                continue
+            # Any complete frame has at least 8 bytes
+            if available < 8:
+                break
+            magic = int.from_bytes(data[position:position + 4], "little")
+            if magic & 0xFFFFFFF0 == 0x184D2A50:
+                # Skippable frame: magic, size and that many bytes
+                self._skip = 8 + int.from_bytes(data[position + 4:position + 8], "little")
+                continue
+            descriptor = data[position + 4]
+            single_segment = descriptor >> 5 & 1
+            content_size_bytes = (single_segment, 2, 4, 8)[descriptor >> 6]
+            dictionary_bytes = (0, 1, 2, 4)[descriptor & 3]
+            self._skip = 5 + (1 - single_segment) + dictionary_bytes + content_size_bytes
+            self._checksum = bool(descriptor >> 2 & 1)
+            self._in_frame = True
+        self._pending = data[position:]
+
+
+class StreamDecompressor:
+    """
+    Incremental decompressor for data arriving in chunks.
+
+    Handles multi-member gzip (including BGZF) and multi-frame zstd data.
+    Output is produced in pieces of at most piece_size bytes, so a highly
+    compressed chunk never expands in memory all at once.
+    """
+
+    def __init__(self, compression: str, piece_size: int = DECOMPRESSED_PIECE_SIZE):
+        """
+        Initialize the decompressor.
+
+        Args:
+            compression: "gzip", "bgzip" or "zstd"
+            piece_size: Largest piece of decompressed data produced at a time
+        """
+        if compression not in ("gzip", "bgzip", "zstd"):
+            raise CompressionError(f"Unsupported compression: {compression}")
+        self.compression = compression
+        self.piece_size = piece_size
+        self._write: Optional[Callable[[bytes], Any]] = None
+        if compression == "zstd":
+            _require_zstd()
+            # The writer decodes across frames and passes on bounded pieces
+            self._decompressor = zstandard.ZstdDecompressor().stream_writer(
+                _CallbackWriter(self._emit), write_size=piece_size)
+            self._frames = _ZstdFrameTracker()
+        else:
+            self._decompressor = zlib.decompressobj(wbits=31)
+        # Whether the current gzip member has received data
+        self._member_started = False
+
+    def _emit(self, data: bytes) -> None:
+        self._write(data)
+
+    def decompress_to(self, chunk: bytes, write: Callable[[bytes], Any]) -> None:
+        """
+        Decompress the next chunk, passing the output on as it is produced.
+
+        Args:
+            chunk: Compressed bytes, split anywhere
+            write: Called with each piece of decompressed data, of at most
+                piece_size bytes; an exception it raises stops decompression
+
+        Raises:
+            CompressionError: If the data is corrupt
+        """
+        self._write = write
+        try:
+            if self.compression == "zstd":
+                self._frames.feed(chunk)
+                self._decompressor.write(chunk)
+            else:
+                self._inflate(chunk)
+        except zlib.error as e:
+            raise CompressionError(f"Corrupt {self.compression} data: {str(e)}")
+        except Exception as e:
+            if ZSTD_AVAILABLE and isinstance(e, zstandard.ZstdError):
+                raise CompressionError(f"Corrupt {self.compression} data: {str(e)}")
+            raise
+        finally:
+            self._write = None
+
+    def _inflate(self, chunk: bytes) -> None:
+        """Decompress gzip data in bounded pieces, member after member"""
+        while chunk:
+            self._member_started = True
+            while True:
+                data = self._decompressor.decompress(chunk, self.piece_size)
+                if data:
+                    self._write(data)
+                chunk = self._decompressor.unconsumed_tail
+                # A full piece may leave output behind even once the input is consumed
+                if self._decompressor.eof or (not chunk and len(data) < self.piece_size):
+                    break
+            if not self._decompressor.eof:
+                break
+            # Start the next gzip member
+            chunk = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(wbits=31)
+            self._member_started = False
+
+    def decompress(self, chunk: bytes) -> bytes:
+        """
+        Decompress the next chunk.
+
+        Args:
+            chunk: Compressed bytes, split anywhere
+
+        Returns:
+            Uncompressed bytes available so far
+
+        Raises:
+            CompressionError: If the data is corrupt
+        """
+        output = []
+        self.decompress_to(chunk, output.append)
+        return b"".join(output)
+
+    def flush(self) -> bytes:
+        """
+        Finish decompression.
+
+        Returns:
+            Remaining uncompressed bytes
+
+        Raises:
+            CompressionError: If the data ended in the middle of a gzip member or zstd frame
+        """
+        finished = self._frames.at_boundary if self.compression == "zstd" else not self._member_started
+        if not finished:
+            raise CompressionError(f"Truncated {self.compression} data")
+        return b""
+
+
+class _CallbackWriter(io.RawIOBase):
+    """Writable stream passing what is written to a callback"""
+
+    def __init__(self, callback: Callable[[bytes], Any]):
+        self._callback = callback
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._callback(bytes(data))
+        return len(data)
+
+
+class BgzfWriter:
+    """
+    Writer compressing data into BGZF blocks.
+
+    Each block holds up to BGZF_BLOCK_SIZE uncompressed bytes as an
+    independent gzip member, so the output is a valid gzip file whose
+    blocks can be located and decompressed on their own.
+    """
+
+    def __init__(self, handle: BinaryIO, level: int = 6):
+        """
+        Initialize the writer.
+
+        Args:
+            handle: Binary file object to write the compressed data to
+            level: zlib compression level
+        """
+        self.handle = handle
+        self.level = level
+        self._buffer = bytearray()
+        self.blocks: List[Tuple[int, int]] = []
+        self._compressed_offset = 0
+        self._uncompressed_offset = 0
+
+    def write(self, data: bytes) -> None:
+        """
+        Compress data, writing every full block.
+
+        Args:
+            data: Uncompressed bytes
+        """
+        self._buffer.extend(data)
+        while len(self._buffer) >= BGZF_BLOCK_SIZE:
+            self._write_block(bytes(self._buffer[:BGZF_BLOCK_SIZE]))
+            del self._buffer[:BGZF_BLOCK_SIZE]
+
+    def _write_block(self, data: bytes) -> None:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        payload = compressor.compress(data) + compressor.flush()
+        block_size = len(payload) + 26
+        header = struct.pack("<4BI2BH2BHH", 0x1f, 0x8b, 8, 4, 0, 0, 0xff, 6,
+                             ord("B"), ord("C"), 2, block_size - 1)
+        footer = struct.pack("<II", zlib.crc32(data) & 0xffffffff, len(data))
+        self.handle.write(header + payload + footer)
+        # (compressed, uncompressed) start offsets of the block
+        self.blocks.append((self._compressed_offset, self._uncompressed_offset))
+        self._compressed_offset += block_size
+        self._uncompressed_offset += len(data)
+
+    def close(self) -> None:
+        """Write the last partial block and the end-of-file marker"""
+        if self._buffer:
+            self._write_block(bytes(self._buffer))
+            self._buffer.clear()
+        self.handle.write(BGZF_EOF)
@@ -0,0 +1,241 @@
+"""
+Job cost model for AMR Predictor.
+
+Every finished prediction job records its size (total bases, segments and
+tokens), the model, engine and device it ran on, and its wall time in the
+amr_job_metrics table. From the recent history of each model the cost
+model fits job time as a fixed overhead plus time per base, which gives
+an expected duration at submission, an ETA while the job runs and the
+job length the queue uses to run short jobs first.
+"""
+
+import time
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple
+
+from .utils import logger
+
+# Finished jobs per model used to fit its throughput
+HISTORY_JOBS = 200
+
+# Seconds a fitted model is reused before the history is read again
+FIT_CACHE_SECONDS = 300
+
+# Rough CPU throughput and per-job overhead (model loading, aggregation)
+# used for a model without history
+DEFAULT_BASES_PER_SECOND = 20000.0
+DEFAULT_OVERHEAD_SECONDS = 15.0
+
+METRICS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS amr_job_metrics (
+    id BIGSERIAL PRIMARY KEY,
+    job_id VARCHAR(255) NOT NULL,
+    model_name VARCHAR(255) NOT NULL,
+    engine VARCHAR(20),
+    device VARCHAR(20),
+    total_bases BIGINT NOT NULL,
+    segments INTEGER,
+    tokens BIGINT,
+    wall_seconds DOUBLE PRECISION NOT NULL,
+    recorded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_job_metrics_model ON amr_job_metrics (model_name, recorded_at DESC);
+"""
+
+
+@dataclass
+class JobMetrics:
+    """Size and wall time of a finished job."""
+    job_id: str
+    model_name: str
+    engine: Optional[str]
+    device: Optional[str]
+    total_bases: int
+    segments: Optional[int]
+    tokens: Optional[int]
+    wall_seconds: float
+
+
+@dataclass
+class ThroughputModel:
+    """Job time as a fixed overhead plus time per base."""
+    overhead_seconds: float
+    seconds_per_base: float
+    samples: int = 0
+
+    def predict(self, total_bases: int) -> float:
+        """Get the expected wall time of a job"""
+        return self.overhead_seconds + self.seconds_per_base * max(0, total_bases)
+
+    @property
+    def bases_per_second(self) -> float:
+        """Get the throughput without the fixed overhead"""
+        return 1.0 / self.seconds_per_base if self.seconds_per_base > 0 else float("inf")
+
+
+DEFAULT_THROUGHPUT = ThroughputModel(DEFAULT_OVERHEAD_SECONDS, 1.0 / DEFAULT_BASES_PER_SECOND)
+
+
+def fit_throughput(observations: List[Tuple[int, float]]) -> Optional[ThroughputModel]:
+    """
+    Fit job time against job size by least squares.
+
+    The overhead and time per base are kept non-negative: if the fitted
+    line has a negative intercept or slope, the time per base is fitted
+    through the origin instead.
+
+    Args:
+        observations: (total bases, wall seconds) of finished jobs
+
+    Returns:
+        Fitted model, or None without observations
+    """
+    observations = [(bases, seconds) for bases, seconds in observations if bases > 0 and seconds >= 0]
+    if not observations:
+        return None
+    n = len(observations)
+    mean_bases = sum(bases for bases, _ in observations) / n
+    mean_seconds = sum(seconds for _, seconds in observations) / n
+    variance = sum((bases - mean_bases) ** 2 for bases, _ in observations)
+    if n >= 2 and variance > 0:
+        slope = sum((bases - mean_bases) * (seconds - mean_seconds) for bases, seconds in observations) / variance
+        intercept = mean_seconds - slope * mean_bases
+        if slope > 0 and intercept >= 0:
+            return ThroughputModel(intercept, slope, n)
+    slope = sum(seconds for _, seconds in observations) / sum(bases for bases, _ in observations)
+    return ThroughputModel(0.0, slope, n)
+
+
+def estimate_remaining_seconds(expected_seconds: Optional[float], elapsed: float,
+                               processed: Optional[int] = None, total: Optional[int] = None,
+                               stage_elapsed: Optional[float] = None) -> Optional[float]:
+    """
+    Estimate the time left of a running job.
+
+    While segments are being predicted the estimate follows the observed
+    rate of the current stage; otherwise it is the expected duration less
+    the elapsed time.
+
+    Args:
+        expected_seconds: Expected duration of the job from the cost model
+        elapsed: Seconds since the job started
+        processed: Segments predicted so far in the current stage
+        total: Segments of the current stage
+        stage_elapsed: Seconds since the current stage started
+
+    Returns:
+        Estimated seconds left, or None without an estimate
+    """
+    if processed and total and stage_elapsed is not None and processed < total:
+        stage_remaining = stage_elapsed / processed * (total - processed)
+        if expected_seconds is None:
+            return round(stage_remaining, 1)
+        # The stage estimate says nothing about the steps after it
+        return round(max(stage_remaining, expected_seconds - elapsed), 1)
+    if expected_seconds is None:
+        return None
+    return round(max(0.0, expected_seconds - elapsed), 1)
+
+
+class JobCostModel:
+    """
+    Per-model throughput fitted from the job history in PostgreSQL.
+
+    Uses the connection pool of AMRDatabaseManager; fitted models are
+    cached for FIT_CACHE_SECONDS.
+    """
+
+    def __init__(self, db_manager=None):
+        """
+        Initialize the cost model.
+
+        Args:
+            db_manager: Database manager providing get_connection/release_connection
+                (default: the AMRDatabaseManager singleton)
+        """
+        if db_manager is None:
+            from .database_manager import AMRDatabaseManager
+            db_manager = AMRDatabaseManager()
+        self.db_manager = db_manager
+        self._fits: Dict[str, Tuple[float, ThroughputModel]] = {}
+        self._lock = threading.Lock()
+
+    def _execute(self, query: str, params: Optional[Any] = None, fetch: str = "none"):
+        """Run one statement in its own transaction"""
+        conn = self.db_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            result = cursor.fetchall() if fetch == "all" else cursor.rowcount
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_manager.release_connection(conn)
+
+    def ensure_table(self) -> None:
+        """Create the metrics table and its index if they do not exist"""
+        self._execute(METRICS_SCHEMA)
+
+    def record(self, metrics: JobMetrics) -> None:
+        """Record a finished job"""
+        self._execute(
+            "INSERT INTO amr_job_metrics (job_id, model_name, engine, device, total_bases, segments, "
+            "tokens, wall_seconds) VALUES (%(job_id)s, %(model_name)s, %(engine)s, %(device)s, "
+            "%(total_bases)s, %(segments)s, %(tokens)s, %(wall_seconds)s)",
+            asdict(metrics)
+        )
+        with self._lock:
+            self._fits.pop(metrics.model_name, None)
+        logger.info(f"Recorded {metrics.total_bases} bases in {metrics.wall_seconds:.1f}s "
+                    f"for {metrics.model_name} job {metrics.job_id}")
+
+    def fit(self, model_name: str) -> ThroughputModel:
+        """
+        Get the throughput model of a model.
+
+        Args:
+            model_name: Model the jobs ran with
+
+        Returns:
+            Model fitted from the recent history, or the defaults without history
+        """
+        with self._lock:
+            cached = self._fits.get(model_name)
+            if cached and time.time() - cached[0] < FIT_CACHE_SECONDS:
+                return cached[1]
+
+        rows = self._execute(
+            "SELECT total_bases, wall_seconds FROM amr_job_metrics WHERE model_name = %s "
+            "ORDER BY recorded_at DESC LIMIT %s",
+            (model_name, HISTORY_JOBS), fetch="all"
+        )
+        model = fit_throughput([(int(bases), float(seconds)) for bases, seconds in rows]) or DEFAULT_THROUGHPUT
+        with self._lock:
+            self._fits[model_name] = (time.time(), model)
+        return model
+
+    def estimate_seconds(self, model_name: str, total_bases: int) -> float:
+        """Get the expected wall time of a job"""
+        return round(self.fit(model_name).predict(total_bases), 1)
+
+
+# Global cost model instance
+_cost_model = None
+
+
+def get_cost_model() -> JobCostModel:
+    """
+    Get the global cost model instance, creating its table on first use.
+
+    Returns:
+        JobCostModel instance
+    """
+    global _cost_model
+    if _cost_model is None:
+        _cost_model = JobCostModel()
+        _cost_model.ensure_table()
+    return _cost_model
@@ -31,6 +31,36 @@ load_dotenv()
 # Get environment (dev, test, or prod)
 ENVIRONMENT = os.getenv('ENVIRONMENT', 'dev')
 
+# Job fields stored in columns of amr_jobs; other fields go to additional_info
+JOB_COLUMNS = ('job_id', 'id', 'status', 'progress', 'start_time', 'end_time',
+               'result_file', 'aggregated_result_file', 'error', 'additional_info')
+
+def connection_params() -> Dict[str, str]:
+    """
+    Get the PostgreSQL connection parameters for the current environment.
+    
+    Returns:
+        Keyword arguments for psycopg2.connect
+    """
+    # Get database name based on environment
+    if ENVIRONMENT == 'dev':
+        database = os.getenv('PG_DATABASE_DEV', 'amr_predictor_dev')
+    elif ENVIRONMENT == 'test':
+        database = os.getenv('PG_DATABASE_TEST', 'amr_predictor_test')
+    elif ENVIRONMENT == 'prod':
+        database = os.getenv('PG_DATABASE_PROD', 'amr_predictor_prod')
+    else:
+        logger.warning(f"Unknown environment: {ENVIRONMENT}, defaulting to dev")
+        database = os.getenv('PG_DATABASE_DEV', 'amr_predictor_dev')
+    
+    return {
+        'host': os.getenv('PG_HOST', 'localhost'),
+        'port': os.getenv('PG_PORT', '5432'),
+        'user': os.getenv('PG_USER', 'postgres'),
+        'password': os.getenv('PG_PASSWORD', ''),
+        'database': database
+    }
+
 class AMRDatabaseManager:
     """
     Database manager for AMR Predictor.
@@ -57,35 +87,11 @@ class AMRDatabaseManager:
             with cls._pool_lock:
                 if cls._pool is None:
                     try:
-                        # Get PostgreSQL connection parameters
-                        pg_host = os.getenv('PG_HOST', 'localhost')
-                        pg_port = os.getenv('PG_PORT', '5432')
-                        pg_user = os.getenv('PG_USER', 'postgres')
-                        pg_password = os.getenv('PG_PASSWORD', '')
-                        
-                        # Get database name based on environment
-                        if ENVIRONMENT == 'dev':
-                            database = os.getenv('PG_DATABASE_DEV', 'amr_predictor_dev')
-                        elif ENVIRONMENT == 'test':
-                            database = os.getenv('PG_DATABASE_TEST', 'amr_predictor_test')
-                        elif ENVIRONMENT == 'prod':
-                            database = os.getenv('PG_DATABASE_PROD', 'amr_predictor_prod')
-                        else:
-                            logger.warning(f"Unknown environment: {ENVIRONMENT}, defaulting to dev")
-                            database = os.getenv('PG_DATABASE_DEV', 'amr_predictor_dev')
-                        
-                        logger.info(f"Initializing database connection pool for {ENVIRONMENT} environment: {database}")
+                        params = connection_params()
+                        logger.info(f"Initializing database connection pool for {ENVIRONMENT} environment: {params['database']}")
                         
                         # Create the connection pool (min=2, max=20 connections)
-                        cls._pool = pool.ThreadedConnectionPool(
-                            minconn=2,
-                            maxconn=20,
-                            host=pg_host,
-                            port=pg_port,
-                            user=pg_user,
-                            password=pg_password,
-                            database=database
-                        )
+                        cls._pool = pool.ThreadedConnectionPool(minconn=2, maxconn=20, **params)
                         
                         logger.info("Database connection pool initialized successfully")
                     except Exception as e:
@@ -146,20 +152,17 @@ class AMRDatabaseManager:
             )
             """)
             
-            # Create amr_job_parameters table if it doesn't exist
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS amr_job_parameters (
-                id SERIAL PRIMARY KEY,
-                job_id VARCHAR(255) REFERENCES amr_jobs(id) ON DELETE CASCADE,
-                param_name VARCHAR(255) NOT NULL,
-                param_value TEXT,
-                UNIQUE(job_id, param_name)
-            )
-            """)
-            
-            # Create indexes for better performance
+            # Create indexes for better performance; the (start_time, id) indexes
+            # back the keyset-paginated job list, newest first, by status or owner
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_status ON amr_jobs(status)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_parameters ON amr_job_parameters(job_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_start_time_id ON amr_jobs(start_time DESC, id DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_status_start_time_id "
+                           "ON amr_jobs(status, start_time DESC, id DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_owner_start_time_id "
+                           "ON amr_jobs((additional_info ->> 'owner'), start_time DESC, id DESC)")
+            # Finished jobs by the hash of their input, to reuse results of duplicate uploads
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_input_sha256 "
+                           "ON amr_jobs((additional_info ->> 'input_sha256')) WHERE status = 'Completed'")
             
             conn.commit()
             logger.info("Database tables verified/created successfully")
@@ -171,11 +174,75 @@ class AMRDatabaseManager:
         finally:
             if conn:
                 self.release_connection(conn)
+        
+        self.migrate_job_parameters()
+    
+    def migrate_job_parameters(self) -> int:
+        """
+        Move job parameters from the legacy amr_job_parameters table into additional_info.
+        
+        Parameters were stored as one text row per key; they are merged into
+        the additional_info JSONB column of their job (parameters win over
+        existing keys, as they were written later), decoding values that
+        were stored as JSON. Migrated rows are deleted, so running this again
+        is cheap. Jobs whose additional_info was saved nested under an
+        "additional_info" key are flattened.
+        
+        Returns:
+            Number of jobs whose parameters were migrated
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            # Flatten additional_info saved as {"additional_info": {...}}
+            cursor.execute("""
+            UPDATE amr_jobs
+            SET additional_info = (additional_info - 'additional_info') || (additional_info -> 'additional_info')
+            WHERE jsonb_typeof(additional_info -> 'additional_info') = 'object'
+            """)
+            
+            cursor.execute("SELECT to_regclass('amr_job_parameters') IS NOT NULL")
+            if not cursor.fetchone()[0]:
+                conn.commit()
+                return 0
+            
+            cursor.execute("SELECT job_id, param_name, param_value FROM amr_job_parameters ORDER BY job_id")
+            parameters: Dict[str, Dict[str, Any]] = {}
+            for job_id, param_name, param_value in cursor.fetchall():
+                try:
+                    value = json.loads(param_value) if param_value is not None else None
+                except (TypeError, ValueError):
+                    value = param_value
+                parameters.setdefault(job_id, {})[param_name] = value
+            
+            for job_id, params in parameters.items():
+                cursor.execute("""
+                UPDATE amr_jobs SET additional_info = COALESCE(additional_info, '{}'::jsonb) || %s::jsonb
+                WHERE id = %s
+                """, (json.dumps(params, default=str), job_id))
+            cursor.execute("DELETE FROM amr_job_parameters")
+            
+            conn.commit()
+            if parameters:
+                logger.info(f"Migrated parameters of {len(parameters)} jobs to additional_info")
+            return len(parameters)
+        except Exception as e:
+            logger.error(f"Error migrating job parameters: {str(e)}")
+            if conn:
+                conn.rollback()
+            return 0
+        finally:
+            if conn:
+                self.release_connection(conn)
     
     def save_job(self, job_data: Dict[str, Any]) -> bool:
         """
         Save a job to the database.
         
+        Fields without a column of their own are stored in additional_info.
+        
         Args:
             job_data: Job data dictionary with all field values
             
@@ -203,67 +270,28 @@ class AMRDatabaseManager:
             aggregated_result_file = job_data.get('aggregated_result_file')
             error = job_data.get('error')
             
-            # Handle additional_info (convert to JSON)
-            additional_info = {}
+            # Merge the remaining fields into additional_info
+            additional_info = dict(job_data.get('additional_info') or {})
             for key, value in job_data.items():
                 # Skip core job fields that are stored in specific columns
-                if key not in ['job_id', 'id', 'status', 'progress', 'start_time', 'end_time', 
-                              'result_file', 'aggregated_result_file', 'error']:
+                if key not in JOB_COLUMNS and value is not None:
                     additional_info[key] = value
             
-            # Check if job already exists
-            cursor.execute("SELECT 1 FROM amr_jobs WHERE id = %s", (job_id,))
-            job_exists = cursor.fetchone() is not None
-            
-            if job_exists:
-                # Update existing job
-                cursor.execute("""
-                UPDATE amr_jobs 
-                SET status = %s, progress = %s, start_time = %s, end_time = %s,
-                    result_file = %s, aggregated_result_file = %s, error = %s, additional_info = %s
-                WHERE id = %s
-                """, (
-                    status, progress, start_time, end_time, 
-                    result_file, aggregated_result_file, error, 
-                    json.dumps(additional_info), job_id
-                ))
-            else:
-                # Insert new job
-                cursor.execute("""
-                INSERT INTO amr_jobs (id, status, progress, start_time, end_time, 
-                                    result_file, aggregated_result_file, error, additional_info)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    job_id, status, progress, start_time, end_time,
-                    result_file, aggregated_result_file, error,
-                    json.dumps(additional_info)
-                ))
-            
-            # Save job parameters (excluding fields already stored in amr_jobs)
-            for key, value in job_data.items():
-                # Skip core job fields and null values
-                if key not in ['job_id', 'id', 'status', 'progress', 'start_time', 'end_time', 
-                              'result_file', 'aggregated_result_file', 'error', 'additional_info'] and value is not None:
-                    # Check if parameter already exists
-                    cursor.execute("""
-                    SELECT 1 FROM amr_job_parameters 
-                    WHERE job_id = %s AND param_name = %s
-                    """, (job_id, key))
-                    param_exists = cursor.fetchone() is not None
-                    
-                    if param_exists:
-                        # Update existing parameter
-                        cursor.execute("""
-                        UPDATE amr_job_parameters 
-                        SET param_value = %s
-                        WHERE job_id = %s AND param_name = %s
-                        """, (str(value), job_id, key))
-                    else:
-                        # Insert new parameter
-                        cursor.execute("""
-                        INSERT INTO amr_job_parameters (job_id, param_name, param_value)
-                        VALUES (%s, %s, %s)
-                        """, (job_id, key, str(value)))
+            # Insert the job, or update it if it exists
+            cursor.execute("""
+            INSERT INTO amr_jobs (id, status, progress, start_time, end_time, 
+                                result_file, aggregated_result_file, error, additional_info)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (id) DO UPDATE SET
+                status = EXCLUDED.status, progress = EXCLUDED.progress,
+                start_time = EXCLUDED.start_time, end_time = EXCLUDED.end_time,
+                result_file = EXCLUDED.result_file, aggregated_result_file = EXCLUDED.aggregated_result_file,
+                error = EXCLUDED.error, additional_info = EXCLUDED.additional_info
+            """, (
+                job_id, status, progress, start_time, end_time,
+                result_file, aggregated_result_file, error,
+                json.dumps(additional_info, default=str)
+            ))
             
             # Commit the transaction
             conn.commit()
@@ -362,7 +390,7 @@ class AMRDatabaseManager:
             # Use RealDictCursor to get results as dictionaries
             cursor = conn.cursor(cursor_factory=RealDictCursor)
             
-            # Get job data
+            # Get job data, including its parameters in additional_info
             cursor.execute("""
             SELECT * FROM amr_jobs WHERE id = %s
             """, (job_id,))
@@ -374,15 +402,6 @@ class AMRDatabaseManager:
             # Convert to regular Python dict
             job_data = dict(job_row)
             
-            # Get job parameters
-            cursor.execute("""
-            SELECT param_name, param_value FROM amr_job_parameters WHERE job_id = %s
-            """, (job_id,))
-            
-            # Add parameters to job data
-            for row in cursor.fetchall():
-                job_data[row["param_name"]] = row["param_value"]
-            
             # Parse additional_info from JSON if needed
             if job_data.get('additional_info'):
                 if isinstance(job_data['additional_info'], str):
@@ -403,6 +422,42 @@ class AMRDatabaseManager:
             if conn:
                 self.release_connection(conn)
     
+    def find_completed_job(self, input_sha256: str, parameters: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find the latest completed job run on the same input with the same parameters.
+        
+        Args:
+            input_sha256: SHA-256 of the job's input file
+            parameters: additional_info values the job must have been run with
+            
+        Returns:
+            Job data dictionary or None if there is no such job
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute("""
+            SELECT * FROM amr_jobs
+            WHERE additional_info ->> 'input_sha256' = %s AND status = 'Completed'
+              AND additional_info @> %s::jsonb
+            ORDER BY end_time DESC NULLS LAST
+            LIMIT 1
+            """, (input_sha256, json.dumps(parameters or {})))
+            
+            job_row = cursor.fetchone()
+            if not job_row:
+                return None
+            job_data = dict(job_row)
+            job_data.setdefault('job_id', job_data.get('id'))
+            return job_data
+        except Exception as e:
+            logger.error(f"Error finding job for input {input_sha256}: {str(e)}")
+            return None
+        finally:
+            if conn:
+                self.release_connection(conn)
+    
     def get_jobs(self, limit: int = 100, offset: int = 0, status: str = None) -> List[Dict[str, Any]]:
         """
         Get a list of jobs with optional filtering by status.
@@ -465,56 +520,141 @@ class AMRDatabaseManager:
             if conn:
                 self.release_connection(conn)
     
-    def add_job_parameter(self, job_id: str, param_name: str, param_value: Any) -> bool:
+    @staticmethod
+    def _job_filters(status: Optional[str] = None, owner: Optional[str] = None,
+                     since: Optional[datetime] = None, until: Optional[datetime] = None) -> Tuple[List[str], List[Any]]:
+        """Build the WHERE clauses and parameters of the job list filters"""
+        clauses, params = [], []
+        if status:
+            clauses.append("status = %s")
+            params.append(status)
+        if owner:
+            clauses.append("additional_info ->> 'owner' = %s")
+            params.append(owner)
+        if since:
+            clauses.append("start_time >= %s")
+            params.append(since)
+        if until:
+            clauses.append("start_time < %s")
+            params.append(until)
+        return clauses, params
+    
+    def get_jobs_page(self, limit: int = 100, after: Optional[Tuple[datetime, str]] = None,
+                      status: Optional[str] = None, owner: Optional[str] = None,
+                      since: Optional[datetime] = None,
+                      until: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, str]]]:
         """
-        Add a parameter to a job.
+        Get a page of jobs, newest first, using keyset pagination.
+        
+        Pages continue after the (start_time, id) of the previous page's
+        last job, so every page is an index range scan regardless of how
+        deep it is, and jobs submitted meanwhile do not shift later pages.
         
         Args:
-            job_id: Job ID
-            param_name: Parameter name
-            param_value: Parameter value
+            limit: Maximum number of jobs to return
+            after: (start_time, id) of the last job of the previous page
+            status: Filter jobs by status
+            owner: Filter jobs by the submitting user
+            since: Only jobs started at or after this time
+            until: Only jobs started before this time
             
         Returns:
-            True if successful, False if job not found
+            Tuple of (jobs, (start_time, id) to continue after, or None on the last page)
         """
         conn = None
         try:
-            # Get a connection from the pool
             conn = self.get_connection()
-            cursor = conn.cursor()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
             
-            # Convert any non-string values to JSON strings
-            if not isinstance(param_value, str):
-                param_value = json.dumps(param_value)
+            clauses, params = self._job_filters(status, owner, since, until)
+            clauses.append("start_time IS NOT NULL")
+            if after is not None:
+                clauses.append("(start_time, id) < (%s, %s)")
+                params.extend(after)
+            
+            # Fetch one extra row to know whether another page follows
+            cursor.execute(
+                f"SELECT * FROM amr_jobs WHERE {' AND '.join(clauses)} "
+                "ORDER BY start_time DESC, id DESC LIMIT %s",
+                params + [limit + 1]
+            )
+            rows = [dict(row) for row in cursor.fetchall()]
             
-            # Check if job exists
-            cursor.execute("SELECT 1 FROM amr_jobs WHERE id = %s", (job_id,))
-            if cursor.fetchone() is None:
-                logger.warning(f"Cannot add parameter to non-existent job: {job_id}")
-                return False
+            next_key = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_key = (rows[-1]["start_time"], rows[-1]["id"])
             
-            # Insert or update parameter
-            cursor.execute("""
-            INSERT INTO amr_job_parameters (job_id, param_name, param_value)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (job_id, param_name) DO UPDATE SET param_value = EXCLUDED.param_value
-            """, (job_id, param_name, param_value))
+            for job_data in rows:
+                if isinstance(job_data.get('additional_info'), str):
+                    try:
+                        job_data['additional_info'] = json.loads(job_data['additional_info'])
+                    except ValueError:
+                        pass
+                job_data.setdefault('job_id', job_data['id'])
             
-            conn.commit()
-            return True
+            return rows, next_key
+        except Exception as e:
+            logger.error(f"Error retrieving jobs page: {str(e)}")
+            return [], None
+        finally:
+            if conn:
+                self.release_connection(conn)
+    
+    def estimate_job_count(self, status: Optional[str] = None, owner: Optional[str] = None,
+                           since: Optional[datetime] = None, until: Optional[datetime] = None) -> Optional[int]:
+        """
+        Estimate the number of jobs matching the job list filters.
+        
+        Uses the planner's row estimate, which comes from table statistics,
+        instead of counting rows.
+        
+        Returns:
+            Approximate number of jobs, or None if it cannot be estimated
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            clauses, params = self._job_filters(status, owner, since, until)
+            where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+            cursor.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM amr_jobs{where}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            conn.rollback()
+            return int(plan[0]["Plan"]["Plan Rows"])
         except Exception as e:
-            logger.error(f"Error adding job parameter: {str(e)}")
+            logger.error(f"Error estimating job count: {str(e)}")
             if conn:
                 conn.rollback()
-            return False
+            return None
         finally:
             if conn:
                 self.release_connection(conn)
     
+    def add_job_parameter(self, job_id: str, param_name: str, param_value: Any) -> bool:
+        """
+        Add a parameter to a job.
+        
+        Args:
+            job_id: Job ID
+            param_name: Parameter name
+            param_value: Parameter value
+            
+        Returns:
+            True if successful, False if job not found
+        """
+        return self.add_job_parameters(job_id, {param_name: param_value})
+    
     def add_job_parameters(self, job_id: str, parameters: Dict[str, Any]) -> bool:
         """
         Add multiple parameters to a job.
         
+        The parameters are merged into the job's additional_info with a
+        single update; existing keys are overwritten.
+        
         Args:
             job_id: Job ID
             parameters: Dictionary of parameters
@@ -528,24 +668,16 @@ class AMRDatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            # Check if job exists
-            cursor.execute("SELECT 1 FROM amr_jobs WHERE id = %s", (job_id,))
-            if cursor.fetchone() is None:
+            cursor.execute("""
+            UPDATE amr_jobs SET additional_info = COALESCE(additional_info, '{}'::jsonb) || %s::jsonb
+            WHERE id = %s
+            """, (json.dumps(parameters, default=str), job_id))
+            
+            if cursor.rowcount == 0:
                 logger.warning(f"Cannot add parameters to non-existent job: {job_id}")
+                conn.rollback()
                 return False
             
-            # Add each parameter
-            for param_name, param_value in parameters.items():
-                # Convert any non-string values to JSON strings
-                if not isinstance(param_value, str):
-                    param_value = json.dumps(param_value)
-                
-                cursor.execute("""
-                INSERT INTO amr_job_parameters (job_id, param_name, param_value)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (job_id, param_name) DO UPDATE SET param_value = EXCLUDED.param_value
-                """, (job_id, param_name, param_value))
-            
             conn.commit()
             return True
         except Exception as e:
@@ -557,6 +689,32 @@ class AMRDatabaseManager:
             if conn:
                 self.release_connection(conn)
     
+    def delete_job(self, job_id: str) -> bool:
+        """
+        Delete a job.
+        
+        Args:
+            job_id: Job ID to delete
+            
+        Returns:
+            True if successful, False if job not found
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM amr_jobs WHERE id = %s", (job_id,))
+            conn.commit()
+            return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error deleting job {job_id}: {str(e)}")
+            if conn:
+                conn.rollback()
+            return False
+        finally:
+            if conn:
+                self.release_connection(conn)
+    
     def close(self):
         """Close the database connection pool."""
         if self.__class__._pool is not None:
@@ -0,0 +1,218 @@
+"""
+Inference engines for the AMR Predictor module.
+
+An engine runs the classifier on tokenized batches and returns class
+probabilities. ModelManager tokenizes and batches; the engine decides how
+the forward pass is executed:
+
+- ``torch``: the PyTorch model (fp32, bf16 autocast or dynamic int8)
+- ``onnx``: an ONNX export of the merged model run with ONNX Runtime,
+  which on CPU-only nodes is faster and uses less memory than PyTorch.
+  It needs the pinned onnx and onnxruntime packages of
+  requirements-onnx.txt (the "onnx" extra), installed in the API image.
+"""
+
+import os
+import json
+from contextlib import nullcontext
+from importlib.metadata import version as package_version
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .utils import logger, LazyImport, module_available, ensure_directory_exists
+
+ONNXRUNTIME_AVAILABLE = module_available("onnxruntime")
+if ONNXRUNTIME_AVAILABLE:
+    onnxruntime = LazyImport("onnxruntime")
+
+torch = LazyImport("torch")
+
+ENGINES = ("torch", "onnx")
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_CONFIG_FILE = "onnx_config.json"
+DEFAULT_OPSET = 17
+
+
+def available_engines() -> List[str]:
+    """Get the engines whose dependencies are installed"""
+    engines = []
+    if module_available("torch") and module_available("transformers"):
+        engines.append("torch")
+    if ONNXRUNTIME_AVAILABLE:
+        engines.append("onnx")
+    return engines
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax"""
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class InferenceEngine:
+    """
+    Base class for inference engines.
+
+    Subclasses set ``name`` and ``tensor_type`` (the ``return_tensors`` value
+    the tokenizer must produce for the engine) and implement predict_proba.
+    """
+
+    name = "base"
+    tensor_type = "np"
+
+    def prepare(self, inputs: Any) -> Any:
+        """Move tokenized inputs to where the engine runs them"""
+        return inputs
+
+    def predict_proba(self, inputs: Any) -> np.ndarray:
+        """
+        Run the classifier on a tokenized batch.
+
+        Args:
+            inputs: Tokenizer output for the batch
+
+        Returns:
+            Array of class probabilities with shape (batch, classes)
+        """
+        raise NotImplementedError
+
+    def get_info(self) -> Dict[str, Any]:
+        """Get engine information for model metadata"""
+        return {"engine": self.name}
+
+
+class TorchEngine(InferenceEngine):
+    """Run the PyTorch model."""
+
+    name = "torch"
+    tensor_type = "pt"
+
+    def __init__(self, model: Any, device: str = "cpu", precision: str = "fp32"):
+        """
+        Initialize the engine.
+
+        Args:
+            model: Loaded PyTorch model
+            device: Device the model is on
+            precision: Inference precision ('fp32', 'bf16', 'int8')
+        """
+        self.model = model
+        self.device = device
+        self.precision = precision
+        self.model.eval()
+
+    def _autocast(self) -> Any:
+        """Get the autocast context for the configured precision"""
+        if self.precision == "bf16":
+            return torch.autocast(device_type=self.device.split(":")[0], dtype=torch.bfloat16)
+        return nullcontext()
+
+    def prepare(self, inputs: Any) -> Any:
+        return inputs.to(self.device)
+
+    def predict_proba(self, inputs: Any) -> np.ndarray:
+        with torch.no_grad(), self._autocast():
+            logits = self.model(**inputs).logits.float()
+            return torch.nn.functional.softmax(logits, dim=1).cpu().numpy()
+
+
+class OnnxRuntimeEngine(InferenceEngine):
+    """Run an ONNX export of the classifier with ONNX Runtime on CPU."""
+
+    name = "onnx"
+    tensor_type = "np"
+
+    def __init__(self, model_dir: str, intra_op_threads: Optional[int] = None,
+                 inter_op_threads: Optional[int] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            model_dir: Directory with the exported model (see export_onnx)
+            intra_op_threads: Threads used within an operator (default: ONNX Runtime's choice)
+            inter_op_threads: Threads used across independent operators (default: ONNX Runtime's choice)
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime is required for the ONNX engine (pip install -r requirements-onnx.txt)")
+
+        self.model_path = os.path.join(model_dir, ONNX_MODEL_FILE)
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        if inter_op_threads:
+            options.inter_op_num_threads = inter_op_threads
+            options.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL
+
+        self.session = onnxruntime.InferenceSession(
+            self.model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+        logger.info(f"Loaded ONNX model from {self.model_path} (inputs: {self.input_names})")
+
+    def predict_proba(self, inputs: Any) -> np.ndarray:
+        feed = {name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names if name in inputs}
+        logits = self.session.run(["logits"], feed)[0]
+        return _softmax(logits.astype(np.float32))
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "engine": self.name,
+            "onnxruntime_version": package_version("onnxruntime"),
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads
+        }
+
+
+def export_onnx(model: Any, tokenizer: Any, output_dir: str, opset: int = DEFAULT_OPSET) -> str:
+    """
+    Export a (merged) sequence classification model to ONNX.
+
+    The batch and sequence axes of the inputs and the batch axis of the
+    logits are dynamic, so the export serves any batch size and segment
+    length. The tokenizer is saved alongside the model.
+
+    Args:
+        model: PyTorch model without adapter layers (see ModelManager.merge_adapter)
+        tokenizer: Tokenizer of the model
+        output_dir: Output directory
+        opset: ONNX opset version
+
+    Returns:
+        Path to the exported model file
+    """
+    if not module_available("onnx"):
+        raise ImportError("onnx is required to export models (pip install -r requirements-onnx.txt)")
+
+    ensure_directory_exists(output_dir)
+    model = model.to("cpu").eval()
+
+    sample = tokenizer(["ACGTACGTACGT", "ACGT"], return_tensors="pt", padding=True)
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    model_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (),
+            model_path,
+            kwargs={name: sample[name] for name in input_names},
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            dynamo=False
+        )
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, ONNX_CONFIG_FILE), "w") as f:
+        json.dump({"opset": opset, "input_names": input_names, "torch_version": package_version("torch")}, f, indent=2)
+
+    logger.info(f"Exported ONNX model to {model_path}")
+    return model_path
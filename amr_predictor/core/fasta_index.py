@@ -0,0 +1,423 @@
+"""
+FASTA index for random access to records and segments.
+
+The index follows the samtools faidx format: for every record a line with
+its name, length, byte offset of its first base and its line layout (bases
+and bytes per line) is written to "<file>.fai". With these, the byte range
+of any segment is computed directly instead of scanning the file, so a
+record is found in O(1) and a segment is read with one seek.
+
+Offsets are positions in the uncompressed data. For BGZF-compressed files
+(see compression.py) a "<file>.gzi" block index, also in the samtools
+format, maps them to the compressed blocks, so only the blocks holding the
+segment are decompressed. Other compressed files are read sequentially up
+to the segment.
+
+The index also gives the file statistics (record count and lengths)
+without reading the file.
+"""
+
+import os
+import zlib
+import bisect
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Any
+
+from .compression import open_maybe_compressed, sniff_compression
+from .utils import logger
+
+# Bytes read at a time while building an index
+INDEX_CHUNK_SIZE = 1024 * 1024
+
+
+class FastaIndexError(ValueError):
+    """Raised when a FASTA file cannot be indexed or a region is out of range."""
+
+
+@dataclass
+class FaiRecord:
+    """Location and line layout of one FASTA record."""
+    name: str
+    length: int
+    offset: int
+    line_bases: int
+    line_width: int
+
+    def byte_offset(self, position: int) -> int:
+        """Get the uncompressed byte offset of a 0-based position in the record"""
+        if self.line_bases == 0:
+            return self.offset
+        return self.offset + position // self.line_bases * self.line_width + position % self.line_bases
+
+
+class FastaIndexBuilder:
+    """
+    Incremental FASTA indexer for data arriving in chunks.
+
+    Like samtools faidx, every line of a record except its last must have
+    the same length, otherwise the record's bases cannot be located by
+    arithmetic and a FastaIndexError is raised.
+    """
+
+    def __init__(self):
+        """Initialize the builder"""
+        self.records: List[FaiRecord] = []
+        self._offset = 0
+        self._current: Optional[FaiRecord] = None
+        self._short_line = False
+        # The unfinished line at the end of the data so far is only counted,
+        # so an unwrapped sequence is not copied again with every chunk;
+        # header lines are kept for their sequence ID
+        self._partial_length = 0
+        self._partial_cr = 0
+        self._partial_header: Optional[bytearray] = None
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Index the next chunk of uncompressed data.
+
+        Args:
+            chunk: Raw bytes, split anywhere
+
+        Raises:
+            FastaIndexError: If a record has lines of different lengths
+        """
+        lines = chunk.split(b"\n")
+        tail = lines.pop()
+        for i, line in enumerate(lines):
+            if i == 0 and self._partial_length:
+                self._extend_partial(line)
+                self._end_partial(1)
+            elif line.startswith(b">"):
+                self._add_header(line, len(line) + 1)
+            else:
+                self._add_sequence_line(len(line.rstrip(b"\r")), len(line) + 1)
+        self._extend_partial(tail)
+
+    def finish(self) -> List[FaiRecord]:
+        """
+        Index the end of the data.
+
+        Returns:
+            Records in file order
+        """
+        if self._partial_length:
+            self._end_partial(0)
+        self._end_record()
+        return self.records
+
+    def _extend_partial(self, piece: bytes) -> None:
+        """Count the next piece of the unfinished line"""
+        if not piece:
+            return
+        if not self._partial_length and piece.startswith(b">"):
+            self._partial_header = bytearray()
+        if self._partial_header is not None:
+            self._partial_header += piece
+        self._partial_length += len(piece)
+        trailing_cr = len(piece) - len(piece.rstrip(b"\r"))
+        self._partial_cr = self._partial_cr + trailing_cr if trailing_cr == len(piece) else trailing_cr
+
+    def _end_partial(self, newline: int) -> None:
+        """Index the unfinished line once its end is known"""
+        width = self._partial_length + newline
+        if self._partial_header is not None:
+            self._add_header(bytes(self._partial_header), width)
+        else:
+            self._add_sequence_line(self._partial_length - self._partial_cr, width)
+        self._partial_length = self._partial_cr = 0
+        self._partial_header = None
+
+    def _end_record(self) -> None:
+        if self._current is not None:
+            self.records.append(self._current)
+            self._current = None
+
+    def _add_header(self, line: bytes, width: int) -> None:
+        start = self._offset
+        self._offset += width
+        self._end_record()
+        fields = line[1:].split()
+        if not fields:
+            raise FastaIndexError(f"Header at byte {start} has no sequence ID")
+        self._current = FaiRecord(fields[0].decode("ascii", "replace"), 0, self._offset, 0, 0)
+        self._short_line = False
+
+    def _add_sequence_line(self, bases: int, width: int) -> None:
+        self._offset += width
+        record = self._current
+        if record is None:
+            if bases:
+                raise FastaIndexError("FASTA data must start with a '>' header line")
+            return
+        if record.line_bases == 0:
+            if bases == 0:
+                # Blank lines before the sequence: it starts after them
+                record.offset = self._offset
+                return
+            record.line_bases, record.line_width = bases, width
+        elif self._short_line and bases:
+            raise FastaIndexError(f"Record {record.name} has lines of different lengths")
+        elif bases > record.line_bases or (bases == record.line_bases and width > record.line_width):
+            raise FastaIndexError(f"Record {record.name} has lines of different lengths")
+        elif bases < record.line_bases:
+            self._short_line = True
+        record.length += bases
+
+
+def read_bgzf_blocks(path: str) -> List[Tuple[int, int]]:
+    """
+    Locate the blocks of a BGZF file from their headers, without decompressing.
+
+    Args:
+        path: Path to the BGZF file
+
+    Returns:
+        (compressed offset, uncompressed offset) of the start of every block
+    """
+    blocks = []
+    compressed = uncompressed = 0
+    with open(path, "rb") as handle:
+        while True:
+            header = handle.read(18)
+            if len(header) < 18:
+                break
+            if header[:4] != b"\x1f\x8b\x08\x04" or header[12:14] != b"BC":
+                raise FastaIndexError(f"{path} is not BGZF-compressed")
+            block_size = struct.unpack("<H", header[16:18])[0] + 1
+            handle.seek(compressed + block_size - 4)
+            isize = struct.unpack("<I", handle.read(4))[0]
+            if isize:
+                blocks.append((compressed, uncompressed))
+            compressed += block_size
+            uncompressed += isize
+    return blocks
+
+
+class FastaIndex:
+    """
+    Index of a FASTA file, plain or compressed.
+    """
+
+    def __init__(self, path: str, records: List[FaiRecord], blocks: Optional[List[Tuple[int, int]]] = None):
+        """
+        Initialize the index.
+
+        Args:
+            path: Path to the indexed FASTA file
+            records: Records in file order
+            blocks: BGZF block offsets, for BGZF-compressed files
+        """
+        self.path = path
+        self.records: Dict[str, FaiRecord] = {record.name: record for record in records}
+        self.blocks = blocks
+        self._block_starts = [uncompressed for _, uncompressed in blocks] if blocks else None
+
+    @classmethod
+    def build(cls, path: str) -> "FastaIndex":
+        """
+        Index a FASTA file by reading it once.
+
+        Args:
+            path: Path to the FASTA file
+
+        Returns:
+            Index of the file
+
+        Raises:
+            FastaIndexError: If a record has lines of different lengths
+        """
+        builder = FastaIndexBuilder()
+        with open_maybe_compressed(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(INDEX_CHUNK_SIZE), b""):
+                builder.feed(chunk)
+        blocks = read_bgzf_blocks(path) if sniff_compression(path) == "bgzip" else None
+        return cls(path, builder.finish(), blocks)
+
+    @classmethod
+    def load(cls, path: str) -> "FastaIndex":
+        """
+        Load the index files of a FASTA file.
+
+        Args:
+            path: Path to the FASTA file (the index is read from path.fai and path.gzi)
+
+        Returns:
+            Index of the file
+        """
+        records = []
+        with open(path + ".fai", "r") as handle:
+            for line in handle:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) >= 5:
+                    records.append(FaiRecord(fields[0], *(int(value) for value in fields[1:5])))
+        blocks = None
+        if os.path.exists(path + ".gzi"):
+            with open(path + ".gzi", "rb") as handle:
+                count = struct.unpack("<Q", handle.read(8))[0]
+                values = struct.unpack(f"<{2 * count}Q", handle.read(16 * count))
+            # The first block at (0, 0) is implicit in the gzi format
+            blocks = [(0, 0)] + list(zip(values[::2], values[1::2]))
+        return cls(path, records, blocks)
+
+    def save(self) -> None:
+        """Write the index next to the FASTA file, as path.fai and, for BGZF files, path.gzi"""
+        with open(self.path + ".fai", "w") as handle:
+            for record in self.records.values():
+                handle.write(f"{record.name}\t{record.length}\t{record.offset}\t"
+                             f"{record.line_bases}\t{record.line_width}\n")
+        if self.blocks:
+            entries = self.blocks[1:]
+            with open(self.path + ".gzi", "wb") as handle:
+                handle.write(struct.pack("<Q", len(entries)))
+                for compressed, uncompressed in entries:
+                    handle.write(struct.pack("<QQ", compressed, uncompressed))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.records
+
+    def __getitem__(self, name: str) -> FaiRecord:
+        return self.records[name]
+
+    @property
+    def names(self) -> List[str]:
+        """Get the record names in file order"""
+        return list(self.records)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the file statistics from the index.
+
+        Returns:
+            Dictionary with sequence_count, total_length and the longest and
+            shortest non-empty sequence lengths
+        """
+        lengths = [record.length for record in self.records.values() if record.length > 0]
+        return {
+            "sequence_count": len(self.records),
+            "total_length": sum(lengths),
+            "max_sequence_length": max(lengths, default=0),
+            "min_sequence_length": min(lengths, default=0)
+        }
+
+    def fetch(self, name: str, start: int = 0, end: Optional[int] = None) -> str:
+        """
+        Read a segment of a record.
+
+        Args:
+            name: Record name
+            start: 0-based start position
+            end: End position, exclusive (default: end of the record)
+
+        Returns:
+            Bases of the segment
+
+        Raises:
+            FastaIndexError: If the record does not exist or the region is out of range
+        """
+        if name not in self.records:
+            raise FastaIndexError(f"Sequence {name} not found in {self.path}")
+        record = self.records[name]
+        end = record.length if end is None else end
+        if not 0 <= start <= end <= record.length:
+            raise FastaIndexError(f"Region {start}-{end} is outside {name} (length {record.length})")
+        if start == end:
+            return ""
+        begin = record.byte_offset(start)
+        data = self._read(begin, record.byte_offset(end - 1) + 1 - begin)
+        return data.replace(b"\n", b"").replace(b"\r", b"").decode("ascii")
+
+    def partition(self, num_slices: int) -> List[List[Tuple[str, int, int]]]:
+        """
+        Split the sequences into slices of about the same number of bases.
+
+        Each worker can then fetch only the (name, start, end) regions of its
+        slice; long records are split between slices.
+
+        Args:
+            num_slices: Number of slices
+
+        Returns:
+            Regions of each slice
+        """
+        total = sum(record.length for record in self.records.values())
+        per_slice = max(1, -(-total // max(1, num_slices)))
+        slices: List[List[Tuple[str, int, int]]] = [[]]
+        room = per_slice
+        for record in self.records.values():
+            position = 0
+            while position < record.length:
+                if room == 0:
+                    slices.append([])
+                    room = per_slice
+                take = min(room, record.length - position)
+                slices[-1].append((record.name, position, position + take))
+                position += take
+                room -= take
+        return [regions for regions in slices if regions]
+
+    def _read(self, offset: int, length: int) -> bytes:
+        """Read uncompressed bytes of the file"""
+        if self._block_starts:
+            return self._read_bgzf(offset, length)
+        with open_maybe_compressed(self.path, "rb") as handle:
+            # Seeking in gzip or zstd data decompresses everything before the offset
+            handle.seek(offset)
+            return handle.read(length)
+
+    def _read_bgzf(self, offset: int, length: int) -> bytes:
+        """Read uncompressed bytes of a BGZF file, decompressing only the blocks holding them"""
+        index = bisect.bisect_right(self._block_starts, offset) - 1
+        compressed, uncompressed = self.blocks[index]
+        skip = offset - uncompressed
+        parts = []
+        remaining = length + skip
+        with open(self.path, "rb") as handle:
+            handle.seek(compressed)
+            while remaining > 0:
+                header = handle.read(18)
+                if len(header) < 18:
+                    break
+                block_size = struct.unpack("<H", header[16:18])[0] + 1
+                payload = handle.read(block_size - 18)
+                data = zlib.decompress(header + payload, wbits=31)
+                parts.append(data)
+                remaining -= len(data)
+        return b"".join(parts)[skip:skip + length]
+
+
+def index_is_current(path: str) -> bool:
+    """Check whether a FASTA file has an index at least as new as the file"""
+    fai_path = path + ".fai"
+    return os.path.exists(fai_path) and os.path.getmtime(fai_path) >= os.path.getmtime(path)
+
+
+def get_fasta_index(path: str, create: bool = True) -> Optional[FastaIndex]:
+    """
+    Get the index of a FASTA file, building and saving it if needed.
+
+    Args:
+        path: Path to the FASTA file
+        create: Whether to build the index if there is no current one
+
+    Returns:
+        Index of the file, or None if there is none and it could not be built
+    """
+    try:
+        if index_is_current(path):
+            return FastaIndex.load(path)
+        if not create:
+            return None
+        index = FastaIndex.build(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not index {path}: {str(e)}")
+        return None
+    try:
+        index.save()
+    except OSError as e:
+        logger.warning(f"Could not save the index of {path}: {str(e)}")
+    return index
@@ -0,0 +1,462 @@
+"""
+Durable PostgreSQL job queue for AMR Predictor.
+
+Jobs submitted to the API are stored in the amr_job_queue table of the
+application database instead of running as in-process background tasks,
+so they survive restarts and can be processed by any number of worker
+processes or containers (python -m amr_predictor worker).
+
+Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+workers never block on or claim the same row. A claimed job holds a lease
+that the worker extends with heartbeats while the job runs; when a worker
+dies its lease expires and the job is claimed again, up to max_attempts.
+
+Jobs are claimed by priority class first. Within a class the user with the
+least recent worker time relative to their weight goes first, and users at
+their concurrency cap wait while other users have jobs to claim, so one
+large submission cannot starve other users (see config/scheduler_config.py).
+The cap is work-conserving: when only capped users have queued jobs, idle
+workers still claim them. Between users with the same
+share, and among one user's jobs, the job expected to finish soonest goes
+first (shortest expected job first, see core/cost_model.py).
+"""
+
+import os
+import math
+import json
+import socket
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Iterable
+
+from .utils import logger
+from ..config.scheduler_config import SchedulerConfig, get_scheduler_config
+
+# Environment variable selecting how the API runs jobs:
+#   background: FastAPI background tasks in the API process (default)
+#   postgres: the durable queue, processed by worker processes
+JOB_QUEUE_ENV = "AMR_JOB_QUEUE"
+JOB_QUEUE_BACKENDS = ("background", "postgres")
+
+# Seconds a claimed job may run without a heartbeat before it is reclaimed
+DEFAULT_LEASE_SECONDS = int(os.getenv("AMR_QUEUE_LEASE_SECONDS", "60"))
+
+# Attempts of a job before it is marked as failed
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("AMR_QUEUE_MAX_ATTEMPTS", "3"))
+
+# Delay before retrying a failed attempt, multiplied by the number of attempts
+RETRY_DELAY_SECONDS = 10
+
+# Owner of jobs submitted without authentication
+ANONYMOUS_OWNER = "anonymous"
+
+# Finished jobs used to estimate job duration for queue ETAs
+ETA_HISTORY_JOBS = 50
+
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS amr_job_queue (
+    id BIGSERIAL PRIMARY KEY,
+    job_id VARCHAR(255) NOT NULL,
+    task VARCHAR(50) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    enqueued_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    claimed_by VARCHAR(255),
+    claimed_at TIMESTAMPTZ,
+    lease_expires_at TIMESTAMPTZ,
+    heartbeat_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    last_error TEXT
+);
+ALTER TABLE amr_job_queue ADD COLUMN IF NOT EXISTS owner VARCHAR(255) NOT NULL DEFAULT 'anonymous';
+ALTER TABLE amr_job_queue ADD COLUMN IF NOT EXISTS priority_class VARCHAR(20) NOT NULL DEFAULT 'batch';
+ALTER TABLE amr_job_queue ADD COLUMN IF NOT EXISTS expected_seconds DOUBLE PRECISION;
+CREATE INDEX IF NOT EXISTS idx_job_queue_claim ON amr_job_queue (priority DESC, id) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_job_queue_lease ON amr_job_queue (lease_expires_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_job_queue_job_id ON amr_job_queue (job_id);
+CREATE INDEX IF NOT EXISTS idx_job_queue_owner_claimed ON amr_job_queue (owner, claimed_at);
+"""
+
+# Claim the next available job: queued jobs whose retry delay has passed,
+# or running jobs whose worker stopped renewing the lease. Within a priority
+# class, users are served by least recent worker seconds per unit of weight
+# (weighted fair queuing by attained service), and then by shortest expected
+# run time. Jobs of users at their concurrency cap come after all other jobs,
+# so they are only claimed when no other user's job is waiting. The cap is
+# soft: concurrent claims may exceed it by the number of workers claiming at
+# the same instant.
+CLAIM_QUERY = """
+WITH running AS (
+    SELECT owner, count(*) AS jobs FROM amr_job_queue
+    WHERE status = 'running' AND lease_expires_at >= now()
+    GROUP BY owner
+), usage AS (
+    SELECT owner, sum(EXTRACT(EPOCH FROM COALESCE(finished_at, now()) - claimed_at)) AS seconds
+    FROM amr_job_queue
+    WHERE claimed_at > now() - make_interval(mins => %(usage_window)s)
+    GROUP BY owner
+), shares AS (
+    SELECT * FROM unnest(%(share_owners)s::text[], %(share_weights)s::float8[], %(share_caps)s::int[])
+        AS s(owner, weight, max_running)
+)
+UPDATE amr_job_queue
+SET status = 'running', attempts = attempts + 1, claimed_by = %(worker_id)s,
+    claimed_at = now(), heartbeat_at = now(),
+    lease_expires_at = now() + make_interval(secs => %(lease_seconds)s)
+WHERE id = (
+    SELECT q.id FROM amr_job_queue q
+    LEFT JOIN running r ON r.owner = q.owner
+    LEFT JOIN usage u ON u.owner = q.owner
+    LEFT JOIN shares s ON s.owner = q.owner
+    WHERE ((q.status = 'queued' AND q.available_at <= now())
+           OR (q.status = 'running' AND q.lease_expires_at < now()))
+      AND q.attempts < q.max_attempts
+      AND (%(tasks)s::text[] IS NULL OR q.task = ANY(%(tasks)s::text[]))
+    ORDER BY COALESCE(r.jobs, 0) >= COALESCE(s.max_running, %(max_running)s),
+             q.priority DESC,
+             COALESCE(u.seconds, 0) / COALESCE(s.weight, %(default_weight)s),
+             q.expected_seconds NULLS LAST,
+             q.id
+    LIMIT 1
+    FOR UPDATE OF q SKIP LOCKED
+)
+RETURNING id, job_id, task, payload, attempts, max_attempts
+"""
+
+# Queued jobs per owner ahead of a job: in a higher priority class, or in
+# the same class and submitted earlier
+QUEUE_AHEAD_QUERY = """
+SELECT owner,
+       count(*) FILTER (WHERE priority > %(priority)s) AS higher,
+       count(*) FILTER (WHERE priority = %(priority)s AND id < %(id)s) AS same_earlier,
+       count(*) FILTER (WHERE priority = %(priority)s) AS same
+FROM amr_job_queue
+WHERE status = 'queued' AND id <> %(id)s
+GROUP BY owner
+"""
+
+# Jobs whose last attempt's lease expired
+REAP_QUERY = """
+UPDATE amr_job_queue
+SET status = 'failed', finished_at = now(),
+    last_error = COALESCE(last_error, 'Worker lease expired')
+WHERE id IN (
+    SELECT id FROM amr_job_queue
+    WHERE status = 'running' AND lease_expires_at < now() AND attempts >= max_attempts
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING job_id, last_error
+"""
+
+
+def get_job_queue_backend() -> str:
+    """Get the configured job queue backend"""
+    backend = os.getenv(JOB_QUEUE_ENV, "background").lower()
+    if backend not in JOB_QUEUE_BACKENDS:
+        logger.warning(f"Unknown job queue backend '{backend}', using background tasks")
+        return "background"
+    return backend
+
+
+def default_worker_id() -> str:
+    """Get a worker ID unique across containers"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def estimate_queue_position(owner: str, ahead: Dict[str, Dict[str, int]],
+                            weights: Dict[str, float]) -> int:
+    """
+    Estimate how many queued jobs will be claimed before a job under fair share.
+
+    Jobs in higher priority classes all go first. In the job's own class,
+    while the owner's earlier jobs and then the job itself are served, each
+    other user is served in proportion to their weight relative to the
+    owner's, up to the jobs they have queued.
+
+    Args:
+        owner: Owner of the job
+        ahead: Per owner, counts of queued jobs in a higher priority class ("higher"),
+            in the same class ("same") and in the same class submitted earlier ("same_earlier")
+        weights: Fair-share weight per owner
+
+    Returns:
+        Number of jobs expected to be claimed first
+    """
+    own = ahead.get(owner, {})
+    own_turns = own.get("same_earlier", 0) + 1
+    own_weight = weights.get(owner, 1.0)
+    position = sum(counts.get("higher", 0) for counts in ahead.values()) + own_turns - 1
+    for other, counts in ahead.items():
+        if other != owner:
+            share = math.ceil(own_turns * weights.get(other, 1.0) / own_weight)
+            position += min(counts.get("same", 0), share)
+    return position
+
+
+@dataclass
+class QueuedJob:
+    """A job claimed from the queue."""
+    id: int
+    job_id: str
+    task: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+class PostgresJobQueue:
+    """
+    Job queue stored in the application's PostgreSQL database.
+
+    Uses the connection pool of AMRDatabaseManager; every operation is one
+    short transaction.
+    """
+
+    def __init__(self, db_manager=None, scheduler_config: Optional[SchedulerConfig] = None):
+        """
+        Initialize the job queue.
+
+        Args:
+            db_manager: Database manager providing get_connection/release_connection
+                (default: the AMRDatabaseManager singleton)
+            scheduler_config: Fair-share settings (default: the global scheduler configuration)
+        """
+        if db_manager is None:
+            from .database_manager import AMRDatabaseManager
+            db_manager = AMRDatabaseManager()
+        self.db_manager = db_manager
+        self.scheduler_config = scheduler_config or get_scheduler_config()
+
+    def _execute(self, query: str, params: Optional[Any] = None, fetch: str = "none"):
+        """Run one statement in its own transaction"""
+        conn = self.db_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            if fetch == "one":
+                result = cursor.fetchone()
+            elif fetch == "all":
+                result = cursor.fetchall()
+            else:
+                result = cursor.rowcount
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_manager.release_connection(conn)
+
+    def ensure_table(self) -> None:
+        """Create the queue table and its indexes if they do not exist"""
+        self._execute(QUEUE_SCHEMA)
+
+    def enqueue(self, job_id: str, task: str, payload: Dict[str, Any], owner: str = ANONYMOUS_OWNER,
+                priority_class: str = "batch", priority: Optional[int] = None,
+                expected_seconds: Optional[float] = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> int:
+        """
+        Add a job to the queue.
+
+        Args:
+            job_id: ID of the job in amr_jobs
+            task: Name of the task handler that runs the job
+            payload: JSON-serializable keyword arguments of the task handler
+            owner: User who submitted the job, for fair sharing
+            priority_class: Priority class of the job ("interactive" or "batch")
+            priority: Explicit priority, higher is claimed first (default: from the priority class)
+            expected_seconds: Expected run time from the cost model; shorter jobs are claimed first
+            max_attempts: Attempts before the job is marked as failed
+
+        Returns:
+            Queue entry ID
+        """
+        if priority is None:
+            priority = self.scheduler_config.get_priority(priority_class)
+        row = self._execute(
+            "INSERT INTO amr_job_queue (job_id, task, payload, owner, priority_class, priority, "
+            "expected_seconds, max_attempts) VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING id",
+            (job_id, task, json.dumps(payload), owner, priority_class, priority, expected_seconds, max_attempts),
+            fetch="one"
+        )
+        logger.info(f"Queued {priority_class} {task} job {job_id} for {owner}")
+        return row[0]
+
+    def claim(self, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+              tasks: Optional[Iterable[str]] = None) -> Optional[QueuedJob]:
+        """
+        Claim the next available job.
+
+        Args:
+            worker_id: ID of the claiming worker
+            lease_seconds: Seconds the claim lasts without a heartbeat
+            tasks: Only claim jobs of these tasks (default: any task)
+
+        Returns:
+            The claimed job, or None if no job is available
+        """
+        config = self.scheduler_config
+        shares = config.get_user_overrides()
+        row = self._execute(CLAIM_QUERY, {
+            "worker_id": worker_id,
+            "lease_seconds": lease_seconds,
+            "tasks": list(tasks) if tasks else None,
+            "usage_window": config.get_usage_window_minutes(),
+            "max_running": config.config["fair_share"]["max_running_per_user"],
+            "default_weight": config.config["fair_share"]["default_weight"],
+            "share_owners": list(shares),
+            "share_weights": [share["weight"] for share in shares.values()],
+            "share_caps": [share["max_running"] for share in shares.values()]
+        }, fetch="one")
+        if row is None:
+            return None
+        queue_id, job_id, task, payload, attempts, max_attempts = row
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        return QueuedJob(queue_id, job_id, task, payload or {}, attempts, max_attempts)
+
+    def heartbeat(self, queue_id: int, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> bool:
+        """
+        Extend the lease of a claimed job.
+
+        Returns:
+            False if the worker no longer holds the job
+        """
+        return self._execute(
+            "UPDATE amr_job_queue SET heartbeat_at = now(), "
+            "lease_expires_at = now() + make_interval(secs => %s) "
+            "WHERE id = %s AND claimed_by = %s AND status = 'running'",
+            (lease_seconds, queue_id, worker_id)
+        ) > 0
+
+    def complete(self, queue_id: int, worker_id: str) -> bool:
+        """Mark a claimed job as done"""
+        return self._execute(
+            "UPDATE amr_job_queue SET status = 'done', finished_at = now(), lease_expires_at = NULL "
+            "WHERE id = %s AND claimed_by = %s AND status = 'running'",
+            (queue_id, worker_id)
+        ) > 0
+
+    def fail(self, job: QueuedJob, worker_id: str, error: str) -> bool:
+        """
+        Record a failed attempt, requeueing the job if attempts remain.
+
+        Returns:
+            True if the job will be retried
+        """
+        retry = job.attempts < job.max_attempts
+        self._execute(
+            "UPDATE amr_job_queue SET status = %s, last_error = %s, lease_expires_at = NULL, "
+            "available_at = now() + make_interval(secs => %s), "
+            "finished_at = CASE WHEN %s THEN NULL ELSE now() END "
+            "WHERE id = %s AND claimed_by = %s AND status = 'running'",
+            ("queued" if retry else "failed", error, RETRY_DELAY_SECONDS * job.attempts,
+             retry, job.id, worker_id)
+        )
+        return retry
+
+    def reap_expired(self) -> List[Dict[str, Any]]:
+        """
+        Fail jobs whose final attempt's lease expired.
+
+        Returns:
+            List of dictionaries with the job_id and error of each failed job
+        """
+        rows = self._execute(REAP_QUERY, fetch="all")
+        return [{"job_id": job_id, "error": error} for job_id, error in rows]
+
+    def average_job_seconds(self) -> Optional[float]:
+        """Get the average run time of recently finished jobs"""
+        row = self._execute(
+            "SELECT avg(EXTRACT(EPOCH FROM finished_at - claimed_at)) FROM ("
+            "SELECT finished_at, claimed_at FROM amr_job_queue WHERE status = 'done' "
+            "ORDER BY finished_at DESC LIMIT %s) recent",
+            (ETA_HISTORY_JOBS,), fetch="one"
+        )
+        return float(row[0]) if row and row[0] is not None else None
+
+    def active_workers(self, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> int:
+        """Get the number of workers that claimed or renewed a job recently"""
+        row = self._execute(
+            "SELECT count(DISTINCT claimed_by) FROM amr_job_queue "
+            "WHERE heartbeat_at > now() - make_interval(secs => %s)",
+            (lease_seconds * 10,), fetch="one"
+        )
+        return int(row[0]) if row else 0
+
+    def queue_position(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the estimated queue position and start time of a queued job.
+
+        Args:
+            job_id: ID of the job in amr_jobs
+
+        Returns:
+            Dictionary with queue_position (jobs expected to be claimed first),
+            priority_class, owner and eta_seconds (estimated seconds until the
+            job finishes, None without an expected time or job history), or None if the
+            job is not queued
+        """
+        row = self._execute(
+            "SELECT id, owner, priority, priority_class, expected_seconds FROM amr_job_queue "
+            "WHERE job_id = %s AND status = 'queued' ORDER BY id DESC LIMIT 1",
+            (job_id,), fetch="one"
+        )
+        if row is None:
+            return None
+        queue_id, owner, priority, priority_class, expected_seconds = row
+
+        rows = self._execute(QUEUE_AHEAD_QUERY, {"id": queue_id, "priority": priority}, fetch="all")
+        ahead = {other: {"higher": higher, "same_earlier": same_earlier, "same": same}
+                 for other, higher, same_earlier, same in rows}
+        weights = {user: self.scheduler_config.get_user_weight(user) for user in set(ahead) | {owner}}
+        position = estimate_queue_position(owner, ahead, weights)
+
+        # Jobs ahead take the recent average time; the job itself its expected time
+        eta_seconds = None
+        job_seconds = self.average_job_seconds()
+        own_seconds = expected_seconds if expected_seconds is not None else job_seconds
+        if own_seconds is not None:
+            workers = max(1, self.active_workers())
+            eta_seconds = round(position / workers * (job_seconds or own_seconds) + own_seconds, 1)
+
+        return {
+            "queue_position": position,
+            "priority_class": priority_class,
+            "owner": owner,
+            "eta_seconds": eta_seconds
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of queue entries by status and the age of the oldest queued job"""
+        rows = self._execute(
+            "SELECT status, count(*), EXTRACT(EPOCH FROM now() - min(enqueued_at)) "
+            "FROM amr_job_queue WHERE status IN ('queued', 'running', 'failed') GROUP BY status",
+            fetch="all"
+        )
+        stats = {"queued": 0, "running": 0, "failed": 0, "oldest_queued_seconds": None}
+        for status, count, oldest in rows:
+            stats[status] = count
+            if status == "queued" and oldest is not None:
+                stats["oldest_queued_seconds"] = float(oldest)
+        return stats
+
+
+# Global queue instance
+_job_queue = None
+
+
+def get_job_queue() -> PostgresJobQueue:
+    """
+    Get the global job queue instance, creating its table on first use.
+
+    Returns:
+        PostgresJobQueue instance
+    """
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = PostgresJobQueue()
+        _job_queue.ensure_table()
+    return _job_queue
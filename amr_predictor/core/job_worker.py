@@ -0,0 +1,150 @@
+"""
+Worker process for the durable AMR Predictor job queue.
+
+A worker repeatedly claims a job from the PostgreSQL queue, runs its task
+handler and marks it done, renewing the job's lease from a heartbeat
+thread while the handler runs. Any number of workers can run against one
+database; throughput scales with the number of workers.
+"""
+
+import time
+import asyncio
+import inspect
+import threading
+from typing import Dict, Any, Callable, Optional
+
+from .utils import logger
+from .job_queue import PostgresJobQueue, QueuedJob, DEFAULT_LEASE_SECONDS, default_worker_id
+
+
+class JobWorker:
+    """
+    Processes jobs from a job queue.
+
+    Handler exceptions count as failed attempts and are retried; handlers
+    that record a job error themselves (such as the API's task functions)
+    complete the queue entry.
+    """
+
+    def __init__(self, queue: PostgresJobQueue, handlers: Dict[str, Callable[..., Any]],
+                 worker_id: Optional[str] = None, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                 poll_interval: float = 1.0, max_poll_interval: float = 10.0,
+                 on_failure: Optional[Callable[[str, str], None]] = None):
+        """
+        Initialize the worker.
+
+        Args:
+            queue: Job queue to process
+            handlers: Task handlers by task name, called with the job payload as keyword
+                arguments; coroutine functions are run to completion
+            worker_id: Worker ID recorded on claimed jobs (default: host name and PID)
+            lease_seconds: Lease of a claimed job; heartbeats renew it every third of it
+            poll_interval: Seconds to wait when the queue is empty
+            max_poll_interval: Longest wait while the queue stays empty
+            on_failure: Callable receiving the job ID and error of jobs that ran out of attempts
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.on_failure = on_failure
+        self.stop_event = threading.Event()
+        self.processed = 0
+
+    def stop(self) -> None:
+        """Stop after the current job"""
+        self.stop_event.set()
+
+    def _heartbeat(self, job: QueuedJob, done: threading.Event) -> None:
+        """Renew the lease of a job until it is done"""
+        interval = max(1.0, self.lease_seconds / 3)
+        while not done.wait(interval):
+            try:
+                if not self.queue.heartbeat(job.id, self.worker_id, self.lease_seconds):
+                    logger.warning(f"Lost the lease of job {job.job_id}")
+                    return
+            except Exception as e:
+                logger.warning(f"Heartbeat for job {job.job_id} failed: {str(e)}")
+
+    def _run_handler(self, job: QueuedJob) -> None:
+        """Run the task handler of a job"""
+        handler = self.handlers.get(job.task)
+        if handler is None:
+            raise ValueError(f"No handler for task '{job.task}'")
+        result = handler(**job.payload)
+        if inspect.isawaitable(result):
+            asyncio.run(result)
+
+    def _report_failure(self, job_id: str, error: str) -> None:
+        """Report a job that ran out of attempts"""
+        logger.error(f"Job {job_id} failed permanently: {error}")
+        if self.on_failure:
+            try:
+                self.on_failure(job_id, error)
+            except Exception as e:
+                logger.error(f"Error recording failure of job {job_id}: {str(e)}")
+
+    def run_once(self) -> bool:
+        """
+        Claim and process one job.
+
+        Returns:
+            True if a job was processed, False if the queue was empty
+        """
+        for expired in self.queue.reap_expired():
+            self._report_failure(expired["job_id"], expired["error"])
+
+        job = self.queue.claim(self.worker_id, self.lease_seconds, tasks=list(self.handlers))
+        if job is None:
+            return False
+
+        logger.info(f"Worker {self.worker_id} running {job.task} job {job.job_id} "
+                    f"(attempt {job.attempts}/{job.max_attempts})")
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done), name="queue-heartbeat", daemon=True)
+        heartbeat.start()
+        start_time = time.time()
+        try:
+            self._run_handler(job)
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+            logger.error(f"Job {job.job_id} attempt {job.attempts} failed: {error}")
+            if not self.queue.fail(job, self.worker_id, error):
+                self._report_failure(job.job_id, error)
+        else:
+            self.queue.complete(job.id, self.worker_id)
+            logger.info(f"Finished {job.task} job {job.job_id} in {time.time() - start_time:.2f}s")
+        finally:
+            done.set()
+            heartbeat.join()
+        self.processed += 1
+        return True
+
+    def run(self, max_jobs: Optional[int] = None) -> int:
+        """
+        Process jobs until stopped.
+
+        Args:
+            max_jobs: Stop after this many jobs (default: run until stopped)
+
+        Returns:
+            Number of processed jobs
+        """
+        logger.info(f"Worker {self.worker_id} processing tasks: {', '.join(sorted(self.handlers))}")
+        wait = self.poll_interval
+        while not self.stop_event.is_set():
+            if max_jobs is not None and self.processed >= max_jobs:
+                break
+            try:
+                if self.run_once():
+                    wait = self.poll_interval
+                    continue
+            except Exception as e:
+                logger.error(f"Error polling the job queue: {str(e)}")
+            # Back off while the queue is empty or the database is unavailable
+            self.stop_event.wait(wait)
+            wait = min(wait * 2, self.max_poll_interval)
+        logger.info(f"Worker {self.worker_id} stopped after {self.processed} jobs")
+        return self.processed
@@ -0,0 +1,460 @@
+"""
+Offline-first model resolution for AMR Predictor.
+
+This module snapshots HuggingFace repositories (the PEFT adapter and the base
+model it was trained on, which also provides the tokenizer) into a local,
+versioned cache directory, and resolves models from that cache without any
+network access. Every snapshot has a manifest with the SHA-256 of each file,
+which is checked before the snapshot is used.
+
+Cache layout::
+
+    <cache_dir>/<owner>--<name>/refs/<revision name>     commit hash of a branch/tag
+    <cache_dir>/<owner>--<name>/snapshots/<commit hash>/  files and manifest.json
+    <cache_dir>/<owner>--<name>/merged/<commit hash>/     adapter merged into the base model
+    <cache_dir>/<owner>--<name>/onnx/<commit hash>/       merged model exported to ONNX
+"""
+
+import os
+import json
+import uuid
+import shutil
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .utils import logger, ensure_directory_exists
+
+MANIFEST_FILE = "manifest.json"
+VERIFIED_FILE = ".verified.json"
+DEFAULT_REVISION = "main"
+DEFAULT_CACHE_DIR = os.path.join(Path.home(), ".cache", "amr_predictor", "models")
+
+# Weight formats we never load, skipped when downloading snapshots
+IGNORE_PATTERNS = ["*.msgpack", "*.h5", "*.ot", "tf_model*", "flax_model*", "rust_model*", "onnx/*"]
+
+
+class ModelNotCachedError(FileNotFoundError):
+    """Raised when a model is not in the local cache and downloads are disabled."""
+
+
+class ModelIntegrityError(RuntimeError):
+    """Raised when a cached snapshot does not match its manifest."""
+
+
+def _env_flag(name: str) -> bool:
+    """Check whether an environment variable is set to a true value"""
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _latest_mtime_ns(directory: str) -> int:
+    """Get the latest modification time of any file in a directory"""
+    latest = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            latest = max(latest, os.stat(os.path.join(root, name)).st_mtime_ns)
+    return latest
+
+
+@dataclass
+class RepoSnapshot:
+    """A single repository resolved to a local directory."""
+    name: str
+    revision: str
+    path: str
+
+
+@dataclass
+class ResolvedModel:
+    """Local paths and revisions of an adapter model and its base model."""
+    model_name: str
+    revision: str
+    adapter_path: str
+    base_model_name: str
+    base_revision: str
+    base_path: str
+
+    @property
+    def tokenizer_path(self) -> str:
+        """The tokenizer is shipped with the base model"""
+        return self.base_path
+
+    def to_metadata(self) -> Dict[str, str]:
+        """
+        Get the revisions for job metadata.
+
+        Returns:
+            Dictionary with model and base model names and revisions
+        """
+        return {
+            "model_name": self.model_name,
+            "model_revision": self.revision,
+            "base_model": self.base_model_name,
+            "base_model_revision": self.base_revision
+        }
+
+
+class ModelResolver:
+    """
+    Resolver for models in the local snapshot cache.
+
+    Models are downloaded at most once per revision; afterwards they are
+    loaded from the cache, and with ``offline=True`` the network is never
+    touched. Local directories are used as they are.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, offline: Optional[bool] = None,
+                 token: Optional[str] = None):
+        """
+        Initialize the model resolver.
+
+        Args:
+            cache_dir: Cache directory (default: $AMR_MODEL_CACHE_DIR or ~/.cache/amr_predictor/models)
+            offline: Never download (default: true if $AMR_MODEL_OFFLINE or $HF_HUB_OFFLINE is set)
+            token: HuggingFace token for downloading private repositories
+        """
+        self.cache_dir = cache_dir or os.getenv("AMR_MODEL_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.offline = offline if offline is not None else (
+            _env_flag("AMR_MODEL_OFFLINE") or _env_flag("HF_HUB_OFFLINE")
+        )
+        self.token = token
+
+    def _repo_dir(self, repo_id: str) -> str:
+        return os.path.join(self.cache_dir, repo_id.replace("/", "--"))
+
+    def _read_ref(self, repo_id: str, revision: str) -> Optional[str]:
+        """Get the commit hash a branch or tag was resolved to"""
+        snapshot_dir = os.path.join(self._repo_dir(repo_id), "snapshots", revision)
+        if os.path.isfile(os.path.join(snapshot_dir, MANIFEST_FILE)):
+            # Revision is already a commit hash
+            return revision
+        ref_file = os.path.join(self._repo_dir(repo_id), "refs", revision)
+        if os.path.isfile(ref_file):
+            with open(ref_file) as f:
+                return f.read().strip()
+        return None
+
+    def _write_ref(self, repo_id: str, revision: str, commit: str) -> None:
+        refs_dir = os.path.join(self._repo_dir(repo_id), "refs")
+        ensure_directory_exists(refs_dir)
+        tmp_file = os.path.join(refs_dir, f".{revision}.{uuid.uuid4().hex}")
+        with open(tmp_file, "w") as f:
+            f.write(commit)
+        os.replace(tmp_file, os.path.join(refs_dir, revision))
+
+    def read_manifest(self, snapshot_dir: str) -> Dict[str, Any]:
+        """
+        Read the manifest of a snapshot.
+
+        Args:
+            snapshot_dir: Snapshot directory
+
+        Returns:
+            Manifest dictionary
+        """
+        with open(os.path.join(snapshot_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+
+    def write_manifest(self, snapshot_dir: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Hash every file in a directory and write its manifest.
+
+        Args:
+            snapshot_dir: Snapshot directory
+            metadata: Additional manifest fields
+
+        Returns:
+            Manifest dictionary
+        """
+        files = {}
+        for root, _, names in os.walk(snapshot_dir):
+            for name in names:
+                if name in (MANIFEST_FILE, VERIFIED_FILE):
+                    continue
+                path = os.path.join(root, name)
+                files[os.path.relpath(path, snapshot_dir)] = _sha256(path)
+
+        manifest = {"created_at": datetime.now().isoformat(), **metadata, "files": files}
+        with open(os.path.join(snapshot_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    def verify_snapshot(self, snapshot_dir: str, full: bool = False) -> None:
+        """
+        Verify a snapshot against the SHA-256 hashes in its manifest.
+
+        Files whose size and modification time match the last successful
+        verification are not re-hashed unless ``full`` is set.
+
+        Args:
+            snapshot_dir: Snapshot directory
+            full: Re-hash every file
+
+        Raises:
+            ModelIntegrityError: If a file is missing or its hash does not match
+        """
+        manifest = self.read_manifest(snapshot_dir)
+        verified_file = os.path.join(snapshot_dir, VERIFIED_FILE)
+        verified = {}
+        if not full and os.path.isfile(verified_file):
+            try:
+                with open(verified_file) as f:
+                    verified = json.load(f)
+            except (OSError, ValueError):
+                verified = {}
+
+        stamps = {}
+        for relative_path, expected in manifest["files"].items():
+            path = os.path.join(snapshot_dir, relative_path)
+            if not os.path.isfile(path):
+                raise ModelIntegrityError(f"Missing file {relative_path} in model snapshot {snapshot_dir}")
+            stat = os.stat(path)
+            stamp = [stat.st_size, stat.st_mtime_ns, expected]
+            if verified.get(relative_path) != stamp and _sha256(path) != expected:
+                raise ModelIntegrityError(f"Hash mismatch for {relative_path} in model snapshot {snapshot_dir}")
+            stamps[relative_path] = stamp
+
+        try:
+            with open(verified_file, "w") as f:
+                json.dump(stamps, f)
+        except OSError:
+            # Read-only cache; verification still happened
+            pass
+
+    def _download(self, repo_id: str, revision: str, target_dir: str) -> str:
+        """
+        Download a repository snapshot.
+
+        Args:
+            repo_id: HuggingFace repository ID
+            revision: Branch, tag or commit
+            target_dir: Directory to download the files into
+
+        Returns:
+            Commit hash of the downloaded revision
+        """
+        import huggingface_hub
+
+        commit = huggingface_hub.HfApi().model_info(repo_id, revision=revision, token=self.token).sha
+        huggingface_hub.snapshot_download(
+            repo_id,
+            revision=commit,
+            local_dir=target_dir,
+            token=self.token,
+            ignore_patterns=IGNORE_PATTERNS
+        )
+        return commit
+
+    def _create_snapshot(self, repo_id: str, revision: str, extra: Optional[Dict[str, Any]] = None) -> RepoSnapshot:
+        """Download a repository into the cache and write its manifest"""
+        repo_dir = self._repo_dir(repo_id)
+        staging_dir = os.path.join(repo_dir, f".staging-{uuid.uuid4().hex}")
+        ensure_directory_exists(staging_dir)
+        try:
+            logger.info(f"Downloading {repo_id}@{revision} into the model cache")
+            commit = self._download(repo_id, revision, staging_dir)
+
+            # Download bookkeeping is not part of the snapshot
+            shutil.rmtree(os.path.join(staging_dir, ".cache"), ignore_errors=True)
+            self.write_manifest(staging_dir, {
+                "repo_id": repo_id,
+                "revision": commit,
+                "requested_revision": revision,
+                **(extra or {})
+            })
+
+            snapshot_dir = os.path.join(repo_dir, "snapshots", commit)
+            ensure_directory_exists(os.path.dirname(snapshot_dir))
+            if os.path.isdir(snapshot_dir):
+                # Another process cached the same commit first
+                shutil.rmtree(staging_dir)
+            else:
+                os.replace(staging_dir, snapshot_dir)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        self._write_ref(repo_id, revision, commit)
+        return RepoSnapshot(name=repo_id, revision=commit, path=snapshot_dir)
+
+    def resolve_repo(self, repo_id: str, revision: Optional[str] = None) -> RepoSnapshot:
+        """
+        Resolve a single repository to a verified local directory.
+
+        Args:
+            repo_id: HuggingFace repository ID or local directory
+            revision: Branch, tag or commit (default: "main")
+
+        Returns:
+            Resolved snapshot
+
+        Raises:
+            ModelNotCachedError: If the repository is not cached and downloads are disabled
+            ModelIntegrityError: If the cached snapshot is corrupted
+        """
+        if os.path.isdir(repo_id):
+            return RepoSnapshot(name=repo_id, revision="local", path=os.path.abspath(repo_id))
+
+        revision = revision or DEFAULT_REVISION
+        commit = self._read_ref(repo_id, revision)
+        if commit is not None:
+            snapshot_dir = os.path.join(self._repo_dir(repo_id), "snapshots", commit)
+            if os.path.isfile(os.path.join(snapshot_dir, MANIFEST_FILE)):
+                self.verify_snapshot(snapshot_dir)
+                logger.debug(f"Resolved {repo_id}@{revision} to cached snapshot {commit}")
+                return RepoSnapshot(name=repo_id, revision=commit, path=snapshot_dir)
+
+        if self.offline:
+            raise ModelNotCachedError(
+                f"Model {repo_id}@{revision} is not in the local model cache ({self.cache_dir}) and "
+                f"downloads are disabled. Run 'python -m amr_predictor models pull {repo_id}' "
+                f"on a machine with network access and copy the cache directory."
+            )
+        return self._create_snapshot(repo_id, revision)
+
+    def resolve(self, model_name: str, revision: Optional[str] = None) -> ResolvedModel:
+        """
+        Resolve an adapter model and the base model it was trained on.
+
+        The base model revision is pinned in the adapter snapshot's manifest
+        the first time it is resolved, so later resolutions (including
+        offline ones) use exactly the same base weights and tokenizer.
+
+        Args:
+            model_name: HuggingFace repository ID or local directory of the adapter
+            revision: Adapter branch, tag or commit
+
+        Returns:
+            Resolved model
+        """
+        adapter = self.resolve_repo(model_name, revision)
+
+        with open(os.path.join(adapter.path, "adapter_config.json")) as f:
+            base_model_name = json.load(f)["base_model_name_or_path"]
+
+        base_revision = None
+        if adapter.revision != "local":
+            base_revision = self.read_manifest(adapter.path).get("base_revision")
+        base = self.resolve_repo(base_model_name, base_revision)
+
+        if adapter.revision != "local" and base_revision is None:
+            manifest = self.read_manifest(adapter.path)
+            manifest["base_revision"] = base.revision
+            try:
+                with open(os.path.join(adapter.path, MANIFEST_FILE), "w") as f:
+                    json.dump(manifest, f, indent=2)
+            except OSError as e:
+                logger.warning(f"Could not pin base model revision for {model_name}: {str(e)}")
+
+        return ResolvedModel(
+            model_name=model_name,
+            revision=adapter.revision,
+            adapter_path=adapter.path,
+            base_model_name=base_model_name,
+            base_revision=base.revision,
+            base_path=base.path
+        )
+
+    def merged_dir(self, resolved: ResolvedModel, kind: str = "merged") -> str:
+        """
+        Get the cache directory for an artifact built from a resolved model.
+
+        Args:
+            resolved: Resolved adapter and base model
+            kind: Artifact kind ("merged" weights or "onnx" export)
+
+        Returns:
+            Directory path (which may not exist yet)
+        """
+        if resolved.revision == "local":
+            key = "local-" + hashlib.sha256(os.path.abspath(resolved.adapter_path).encode()).hexdigest()[:12]
+            return os.path.join(self.cache_dir, f"local--{kind}", key)
+        return os.path.join(self._repo_dir(resolved.model_name), kind, resolved.revision)
+
+    def merged_metadata(self, resolved: ResolvedModel) -> Dict[str, Any]:
+        """
+        Get the manifest fields that tie merged weights to their sources.
+
+        Args:
+            resolved: Resolved adapter and base model
+
+        Returns:
+            Dictionary of manifest fields
+        """
+        metadata = {
+            **resolved.to_metadata(),
+            "revision": resolved.revision,
+            "base_revision": resolved.base_revision
+        }
+        if resolved.revision == "local":
+            # Local adapters have no revision; rebuild if the adapter changed
+            metadata["adapter_mtime_ns"] = _latest_mtime_ns(resolved.adapter_path)
+        return metadata
+
+    def find_merged(self, resolved: ResolvedModel, kind: str = "merged") -> Optional[str]:
+        """
+        Find a verified artifact (merged weights or ONNX export) matching a resolved model.
+
+        Artifacts are only used if they were built from exactly the resolved
+        adapter and base model revisions.
+
+        Args:
+            resolved: Resolved adapter and base model
+            kind: Artifact kind ("merged" weights or "onnx" export)
+
+        Returns:
+            Directory with the artifact, or None if there is none
+        """
+        merged_dir = self.merged_dir(resolved, kind)
+        if not os.path.isfile(os.path.join(merged_dir, MANIFEST_FILE)):
+            return None
+        manifest = self.read_manifest(merged_dir)
+        expected = self.merged_metadata(resolved)
+        for key in ("revision", "base_revision", "adapter_mtime_ns"):
+            if manifest.get(key) != expected.get(key):
+                return None
+        self.verify_snapshot(merged_dir)
+        return merged_dir
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """
+        List cached snapshots.
+
+        Returns:
+            List of dictionaries with repository, revision, path and size
+        """
+        snapshots = []
+        if not os.path.isdir(self.cache_dir):
+            return snapshots
+        for repo in sorted(os.listdir(self.cache_dir)):
+            snapshots_dir = os.path.join(self.cache_dir, repo, "snapshots")
+            if not os.path.isdir(snapshots_dir):
+                continue
+            for commit in sorted(os.listdir(snapshots_dir)):
+                path = os.path.join(snapshots_dir, commit)
+                if not os.path.isfile(os.path.join(path, MANIFEST_FILE)):
+                    continue
+                manifest = self.read_manifest(path)
+                snapshots.append({
+                    "repo_id": manifest.get("repo_id", repo.replace("--", "/")),
+                    "revision": commit,
+                    "created_at": manifest.get("created_at"),
+                    "files": len(manifest["files"]),
+                    "size_mb": sum(
+                        os.path.getsize(os.path.join(path, name))
+                        for name in manifest["files"]
+                        if os.path.isfile(os.path.join(path, name))
+                    ) / (1024 ** 2),
+                    "path": path
+                })
+        return snapshots
@@ -14,24 +14,38 @@ from pathlib import Path
 import json
 import gc
 import time
+import queue
+import weakref
+import threading
+from importlib.metadata import version as package_version
 
-from .utils import logger, timer, ProgressTracker
+from .utils import logger, timer, ProgressTracker, LazyImport, module_available, ensure_directory_exists
+from .model_cache import ModelResolver, ResolvedModel
+from .engines import (
+    ENGINES, ONNXRUNTIME_AVAILABLE, DEFAULT_OPSET, InferenceEngine, TorchEngine, OnnxRuntimeEngine,
+    available_engines, export_onnx
+)
+from ..config.model_registry import get_model_registry, PRECISIONS
+from ..monitoring.telemetry import observe_stage, record_batch, record_throughput
 
-# Try to import necessary libraries, providing graceful fallbacks
-try:
-    import torch
-    import transformers
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
+# The ML stack takes seconds and hundreds of MB to import, so availability is
+# checked without importing it and the modules are imported on first use
+# (i.e. when a model is loaded or run), keeping CLI startup and imports of the
+# processing and Bakta packages free of torch.
+TORCH_AVAILABLE = module_available("torch") and module_available("transformers")
+if TORCH_AVAILABLE:
+    torch = LazyImport("torch")
+    transformers = LazyImport("transformers")
+    AutoTokenizer = LazyImport("transformers", "AutoTokenizer")
+    AutoModelForSequenceClassification = LazyImport("transformers", "AutoModelForSequenceClassification")
+else:
     logger.warning("PyTorch/Transformers not available. Model loading functionality will be limited.")
 
-try:
-    from peft import PeftModel, PeftConfig
-    PEFT_AVAILABLE = True
-except ImportError:
-    PEFT_AVAILABLE = False
+PEFT_AVAILABLE = module_available("peft")
+if PEFT_AVAILABLE:
+    PeftModel = LazyImport("peft", "PeftModel")
+    PeftConfig = LazyImport("peft", "PeftConfig")
+else:
     logger.warning("PEFT not available. Adapter model loading will be limited.")
 
 try:
@@ -42,6 +56,10 @@ except ImportError:
     logger.warning("python-dotenv not available. Environment variables may not be loaded properly.")
 
 
+# Model managers with a loaded model, for health reporting
+_LOADED_MANAGERS = weakref.WeakSet()
+
+
 class ModelManager:
     """
     Manager class for handling model and tokenizer loading and configuration.
@@ -53,7 +71,17 @@ class ModelManager:
     
     def __init__(self, model_name: Optional[str] = None, 
                  device: Optional[str] = None,
-                 progress_tracker: Optional[ProgressTracker] = None):
+                 progress_tracker: Optional[ProgressTracker] = None,
+                 revision: Optional[str] = None,
+                 cache_dir: Optional[str] = None,
+                 offline: Optional[bool] = None,
+                 use_merged: bool = True,
+                 precision: Optional[str] = None,
+                 engine: Optional[str] = None,
+                 intra_op_threads: Optional[int] = None,
+                 inter_op_threads: Optional[int] = None,
+                 prefetch_batches: int = 2,
+                 load_environment: bool = True):
         """
         Initialize the model manager.
         
@@ -61,15 +89,44 @@ class ModelManager:
             model_name: HuggingFace model name or path to local model
             device: Device to load the model on ('cpu', 'cuda', 'cuda:0', etc.)
             progress_tracker: Optional progress tracker for loading operations
+            revision: Model branch, tag or commit (default: "main")
+            cache_dir: Local model snapshot cache directory
+            offline: Only load models from the local cache (default: from environment)
+            use_merged: Load pre-merged weights (see merge_adapter) when they exist
+            precision: Inference precision ('fp32', 'bf16', 'int8'; default: from the model registry)
+            engine: Inference engine ('torch', 'onnx'; default: from the model registry)
+            intra_op_threads: ONNX Runtime threads within an operator (default: from the model registry)
+            inter_op_threads: ONNX Runtime threads across operators (default: from the model registry)
+            prefetch_batches: Batches tokenized ahead in a background thread while the model runs,
+                0 to tokenize each batch just before it is run
+            load_environment: Load the .env file and the HuggingFace token; models that are not
+                downloaded (e.g. the benchmark stub) skip this
         """
         self.model_name = model_name or self.DEFAULT_MODEL_NAME
         self.device = device or self._get_default_device()
         self.model = None
         self.tokenizer = None
         self.progress_tracker = progress_tracker
+        self.revision = revision
+        self.resolved_model: Optional[ResolvedModel] = None
+        self.use_merged = use_merged
+        self.weights_format: Optional[str] = None
+        model_config = get_model_registry().get_model_config(self.model_name)
+        self.precision = precision or get_model_registry().get_precision(self.model_name)
+        if self.precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{self.precision}', expected one of {PRECISIONS}")
+        self.engine_name = engine or model_config.get("engine", "torch")
+        if self.engine_name not in ENGINES:
+            raise ValueError(f"Unknown engine '{self.engine_name}', expected one of {ENGINES}")
+        self.intra_op_threads = intra_op_threads or model_config.get("intra_op_threads")
+        self.inter_op_threads = inter_op_threads or model_config.get("inter_op_threads")
+        self.engine: Optional[InferenceEngine] = None
+        self.prefetch_batches = prefetch_batches
+        # Tokens predicted by this manager in this process, for the job cost model
+        self.tokens_processed = 0
         
         # Load environment variables from .env file
-        if DOTENV_AVAILABLE:
+        if load_environment and DOTENV_AVAILABLE:
             # Get the project root directory (where .env is located)
             project_root = Path(__file__).parent.parent.parent
             env_path = project_root / '.env'
@@ -79,27 +136,16 @@ class ModelManager:
             else:
                 logger.warning(f"Environment file not found at {env_path}")
         
-        # Get HuggingFace token from environment
-        self.hf_token = os.getenv("HF_TOKEN")
-        if not self.hf_token:
-            logger.warning("HF_TOKEN not found in environment variables. Some models may require authentication.")
-        else:
-            logger.debug("Successfully loaded HuggingFace token from environment")
-            
-        # Set up HuggingFace token for transformers
-        if self.hf_token:
-            os.environ["HUGGING_FACE_HUB_TOKEN"] = self.hf_token
-            logger.debug("Set HuggingFace token in environment")
-            
-            # Also set the token for the transformers library
-            try:
-                import huggingface_hub
-                huggingface_hub.login(token=self.hf_token)
-                logger.debug("Logged in to HuggingFace Hub")
-            except Exception as e:
-                logger.warning(f"Failed to login to HuggingFace Hub: {str(e)}")
+        # Get HuggingFace token from environment. It is passed explicitly to
+        # downloads, so no Hub login (and no network access) happens here.
+        self.hf_token = os.getenv("HF_TOKEN") if load_environment else None
+        if load_environment and not self.hf_token:
+            logger.debug("HF_TOKEN not found in environment variables. Private models cannot be downloaded.")
+        
+        self.resolver = ModelResolver(cache_dir=cache_dir, offline=offline, token=self.hf_token)
     
-    def _get_default_device(self) -> str:
+    @staticmethod
+    def _get_default_device() -> str:
         """Determine the default device to use based on availability"""
         if not TORCH_AVAILABLE:
             return "cpu"
@@ -136,43 +182,55 @@ class ModelManager:
         self.clear_gpu_memory()
         
         try:
-            # Load configuration
-            logger.info(f"Loading model configuration from '{self.model_name}'")
-            config = PeftConfig.from_pretrained(
-                self.model_name,
-                token=self.hf_token,
-                trust_remote_code=True
-            )
-            
-            # Load base model
-            logger.info(f"Loading base model '{config.base_model_name_or_path}'")
-            base_model = AutoModelForSequenceClassification.from_pretrained(
-                config.base_model_name_or_path,
-                num_labels=len(self.CLASS_NAMES),
-                token=self.hf_token,
-                trust_remote_code=True
-            )
+            # Resolve the adapter and base model to local snapshots
+            self.resolved_model = self.resolver.resolve(self.model_name, self.revision)
+            resolved = self.resolved_model
+            logger.info(f"Resolved {self.model_name} to revision {resolved.revision} "
+                        f"(base {resolved.base_model_name}@{resolved.base_revision})")
             
-            # Load fine-tuned model with PEFT
-            logger.info("Applying PEFT adaptations to model")
-            self.model = PeftModel.from_pretrained(
-                base_model,
-                self.model_name,
-                token=self.hf_token,
-                trust_remote_code=True
-            )
+            if self.engine_name == "onnx" and self._load_onnx(resolved):
+                _LOADED_MANAGERS.add(self)
+                return self.model, self.tokenizer
             
-            # Load tokenizer
-            logger.info("Loading tokenizer")
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                config.base_model_name_or_path,
-                token=self.hf_token,
-                trust_remote_code=True
-            )
+            merged_dir = self.resolver.find_merged(resolved) if self.use_merged else None
+            if merged_dir:
+                # Single pre-merged artifact: no adapter indirection at load or inference time
+                logger.info(f"Loading pre-merged weights from {merged_dir}")
+                self.model = self._load_pretrained(merged_dir)
+                self.tokenizer = AutoTokenizer.from_pretrained(
+                    merged_dir,
+                    trust_remote_code=True,
+                    local_files_only=True
+                )
+                self.weights_format = "merged"
+            else:
+                # Load base model
+                logger.info(f"Loading base model '{resolved.base_model_name}'")
+                base_model = self._load_pretrained(resolved.base_path)
+                
+                # Load fine-tuned model with PEFT
+                logger.info("Applying PEFT adaptations to model")
+                self.model = PeftModel.from_pretrained(
+                    base_model,
+                    resolved.adapter_path,
+                    local_files_only=True
+                )
+                
+                # Load tokenizer
+                logger.info("Loading tokenizer")
+                self.tokenizer = AutoTokenizer.from_pretrained(
+                    resolved.tokenizer_path,
+                    trust_remote_code=True,
+                    local_files_only=True
+                )
+                self.weights_format = "adapter"
             
             # Move model to specified device
             self.model.to(self.device)
             logger.info(f"Model moved to {self.device}")
+            self._apply_precision()
+            self.engine = TorchEngine(self.model, self.device, self.precision)
+            _LOADED_MANAGERS.add(self)
             
             return self.model, self.tokenizer
             
@@ -180,6 +238,237 @@ class ModelManager:
             logger.error(f"Error loading model: {str(e)}")
             raise
     
+    def _apply_precision(self) -> None:
+        """Prepare the loaded model for the configured inference precision"""
+        if self.precision == "int8":
+            if not self.device.startswith("cpu"):
+                logger.warning(f"Dynamic int8 quantization is CPU-only, running fp32 on {self.device}")
+                self.precision = "fp32"
+                return
+            if hasattr(self.model, "merge_and_unload"):
+                # LoRA layers cannot wrap quantized Linear layers; fold the adapter in first
+                self.model = self.model.merge_and_unload()
+            # Quantize Linear weights to int8 once; activations are quantized on the fly
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        logger.info(f"Running inference in {self.precision}")
+    
+    def _load_onnx(self, resolved: ResolvedModel) -> bool:
+        """
+        Load the ONNX export of a resolved model into an ONNX Runtime engine.
+        
+        Args:
+            resolved: Resolved adapter and base model
+            
+        Returns:
+            True if the ONNX engine was loaded, False to fall back to PyTorch
+        """
+        onnx_dir = self.resolver.find_merged(resolved, kind="onnx")
+        if not ONNXRUNTIME_AVAILABLE or onnx_dir is None:
+            reason = "onnxruntime is not installed" if not ONNXRUNTIME_AVAILABLE else \
+                f"no ONNX export of {self.model_name}@{resolved.revision} (run 'models export-onnx')"
+            logger.warning(f"Cannot use the ONNX engine: {reason}; falling back to PyTorch")
+            self.engine_name = "torch"
+            return False
+        
+        if self.precision != "fp32":
+            logger.warning(f"The ONNX engine runs the fp32 export, ignoring precision {self.precision}")
+            self.precision = "fp32"
+        
+        self.engine = OnnxRuntimeEngine(onnx_dir, self.intra_op_threads, self.inter_op_threads)
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            onnx_dir,
+            trust_remote_code=True,
+            local_files_only=True
+        )
+        self.model = None
+        self.weights_format = "onnx"
+        return True
+    
+    def _load_pretrained(self, path: str) -> Any:
+        """
+        Load a sequence classification model from a local directory.
+        
+        Safetensors weights are memory-mapped and the model is initialised
+        without first allocating random weights, so peak memory stays close
+        to the size of the model.
+        
+        Args:
+            path: Model directory
+            
+        Returns:
+            The loaded model
+        """
+        kwargs = {}
+        if int(package_version("transformers").split(".")[0]) < 5 and module_available("accelerate"):
+            # Default (and the only behaviour) from transformers 5 onwards
+            kwargs["low_cpu_mem_usage"] = True
+        return AutoModelForSequenceClassification.from_pretrained(
+            path,
+            num_labels=len(self.CLASS_NAMES),
+            trust_remote_code=True,
+            local_files_only=True,
+            use_safetensors=True if any(name.endswith(".safetensors") for name in os.listdir(path)) else None,
+            **kwargs
+        )
+    
+    def merge_adapter(self, output_dir: Optional[str] = None) -> str:
+        """
+        Merge the PEFT adapter into the base weights and save the result.
+        
+        The merged model is saved as safetensors together with the tokenizer
+        and a manifest recording the adapter and base revisions it was built
+        from. Later loads of the same revisions pick it up automatically.
+        
+        Args:
+            output_dir: Output directory (default: the merged directory in the model cache)
+            
+        Returns:
+            Path to the merged model directory
+        """
+        if not TORCH_AVAILABLE or not PEFT_AVAILABLE:
+            raise ImportError("PyTorch, Transformers and PEFT are required to merge adapters")
+        
+        resolved = self.resolver.resolve(self.model_name, self.revision)
+        output_dir = output_dir or self.resolver.merged_dir(resolved)
+        ensure_directory_exists(output_dir)
+        
+        with timer("merge_adapter"):
+            base_model = self._load_pretrained(resolved.base_path)
+            model = PeftModel.from_pretrained(base_model, resolved.adapter_path, local_files_only=True)
+            merged = model.merge_and_unload()
+            merged.save_pretrained(output_dir, safe_serialization=True)
+            tokenizer = AutoTokenizer.from_pretrained(
+                resolved.tokenizer_path,
+                trust_remote_code=True,
+                local_files_only=True
+            )
+            tokenizer.save_pretrained(output_dir)
+        
+        self.resolver.write_manifest(output_dir, self.resolver.merged_metadata(resolved))
+        logger.info(f"Saved merged model to {output_dir}")
+        return output_dir
+    
+    def export_onnx(self, output_dir: Optional[str] = None, opset: int = DEFAULT_OPSET) -> str:
+        """
+        Export the merged classifier to ONNX for the ONNX Runtime engine.
+        
+        Existing merged weights are reused; otherwise the adapter is merged
+        in memory first.
+        
+        Args:
+            output_dir: Output directory (default: the onnx directory in the model cache)
+            opset: ONNX opset version
+            
+        Returns:
+            Path to the ONNX export directory
+        """
+        if not TORCH_AVAILABLE:
+            raise ImportError("PyTorch and Transformers are required to export models")
+        
+        resolved = self.resolver.resolve(self.model_name, self.revision)
+        output_dir = output_dir or self.resolver.merged_dir(resolved, kind="onnx")
+        
+        with timer("export_onnx"):
+            merged_dir = self.resolver.find_merged(resolved)
+            if merged_dir:
+                model = self._load_pretrained(merged_dir)
+                tokenizer_path = merged_dir
+            else:
+                if not PEFT_AVAILABLE:
+                    raise ImportError("PEFT is required to merge the adapter before export")
+                base_model = self._load_pretrained(resolved.base_path)
+                model = PeftModel.from_pretrained(base_model, resolved.adapter_path, local_files_only=True)
+                model = model.merge_and_unload()
+                tokenizer_path = resolved.tokenizer_path
+            tokenizer = AutoTokenizer.from_pretrained(
+                tokenizer_path,
+                trust_remote_code=True,
+                local_files_only=True
+            )
+            export_onnx(model, tokenizer, output_dir, opset=opset)
+        
+        self.resolver.write_manifest(output_dir, self.resolver.merged_metadata(resolved))
+        return output_dir
+    
+    def _tokenize_batch(self, batch: List[str], max_length: int) -> Tuple[Any, float]:
+        """Tokenize a batch for the engine and return (inputs, seconds)"""
+        start = time.time()
+        inputs = self.engine.prepare(self.tokenizer(
+            batch,
+            return_tensors=self.engine.tensor_type,
+            padding=True,
+            truncation=True,
+            max_length=max_length
+        ))
+        return inputs, time.time() - start
+    
+    def _tokenized_batches(self, sequences: List[str], batch_size: int, max_length: int):
+        """
+        Yield tokenized batches, tokenizing ahead in a background thread.
+        
+        Up to prefetch_batches batches are tokenized into a bounded queue
+        while the caller runs the model on the current batch, so tokenization
+        only adds to the critical path when it is slower than inference.
+        
+        Args:
+            sequences: List of sequences to predict
+            batch_size: Batch size for prediction
+            max_length: Maximum sequence length for tokenization
+            
+        Yields:
+            Tuples of (batch start index, batch size, inputs, tokenize seconds,
+            seconds spent waiting for the batch)
+        """
+        starts = range(0, len(sequences), batch_size)
+        if self.prefetch_batches <= 0:
+            for i in starts:
+                batch = sequences[i:i + batch_size]
+                inputs, seconds = self._tokenize_batch(batch, max_length)
+                yield i, len(batch), inputs, seconds, seconds
+            return
+        
+        end_of_batches = object()
+        prefetched = queue.Queue(maxsize=self.prefetch_batches)
+        stop = threading.Event()
+        
+        def put(item: Any) -> bool:
+            # Block while the queue is full, but give up once the consumer has stopped
+            while not stop.is_set():
+                try:
+                    prefetched.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce() -> None:
+            try:
+                for i in starts:
+                    batch = sequences[i:i + batch_size]
+                    if not put((i, len(batch), *self._tokenize_batch(batch, max_length))):
+                        return
+            except Exception as e:
+                put(e)
+            put(end_of_batches)
+        
+        producer = threading.Thread(target=produce, name="tokenize-prefetch", daemon=True)
+        producer.start()
+        try:
+            while True:
+                wait_start = time.time()
+                item = prefetched.get()
+                wait_time = time.time() - wait_start
+                if item is end_of_batches:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield (*item, wait_time)
+        finally:
+            stop.set()
+            producer.join()
+    
     def predict(self, sequences: List[str], max_length: int = 1000, 
                 batch_size: int = 8) -> List[Dict[str, float]]:
         """
@@ -197,21 +486,24 @@ class ModelManager:
             logger.error("Cannot predict: PyTorch/Transformers not available")
             return []
         
-        if self.model is None or self.tokenizer is None:
+        if self.engine is None and self.model is not None:
+            # Model assigned directly rather than through load()
+            self.engine = TorchEngine(self.model, self.device, self.precision)
+        
+        if self.engine is None or self.tokenizer is None:
             logger.error("Model and tokenizer must be loaded before prediction")
             return []
         
         results = []
         total_sequences = len(sequences)
+        total_tokens = 0
+        stage_totals = {"tokenize": 0.0, "tokenize_wait": 0.0, "inference": 0.0}
+        predict_start = time.time()
         
         try:
-            # Set the model to evaluation mode
-            self.model.eval()
-            
-            # Process in batches
-            for i in range(0, total_sequences, batch_size):
-                batch = sequences[i:i + batch_size]
-                batch_size_actual = len(batch)
+            # Process in batches, tokenizing upcoming batches while the model runs
+            for i, batch_size_actual, inputs, tokenize_time, wait_time in self._tokenized_batches(
+                    sequences, batch_size, max_length):
                 
                 if self.progress_tracker:
                     progress_percentage = (i / total_sequences) * 100
@@ -220,27 +512,30 @@ class ModelManager:
                         additional_info={"processed": i, "total": total_sequences}
                     )
                 
-                # Tokenize the batch
-                tokenize_start = time.time()
-                inputs = self.tokenizer(
-                    batch,
-                    return_tensors="pt",
-                    padding=True,
-                    truncation=True,
-                    max_length=max_length
-                ).to(self.device)
-                tokenize_time = time.time() - tokenize_start
-                logger.debug(f"Tokenization completed in {tokenize_time:.2f} seconds")
+                logger.debug(f"Tokenization completed in {tokenize_time:.2f} seconds "
+                             f"({wait_time:.2f} seconds waited)")
                 
                 # Run inference
                 inference_start = time.time()
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
-                    logits = outputs.logits
-                    probabilities = torch.nn.functional.softmax(logits, dim=1).cpu().numpy()
+                probabilities = self.engine.predict_proba(inputs)
                 inference_time = time.time() - inference_start
                 logger.debug(f"Inference completed in {inference_time:.2f} seconds")
                 
+                # Record batch telemetry
+                if "attention_mask" in inputs:
+                    batch_tokens = int(inputs["attention_mask"].sum())
+                else:
+                    batch_tokens = int(inputs["input_ids"].shape[0] * inputs["input_ids"].shape[1])
+                total_tokens += batch_tokens
+                self.tokens_processed += batch_tokens
+                stage_totals["tokenize"] += tokenize_time
+                stage_totals["tokenize_wait"] += wait_time
+                stage_totals["inference"] += inference_time
+                observe_stage("tokenize", tokenize_time)
+                observe_stage("tokenize_wait", wait_time)
+                observe_stage("inference", inference_time)
+                record_batch(batch_size_actual, batch_tokens, wait_time + inference_time)
+                
                 # Convert predictions to the expected format
                 for j in range(batch_size_actual):
                     prediction = {
@@ -249,6 +544,11 @@ class ModelManager:
                     }
                     results.append(prediction)
             
+            record_throughput(total_sequences, total_tokens, time.time() - predict_start)
+            logger.info(f"Tokenization took {stage_totals['tokenize']:.2f}s, of which "
+                        f"{stage_totals['tokenize_wait']:.2f}s on the critical path; "
+                        f"inference took {stage_totals['inference']:.2f}s")
+            
             if self.progress_tracker:
                 self.progress_tracker.update(
                     status="Prediction complete",
@@ -273,9 +573,10 @@ class ModelManager:
         info = {
             "model_name": self.model_name,
             "device": self.device,
-            "is_loaded": self.model is not None and self.tokenizer is not None,
+            "is_loaded": (self.engine is not None or self.model is not None) and self.tokenizer is not None,
             "class_names": self.CLASS_NAMES
         }
+        info.update(self.get_model_metadata())
         
         # Add additional information if available
         if TORCH_AVAILABLE and self.model is not None:
@@ -296,16 +597,62 @@ class ModelManager:
         
         return info
     
+    def get_model_metadata(self) -> Dict[str, Any]:
+        """
+        Get the resolved model revisions for job metadata.
+        
+        Returns:
+            Dictionary with model and base model names and revisions
+        """
+        if self.resolved_model is None:
+            return {"model_name": self.model_name, "model_revision": self.revision,
+                    "precision": self.precision, "engine": self.engine_name}
+        metadata = {**self.resolved_model.to_metadata(), "weights_format": self.weights_format,
+                    "precision": self.precision, "engine": self.engine_name}
+        if self.engine is not None:
+            metadata.update(self.engine.get_info())
+        return metadata
+    
     def unload(self) -> None:
         """Unload the model and clear memory"""
         self.model = None
         self.tokenizer = None
+        self.engine = None
+        _LOADED_MANAGERS.discard(self)
         self.clear_gpu_memory()
         logger.info("Model unloaded and memory cleared")
 
 
 # Standalone functions for backward compatibility
 
+def get_loaded_models() -> List[Dict[str, Any]]:
+    """
+    Get the metadata of every model currently loaded in this process.
+    
+    Returns:
+        List of model metadata dictionaries
+    """
+    return [manager.get_model_metadata() for manager in list(_LOADED_MANAGERS)]
+
+
+def get_model_health() -> Dict[str, Any]:
+    """
+    Get model and engine information for health endpoints.
+    
+    Returns:
+        Dictionary with the available engines, the configured engine and precision
+        of the default model, and the models loaded in this process
+    """
+    default_config = get_model_registry().get_model_config(ModelManager.DEFAULT_MODEL_NAME)
+    return {
+        "available_engines": available_engines(),
+        "default_model": ModelManager.DEFAULT_MODEL_NAME,
+        "default_engine": default_config.get("engine", "torch"),
+        "default_precision": default_config.get("precision", "fp32"),
+        "loaded_models": get_loaded_models()
+    }
+
+
 def load_model_and_tokenizer(model_name: str, device: Optional[str] = None) -> Tuple[Any, Any]:
     """
     Load a model and tokenizer. This is a standalone function for backward compatibility.
@@ -0,0 +1,147 @@
+"""
+Data-parallel CPU inference for the AMR Predictor module.
+
+PyTorch's intra-op threading scales poorly beyond a few cores at the batch
+sizes used for genome segments, so a large job on a many-core node is
+split into shards that run in separate worker processes, each with a small
+pinned thread count. Workers are forked after the model is loaded, so they
+share the parent's weights copy-on-write instead of loading their own copy.
+"""
+
+import os
+import time
+import multiprocessing
+from typing import Dict, List, Optional, Any, Tuple
+
+from .utils import logger, LazyImport
+
+torch = LazyImport("torch")
+
+# Intra-op threads per worker; small thread counts use cores most efficiently
+DEFAULT_THREADS_PER_WORKER = 4
+
+# Shards per worker, so faster workers pick up more work and progress can be reported
+SHARDS_PER_WORKER = 4
+
+# Model manager used by forked workers; set in the parent just before forking
+_worker_manager = None
+
+
+def parallel_supported() -> bool:
+    """Check whether workers can be forked to share the loaded model"""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def available_cpus() -> int:
+    """Get the number of CPUs this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def choose_num_workers(num_sequences: int, batch_size: int,
+                       threads_per_worker: int = DEFAULT_THREADS_PER_WORKER,
+                       cpus: Optional[int] = None) -> int:
+    """
+    Choose the number of worker processes for a job.
+
+    Args:
+        num_sequences: Number of segments to predict
+        batch_size: Batch size for prediction
+        threads_per_worker: Intra-op threads per worker
+        cpus: Available CPUs (default: detected)
+
+    Returns:
+        Number of workers, 1 meaning in-process inference
+    """
+    cpus = cpus or available_cpus()
+    num_batches = (num_sequences + batch_size - 1) // batch_size
+    return max(1, min(cpus // max(1, threads_per_worker), num_batches))
+
+
+def _init_worker(threads: int) -> None:
+    """Pin the thread count of a forked worker"""
+    # The tokenizer's own thread pool is not fork-safe and workers are already parallel
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    torch.set_num_threads(threads)
+    # Progress is reported by the parent as shards complete
+    _worker_manager.progress_tracker = None
+
+
+def _predict_shard(task: Tuple[int, List[str], int, int]) -> Tuple[int, List[Dict[str, float]], int]:
+    """Predict one shard in a worker process, returning its predictions and the tokens predicted"""
+    start, sequences, batch_size, max_length = task
+    tokens_before = _worker_manager.tokens_processed
+    predictions = _worker_manager.predict(sequences, max_length=max_length, batch_size=batch_size)
+    return start, predictions, _worker_manager.tokens_processed - tokens_before
+
+
+def predict_parallel(manager: Any, sequences: List[str], batch_size: int = 8, max_length: int = 1000,
+                     num_workers: int = 0, threads_per_worker: Optional[int] = None,
+                     progress_callback=None) -> List[Dict[str, float]]:
+    """
+    Predict sequences in forked worker processes sharing a loaded model.
+
+    The tokens predicted by the workers are added to the manager's
+    tokens_processed count.
+
+    Args:
+        manager: Loaded ModelManager
+        sequences: List of sequences to predict
+        batch_size: Batch size for prediction
+        max_length: Maximum sequence length for tokenization
+        num_workers: Number of worker processes, 0 to choose from the available CPUs
+        threads_per_worker: Intra-op threads per worker (default: CPUs divided among workers,
+            at most DEFAULT_THREADS_PER_WORKER when choosing automatically)
+        progress_callback: Optional callable receiving the number of predicted sequences
+
+    Returns:
+        List of prediction dictionaries in input order, or an empty list on failure
+    """
+    global _worker_manager
+
+    cpus = available_cpus()
+    if num_workers <= 0:
+        num_workers = choose_num_workers(len(sequences), batch_size,
+                                         threads_per_worker or DEFAULT_THREADS_PER_WORKER, cpus)
+    threads_per_worker = threads_per_worker or max(1, cpus // num_workers)
+
+    if num_workers <= 1 or not parallel_supported():
+        return manager.predict(sequences, max_length=max_length, batch_size=batch_size)
+
+    # Contiguous shards of whole batches, so batching matches in-process inference
+    shard_batches = max(1, -(-len(sequences) // (batch_size * num_workers * SHARDS_PER_WORKER)))
+    shard_size = shard_batches * batch_size
+    tasks = [(i, sequences[i:i + shard_size], batch_size, max_length)
+             for i in range(0, len(sequences), shard_size)]
+
+    logger.info(f"Predicting {len(sequences)} sequences in {len(tasks)} shards on {num_workers} worker "
+                f"processes with {threads_per_worker} threads each")
+    start_time = time.time()
+    predictions: List[Optional[List[Dict[str, float]]]] = [None] * len(tasks)
+    completed = 0
+
+    _worker_manager = manager
+    try:
+        context = multiprocessing.get_context("fork")
+        with context.Pool(processes=num_workers, initializer=_init_worker,
+                          initargs=(threads_per_worker,)) as pool:
+            for index, (start, shard_predictions, tokens) in enumerate(pool.imap(_predict_shard, tasks)):
+                if len(shard_predictions) != len(tasks[index][1]):
+                    logger.error(f"Worker failed to predict shard starting at sequence {start}")
+                    return []
+                predictions[index] = shard_predictions
+                manager.tokens_processed += tokens
+                completed += len(shard_predictions)
+                if progress_callback:
+                    progress_callback(completed)
+    except Exception as e:
+        logger.error(f"Error during parallel prediction: {str(e)}")
+        return []
+    finally:
+        _worker_manager = None
+
+    elapsed = time.time() - start_time
+    logger.info(f"Parallel prediction of {len(sequences)} sequences took {elapsed:.2f}s "
+                f"({len(sequences) / elapsed if elapsed > 0 else 0:.1f} sequences/s)")
+    return [prediction for shard in predictions for prediction in shard]
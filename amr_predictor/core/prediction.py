@@ -16,9 +16,19 @@ import pandas as pd
 
 from .utils import logger, timer, ProgressTracker, ensure_directory_exists, get_default_output_path
 from .models import ModelManager
-from .sequence import load_fasta, split_sequence, calculate_sequence_complexity
+from .parallel import predict_parallel, choose_num_workers, DEFAULT_THREADS_PER_WORKER
+from .sequence import load_fasta, split_sequence, tile_region, merge_regions, calculate_sequence_complexity
 from ..processing.sequence_aggregation import SequenceAggregator
 
+# Screening model of the two-stage cascade
+DEFAULT_SCREENING_MODEL = "alakob/DraGNOME-50m-v1"
+
+# Resistant probabilities of the screening model that are sent to the full model
+DEFAULT_UNCERTAINTY_BAND = (0.1, 0.9)
+
+# Shortest window of adaptive refinement; shorter windows carry too little context
+MIN_REFINEMENT_WINDOW = 300
+
 class PredictionPipeline:
     """
     Main prediction pipeline for AMR prediction.
@@ -39,7 +49,16 @@ class PredictionPipeline:
                  device: Optional[str] = None,
                  progress_tracker: Optional[ProgressTracker] = None,
                  enable_sequence_aggregation: bool = True,
-                 resistance_threshold: float = 0.5):
+                 resistance_threshold: float = 0.5,
+                 model_manager: Optional[ModelManager] = None,
+                 num_workers: int = 1,
+                 threads_per_worker: Optional[int] = None,
+                 screening_model: Optional[str] = None,
+                 screening_model_manager: Optional[ModelManager] = None,
+                 uncertainty_band: Tuple[float, float] = DEFAULT_UNCERTAINTY_BAND,
+                 refinement_passes: int = 0,
+                 refinement_threshold: Optional[float] = None,
+                 refinement_factor: int = 2):
         """
         Initialize the prediction pipeline.
         
@@ -50,6 +69,22 @@ class PredictionPipeline:
             segment_overlap: Overlap between segments in nucleotides
             device: Device to run predictions on ('cpu', 'cuda', etc.)
             progress_tracker: Optional progress tracker
+            model_manager: Optional pre-configured model manager (overrides model_name and device)
+            num_workers: Worker processes for CPU inference, 0 to choose from the available CPUs,
+                1 to predict in-process
+            threads_per_worker: Intra-op threads per worker process (default: CPUs divided among workers)
+            screening_model: Smaller model to screen all segments with first; enables the cascade,
+                in which only segments whose Resistant probability falls in uncertainty_band are
+                predicted again with the main model
+            screening_model_manager: Optional pre-configured screening model manager (overrides
+                screening_model); also enables the cascade
+            uncertainty_band: Inclusive (low, high) band of screening Resistant probabilities to
+                send to the main model
+            refinement_passes: Adaptive segmentation passes; when positive, the first pass tiles
+                sequences without overlap and each further pass re-predicts the neighbourhood of
+                resistant hits with windows refinement_factor times shorter, overlapping by half
+            refinement_threshold: Resistant probability of a hit to refine (default: resistance_threshold)
+            refinement_factor: Window shrink factor per refinement pass
         """
         self.batch_size = batch_size
         self.segment_length = segment_length
@@ -57,18 +92,49 @@ class PredictionPipeline:
         self.progress_tracker = progress_tracker
         self.enable_sequence_aggregation = enable_sequence_aggregation
         self.resistance_threshold = resistance_threshold
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
         
         # Check segment parameters
         if segment_length > 0 and segment_overlap >= segment_length:
             logger.warning(f"Segment overlap ({segment_overlap}) must be less than segment length ({segment_length})")
             self.segment_overlap = max(0, segment_length // 2)
         
+        # Adaptive segmentation: a coarse pass without overlap, refined around hits
+        if refinement_factor < 2:
+            raise ValueError(f"Refinement factor must be at least 2, got {refinement_factor}")
+        self.refinement_passes = max(0, refinement_passes)
+        self.refinement_threshold = resistance_threshold if refinement_threshold is None else refinement_threshold
+        self.refinement_factor = refinement_factor
+        if self.refinement_passes and self.segment_overlap > 0:
+            logger.info("Adaptive segmentation tiles the first pass without overlap, ignoring segment overlap")
+            self.segment_overlap = 0
+        
         # Initialize model manager
-        self.model_manager = ModelManager(
-            model_name=model_name,
-            device=device,
-            progress_tracker=progress_tracker
-        )
+        if model_manager is not None:
+            self.model_manager = model_manager
+        else:
+            self.model_manager = ModelManager(
+                model_name=model_name,
+                device=device,
+                progress_tracker=progress_tracker
+            )
+        
+        # Initialize the screening model manager of the cascade, if enabled
+        low, high = uncertainty_band
+        if not 0.0 <= low <= high <= 1.0:
+            raise ValueError(f"Invalid uncertainty band {uncertainty_band}, expected 0 <= low <= high <= 1")
+        self.uncertainty_band = (low, high)
+        if screening_model_manager is not None:
+            self.screening_model_manager = screening_model_manager
+        elif screening_model:
+            self.screening_model_manager = ModelManager(
+                model_name=screening_model,
+                device=self.model_manager.device,
+                progress_tracker=progress_tracker
+            )
+        else:
+            self.screening_model_manager = None
         
         # Initialize tracking variables
         self.num_sequences = 0
@@ -83,7 +149,228 @@ class PredictionPipeline:
             True if loading was successful, False otherwise
         """
         model, tokenizer = self.model_manager.load()
-        return model is not None and tokenizer is not None
+        # ONNX Runtime engines have no PyTorch model
+        return tokenizer is not None and (model is not None or self.model_manager.engine is not None)
+    
+    def _load_manager(self, manager: ModelManager) -> bool:
+        """Load a model manager unless it is already loaded"""
+        if manager.model is not None or manager.engine is not None:
+            return True
+        logger.info(f"Loading model and tokenizer for {manager.model_name}")
+        if manager is self.model_manager:
+            return self.load_model()
+        model, tokenizer = manager.load()
+        return tokenizer is not None and (model is not None or manager.engine is not None)
+    
+    def _tokens_processed(self) -> int:
+        """Get the tokens predicted so far by the models of the pipeline"""
+        managers = [self.model_manager, self.screening_model_manager]
+        return sum(getattr(manager, "tokens_processed", 0) for manager in managers if manager is not None)
+    
+    def _resolve_num_workers(self, manager: Optional[ModelManager] = None,
+                             num_sequences: Optional[int] = None) -> int:
+        """Get the number of inference worker processes for a prediction stage of the current job"""
+        manager = manager or self.model_manager
+        num_sequences = self.num_segments if num_sequences is None else num_sequences
+        if self.num_workers == 1:
+            return 1
+        if not str(manager.device).startswith("cpu"):
+            logger.info(f"Data-parallel inference is CPU-only, predicting in-process on {manager.device}")
+            return 1
+        if self.num_workers > 1:
+            return self.num_workers
+        return choose_num_workers(num_sequences, self.batch_size,
+                                  self.threads_per_worker or DEFAULT_THREADS_PER_WORKER)
+    
+    def _report_parallel_progress(self, completed: int, total: Optional[int] = None) -> None:
+        """Report progress of data-parallel inference"""
+        total = self.num_segments if total is None else total
+        if self.progress_tracker:
+            self.progress_tracker.update(
+                status=f"Predicted {completed}/{total} segments",
+                additional_info={"processed": completed, "total": total}
+            )
+    
+    def _predict_segments(self, manager: ModelManager, sequences: List[str],
+                          results: Dict[str, Any]) -> List[Dict[str, float]]:
+        """Predict segments with one model, in-process or in worker processes"""
+        num_workers = self._resolve_num_workers(manager, len(sequences))
+        if num_workers <= 1:
+            return manager.predict(sequences=sequences, batch_size=self.batch_size)
+        
+        results["num_workers"] = num_workers
+        return predict_parallel(
+            manager,
+            sequences,
+            batch_size=self.batch_size,
+            num_workers=num_workers,
+            threads_per_worker=self.threads_per_worker,
+            progress_callback=lambda completed: self._report_parallel_progress(completed, len(sequences))
+        )
+    
+    def _predict_cascade(self, sequences: List[str], results: Dict[str, Any]) -> Tuple[List[Dict[str, float]], List[str]]:
+        """
+        Predict segments with the screening model, then uncertain segments with the main model.
+        
+        Args:
+            sequences: Segments to predict
+            results: Results dictionary, updated with cascade statistics
+            
+        Returns:
+            Tuple of (predictions, name of the model that produced each prediction);
+            predictions are empty if a stage failed
+        """
+        screening_manager = self.screening_model_manager
+        screening_name = screening_manager.model_name
+        
+        logger.info(f"Screening {len(sequences)} segments with {screening_name}")
+        predictions = self._predict_segments(screening_manager, sequences, results)
+        if len(predictions) != len(sequences):
+            return predictions, []
+        models = [screening_name] * len(predictions)
+        
+        low, high = self.uncertainty_band
+        uncertain = [i for i, prediction in enumerate(predictions)
+                     if low <= prediction.get("Resistant", 0.0) <= high]
+        # Counts accumulate over the passes of adaptive segmentation
+        cascade_info = results.setdefault("cascade", {
+            "screening_model": screening_manager.get_model_metadata(),
+            "uncertainty_band": [low, high],
+            "screened_segments": 0,
+            "escalated_segments": 0
+        })
+        cascade_info["screened_segments"] += len(predictions)
+        cascade_info["escalated_segments"] += len(uncertain)
+        cascade_info["escalated_fraction"] = (cascade_info["escalated_segments"] / cascade_info["screened_segments"]
+                                              if cascade_info["screened_segments"] else 0.0)
+        logger.info(f"{len(uncertain)}/{len(predictions)} segments have a Resistant probability in "
+                    f"[{low}, {high}], predicting them with {self.model_manager.model_name}")
+        
+        if self.progress_tracker:
+            self.progress_tracker.update(
+                status=f"Predicting {len(uncertain)} uncertain segments",
+                additional_info={"escalated_segments": len(uncertain)}
+            )
+        
+        if uncertain:
+            # The main model is only loaded when some segments need it
+            if not self._load_manager(self.model_manager):
+                logger.error(f"Failed to load model {self.model_manager.model_name}")
+                return [], []
+            results["model"] = self.model_manager.get_model_metadata()
+            
+            escalated = self._predict_segments(self.model_manager, [sequences[i] for i in uncertain], results)
+            if len(escalated) != len(uncertain):
+                return [], []
+            for i, prediction in zip(uncertain, escalated):
+                predictions[i] = prediction
+                models[i] = self.model_manager.model_name
+        
+        return predictions, models
+    
+    def _predict_stage(self, sequences: List[str], results: Dict[str, Any]) -> Tuple[List[Dict[str, float]], Optional[List[str]]]:
+        """Predict segments with the main model or the cascade; models are None without a cascade"""
+        if self.screening_model_manager is not None:
+            return self._predict_cascade(sequences, results)
+        return self._predict_segments(self.model_manager, sequences, results), None
+    
+    def _refine_predictions(self, fasta_data: List[Tuple[str, str]], segment_ids: List[str],
+                            segments: List[str], predictions: List[Dict[str, float]],
+                            prediction_models: Optional[List[str]], results: Dict[str, Any]) -> List[int]:
+        """
+        Re-predict the neighbourhood of resistant hits with shorter, overlapping windows.
+        
+        Refined segments are appended to segment_ids, segments, predictions and
+        prediction_models in place, named like split_sequence segments.
+        
+        Args:
+            fasta_data: Sequences of the FASTA file
+            segment_ids: IDs of the first-pass segments
+            segments: Sequences of the first-pass segments
+            predictions: Predictions of the first-pass segments
+            prediction_models: Models of the first-pass predictions, if predicted by the cascade
+            results: Results dictionary, updated with refinement statistics
+            
+        Returns:
+            Refinement pass of each segment, 0 for the first pass
+        """
+        sequences = dict(fasta_data)
+        spans = []
+        for segment_id, segment in zip(segment_ids, segments):
+            if segment_id in sequences:
+                spans.append((segment_id, 0, len(segment)))
+            else:
+                seq_id, _, start, end = segment_id.rsplit("_", 3)
+                spans.append((seq_id, int(start) - 1, int(end)))
+        
+        passes = [0] * len(segments)
+        # Window of the first pass; unsplit sequences are refined from their full length
+        window = max((end - start for _, start, end in spans), default=0)
+        if self.segment_length > 0:
+            window = min(window, self.segment_length)
+        refinement_info = {"threshold": self.refinement_threshold, "windows": [], "segments_per_pass": [len(segments)]}
+        results["refinement"] = refinement_info
+        seen = set(spans)
+        current = range(len(segments))
+        
+        for refinement_pass in range(1, self.refinement_passes + 1):
+            window //= self.refinement_factor
+            if window < MIN_REFINEMENT_WINDOW:
+                logger.info(f"Stopping refinement: window would be shorter than {MIN_REFINEMENT_WINDOW} bp")
+                break
+            overlap = window // 2
+            
+            # Neighbourhood of each hit, extended so genes straddling its edges are covered
+            regions = {}
+            for i in current:
+                if predictions[i].get("Resistant", 0.0) >= self.refinement_threshold:
+                    seq_id, start, end = spans[i]
+                    regions.setdefault(seq_id, []).append(
+                        (max(0, start - overlap), min(len(sequences[seq_id]), end + overlap)))
+            if not regions:
+                break
+            
+            new_spans = []
+            for seq_id, seq_regions in regions.items():
+                for region_start, region_end in merge_regions(seq_regions):
+                    for start, end in tile_region(region_start, region_end, window, overlap):
+                        if (seq_id, start, end) not in seen:
+                            seen.add((seq_id, start, end))
+                            new_spans.append((seq_id, start, end))
+            if not new_spans:
+                break
+            
+            logger.info(f"Refinement pass {refinement_pass}: predicting {len(new_spans)} windows of {window} bp "
+                        f"around {sum(len(r) for r in regions.values())} hits")
+            if self.progress_tracker:
+                self.progress_tracker.update(
+                    status=f"Refinement pass {refinement_pass}: {len(new_spans)} windows",
+                    additional_info={"refinement_pass": refinement_pass, "refined_segments": len(new_spans)}
+                )
+            
+            new_segments = [sequences[seq_id][start:end] for seq_id, start, end in new_spans]
+            new_predictions, new_models = self._predict_stage(new_segments, results)
+            if len(new_predictions) != len(new_segments):
+                raise RuntimeError(f"Refinement pass {refinement_pass} failed to predict {len(new_segments)} windows")
+            
+            current = range(len(segments), len(segments) + len(new_segments))
+            spans.extend(new_spans)
+            segment_ids.extend(f"{seq_id}_segment_{start + 1}_{end}" for seq_id, start, end in new_spans)
+            segments.extend(new_segments)
+            predictions.extend(new_predictions)
+            if prediction_models is not None:
+                prediction_models.extend(new_models)
+            passes.extend([refinement_pass] * len(new_segments))
+            refinement_info["windows"].append(window)
+            refinement_info["segments_per_pass"].append(len(new_segments))
+        
+        # Keep the rows of each sequence together and in positional order
+        order = {seq_id: index for index, (seq_id, _) in enumerate(fasta_data)}
+        ranking = sorted(range(len(spans)), key=lambda i: (order[spans[i][0]], spans[i][1], spans[i][2]))
+        for values in (segment_ids, segments, predictions, prediction_models, passes):
+            if values is not None:
+                values[:] = [values[i] for i in ranking]
+        return passes
     
     def process_fasta_file(self, fasta_file: str, output_file: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -161,12 +448,14 @@ class PredictionPipeline:
                     self.progress_tracker.set_error(error_msg)
                 return {"error": error_msg, **results}
             
+            results["total_bases"] = sum(len(seq) for _, seq in fasta_data)
+            
             # Update progress
             if self.progress_tracker:
                 self.progress_tracker.update(
                     status="Processing sequences", 
                     increment=5,
-                    additional_info={"total_sequences": self.num_sequences}
+                    additional_info={"total_sequences": self.num_sequences, "total_bases": results["total_bases"]}
                 )
             
             # Split sequences if needed
@@ -227,15 +516,19 @@ class PredictionPipeline:
                     }
                 )
             
-            # Load model and tokenizer if not already loaded
-            if self.model_manager.model is None:
-                logger.info("Loading model and tokenizer")
-                if not self.load_model():
-                    error_msg = "Failed to load model and tokenizer"
-                    logger.error(error_msg)
-                    if self.progress_tracker:
-                        self.progress_tracker.set_error(error_msg)
-                    return {"error": error_msg, **results}
+            # Load model and tokenizer if not already loaded; in the cascade the
+            # screening model is loaded first and the main model only if needed
+            first_manager = self.screening_model_manager or self.model_manager
+            if not self._load_manager(first_manager):
+                error_msg = "Failed to load model and tokenizer"
+                logger.error(error_msg)
+                if self.progress_tracker:
+                    self.progress_tracker.set_error(error_msg)
+                return {"error": error_msg, **results}
+            
+            # Record which model revision produced the predictions
+            model_metadata = first_manager.get_model_metadata()
+            results["model"] = model_metadata
             
             # Update progress
             if self.progress_tracker:
@@ -244,17 +537,16 @@ class PredictionPipeline:
                     increment=10,
                     additional_info={
                         "total_sequences": self.num_sequences,
-                        "total_segments": self.num_segments
+                        "total_segments": self.num_segments,
+                        **model_metadata
                     }
                 )
             
             # Make predictions
             logger.info(f"Making predictions on {self.num_segments} sequences in batches of {self.batch_size}")
+            tokens_before = self._tokens_processed()
             with timer("predict"):
-                predictions = self.model_manager.predict(
-                    sequences=fasta_sequences,
-                    batch_size=self.batch_size
-                )
+                predictions, prediction_models = self._predict_stage(fasta_sequences, results)
             
             # Update progress
             if self.progress_tracker:
@@ -276,6 +568,17 @@ class PredictionPipeline:
                     self.progress_tracker.set_error(error_msg)
                 return {"error": error_msg, **results}
             
+            # Refine predictions around resistant hits
+            refinement_passes = None
+            if self.refinement_passes:
+                with timer("refine"):
+                    fasta_ids = list(fasta_ids)
+                    refinement_passes = self._refine_predictions(
+                        fasta_data, fasta_ids, fasta_sequences, predictions, prediction_models, results)
+                self.num_segments = len(fasta_sequences)
+            results["tokens"] = self._tokens_processed() - tokens_before or None
+            results["engine"] = getattr(self.model_manager, "engine_name", None)
+            
             # Prepare results
             prediction_results = []
             for i, (prediction, seq_id, sequence) in enumerate(zip(predictions, fasta_ids, fasta_sequences)):
@@ -284,6 +587,11 @@ class PredictionPipeline:
                     "Length": len(sequence),
                     **prediction
                 }
+                if prediction_models:
+                    # Record which model of the cascade produced the probabilities
+                    result["Model"] = prediction_models[i]
+                if refinement_passes:
+                    result["Refinement_Pass"] = refinement_passes[i]
                 prediction_results.append(result)
             
             # Update progress
@@ -417,6 +725,9 @@ class PredictionPipeline:
                 
                 # Ensure Sequence_ID is the first column, followed by Start and End
                 ordered_fields = ["Sequence_ID", "Start", "End", "Length", "Resistant", "Susceptible"]
+                for field in ("Model", "Refinement_Pass"):
+                    if field in fieldnames:
+                        ordered_fields.append(field)
                 
                 # Add any remaining fields
                 for field in fieldnames:
@@ -438,7 +749,8 @@ def process_fasta_file(fasta_path: str, model_name: str,
                       batch_size: int = 8, segment_length: int = 6000, 
                       segment_overlap: int = 0, output_file: Optional[str] = None, 
                       device: Optional[str] = None, enable_sequence_aggregation: bool = True,
-                      resistance_threshold: float = 0.5) -> Dict[str, Any]:
+                      resistance_threshold: float = 0.5,
+                      screening_model: Optional[str] = None) -> Dict[str, Any]:
     """
     Process a FASTA file and make AMR predictions. Standalone function for backward compatibility.
     
@@ -450,6 +762,7 @@ def process_fasta_file(fasta_path: str, model_name: str,
         segment_overlap: Overlap between segments in nucleotides
         output_file: Path to save the results (default: generated based on timestamp)
         device: Device to run predictions on ('cpu', 'cuda', etc.)
+        screening_model: Optional smaller model screening all segments before model_name
         
     Returns:
         Dictionary with processing results and statistics
@@ -461,7 +774,8 @@ def process_fasta_file(fasta_path: str, model_name: str,
         segment_overlap=segment_overlap,
         device=device,
         enable_sequence_aggregation=enable_sequence_aggregation,
-        resistance_threshold=resistance_threshold
+        resistance_threshold=resistance_threshold,
+        screening_model=screening_model
     )
     
     return pipeline.process_fasta_file(fasta_path, output_file)
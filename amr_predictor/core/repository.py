@@ -8,15 +8,136 @@ import os
 import logging
 import psycopg2
 import json
+import copy
+import time
+import base64
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 from pathlib import Path
 
 from ..core.database_manager import AMRDatabaseManager
+from ..monitoring.metrics import track_operation
 
 # Configure logging
 logger = logging.getLogger("amr-repository")
 
+# Job statuses that only change again by archiving or deleting the job
+TERMINAL_STATUSES = ("Completed", "Error", "Archived")
+
+# Terminal jobs kept in memory, and how long an entry is trusted; the TTL
+# bounds how stale a job can be in processes other than the one that
+# archived or deleted it
+TERMINAL_JOB_CACHE_SIZE = int(os.getenv("AMR_JOB_CACHE_SIZE", "10000"))
+TERMINAL_JOB_CACHE_TTL = float(os.getenv("AMR_JOB_CACHE_TTL", "300"))
+
+# Prefix of the Bakta integration columns of amr_jobs. The Streamlit client
+# links Bakta jobs to finished AMR jobs directly in the database, so these
+# columns can change without invalidating any cache; they are left out of
+# the jobs returned by the repository, which are cached
+BAKTA_COLUMN_PREFIX = "bakta_"
+
+
+class TerminalJobCache:
+    """
+    In-process LRU cache of jobs in a terminal status.
+    
+    Finished jobs never change until they are archived or deleted, so
+    polling them can skip the database. Entries are invalidated by this
+    process's repository writes and expire after the TTL. Columns written
+    outside the repository (the Bakta links) are not part of cached jobs.
+    """
+    
+    def __init__(self, max_size: int = TERMINAL_JOB_CACHE_SIZE, ttl: float = TERMINAL_JOB_CACHE_TTL):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of cached jobs, 0 to disable caching
+            ttl: Seconds an entry is served before it is read again
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._jobs: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a cached job, or None if it is not cached"""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._jobs[job_id]
+                self.misses += 1
+                return None
+            self._jobs.move_to_end(job_id)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+    
+    def put(self, job_data: Dict[str, Any]) -> None:
+        """Cache a job if it is in a terminal status"""
+        job_id = job_data.get('job_id') or job_data.get('id')
+        if self.max_size <= 0 or not job_id or job_data.get('status') not in TERMINAL_STATUSES:
+            return
+        with self._lock:
+            self._jobs[job_id] = (time.monotonic() + self.ttl, copy.deepcopy(job_data))
+            self._jobs.move_to_end(job_id)
+            while len(self._jobs) > self.max_size:
+                self._jobs.popitem(last=False)
+    
+    def invalidate(self, job_id: str) -> None:
+        """Drop a job from the cache"""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+    
+    def clear(self) -> None:
+        """Drop all jobs from the cache"""
+        with self._lock:
+            self._jobs.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Get the size, hits and misses of the cache"""
+        with self._lock:
+            return {"size": len(self._jobs), "hits": self.hits, "misses": self.misses}
+
+
+# Cache shared by the repositories of this process
+_terminal_job_cache = TerminalJobCache()
+
+
+def get_terminal_job_cache() -> TerminalJobCache:
+    """Get the process-wide cache of terminal jobs"""
+    return _terminal_job_cache
+
+
+def without_bakta_columns(job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the Bakta integration columns from a job row"""
+    return {key: value for key, value in job_data.items() if not key.startswith(BAKTA_COLUMN_PREFIX)}
+
+
+def encode_job_cursor(start_time: datetime, job_id: str) -> str:
+    """Encode the (start_time, id) of a job as an opaque page cursor"""
+    payload = json.dumps([start_time.isoformat(), job_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_job_cursor(cursor: str) -> tuple:
+    """
+    Decode a page cursor into the (start_time, id) of a job.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start_time, job_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(start_time), str(job_id)
+    except Exception as e:
+        raise ValueError(f"Invalid page cursor: {cursor}") from e
+
 class AMRJobRepository:
     """
     Repository for AMR prediction jobs.
@@ -24,16 +145,19 @@ class AMRJobRepository:
     This class provides methods for storing and retrieving AMR prediction jobs.
     """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, db_manager: Optional[AMRDatabaseManager] = None):
         """
         Initialize the AMR job repository.
         
         Args:
             db_path: Ignored for PostgreSQL, kept for backwards compatibility
+            db_manager: Database manager to use (default: the AMRDatabaseManager singleton)
         """
-        self.db_manager = AMRDatabaseManager()
+        self.db_manager = db_manager or AMRDatabaseManager()
+        self.job_cache = get_terminal_job_cache()
         logger.info("Initialized AMR job repository")
     
+    @track_operation("repository.create_job", category="db")
     def create_job(self, job_id: str, initial_status: str = "Submitted", 
                    additional_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -63,6 +187,7 @@ class AMRJobRepository:
         logger.info(f"Created AMR job: {job_id}")
         return job_data
     
+    @track_operation("repository.update_job_status", category="db")
     def update_job_status(self, job_id: str, status: str, progress: float = None,
                          error: Optional[str] = None, result_file: Optional[str] = None,
                          aggregated_result_file: Optional[str] = None) -> bool:
@@ -80,6 +205,7 @@ class AMRJobRepository:
         Returns:
             True if successful, False if job not found
         """
+        self.job_cache.invalidate(job_id)
         result = self.db_manager.update_job_status(
             job_id=job_id,
             status=status,
@@ -98,6 +224,7 @@ class AMRJobRepository:
             
         return result
     
+    @track_operation("repository.get_job", category="db")
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
         Get job data by ID.
@@ -106,8 +233,13 @@ class AMRJobRepository:
             job_id: Job ID to retrieve
             
         Returns:
-            Job data or None if not found
+            Job data, without the Bakta integration columns, or None if not found
         """
+        # Finished jobs are served from memory
+        cached = self.job_cache.get(job_id)
+        if cached is not None:
+            return cached
+        
         try:
             job_data = self.db_manager.get_job(job_id)
             
@@ -121,7 +253,9 @@ class AMRJobRepository:
                 
             if 'end_time' in job_data and job_data['end_time'] and isinstance(job_data['end_time'], datetime):
                 job_data['end_time'] = job_data['end_time'].isoformat()
-                
+            
+            job_data = without_bakta_columns(job_data)
+            self.job_cache.put(job_data)
             return job_data
         except psycopg2.Error as e:
             if "connection" in str(e).lower():
@@ -129,11 +263,13 @@ class AMRJobRepository:
                 # Create a fresh connection
                 from ..core.database_manager import AMRDatabaseManager
                 fresh_db = AMRDatabaseManager()
-                return fresh_db.get_job(job_id)
+                job_data = fresh_db.get_job(job_id)
+                return without_bakta_columns(job_data) if job_data else None
             else:
                 # Re-raise if it's a different error
                 raise
     
+    @track_operation("repository.get_jobs", category="db")
     def get_jobs(self, status: Optional[str] = None, limit: int = 100,
                 offset: int = 0) -> List[Dict[str, Any]]:
         """
@@ -159,6 +295,78 @@ class AMRJobRepository:
                 
         return jobs
     
+    @track_operation("repository.find_completed_job", category="db")
+    def find_completed_job(self, input_sha256: str,
+                           parameters: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find a completed job run on the same input with the same parameters.
+        
+        Args:
+            input_sha256: SHA-256 of the input file
+            parameters: additional_info values the job must have been run with
+            
+        Returns:
+            Job data dictionary or None if there is no such job
+        """
+        job = self.db_manager.find_completed_job(input_sha256, parameters)
+        if job is None:
+            return None
+        
+        for key in ('start_time', 'end_time'):
+            if isinstance(job.get(key), datetime):
+                job[key] = job[key].isoformat()
+        job = without_bakta_columns(job)
+        self.job_cache.put(job)
+        return job
+    
+    @track_operation("repository.get_jobs_page", category="db")
+    def get_jobs_page(self, limit: int = 100, cursor: Optional[str] = None,
+                      status: Optional[str] = None, owner: Optional[str] = None,
+                      since: Optional[datetime] = None, until: Optional[datetime] = None,
+                      include_total: bool = True) -> Dict[str, Any]:
+        """
+        Get a page of jobs, newest first.
+        
+        Args:
+            limit: Maximum number of jobs to return
+            cursor: Cursor returned with the previous page (default: first page)
+            status: Filter by status (optional)
+            owner: Filter by the submitting user (optional)
+            since: Only jobs started at or after this time (optional)
+            until: Only jobs started before this time (optional)
+            include_total: Whether to estimate the number of matching jobs
+            
+        Returns:
+            Dictionary with the jobs, next_cursor (None on the last page) and
+            approximate_total (from table statistics, None if not requested)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = decode_job_cursor(cursor) if cursor else None
+        jobs, next_key = self.db_manager.get_jobs_page(
+            limit=limit, after=after, status=status, owner=owner, since=since, until=until)
+        
+        # Convert datetime objects to strings for API compatibility
+        for job in jobs:
+            if 'start_time' in job and isinstance(job['start_time'], datetime):
+                job['start_time'] = job['start_time'].isoformat()
+                
+            if 'end_time' in job and job['end_time'] and isinstance(job['end_time'], datetime):
+                job['end_time'] = job['end_time'].isoformat()
+        
+        approximate_total = None
+        if include_total:
+            approximate_total = self.db_manager.estimate_job_count(
+                status=status, owner=owner, since=since, until=until)
+        
+        return {
+            "jobs": jobs,
+            "next_cursor": encode_job_cursor(*next_key) if next_key else None,
+            "approximate_total": approximate_total
+        }
+    
+    @track_operation("repository.add_job_parameter", category="db")
     def add_job_parameter(self, job_id: str, param_name: str, param_value: Any) -> bool:
         """
         Add a parameter to a job.
@@ -171,8 +379,10 @@ class AMRJobRepository:
         Returns:
             True if successful, False if job not found
         """
+        self.job_cache.invalidate(job_id)
         return self.db_manager.add_job_parameter(job_id, param_name, param_value)
     
+    @track_operation("repository.add_job_parameters", category="db")
     def add_job_parameters(self, job_id: str, parameters: Dict[str, Any]) -> bool:
         """
         Add multiple parameters to a job.
@@ -184,8 +394,10 @@ class AMRJobRepository:
         Returns:
             True if successful, False if job not found
         """
+        self.job_cache.invalidate(job_id)
         return self.db_manager.add_job_parameters(job_id, parameters)
     
+    @track_operation("repository.delete_job", category="db")
     def delete_job(self, job_id: str) -> bool:
         """
         Delete a job.
@@ -196,6 +408,7 @@ class AMRJobRepository:
         Returns:
             True if successful, False if job not found
         """
+        self.job_cache.invalidate(job_id)
         result = self.db_manager.delete_job(job_id)
         
         if result:
@@ -205,6 +418,19 @@ class AMRJobRepository:
             
         return result
     
+    @track_operation("repository.archive_job", category="db")
+    def archive_job(self, job_id: str) -> bool:
+        """
+        Archive a finished job.
+        
+        Args:
+            job_id: Job ID to archive
+            
+        Returns:
+            True if successful, False if job not found
+        """
+        return self.update_job_status(job_id, status="Archived")
+    
     def close(self):
         """Close the database manager."""
         self.db_manager.close()
@@ -14,6 +14,8 @@ import re
 from pathlib import Path
 
 from .utils import logger
+from .compression import open_maybe_compressed
+from .fasta_index import get_fasta_index
 
 # Try to import BioPython for FASTA parsing
 try:
@@ -26,7 +28,7 @@ except ImportError:
 
 def load_fasta(file_path: str) -> List[Tuple[str, str]]:
     """
-    Load sequences from a FASTA file.
+    Load sequences from a FASTA file, plain or gzip/bgzip/zstd-compressed.
     
     Args:
         file_path: Path to the FASTA file
@@ -42,7 +44,7 @@ def load_fasta(file_path: str) -> List[Tuple[str, str]]:
     
     if BIOPYTHON_AVAILABLE:
         try:
-            with open(file_path, "r") as handle:
+            with open_maybe_compressed(file_path) as handle:
                 for record in SeqIO.parse(handle, "fasta"):
                     sequences.append((record.id, str(record.seq)))
             logger.info(f"Loaded {len(sequences)} sequences from {file_path}")
@@ -53,7 +55,7 @@ def load_fasta(file_path: str) -> List[Tuple[str, str]]:
     
     # Manual FASTA parsing as fallback
     try:
-        with open(file_path, "r") as file:
+        with open_maybe_compressed(file_path) as file:
             current_id = None
             current_sequence = []
             
@@ -143,6 +145,58 @@ def split_sequence(seq_id: str, sequence: str, max_length: int = 6000,
     return segments
 
 
+def tile_region(start: int, end: int, window: int, overlap: int = 0) -> List[Tuple[int, int]]:
+    """
+    Tile a region of a sequence with overlapping windows.
+
+    Windows advance by window - overlap; the last window is aligned to the
+    end of the region so that no window extends past it.
+
+    Args:
+        start: 0-based start of the region
+        end: End of the region (exclusive)
+        window: Window length
+        overlap: Number of nucleotides to overlap between windows
+
+    Returns:
+        List of (start, end) tuples, 0-based with exclusive ends
+    """
+    if end - start <= window:
+        return [(start, end)]
+
+    step_size = window - overlap
+    if step_size <= 0:
+        logger.warning(f"Invalid window parameters: window ({window}) must be greater than overlap ({overlap})")
+        step_size = max(1, window // 2)
+
+    tiles = []
+    position = start
+    while position + window < end:
+        tiles.append((position, position + window))
+        position += step_size
+    tiles.append((end - window, end))
+    return tiles
+
+
+def merge_regions(regions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Merge overlapping or adjacent regions.
+
+    Args:
+        regions: List of (start, end) tuples
+
+    Returns:
+        Sorted list of disjoint (start, end) tuples
+    """
+    merged = []
+    for start, end in sorted(regions):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
 def calculate_sequence_complexity(sequence: str) -> Dict[str, float]:
     """
     Calculate complexity metrics for a DNA sequence.
@@ -216,10 +270,158 @@ def clean_sequence(sequence: str, keep_chars: str = "ACGTN-") -> str:
     return "".join(char for char in sequence.upper() if char in keep_chars)
 
 
+# Nucleotide letters accepted in uploads, including IUPAC ambiguity codes
+FASTA_ALPHABET = frozenset("ACGTURYKMSWBDHVN-.acgturykmswbdhvn")
+
+
+class FastaValidationError(ValueError):
+    """Raised when uploaded data is not a nucleotide FASTA file."""
+
+
+class FastaStreamValidator:
+    """
+    Incremental FASTA validator for data arriving in chunks.
+    
+    Checks that the data starts with a header, that every header has an ID
+    and is followed by sequence, and that sequence lines only hold
+    nucleotide letters. Sequence lines may be of any length (unwrapped
+    FASTA): the received part of a line is checked as it arrives, so only
+    a partial header line is kept in memory. Errors are raised as soon as
+    the offending data arrives, or for headers once the line is complete.
+    """
+    
+    def __init__(self, alphabet: frozenset = FASTA_ALPHABET, max_header_length: int = 1 << 20):
+        """
+        Initialize the validator.
+        
+        Args:
+            alphabet: Characters allowed in sequence lines
+            max_header_length: Longest header line accepted, to bound the partial line buffer
+        """
+        self.alphabet = alphabet
+        self.max_header_length = max_header_length
+        self.sequence_count = 0
+        self.total_length = 0
+        self.line_number = 0
+        self._current_id = None
+        self._current_length = 0
+        self._partial = b""
+        # Whether the start of the current line was already checked as sequence
+        self._in_sequence_line = False
+    
+    def feed(self, chunk: bytes) -> None:
+        """
+        Validate the next chunk of data.
+        
+        Args:
+            chunk: Raw bytes, split anywhere
+            
+        Raises:
+            FastaValidationError: If the data seen so far is not valid FASTA
+        """
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            if self._in_sequence_line:
+                self._check_sequence(line.rstrip())
+                self._in_sequence_line = False
+            else:
+                self._check_line(line)
+        
+        if not self._partial:
+            return
+        if not self._in_sequence_line:
+            start = self._partial.lstrip()
+            if not start:
+                return
+            if start.startswith(b">"):
+                if len(self._partial) > self.max_header_length:
+                    raise FastaValidationError(
+                        f"Header on line {self.line_number + 1} is longer than {self.max_header_length} characters"
+                    )
+                return
+            # A sequence line: check what has arrived instead of buffering the line
+            self.line_number += 1
+            self._in_sequence_line = True
+            self._partial = start
+        # Trailing whitespace is held back, it is only allowed at the end of the line
+        body = self._partial.rstrip()
+        self._check_sequence(body)
+        self._partial = self._partial[len(body):]
+    
+    def finish(self) -> Dict[str, int]:
+        """
+        Validate the end of the data.
+        
+        Returns:
+            Dictionary with sequence_count and total_length
+            
+        Raises:
+            FastaValidationError: If the data is empty or ends with a header without sequence
+        """
+        if self._in_sequence_line:
+            self._in_sequence_line = False
+        elif self._partial:
+            self._check_line(self._partial)
+        self._partial = b""
+        self._end_record()
+        if self.sequence_count == 0:
+            raise FastaValidationError("No sequences found")
+        return {"sequence_count": self.sequence_count, "total_length": self.total_length}
+    
+    def _end_record(self) -> None:
+        if self._current_id is not None and self._current_length == 0:
+            raise FastaValidationError(f"Sequence {self._current_id} is empty")
+    
+    def _decode(self, raw: bytes) -> str:
+        try:
+            return raw.decode("ascii")
+        except UnicodeDecodeError:
+            raise FastaValidationError(f"Line {self.line_number} is not plain text")
+    
+    def _check_line(self, raw: bytes) -> None:
+        self.line_number += 1
+        line = self._decode(raw).strip()
+        if not line:
+            return
+        if line.startswith(">"):
+            if len(line) > self.max_header_length:
+                raise FastaValidationError(
+                    f"Header on line {self.line_number} is longer than {self.max_header_length} characters"
+                )
+            self._end_record()
+            fields = line[1:].split()
+            if not fields:
+                raise FastaValidationError(f"Header on line {self.line_number} has no sequence ID")
+            self._current_id = fields[0]
+            self._current_length = 0
+            self.sequence_count += 1
+            return
+        self._check_sequence(raw.strip())
+    
+    def _check_sequence(self, raw: bytes) -> None:
+        """Check sequence letters, the whole of a line or the part of it received so far"""
+        if self._current_id is None:
+            raise FastaValidationError("FASTA data must start with a '>' header line")
+        line = self._decode(raw)
+        invalid = set(line) - self.alphabet
+        if invalid:
+            shown = "".join(sorted(invalid))[:10]
+            raise FastaValidationError(
+                f"Invalid characters '{shown}' in sequence {self._current_id} on line {self.line_number}"
+            )
+        self._current_length += len(line)
+        self.total_length += len(line)
+
+
 def get_fasta_info(file_path: str) -> Dict[str, Any]:
     """
     Get information about a FASTA file without loading all sequences.
     
+    Compressed files are decompressed while they are read; file_size is
+    the size on disk. If the file has a current .fai index the statistics
+    are taken from it without reading the file.
+    
     Args:
         file_path: Path to the FASTA file
         
@@ -235,14 +437,26 @@ def get_fasta_info(file_path: str) -> Dict[str, Any]:
     
     file_size = os.path.getsize(file_path)
     
+    index = get_fasta_index(file_path, create=False)
+    if index is not None:
+        return {
+            "exists": True,
+            "file_size": file_size,
+            **index.stats(),
+            "file_path": file_path,
+            "file_name": os.path.basename(file_path),
+            "indexed": True
+        }
+    
     # Count sequences by counting '>' characters at the start of lines
     sequence_count = 0
     max_seq_length = 0
     min_seq_length = float('inf')
     current_length = 0
+    total_length = 0
     
     try:
-        with open(file_path, "r") as file:
+        with open_maybe_compressed(file_path) as file:
             for line in file:
                 line = line.strip()
                 if not line:
@@ -256,6 +470,7 @@ def get_fasta_info(file_path: str) -> Dict[str, Any]:
                     current_length = 0
                 else:
                     current_length += len(line)
+                    total_length += len(line)
             
             # Account for the last sequence
             if current_length > 0:
@@ -281,6 +496,7 @@ def get_fasta_info(file_path: str) -> Dict[str, Any]:
         "sequence_count": sequence_count,
         "max_sequence_length": max_seq_length,
         "min_sequence_length": min_seq_length,
+        "total_length": total_length,
         "file_path": file_path,
         "file_name": os.path.basename(file_path)
     }
@@ -0,0 +1,206 @@
+"""
+Shared model loading for AMR Predictor workers.
+
+Each inference worker used to load its own copy of the model weights for
+every job. This module keeps one loaded ModelManager per model and device
+in each process, and lets a parent process preload models before forking
+its workers: the workers then share the parent's weights copy-on-write, so
+the memory of a node stays close to one model regardless of the number of
+workers. A memory report shows how much of each process is shared.
+"""
+
+import os
+import gc
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+
+from .utils import logger, ProgressTracker
+from .models import ModelManager, get_loaded_models
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Loaded model managers of this process, keyed by (model name, device)
+_shared_managers: Dict[Tuple[str, str], ModelManager] = {}
+_locks: Dict[Tuple[str, str], threading.RLock] = {}
+_pool_lock = threading.Lock()
+
+# Process that preloaded the models this process inherited, if it was forked,
+# and the keys of the inherited models
+_preloaded_by: Optional[int] = None
+_inherited_keys = set()
+
+
+def _key(model_name: Optional[str], device: Optional[str]) -> Tuple[str, str]:
+    """Get the pool key of a model"""
+    # Workers forked from a preloading parent default to the CPU, where their
+    # models were preloaded: CUDA cannot be used after a fork. Elsewhere the
+    # default device is resolved the way ModelManager does.
+    if device in (None, "auto"):
+        device = "cpu" if _preloaded_by is not None else ModelManager._get_default_device()
+    return (model_name or ModelManager.DEFAULT_MODEL_NAME, device)
+
+
+def get_shared_model(model_name: Optional[str] = None, device: Optional[str] = None,
+                     **manager_kwargs) -> ModelManager:
+    """
+    Get the loaded model manager for a model, loading it once per process.
+
+    Args:
+        model_name: HuggingFace model name or path to local model
+        device: Device to load the model on (default: best available)
+        **manager_kwargs: Additional ModelManager arguments used when loading
+
+    Returns:
+        Loaded ModelManager shared by all jobs of this process
+    """
+    key = _key(model_name, device)
+    with _pool_lock:
+        lock = _locks.setdefault(key, threading.RLock())
+    with lock:
+        manager = _shared_managers.get(key)
+        if manager is None or (manager.model is None and manager.engine is None):
+            manager = ModelManager(model_name=key[0], device=key[1], **manager_kwargs)
+            manager.load()
+            _shared_managers[key] = manager
+        return manager
+
+
+@contextmanager
+def shared_model(model_name: Optional[str] = None, device: Optional[str] = None,
+                 progress_tracker: Optional[ProgressTracker] = None, **manager_kwargs):
+    """
+    Use a shared model manager for one job.
+
+    Jobs using the same model in a process run one at a time, since each
+    already uses all of the process's inference threads; the job's progress
+    tracker is attached for the duration of the job.
+
+    Args:
+        model_name: HuggingFace model name or path to local model
+        device: Device to load the model on (default: best available)
+        progress_tracker: Progress tracker of the job
+        **manager_kwargs: Additional ModelManager arguments used when loading
+
+    Yields:
+        Loaded ModelManager
+    """
+    key = _key(model_name, device)
+    with _pool_lock:
+        lock = _locks.setdefault(key, threading.RLock())
+    with lock:
+        manager = get_shared_model(model_name, device, **manager_kwargs)
+        manager.progress_tracker = progress_tracker
+        try:
+            yield manager
+        finally:
+            manager.progress_tracker = None
+
+
+def _mark_forked_child() -> None:
+    """Record that this process inherited preloaded models from its parent"""
+    global _preloaded_by, _inherited_keys, _locks, _pool_lock
+    if _shared_managers:
+        _preloaded_by = os.getppid()
+        _inherited_keys = set(_shared_managers)
+    # Locks may have been held by another thread of the parent at fork time
+    _pool_lock = threading.Lock()
+    _locks = {}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_mark_forked_child)
+
+
+def preload_models(model_names: List[str], **manager_kwargs) -> List[ModelManager]:
+    """
+    Load models on the CPU in a parent process so forked workers share their weights.
+
+    Models are always preloaded on the CPU: GPU memory is not shared
+    copy-on-write, and forked children cannot use CUDA once the parent has
+    initialized it. Jobs in the workers then default to the CPU as well.
+
+    After loading, parameters are made read-only and all objects are moved
+    out of reach of the cyclic garbage collector, whose bookkeeping writes
+    would otherwise copy the shared pages into every worker.
+
+    Args:
+        model_names: Models to load
+        **manager_kwargs: Additional ModelManager arguments
+
+    Returns:
+        Loaded model managers
+    """
+    managers = []
+    for model_name in model_names:
+        manager = get_shared_model(model_name, "cpu", **manager_kwargs)
+        if manager.model is not None:
+            manager.model.requires_grad_(False)
+        managers.append(manager)
+        logger.info(f"Preloaded {model_name} for worker processes")
+
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+    return managers
+
+
+def _model_parameter_mb(manager: ModelManager) -> float:
+    """Get the size of a model's parameters and buffers in MB"""
+    if manager.model is None:
+        return 0.0
+    tensors = list(manager.model.parameters()) + list(manager.model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors) / (1024 ** 2)
+
+
+def _process_memory(process: "psutil.Process") -> Dict[str, Any]:
+    """Get the memory of one process in MB"""
+    info = process.memory_full_info() if hasattr(process, "memory_full_info") else process.memory_info()
+    memory = {"pid": process.pid, "rss_mb": round(info.rss / (1024 ** 2), 1)}
+    if hasattr(info, "uss"):
+        # USS is private to the process; PSS splits shared pages between their users
+        memory["uss_mb"] = round(info.uss / (1024 ** 2), 1)
+        memory["shared_mb"] = round((info.rss - info.uss) / (1024 ** 2), 1)
+    if hasattr(info, "pss"):
+        memory["pss_mb"] = round(info.pss / (1024 ** 2), 1)
+    return memory
+
+
+def memory_report() -> Dict[str, Any]:
+    """
+    Get a memory report for health endpoints.
+
+    Returns:
+        Dictionary with the memory of this process, the size of its loaded
+        models and, for forked workers, the total across the parent and all
+        of its workers
+    """
+    report = {
+        "models": [
+            {**manager.get_model_metadata(), "parameter_mb": round(_model_parameter_mb(manager), 1),
+             "shared_from_parent": key in _inherited_keys}
+            for key, manager in list(_shared_managers.items())
+        ],
+        "loaded_models": len(get_loaded_models()),
+        "preloaded_by": _preloaded_by
+    }
+    if not PSUTIL_AVAILABLE:
+        return report
+
+    try:
+        report["process"] = _process_memory(psutil.Process())
+        if _preloaded_by is not None and psutil.pid_exists(_preloaded_by):
+            parent = psutil.Process(_preloaded_by)
+            processes = [_process_memory(p) for p in [parent] + parent.children()]
+            report["node"] = {
+                "workers": len(processes) - 1,
+                "rss_mb": round(sum(p["rss_mb"] for p in processes), 1),
+                "pss_mb": round(sum(p.get("pss_mb", p["rss_mb"]) for p in processes), 1)
+            }
+    except (psutil.Error, OSError) as e:
+        report["error"] = str(e)
+    return report
@@ -0,0 +1,213 @@
+"""
+Streaming upload handling for AMR Predictor.
+
+Uploaded files are copied to disk in fixed-size chunks instead of being
+read into memory whole. While the data streams through, its size is
+checked against a cap, its SHA-256 is computed and, for FASTA input, it is
+validated incrementally, so a bad or oversized upload is rejected as soon
+as the offending chunk arrives.
+
+gzip, bgzip and zstd uploads are decompressed on the fly for these checks,
+so the hash, cap and validation apply to the FASTA content whatever its
+compression. With compression enabled uploads are stored as BGZF.
+
+FASTA uploads can also be indexed as they stream (see fasta_index.py); the
+index is written next to the stored file.
+"""
+
+import os
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+from .compression import BgzfWriter, StreamDecompressor, detect_compression, strip_compression_suffix
+from .fasta_index import FastaIndex, FastaIndexBuilder, FastaIndexError, read_bgzf_blocks
+from .sequence import FastaStreamValidator
+from .utils import logger
+
+# Bytes read from the upload per chunk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Largest accepted upload in bytes, after decompression
+MAX_UPLOAD_BYTES = int(os.getenv("AMR_MAX_UPLOAD_BYTES", str(512 * 1024 * 1024)))
+
+# Whether FASTA uploads are stored BGZF-compressed, and at which zlib level
+COMPRESS_UPLOADS = os.getenv("AMR_COMPRESS_UPLOADS", "true").lower() in ("1", "true", "yes")
+UPLOAD_COMPRESSION_LEVEL = int(os.getenv("AMR_UPLOAD_COMPRESSION_LEVEL", "6"))
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the size cap."""
+
+
+@dataclass
+class UploadInfo:
+    """An upload saved to disk."""
+    path: str
+    size: int
+    sha256: str
+    sequence_count: Optional[int] = None
+    total_length: Optional[int] = None
+    compression: Optional[str] = None
+    stored_size: Optional[int] = None
+    indexed: bool = False
+    # Size of the content after decompression; size is the upload as sent
+    uncompressed_size: Optional[int] = None
+
+
+def upload_path(upload_dir: str, job_id: str, filename: Optional[str]) -> str:
+    """
+    Get the path an upload is stored at.
+
+    Only the base name of the client's file name is kept, so it cannot
+    point outside the upload directory.
+
+    Args:
+        upload_dir: Directory for uploads
+        job_id: Job the upload belongs to
+        filename: File name sent by the client
+
+    Returns:
+        Path of the upload
+    """
+    name = os.path.basename((filename or "").replace("\\", "/")) or "upload"
+    return os.path.join(upload_dir, f"{job_id}_{name}")
+
+
+async def save_upload(upload, path: str, max_bytes: int = MAX_UPLOAD_BYTES,
+                      validator: Optional[FastaStreamValidator] = None,
+                      chunk_size: int = UPLOAD_CHUNK_SIZE, compress: bool = False,
+                      compression_level: int = UPLOAD_COMPRESSION_LEVEL,
+                      indexer: Optional[FastaIndexBuilder] = None) -> UploadInfo:
+    """
+    Stream an upload to disk, hashing and optionally validating it.
+
+    Compressed uploads are detected from their magic bytes and decompressed
+    as they stream; the size cap, hash and validation apply to the
+    decompressed content. The partial file is removed if the upload is
+    rejected. A FASTA file whose line layout cannot be indexed is still
+    saved, just without an index.
+
+    Args:
+        upload: Object with an async read(size) method, e.g. a FastAPI UploadFile
+        path: Destination path; with compress, a compression suffix is replaced by .gz
+        max_bytes: Largest accepted decompressed size in bytes
+        validator: Incremental FASTA validator, None to skip validation
+        chunk_size: Bytes read per chunk
+        compress: Whether to store the content as BGZF (bgzip uploads are kept as sent)
+        compression_level: zlib level of the BGZF blocks
+        indexer: FASTA index builder, None to skip indexing; the index is saved as path.fai
+
+    Returns:
+        Saved upload with its sizes and the SHA-256 of its content
+
+    Raises:
+        UploadTooLargeError: If the decompressed upload is larger than max_bytes
+        FastaValidationError: If the validator rejects the data
+        CompressionError: If compressed data is corrupt or its format is not supported
+    """
+    # Look at the first bytes to detect compression
+    head = b""
+    while len(head) < 16:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        head += chunk
+    compression = detect_compression(head)
+    decompressor = StreamDecompressor(compression) if compression else None
+
+    # Keep bgzip as sent; recompress anything else into BGZF blocks
+    recompress = compress and compression != "bgzip"
+    if compress:
+        path = strip_compression_suffix(path) + ".gz"
+
+    digest = hashlib.sha256()
+    received = 0
+    size = 0
+    stats = {}
+    handle = await asyncio.to_thread(open, path, "wb")
+    writer = BgzfWriter(handle, level=compression_level) if recompress else None
+
+    def consume(data: bytes) -> None:
+        """Check, hash, validate, index and store a piece of decompressed data"""
+        nonlocal size, indexer
+        size += len(data)
+        if size > max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds the limit of {max_bytes} bytes")
+        digest.update(data)
+        if validator is not None:
+            validator.feed(data)
+        if indexer is not None:
+            try:
+                indexer.feed(data)
+            except FastaIndexError as e:
+                logger.warning(f"Not indexing upload {path}: {str(e)}")
+                indexer = None
+        if writer is not None:
+            writer.write(data)
+
+    def process(chunk: bytes) -> None:
+        """Handle one chunk of the upload as sent"""
+        if decompressor is not None:
+            # Decompressed in bounded pieces, so the size cap applies before a
+            # highly compressed chunk expands in memory
+            decompressor.decompress_to(chunk, consume)
+        else:
+            consume(chunk)
+        if writer is None:
+            handle.write(chunk)
+
+    try:
+        chunk = head
+        while chunk:
+            received += len(chunk)
+            # The CPU work of each chunk runs off the event loop
+            await asyncio.to_thread(process, chunk)
+            chunk = await upload.read(chunk_size)
+        if decompressor is not None:
+            decompressor.flush()
+        if validator is not None:
+            stats = validator.finish()
+        if writer is not None:
+            await asyncio.to_thread(writer.close)
+    except BaseException:
+        handle.close()
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    handle.close()
+
+    indexed = False
+    if indexer is not None:
+        indexed = await asyncio.to_thread(_save_index, path, indexer, compression,
+                                          writer.blocks if writer is not None else None)
+
+    stored_size = os.path.getsize(path)
+    logger.info(f"Saved upload of {received} bytes ({size} uncompressed) to {path} as {stored_size} bytes")
+    return UploadInfo(path=path, size=received, sha256=digest.hexdigest(), compression=compression,
+                      stored_size=stored_size, indexed=indexed, uncompressed_size=size, **stats)
+
+
+def remove_upload(path: str) -> None:
+    """
+    Delete a saved upload together with its index files.
+
+    Args:
+        path: Path of the upload
+    """
+    for file_path in (path, path + ".fai", path + ".gzi"):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def _save_index(path: str, indexer: FastaIndexBuilder, compression: Optional[str], blocks) -> bool:
+    try:
+        records = indexer.finish()
+        if blocks is None and compression == "bgzip":
+            blocks = read_bgzf_blocks(path)
+        FastaIndex(path, records, blocks).save()
+        return True
+    except (OSError, FastaIndexError) as e:
+        logger.warning(f"Could not index upload {path}: {str(e)}")
+        return False
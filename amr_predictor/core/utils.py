@@ -9,11 +9,15 @@ import os
 import sys
 import logging
 import time
+import importlib
+import importlib.util
 from datetime import datetime
 from typing import Optional, Dict, Any, Union, Callable
 from contextlib import contextmanager
 import re
 
+from ..monitoring.telemetry import observe_stage
+
 # Try to import colorama for colored terminal output
 try:
     from colorama import init, Fore, Style
@@ -39,13 +43,15 @@ class ProgressTracker:
     which can be used by a UI to display current processing status.
     """
     
-    def __init__(self, total_steps: int = 100, callback: Optional[Callable] = None):
+    def __init__(self, total_steps: int = 100, callback: Optional[Callable] = None,
+                 expected_seconds: Optional[float] = None):
         """
         Initialize a new progress tracker.
         
         Args:
             total_steps: Total number of steps in the operation
             callback: Optional callback function to be called on progress updates
+            expected_seconds: Expected duration of the operation, used for the ETA
         """
         self.total_steps = total_steps
         self.current_step = 0
@@ -54,6 +60,10 @@ class ProgressTracker:
         self.callback = callback
         self.additional_info = {}
         self.error = None
+        self.expected_seconds = expected_seconds
+        # Start of the current stage of per-segment progress ("processed" of "total")
+        self.stage_start_time = None
+        self._stage_processed = None
     
     def update(self, step: Optional[int] = None, increment: Optional[int] = None, 
                status: Optional[str] = None, additional_info: Optional[Dict[str, Any]] = None) -> None:
@@ -75,6 +85,12 @@ class ProgressTracker:
             self.status = status
         
         if additional_info is not None:
+            processed = additional_info.get("processed")
+            if processed is not None:
+                # A new stage (another model or refinement pass) restarts its count
+                if self._stage_processed is None or processed < self._stage_processed:
+                    self.stage_start_time = time.time()
+                self._stage_processed = processed
             self.additional_info.update(additional_info)
         
         # Call the callback if provided
@@ -98,6 +114,20 @@ class ProgressTracker:
         """Get the elapsed time in seconds"""
         return time.time() - self.start_time
     
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Get the estimated seconds left, or None without an estimate"""
+        from .cost_model import estimate_remaining_seconds
+        if self.current_step >= self.total_steps:
+            return 0.0
+        stage_elapsed = time.time() - self.stage_start_time if self.stage_start_time is not None else None
+        return estimate_remaining_seconds(
+            self.expected_seconds, self.elapsed_time,
+            processed=self._stage_processed,
+            total=self.additional_info.get("total"),
+            stage_elapsed=stage_elapsed
+        )
+    
     def get_state(self) -> Dict[str, Any]:
         """Get the current state as a dictionary suitable for serialization"""
         return {
@@ -106,11 +136,74 @@ class ProgressTracker:
             "total_steps": self.total_steps,
             "status": self.status,
             "elapsed_time": self.elapsed_time,
+            "eta_seconds": self.eta_seconds,
             "additional_info": self.additional_info,
             "error": self.error
         }
 
 
+def module_available(module_name: str) -> bool:
+    """
+    Check whether a module can be imported, without importing it.
+    
+    Args:
+        module_name: Fully qualified module name
+        
+    Returns:
+        True if the module is installed
+    """
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyImport:
+    """
+    Proxy for a module, or an attribute of a module, imported on first use.
+    
+    Heavy optional dependencies (torch, transformers, peft) are bound to
+    LazyImport proxies at module level so that importing the package stays
+    cheap; the real import happens on the first attribute access or call.
+    """
+    
+    def __init__(self, module_name: str, attribute: Optional[str] = None):
+        """
+        Initialize the proxy.
+        
+        Args:
+            module_name: Module to import
+            attribute: Optional attribute of the module to resolve
+        """
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+    
+    def _load(self) -> Any:
+        """Import and return the proxied object"""
+        if self._target is None:
+            module = importlib.import_module(self._module_name)
+            self._target = getattr(module, self._attribute) if self._attribute else module
+        return self._target
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the proxied object has been imported"""
+        return self._target is not None
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+    
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._load()(*args, **kwargs)
+    
+    def __repr__(self) -> str:
+        target = f"{self._module_name}.{self._attribute}" if self._attribute else self._module_name
+        return f"<LazyImport {target} ({'loaded' if self.is_loaded else 'not loaded'})>"
+
+
 def setup_logger(level: int = logging.INFO) -> logging.Logger:
     """
     Set up a logger with colored output if available.
@@ -168,6 +261,8 @@ def timer(name: str, metrics_dict: Optional[Dict[str, float]] = None):
     """
     Context manager for timing code blocks and recording metrics.
     
+    Durations are also recorded in the pipeline stage telemetry histogram.
+    
     Args:
         name: Name of the operation being timed
         metrics_dict: Optional dictionary to store timing results
@@ -180,6 +275,7 @@ def timer(name: str, metrics_dict: Optional[Dict[str, float]] = None):
         duration = end_time - start_time
         if metrics_dict is not None:
             metrics_dict[name] = duration
+        observe_stage(name, duration)
         logger.debug(f"Timing - {name}: {duration:.4f} seconds")
 
 
@@ -236,9 +332,10 @@ def get_default_output_path(prefix: str, extension: str = "txt", input_file: Opt
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    # If input file is provided, prepend its basename (without extension)
+    # If input file is provided, prepend its basename (without compression suffix and extension)
     if input_file:
-        input_basename = os.path.splitext(os.path.basename(input_file))[0]
+        from .compression import strip_compression_suffix
+        input_basename = os.path.splitext(strip_compression_suffix(os.path.basename(input_file)))[0]
         return f"{input_basename}_{prefix}_{timestamp}.{extension}"
     
     return f"{prefix}_{timestamp}.{extension}"
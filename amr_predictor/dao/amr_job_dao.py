@@ -11,6 +11,7 @@ from datetime import datetime
 from amr_predictor.bakta.database import DatabaseManager, BaktaDatabaseError
 from amr_predictor.models.amr_job import AMRJob, AMRJobParams
 from amr_predictor.bakta.database_extensions import extend_database_manager
+from amr_predictor.monitoring.metrics import track_operation
 
 # Configure logging
 logger = logging.getLogger("amr-job-dao")
@@ -41,6 +42,7 @@ class AMRJobDAO:
         if isinstance(error, BaktaDatabaseError):
             raise error
     
+    @track_operation("amr_job_dao.save", category="db")
     def save(self, job: AMRJob) -> AMRJob:
         """
         Save a new AMR job to the database.
@@ -60,6 +62,7 @@ class AMRJobDAO:
             self._handle_db_error("save", e)
             raise
     
+    @track_operation("amr_job_dao.update", category="db")
     def update(self, job: AMRJob) -> AMRJob:
         """
         Update an existing AMR job.
@@ -79,6 +82,7 @@ class AMRJobDAO:
             self._handle_db_error("update", e)
             raise
     
+    @track_operation("amr_job_dao.update_status", category="db")
     def update_status(self, id: str, status: str, progress: Optional[float] = None,
                     error: Optional[str] = None, completed_at: Optional[datetime] = None) -> bool:
         """
@@ -100,6 +104,7 @@ class AMRJobDAO:
             self._handle_db_error("update_status", e)
             return False
     
+    @track_operation("amr_job_dao.get_by_id", category="db")
     def get_by_id(self, id: str) -> Optional[AMRJob]:
         """
         Get a job by ID.
@@ -116,6 +121,7 @@ class AMRJobDAO:
             self._handle_db_error("get_by_id", e)
             return None
     
+    @track_operation("amr_job_dao.get_by_user", category="db")
     def get_by_user(self, user_id: str, limit: int = 50, offset: int = 0) -> List[AMRJob]:
         """
         Get jobs for a user.
@@ -134,6 +140,7 @@ class AMRJobDAO:
             self._handle_db_error("get_by_user", e)
             return []
     
+    @track_operation("amr_job_dao.get_all", category="db")
     def get_all(self, limit: int = 50, offset: int = 0, status: Optional[str] = None) -> List[AMRJob]:
         """
         Get all jobs with optional status filtering.
@@ -152,6 +159,7 @@ class AMRJobDAO:
             self._handle_db_error("get_all", e)
             return []
     
+    @track_operation("amr_job_dao.delete", category="db")
     def delete(self, id: str) -> bool:
         """
         Delete a job by ID.
@@ -168,6 +176,7 @@ class AMRJobDAO:
             self._handle_db_error("delete", e)
             return False
     
+    @track_operation("amr_job_dao.save_params", category="db")
     def save_params(self, job_id: str, params: AMRJobParams) -> bool:
         """
         Save or update job parameters.
@@ -185,6 +194,7 @@ class AMRJobDAO:
             self._handle_db_error("save_params", e)
             return False
     
+    @track_operation("amr_job_dao.get_params", category="db")
     def get_params(self, job_id: str) -> Optional[AMRJobParams]:
         """
         Get job parameters.
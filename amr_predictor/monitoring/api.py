@@ -9,11 +9,13 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 
 from amr_predictor.auth.user_manager import UserManager
 from amr_predictor.auth.models import User
 from amr_predictor.auth.dependencies import get_current_user
 from amr_predictor.monitoring.metrics import get_metrics_tracker, MetricsReport
+from amr_predictor.monitoring.telemetry import render_prometheus, PROMETHEUS_CONTENT_TYPE
 from amr_predictor.bakta.database_manager_optimized import OptimizedDatabaseManager
 from amr_predictor.dao.amr_job_dao import AMRJobDAO
 
@@ -51,6 +53,20 @@ async def get_metrics_summary(
     return report
 
 
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics() -> PlainTextResponse:
+    """
+    Get pipeline telemetry in the Prometheus text exposition format.
+    
+    This endpoint is unauthenticated so that Prometheus can scrape it;
+    it exposes only aggregate timings and counters.
+    
+    Returns:
+        Metrics text for scraping
+    """
+    return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @router.get("/metrics/slow-operations")
 async def get_slow_operations(
     threshold_ms: float = Query(500.0, description="Threshold in milliseconds"),
@@ -5,14 +5,22 @@ Performance metrics and monitoring for AMR predictor.
 This module provides utilities for tracking performance metrics
 and monitoring system health for the AMR predictor API.
 """
+import math
 import time
+import uuid
+import inspect
 import logging
 import functools
 import threading
-from typing import Dict, List, Any, Optional, Callable
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Any, Optional, Callable, Sequence
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 
+from amr_predictor.monitoring.telemetry import observe_operation
+
 # Configure logging
 logger = logging.getLogger("amr-monitoring")
 
@@ -25,6 +33,141 @@ class OperationMetric:
     timestamp: datetime = field(default_factory=datetime.now)
     success: bool = True
     error_message: Optional[str] = None
+    cpu_time_ms: Optional[float] = None
+    db_time_ms: Optional[float] = None
+    correlation_id: Optional[str] = None
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with bounded relative error.
+    
+    Values are counted in logarithmically sized bins, so any quantile is
+    returned within ``relative_accuracy`` of the true value while memory
+    depends only on the range of values seen, not on how many were added.
+    Sketches with the same accuracy can be merged, which is how windowed
+    percentiles are computed from time-bucketed rollups.
+    """
+    
+    # Values at or below this are counted in a dedicated zero bin
+    MIN_VALUE = 1e-6
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Initialize the sketch.
+        
+        Args:
+            relative_accuracy: Maximum relative error of returned quantiles
+        """
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+    
+    def key(self, value: float) -> Optional[int]:
+        """
+        Get the bin key for a value.
+        
+        Args:
+            value: Value to bin
+            
+        Returns:
+            Bin key, or None for the zero bin
+        """
+        if value <= self.MIN_VALUE:
+            return None
+        return math.ceil(math.log(value) / self._log_gamma)
+    
+    def add(self, value: float, key: Optional[int] = None) -> None:
+        """
+        Add a value to the sketch.
+        
+        Args:
+            value: Value to add
+            key: Precomputed bin key for the value (see :meth:`key`)
+        """
+        if key is None:
+            key = self.key(value)
+        if key is None:
+            self._zero_count += 1
+        else:
+            self._bins[key] = self._bins.get(key, 0) + 1
+        self.count += 1
+    
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Merge another sketch with the same accuracy into this one.
+        
+        Args:
+            other: Sketch to merge
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in dict(other._bins).items():
+            self._bins[key] = self._bins.get(key, 0) + count
+        self._zero_count += other._zero_count
+        self.count += other.count
+    
+    def quantile(self, q: float) -> float:
+        """
+        Get an approximate quantile.
+        
+        Args:
+            q: Quantile between 0 and 1
+            
+        Returns:
+            Approximate value at the quantile, or 0.0 if the sketch is empty
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        cumulative = self._zero_count
+        if cumulative > rank:
+            return 0.0
+        for key in sorted(self._bins):
+            cumulative += self._bins[key]
+            if cumulative > rank:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._bins) / (self._gamma + 1)
+
+
+@dataclass
+class OperationStats:
+    """Aggregated statistics for an operation over a period of time."""
+    count: int = 0
+    error_count: int = 0
+    total_duration_ms: float = 0.0
+    max_duration_ms: float = 0.0
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    
+    def add(self, duration_ms: float, success: bool, key: Optional[int] = None) -> None:
+        """Add a single operation"""
+        self.count += 1
+        if not success:
+            self.error_count += 1
+        self.total_duration_ms += duration_ms
+        self.max_duration_ms = max(self.max_duration_ms, duration_ms)
+        self.sketch.add(duration_ms, key)
+    
+    def merge(self, other: "OperationStats") -> None:
+        """Merge the statistics of another period"""
+        self.count += other.count
+        self.error_count += other.error_count
+        self.total_duration_ms += other.total_duration_ms
+        self.max_duration_ms = max(self.max_duration_ms, other.max_duration_ms)
+        self.sketch.merge(other.sketch)
+    
+    @property
+    def average_duration_ms(self) -> float:
+        """Average duration in milliseconds"""
+        return self.total_duration_ms / self.count if self.count else 0.0
+    
+    @property
+    def error_rate(self) -> float:
+        """Error rate as a percentage (0-100)"""
+        return (self.error_count / self.count) * 100.0 if self.count else 0.0
 
 
 class MetricsTracker:
@@ -33,21 +176,46 @@ class MetricsTracker:
     
     This class tracks performance metrics for various operations
     and provides methods to retrieve and analyze them.
+    
+    Raw samples are kept in bounded ring buffers (``metrics`` for the most
+    recent operations overall, plus one per operation). Aggregates are kept
+    as lifetime totals and per-operation rollups of ``rollup_seconds`` each,
+    so counts, averages, error rates and percentiles are computed from
+    rollups in time proportional to the number of operations and buckets,
+    not the number of samples. Time-filtered aggregates have the resolution
+    of one rollup bucket.
     """
     
-    def __init__(self, max_history: int = 1000):
+    def __init__(self, max_history: int = 1000, rollup_seconds: int = 60,
+                 rollup_retention: timedelta = timedelta(hours=24),
+                 relative_accuracy: float = 0.01):
         """
         Initialize the metrics tracker.
         
         Args:
-            max_history: Maximum number of operations to track
+            max_history: Maximum number of raw operations to keep, overall and per operation
+            rollup_seconds: Width of the time buckets used for aggregates
+            rollup_retention: How long rollup buckets are kept
+            relative_accuracy: Relative accuracy of percentile estimates
         """
         self.max_history = max_history
-        self.metrics: List[OperationMetric] = []
+        self.rollup_seconds = rollup_seconds
+        self.relative_accuracy = relative_accuracy
+        self._max_rollups = max(1, int(rollup_retention.total_seconds() // rollup_seconds))
+        self.metrics: Deque[OperationMetric] = deque(maxlen=max_history)
+        self._recent: Dict[str, Deque[OperationMetric]] = {}
+        self._totals: Dict[str, OperationStats] = {}
+        self._rollups: Dict[str, "OrderedDict[int, OperationStats]"] = {}
+        self._sketch = QuantileSketch(relative_accuracy)
         self.lock = threading.RLock()
     
+    def _new_stats(self) -> OperationStats:
+        return OperationStats(sketch=QuantileSketch(self.relative_accuracy))
+    
     def record_operation(self, operation_name: str, duration_ms: float, 
-                        success: bool = True, error_message: Optional[str] = None):
+                        success: bool = True, error_message: Optional[str] = None,
+                        cpu_time_ms: Optional[float] = None, db_time_ms: Optional[float] = None,
+                        correlation_id: Optional[str] = None):
         """
         Record an operation metric.
         
@@ -56,26 +224,81 @@ class MetricsTracker:
             duration_ms: Duration in milliseconds
             success: Whether the operation was successful
             error_message: Optional error message if operation failed
+            cpu_time_ms: CPU time spent executing the operation
+            db_time_ms: Time spent waiting on database calls
+            correlation_id: Request or job correlation ID
         """
+        metric = OperationMetric(
+            operation_name=operation_name,
+            duration_ms=duration_ms,
+            timestamp=datetime.now(),
+            success=success,
+            error_message=error_message,
+            cpu_time_ms=cpu_time_ms,
+            db_time_ms=db_time_ms,
+            correlation_id=correlation_id
+        )
+        bucket = int(metric.timestamp.timestamp() // self.rollup_seconds) * self.rollup_seconds
+        key = self._sketch.key(duration_ms)
+        
         with self.lock:
-            metric = OperationMetric(
-                operation_name=operation_name,
-                duration_ms=duration_ms,
-                timestamp=datetime.now(),
-                success=success,
-                error_message=error_message
-            )
-            
             self.metrics.append(metric)
             
-            # Trim history if needed
-            if len(self.metrics) > self.max_history:
-                self.metrics = self.metrics[-self.max_history:]
+            recent = self._recent.get(operation_name)
+            if recent is None:
+                recent = self._recent[operation_name] = deque(maxlen=self.max_history)
+                self._totals[operation_name] = self._new_stats()
+                self._rollups[operation_name] = OrderedDict()
+            recent.append(metric)
+            self._totals[operation_name].add(duration_ms, success, key)
+            
+            rollups = self._rollups[operation_name]
+            stats = rollups.get(bucket)
+            if stats is None:
+                stats = rollups[bucket] = self._new_stats()
+                if len(rollups) > self._max_rollups:
+                    rollups.popitem(last=False)
+            stats.add(duration_ms, success, key)
+    
+    def _stats(self, operation_name: Optional[str] = None,
+               since: Optional[datetime] = None) -> Dict[str, OperationStats]:
+        """
+        Aggregate statistics per operation.
+        
+        Args:
+            operation_name: Restrict to this operation
+            since: Only include rollup buckets ending after this time
+            
+        Returns:
+            Dictionary mapping operation names to merged statistics
+        """
+        with self.lock:
+            if operation_name is not None:
+                names = [operation_name] if operation_name in self._totals else []
+            else:
+                names = list(self._totals)
+            if since is None:
+                sources = {name: [self._totals[name]] for name in names}
+            else:
+                cutoff = since.timestamp() - self.rollup_seconds
+                sources = {
+                    name: [stats for bucket, stats in self._rollups[name].items() if bucket > cutoff]
+                    for name in names
+                }
+        
+        result = {}
+        for name, parts in sources.items():
+            merged = self._new_stats()
+            for part in parts:
+                merged.merge(part)
+            if merged.count:
+                result[name] = merged
+        return result
     
     def get_metrics(self, operation_name: Optional[str] = None, 
                    since: Optional[datetime] = None) -> List[OperationMetric]:
         """
-        Get metrics, optionally filtered.
+        Get recent raw metrics, optionally filtered.
         
         Args:
             operation_name: Filter by operation name
@@ -86,11 +309,10 @@ class MetricsTracker:
         """
         with self.lock:
             # Make a copy to avoid threading issues
-            metrics = self.metrics.copy()
-        
-        # Filter by operation name if specified
-        if operation_name:
-            metrics = [m for m in metrics if m.operation_name == operation_name]
+            if operation_name:
+                metrics = list(self._recent.get(operation_name, ()))
+            else:
+                metrics = list(self.metrics)
         
         # Filter by time if specified
         if since:
@@ -110,13 +332,27 @@ class MetricsTracker:
         Returns:
             Average duration in milliseconds
         """
-        metrics = self.get_metrics(operation_name, since)
-        
-        if not metrics:
-            return 0.0
+        stats = self._stats(operation_name, since).get(operation_name)
+        return stats.average_duration_ms if stats else 0.0
+    
+    def get_percentiles(self, operation_name: str, since: Optional[datetime] = None,
+                        percentiles: Sequence[float] = (50, 95, 99)) -> Dict[str, float]:
+        """
+        Get approximate duration percentiles for an operation.
         
-        total_duration = sum(m.duration_ms for m in metrics)
-        return total_duration / len(metrics)
+        Args:
+            operation_name: Operation to get percentiles for
+            since: Filter to metrics since this time
+            percentiles: Percentiles to compute (0-100)
+            
+        Returns:
+            Dictionary mapping "p50", "p95", ... to durations in milliseconds
+        """
+        stats = self._stats(operation_name, since).get(operation_name)
+        return {
+            f"p{p:g}": stats.sketch.quantile(p / 100.0) if stats else 0.0
+            for p in percentiles
+        }
     
     def get_error_rate(self, operation_name: Optional[str] = None, 
                       since: Optional[datetime] = None) -> float:
@@ -130,13 +366,13 @@ class MetricsTracker:
         Returns:
             Error rate as a percentage (0-100)
         """
-        metrics = self.get_metrics(operation_name, since)
-        
-        if not metrics:
+        stats = self._stats(operation_name, since).values()
+        count = sum(s.count for s in stats)
+        if not count:
             return 0.0
         
-        error_count = sum(1 for m in metrics if not m.success)
-        return (error_count / len(metrics)) * 100.0
+        error_count = sum(s.error_count for s in stats)
+        return (error_count / count) * 100.0
     
     def get_operation_counts(self, since: Optional[datetime] = None) -> Dict[str, int]:
         """
@@ -148,18 +384,15 @@ class MetricsTracker:
         Returns:
             Dictionary of operation counts
         """
-        metrics = self.get_metrics(since=since)
-        
-        counts = {}
-        for metric in metrics:
-            counts[metric.operation_name] = counts.get(metric.operation_name, 0) + 1
-        
-        return counts
+        return {name: stats.count for name, stats in self._stats(since=since).items()}
     
     def clear_metrics(self):
         """Clear all metrics."""
         with self.lock:
             self.metrics.clear()
+            self._recent.clear()
+            self._totals.clear()
+            self._rollups.clear()
 
 
 # Global metrics tracker instance
@@ -175,45 +408,223 @@ def get_metrics_tracker() -> MetricsTracker:
     return _metrics_tracker
 
 
-def track_operation(operation_name: str):
+# Correlation ID of the request or job being processed in the current context
+_correlation_id: ContextVar[Optional[str]] = ContextVar("amr_correlation_id", default=None)
+
+# Operation currently being tracked in the current context
+_current_operation: ContextVar[Optional["_OperationScope"]] = ContextVar("amr_current_operation", default=None)
+
+CORRELATION_ID_HEADER = "X-Request-ID"
+
+
+def get_correlation_id() -> Optional[str]:
+    """
+    Get the correlation ID of the current request or job.
+    
+    Returns:
+        Correlation ID, or None outside a correlated context
+    """
+    return _correlation_id.get()
+
+
+def set_correlation_id(correlation_id: Optional[str] = None) -> str:
+    """
+    Set the correlation ID for the current context.
+    
+    Tasks started from this context inherit the ID.
+    
+    Args:
+        correlation_id: Correlation ID, generated if not provided
+        
+    Returns:
+        The correlation ID that was set
+    """
+    correlation_id = correlation_id or uuid.uuid4().hex
+    _correlation_id.set(correlation_id)
+    return correlation_id
+
+
+@contextmanager
+def correlation_context(correlation_id: Optional[str] = None):
+    """
+    Context manager that sets a correlation ID for the enclosed block.
+    
+    Args:
+        correlation_id: Correlation ID, generated if not provided
+    """
+    token = _correlation_id.set(correlation_id or uuid.uuid4().hex)
+    try:
+        yield _correlation_id.get()
+    finally:
+        _correlation_id.reset(token)
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Logging filter adding a ``correlation_id`` attribute to log records."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = _correlation_id.get() or "-"
+        return True
+
+
+async def correlation_id_middleware(request, call_next):
+    """
+    HTTP middleware that assigns a correlation ID to each request.
+    
+    The ID is taken from the X-Request-ID header when present, otherwise
+    generated, and is echoed back in the response headers.
+    """
+    with correlation_context(request.headers.get(CORRELATION_ID_HEADER)) as correlation_id:
+        response = await call_next(request)
+        response.headers[CORRELATION_ID_HEADER] = correlation_id
+        return response
+
+
+class _OperationScope:
+    """Timing state for one tracked operation invocation."""
+    
+    def __init__(self, operation_name: str, category: Optional[str]):
+        self.operation_name = operation_name
+        self.category = category
+        self.parent = _current_operation.get()
+        self.correlation_id = _correlation_id.get()
+        self.start_time = time.perf_counter()
+        self.cpu_seconds = 0.0
+        self.db_seconds = 0.0
+    
+    def run(self, func, *args, **kwargs):
+        """Run a synchronous step of the operation inside this scope."""
+        token = _current_operation.set(self)
+        cpu_start = time.thread_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.cpu_seconds += time.thread_time() - cpu_start
+            _current_operation.reset(token)
+    
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Record the operation in the metrics tracker and telemetry."""
+        duration = time.perf_counter() - self.start_time
+        if self.category == "db" and self.parent is not None:
+            # Attribute database time to the enclosing operation
+            self.parent.db_seconds += duration
+        elif self.category == "db":
+            self.db_seconds = duration
+        
+        success = error is None
+        get_metrics_tracker().record_operation(
+            operation_name=self.operation_name,
+            duration_ms=duration * 1000.0,
+            success=success,
+            error_message=None if success else str(error) or type(error).__name__,
+            cpu_time_ms=self.cpu_seconds * 1000.0,
+            db_time_ms=self.db_seconds * 1000.0,
+            correlation_id=self.correlation_id
+        )
+        observe_operation(self.operation_name, duration, success, self.category,
+                          cpu_seconds=self.cpu_seconds, db_seconds=self.db_seconds)
+        logger.debug(
+            f"[{self.correlation_id or '-'}] {self.operation_name} "
+            f"{'completed' if success else 'failed'} in {duration * 1000.0:.1f} ms "
+            f"(cpu {self.cpu_seconds * 1000.0:.1f} ms, db {self.db_seconds * 1000.0:.1f} ms)"
+        )
+
+
+class _TrackedAwaitable:
+    """
+    Awaitable that drives a coroutine one step at a time.
+    
+    Each step runs inside the operation scope, so CPU time is measured only
+    while the coroutine is actually executing, not while it is suspended
+    and other tasks run on the event loop.
+    """
+    
+    def __init__(self, coro, scope: _OperationScope):
+        self._coro = coro
+        self._scope = scope
+    
+    def __await__(self):
+        send_value, error = None, None
+        while True:
+            try:
+                if error is not None:
+                    yielded = self._scope.run(self._coro.throw, error)
+                else:
+                    yielded = self._scope.run(self._coro.send, send_value)
+            except StopIteration as stop:
+                return stop.value
+            send_value, error = None, None
+            try:
+                send_value = yield yielded
+            except BaseException as e:
+                error = e
+
+
+def track_operation(operation_name: str, category: Optional[str] = None):
     """
     Decorator to track an operation's performance.
     
+    Works on regular functions, coroutine functions and async generators.
+    Wall time, CPU time and the time spent in nested database operations
+    (those tracked with ``category="db"``) are recorded in the metrics
+    tracker and in the Prometheus telemetry histograms, together with the
+    current correlation ID. For coroutines, CPU time excludes time spent
+    suspended on the event loop.
+    
     Args:
         operation_name: Name of the operation to track
+        category: "db" to record the operation as a database call
     """
     def decorator(func):
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def asyncgen_wrapper(*args, **kwargs):
+                scope = _OperationScope(operation_name, category)
+                agen = scope.run(func, *args, **kwargs)
+                try:
+                    while True:
+                        try:
+                            item = await _TrackedAwaitable(agen.__anext__(), scope)
+                        except StopAsyncIteration:
+                            break
+                        yield item
+                except BaseException as e:
+                    if not isinstance(e, GeneratorExit):
+                        scope.finish(e)
+                        raise
+                    await agen.aclose()
+                    scope.finish()
+                    raise
+                scope.finish()
+            
+            return asyncgen_wrapper
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                scope = _OperationScope(operation_name, category)
+                try:
+                    result = await _TrackedAwaitable(func(*args, **kwargs), scope)
+                except BaseException as e:
+                    # Includes cancellation (client disconnects, timeouts)
+                    scope.finish(e)
+                    raise
+                scope.finish()
+                return result
+            
+            return async_wrapper
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            scope = _OperationScope(operation_name, category)
             try:
-                result = func(*args, **kwargs)
-                end_time = time.time()
-                duration_ms = (end_time - start_time) * 1000.0
-                
-                # Record successful operation
-                get_metrics_tracker().record_operation(
-                    operation_name=operation_name,
-                    duration_ms=duration_ms,
-                    success=True
-                )
-                
-                return result
-                
+                result = scope.run(func, *args, **kwargs)
             except Exception as e:
-                end_time = time.time()
-                duration_ms = (end_time - start_time) * 1000.0
-                
-                # Record failed operation
-                get_metrics_tracker().record_operation(
-                    operation_name=operation_name,
-                    duration_ms=duration_ms,
-                    success=False,
-                    error_message=str(e)
-                )
-                
-                # Re-raise the exception
+                # Record failed operation and re-raise the exception
+                scope.finish(e)
                 raise
+            scope.finish()
+            return result
         
         return wrapper
     
@@ -260,7 +671,8 @@ class MetricsReport:
             report["operation_metrics"][operation] = {
                 "average_duration_ms": tracker.get_average_duration(operation, since),
                 "error_rate": tracker.get_error_rate(operation, since),
-                "count": operation_counts[operation]
+                "count": operation_counts[operation],
+                "percentiles_ms": tracker.get_percentiles(operation, since)
             }
         
         return report
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Pipeline telemetry exported in the Prometheus text format.
+
+This module provides counters, gauges and fixed-bucket histograms for the
+prediction pipeline (stage durations, segment and token throughput, batch
+latency, queue wait, database call latency and cache hits), built on
+prometheus_client. Every metric keeps a fixed amount of state per label
+set, so memory use does not grow with traffic. Label values must come from
+a bounded set (stage, operation and cache names defined in code), never
+from request data.
+"""
+import threading
+from typing import Dict, Optional, Sequence
+
+import prometheus_client
+from prometheus_client import CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
+
+# Default histogram buckets in seconds, from sub-millisecond DB calls to
+# multi-minute pipeline stages
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0
+)
+
+PROMETHEUS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+class _Metric:
+    """
+    A prometheus_client metric taking its label values as keyword arguments.
+    """
+
+    metric_type = "untyped"
+    _client_class = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[CollectorRegistry] = None, **kwargs):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._metric = self._client_class(name, documentation, self.labelnames, registry=registry, **kwargs)
+
+    def _check_labels(self, labels: Dict[str, str]) -> None:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+
+    def _child(self, labels: Dict[str, str]):
+        self._check_labels(labels)
+        return self._metric.labels(**labels) if self.labelnames else self._metric
+
+    def _sample(self, suffix: str, labels: Dict[str, str]) -> float:
+        """Get the value of a sample of the metric, 0 if the label set was never used"""
+        self._check_labels(labels)
+        wanted = {name: str(value) for name, value in labels.items()}
+        for family in self._metric.collect():
+            for sample in family.samples:
+                if sample.name == self.name + suffix and sample.labels == wanted:
+                    return sample.value
+        return 0.0
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    metric_type = "counter"
+    _client_class = prometheus_client.Counter
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """Increment the counter"""
+        self._child(labels).inc(amount)
+
+    def get(self, **labels) -> float:
+        """Get the current counter value"""
+        # prometheus_client strips a _total suffix from counter names and adds it to the sample
+        return self._sample("" if self.name.endswith("_total") else "_total", labels)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    metric_type = "gauge"
+    _client_class = prometheus_client.Gauge
+
+    def set(self, value: float, **labels) -> None:
+        """Set the gauge value"""
+        self._child(labels).set(value)
+
+    def get(self, **labels) -> float:
+        """Get the current gauge value"""
+        return self._sample("", labels)
+
+
+class Histogram(_Metric):
+    """Histogram with fixed cumulative buckets."""
+
+    metric_type = "histogram"
+    _client_class = prometheus_client.Histogram
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[CollectorRegistry] = None, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames, registry=registry, buckets=tuple(sorted(buckets)))
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        """Record an observation"""
+        self._child(labels).observe(value)
+
+    def get_count(self, **labels) -> int:
+        """Get the number of observations"""
+        return int(self._sample("_count", labels))
+
+    def get_sum(self, **labels) -> float:
+        """Get the sum of observations"""
+        return self._sample("_sum", labels)
+
+
+class TelemetryRegistry:
+    """
+    Registry of telemetry metrics.
+
+    Metrics are created on first use and returned on subsequent lookups,
+    so instrumentation points can share them by name. Each registry has
+    its own prometheus_client CollectorRegistry.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.collector_registry = CollectorRegistry()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, registry=self.collector_registry, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.metric_type}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge"""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Get a registered metric by name"""
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text
+        """
+        return generate_latest(self.collector_registry).decode("utf-8")
+
+    def clear(self):
+        """Remove all metrics"""
+        with self._lock:
+            for metric in self._metrics.values():
+                self.collector_registry.unregister(metric._metric)
+            self._metrics.clear()
+
+
+# Global telemetry registry instance
+_registry = TelemetryRegistry()
+
+
+def get_telemetry_registry() -> TelemetryRegistry:
+    """
+    Get the global telemetry registry instance.
+
+    Returns:
+        Global telemetry registry
+    """
+    return _registry
+
+
+def render_prometheus() -> str:
+    """
+    Render the global registry in the Prometheus text exposition format.
+
+    Returns:
+        Metrics text
+    """
+    return _registry.render()
+
+
+# Instrumentation helpers used by the pipeline, API and data access layers
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """
+    Record the duration of a pipeline stage.
+
+    Args:
+        stage: Stage name (e.g. "load_fasta", "predict")
+        seconds: Duration in seconds
+    """
+    _registry.histogram(
+        "amr_pipeline_stage_duration_seconds",
+        "Duration of prediction pipeline stages",
+        ["stage"]
+    ).observe(seconds, stage=stage)
+
+
+def record_batch(segments: int, tokens: int, seconds: float) -> None:
+    """
+    Record a model inference batch.
+
+    Args:
+        segments: Number of segments in the batch
+        tokens: Number of non-padding tokens in the batch
+        seconds: Batch latency (tokenization and forward pass) in seconds
+    """
+    _registry.histogram(
+        "amr_batch_latency_seconds",
+        "Latency of model inference batches including tokenization"
+    ).observe(seconds)
+    _registry.counter(
+        "amr_segments_processed_total",
+        "Sequence segments run through the model"
+    ).inc(segments)
+    _registry.counter(
+        "amr_tokens_processed_total",
+        "Tokens run through the model"
+    ).inc(tokens)
+
+
+def record_throughput(segments: int, tokens: int, seconds: float) -> None:
+    """
+    Record the throughput of the most recent prediction run.
+
+    Args:
+        segments: Number of segments predicted
+        tokens: Number of tokens predicted
+        seconds: Total prediction time in seconds
+    """
+    if seconds <= 0:
+        return
+    _registry.gauge(
+        "amr_segments_per_second",
+        "Segment throughput of the most recent prediction run"
+    ).set(segments / seconds)
+    _registry.gauge(
+        "amr_tokens_per_second",
+        "Token throughput of the most recent prediction run"
+    ).set(tokens / seconds)
+
+
+def observe_queue_wait(seconds: float) -> None:
+    """
+    Record how long a job waited between submission and start.
+
+    Args:
+        seconds: Queue wait in seconds
+    """
+    _registry.histogram(
+        "amr_job_queue_wait_seconds",
+        "Time jobs spend queued before processing starts"
+    ).observe(seconds)
+
+
+def observe_operation(operation: str, seconds: float, success: bool = True,
+                      category: Optional[str] = None, cpu_seconds: Optional[float] = None,
+                      db_seconds: Optional[float] = None) -> None:
+    """
+    Record a tracked operation.
+
+    Args:
+        operation: Operation name
+        seconds: Wall-clock duration in seconds
+        success: Whether the operation succeeded
+        category: "db" to record as a database call, otherwise a generic operation
+        cpu_seconds: CPU time spent executing the operation
+        db_seconds: Time spent in nested database calls (generic operations only)
+    """
+    if category == "db":
+        name, documentation = "amr_db_call_duration_seconds", "Latency of database calls"
+    else:
+        name, documentation = "amr_operation_duration_seconds", "Latency of tracked operations"
+    _registry.histogram(name, documentation, ["operation"]).observe(seconds, operation=operation)
+    if cpu_seconds is not None:
+        _registry.histogram(
+            "amr_operation_cpu_seconds",
+            "CPU time of tracked operations",
+            ["operation"]
+        ).observe(cpu_seconds, operation=operation)
+    if db_seconds is not None and category != "db":
+        _registry.histogram(
+            "amr_operation_db_wait_seconds",
+            "Time tracked operations spend waiting on database calls",
+            ["operation"]
+        ).observe(db_seconds, operation=operation)
+    if not success:
+        _registry.counter(
+            "amr_operation_errors_total",
+            "Tracked operations that raised an error",
+            ["operation"]
+        ).inc(operation=operation)
+
+
+def record_cache_access(cache: str, hit: bool) -> None:
+    """
+    Record a cache lookup.
+
+    The hit rate is ``rate(amr_cache_requests_total{result="hit"}[5m]) /
+    rate(amr_cache_requests_total[5m])``.
+
+    Args:
+        cache: Cache name
+        hit: Whether the lookup was a hit
+    """
+    _registry.counter(
+        "amr_cache_requests_total",
+        "Cache lookups by result",
+        ["cache", "result"]
+    ).inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_db_pool_usage(pool: str, in_use: int, waiting: int, size: int) -> None:
+    """
+    Record the utilisation of a database connection pool.
+
+    Args:
+        pool: Pool name
+        in_use: Connections checked out of the pool
+        waiting: Callers waiting for a connection
+        size: Maximum number of connections
+    """
+    _registry.gauge(
+        "amr_db_pool_connections_in_use",
+        "Connections checked out of the database pool",
+        ["pool"]
+    ).set(in_use, pool=pool)
+    _registry.gauge(
+        "amr_db_pool_waiting",
+        "Callers waiting for a database pool connection",
+        ["pool"]
+    ).set(waiting, pool=pool)
+    _registry.gauge(
+        "amr_db_pool_size",
+        "Maximum connections of the database pool",
+        ["pool"]
+    ).set(size, pool=pool)
+
+
+def observe_db_pool_acquire(pool: str, seconds: float, timed_out: bool = False) -> None:
+    """
+    Record how long a caller waited for a database pool connection.
+
+    Args:
+        pool: Pool name
+        seconds: Wait in seconds
+        timed_out: Whether the wait ended without a connection
+    """
+    _registry.histogram(
+        "amr_db_pool_acquire_seconds",
+        "Time spent waiting for a database pool connection",
+        ["pool"]
+    ).observe(seconds, pool=pool)
+    if timed_out:
+        _registry.counter(
+            "amr_db_pool_timeouts_total",
+            "Database pool acquisitions that timed out",
+            ["pool"]
+        ).inc(pool=pool)
@@ -9,13 +9,89 @@ determining resistance status.
 import os
 import glob
 import re
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple, Optional, Any, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional, Any, Union, Iterator
 from datetime import datetime
 import time
 
 from ..core.utils import logger, timer, ProgressTracker, ensure_directory_exists
 
+REQUIRED_PREDICTION_COLUMNS = ["Sequence_ID", "Resistant", "Susceptible"]
+
+
+def aggregate_prediction_file(file_path: str, resistance_threshold: float = 0.5) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Aggregate a single prediction file by genomic file.
+    
+    This is a module-level function so it can be dispatched to worker processes.
+    All statistics are computed with a single groupby-agg over vectorised columns.
+    
+    Args:
+        file_path: Path to the prediction file
+        resistance_threshold: Threshold for resistance classification
+        
+    Returns:
+        Tuple of (DataFrame indexed by genomic_id, file statistics)
+    """
+    start_time = time.time()
+    
+    df = pd.read_csv(file_path)
+    
+    # Verify required columns exist
+    missing_columns = [col for col in REQUIRED_PREDICTION_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+    
+    # Only first-pass segments tile the sequences evenly; refinement windows
+    # around resistant hits would bias the statistics toward Resistant
+    if 'Refinement_Pass' in df.columns:
+        df = df[df['Refinement_Pass'] == 0]
+    
+    # Extract genomic ID (everything up to the first colon) from sequence ID
+    genomic_id = df['Sequence_ID'].astype(str).str.extract(r'^([^:]+):', expand=False)
+    resistant_hit = df['Resistant'] > resistance_threshold
+    susceptible_hit = df['Susceptible'] > resistance_threshold
+    
+    work = pd.DataFrame({
+        'genomic_id': genomic_id,
+        'Sequence_ID': df['Sequence_ID'],
+        'resistant_hit': resistant_hit,
+        'susceptible_hit': susceptible_hit,
+        'Resistant': df['Resistant'],
+        'Susceptible': df['Susceptible'],
+    })
+    
+    grouped = work.groupby('genomic_id').agg(
+        sequence_count=('Sequence_ID', 'count'),
+        any_resistance=('resistant_hit', 'any'),
+        any_susceptible=('susceptible_hit', 'any'),
+        resistant_fraction=('resistant_hit', 'mean'),
+        avg_resistant=('Resistant', 'mean'),
+        avg_susceptible=('Susceptible', 'mean'),
+    )
+    
+    # Majority voting and average-probability classification
+    majority_vote = np.where(grouped['resistant_fraction'] > 0.5, 'Resistant', 'Susceptible')
+    avg_classification = np.where(grouped['avg_resistant'] > grouped['avg_susceptible'], 'Resistant', 'Susceptible')
+    
+    grouped = grouped.drop(columns=['resistant_fraction'])
+    grouped.insert(3, 'majority_vote', majority_vote)
+    grouped['avg_classification'] = avg_classification
+    grouped['methods_agree'] = majority_vote == avg_classification
+    
+    stats = {
+        "file_path": file_path,
+        "total_sequences": len(df),
+        "resistant_sequences": int(resistant_hit.sum()),
+        "susceptible_sequences": int(susceptible_hit.sum()),
+        "processing_time": time.time() - start_time
+    }
+    
+    return grouped, stats
+
+
 class PredictionAggregator:
     """
     Aggregator for AMR prediction results across multiple models or files.
@@ -42,6 +118,7 @@ class PredictionAggregator:
         self.model_suffix = model_suffix
         self.resistance_threshold = resistance_threshold
         self.progress_tracker = progress_tracker
+        self.file_timings: Dict[str, float] = {}
     
     def extract_genomic_filename(self, sequence_id: str) -> Optional[str]:
         """
@@ -67,14 +144,20 @@ class PredictionAggregator:
             logger.error(f"Error extracting genomic filename from {sequence_id}: {str(e)}")
             return None
     
-    def process_prediction_files(self, input_files: List[str], output_dir: str, model_suffix: str) -> pd.DataFrame:
+    def process_prediction_files(self, input_files: List[str], output_dir: Optional[str] = None,
+                                 model_suffix: Optional[str] = None,
+                                 max_workers: Optional[int] = None) -> pd.DataFrame:
         """
         Process prediction files and aggregate results.
         
+        Files are aggregated in parallel across a process pool and the per-file
+        results are concatenated once at the end.
+        
         Args:
             input_files: List of prediction file paths
             output_dir: Directory to save aggregated results
             model_suffix: Suffix to identify model-specific files
+            max_workers: Number of worker processes (default: one per CPU, 1 to run serially)
             
         Returns:
             DataFrame containing aggregated results
@@ -83,72 +166,29 @@ class PredictionAggregator:
             logger.warning("No prediction files provided")
             return pd.DataFrame()
         
-        # Initialize empty DataFrame to store all results
-        all_results = pd.DataFrame()
+        # Collect per-file results and concatenate once at the end
+        file_results = []
+        self.file_timings = {}
         
-        # Process each prediction file
-        for i, file_path in enumerate(input_files, 1):
-            logger.info(f"Processing file {i}/{len(input_files)}: {os.path.basename(file_path)}")
+        for i, (file_path, grouped, stats) in enumerate(
+                self.iter_prediction_files(input_files, max_workers=max_workers), 1):
+            logger.info(f"Processed file {i}/{len(input_files)}: {os.path.basename(file_path)} "
+                        f"in {stats['processing_time']:.2f}s")
             
-            try:
-                # Read the prediction file
-                df = pd.read_csv(file_path)
-                
-                # Verify required columns exist
-                required_columns = ["Sequence_ID", "Resistant", "Susceptible"]
-                missing_columns = [col for col in required_columns if col not in df.columns]
-                if missing_columns:
-                    raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
-                
-                # Extract genomic ID from sequence ID
-                df['genomic_id'] = df['Sequence_ID'].apply(self.extract_genomic_filename)
-                
-                # Group by genomic ID and calculate statistics
-                grouped = df.groupby('genomic_id').agg({
-                    'Sequence_ID': 'count',
-                    'Resistant': lambda x: (x > self.resistance_threshold).any(),
-                    'Susceptible': lambda x: (x > self.resistance_threshold).any()
-                }).rename(columns={
-                    'Sequence_ID': 'sequence_count',
-                    'Resistant': 'any_resistance',
-                    'Susceptible': 'any_susceptible'
-                })
-                
-                # Calculate majority voting
-                grouped['majority_vote'] = df.groupby('genomic_id').apply(
-                    lambda x: 'Resistant' if (x['Resistant'] > self.resistance_threshold).mean() > 0.5 else 'Susceptible'
-                )
-                
-                # Calculate average probabilities
-                grouped['avg_resistant'] = df.groupby('genomic_id')['Resistant'].mean()
-                grouped['avg_susceptible'] = df.groupby('genomic_id')['Susceptible'].mean()
-                grouped['avg_classification'] = grouped.apply(
-                    lambda x: 'Resistant' if x['avg_resistant'] > x['avg_susceptible'] else 'Susceptible',
-                    axis=1
-                )
-                
-                # Calculate method agreement
-                grouped['methods_agree'] = grouped.apply(
-                    lambda x: x['majority_vote'] == x['avg_classification'],
-                    axis=1
-                )
-                
-                # Add to all results
-                all_results = pd.concat([all_results, grouped])
-                
-                # Log resistance statistics
-                total_sequences = len(df)
-                resistant_sequences = (df['Resistant'] > self.resistance_threshold).sum()
-                susceptible_sequences = (df['Susceptible'] > self.resistance_threshold).sum()
-                
-                logger.info(f"File statistics:")
-                logger.info(f"  Total sequences: {total_sequences}")
+            # Log resistance statistics
+            total_sequences = stats["total_sequences"]
+            resistant_sequences = stats["resistant_sequences"]
+            susceptible_sequences = stats["susceptible_sequences"]
+            
+            logger.info(f"File statistics:")
+            logger.info(f"  Total sequences: {total_sequences}")
+            if total_sequences:
                 logger.info(f"  Resistant sequences: {resistant_sequences} ({resistant_sequences/total_sequences*100:.1f}%)")
                 logger.info(f"  Susceptible sequences: {susceptible_sequences} ({susceptible_sequences/total_sequences*100:.1f}%)")
-                
-            except Exception as e:
-                logger.error(f"Error processing file {file_path}: {str(e)}")
-                continue
+            
+            file_results.append(grouped)
+        
+        all_results = pd.concat(file_results) if file_results else pd.DataFrame()
         
         if all_results.empty:
             logger.warning("No results were generated from the prediction files")
@@ -173,6 +213,68 @@ class PredictionAggregator:
         
         return all_results
     
+    def iter_prediction_files(self, input_files: List[str],
+                              max_workers: Optional[int] = None) -> Iterator[Tuple[str, pd.DataFrame, Dict[str, Any]]]:
+        """
+        Aggregate prediction files and yield partial results in input order.
+        
+        Files are aggregated in parallel, and each result is yielded as soon
+        as it and the results of all earlier files are ready, so the output
+        does not depend on worker timing. Files that fail to load are logged and skipped. Per-file timings are
+        recorded in ``self.file_timings``.
+        
+        Args:
+            input_files: List of prediction file paths
+            max_workers: Number of worker processes (default: one per CPU, 1 to run serially)
+            
+        Yields:
+            Tuples of (file_path, grouped DataFrame indexed by genomic_id, file statistics)
+        """
+        total_files = len(input_files)
+        if max_workers is None:
+            max_workers = min(total_files, os.cpu_count() or 1)
+        max_workers = max(1, min(max_workers, total_files))
+        
+        def _record(index: int, file_path: str, result: Tuple[pd.DataFrame, Dict[str, Any]]):
+            grouped, stats = result
+            self.file_timings[file_path] = stats["processing_time"]
+            if self.progress_tracker:
+                self.progress_tracker.update(
+                    step=int(index / total_files * self.progress_tracker.total_steps),
+                    status=f"Aggregated file {index}/{total_files}",
+                    additional_info={"files_processed": index, "total_files": total_files}
+                )
+            return file_path, grouped, stats
+        
+        if max_workers == 1:
+            logger.debug(f"Aggregating {total_files} prediction files serially")
+            completed = 0
+            for file_path in input_files:
+                try:
+                    result = aggregate_prediction_file(file_path, self.resistance_threshold)
+                except Exception as e:
+                    logger.error(f"Error processing file {file_path}: {str(e)}")
+                    continue
+                completed += 1
+                yield _record(completed, file_path, result)
+            return
+        
+        logger.debug(f"Aggregating {total_files} prediction files with {max_workers} worker processes")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(aggregate_prediction_file, file_path, self.resistance_threshold)
+                for file_path in input_files
+            ]
+            completed = 0
+            for file_path, future in zip(input_files, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing file {file_path}: {str(e)}")
+                    continue
+                completed += 1
+                yield _record(completed, file_path, result)
+    
     def find_prediction_files(self, 
                            input_dir: Optional[str] = None,
                            input_pattern: Optional[str] = None,
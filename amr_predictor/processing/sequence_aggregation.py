@@ -82,6 +82,13 @@ class SequenceAggregator:
                     self.progress_tracker.set_error(error_msg)
                 return pd.DataFrame()
             
+            # Refinement windows only resample the neighbourhood of resistant hits;
+            # counting them would bias the calls toward Resistant, so sequences are
+            # aggregated over the first pass, which tiles every sequence once
+            if 'Refinement_Pass' in df.columns:
+                df = df[df['Refinement_Pass'] == 0].copy()
+                logger.info(f"Aggregating the {len(df)} first-pass segments, ignoring refinement windows")
+            
             # Check if Start and End columns are available in the input file
             # Check if any sequence ID contains patterns we need to clean
             has_segments = any('_segment_' in id for id in df['Sequence_ID'])
@@ -10,13 +10,17 @@ import psycopg2
 import tempfile
 import json
 import uuid
+import time
+import hashlib
+from urllib.parse import urlencode
 # import asyncio  # Commented out temporarily
 from typing import List, Dict, Optional, Any, Union
 from datetime import datetime
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Query, Path, Body, Request, Form
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Query, Path, Body, Request, Form, Response
 from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 # SSE temporarily disabled
 # from sse_starlette.sse import EventSourceResponse
 from pydantic import BaseModel, Field
@@ -31,10 +35,22 @@ except ImportError:
 
 from ..core.utils import logger, ProgressTracker, ensure_directory_exists, get_default_output_path
 from ..core.prediction import PredictionPipeline
+from ..core.models import get_model_health
+from ..core.shared_models import shared_model, memory_report
+from ..core.sequence import get_fasta_info, FastaStreamValidator, FastaValidationError
+from ..core.fasta_index import FastaIndexBuilder
+from ..core.uploads import save_upload, remove_upload, upload_path, UploadInfo, UploadTooLargeError, MAX_UPLOAD_BYTES, COMPRESS_UPLOADS
+from ..core.compression import CompressionError
+from ..core.cost_model import get_cost_model, JobMetrics
 from ..processing.aggregation import PredictionAggregator
 from ..processing.sequence_processing import SequenceProcessor
 from ..processing.visualization import VisualizationGenerator
-from ..core.repository import AMRJobRepository
+from ..core.repository import AMRJobRepository, TERMINAL_STATUSES
+from ..core.async_database import AsyncAMRJobRepository, DatabasePoolTimeout
+from ..core.job_queue import get_job_queue, get_job_queue_backend, ANONYMOUS_OWNER
+from ..config.scheduler_config import get_scheduler_config
+from ..monitoring.telemetry import observe_queue_wait, render_prometheus, PROMETHEUS_CONTENT_TYPE
+from ..monitoring.metrics import CorrelationIdFilter, correlation_id_middleware, set_correlation_id
 
 # Create FastAPI app
 app = FastAPI(
@@ -55,6 +71,16 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         }
     )
 
+# Shed load with 503 when no database connection frees up in time
+@app.exception_handler(DatabasePoolTimeout)
+async def database_pool_timeout_handler(request: Request, exc: DatabasePoolTimeout):
+    logger.warning(f"Database pool exhausted: {str(exc)}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
 # Add CORS middleware if available
 if CORS_AVAILABLE:
     app.add_middleware(
@@ -65,6 +91,10 @@ if CORS_AVAILABLE:
         allow_headers=["*"],
     )
 
+# Assign a correlation ID to every request for logs and metrics
+app.middleware("http")(correlation_id_middleware)
+logger.addFilter(CorrelationIdFilter())
+
 # Define directories for uploads and results
 UPLOAD_DIR = os.path.join(os.getcwd(), "uploads")
 RESULTS_DIR = os.path.join(os.getcwd(), "results")
@@ -73,8 +103,10 @@ RESULTS_DIR = os.path.join(os.getcwd(), "results")
 ensure_directory_exists(UPLOAD_DIR)
 ensure_directory_exists(RESULTS_DIR)
 
-# Initialize AMR job repository for job storage
+# Initialize AMR job repository for job storage; background tasks run in
+# worker threads and use it directly, request handlers use the async pool
 job_repository = AMRJobRepository()
+async_jobs = AsyncAMRJobRepository()
 logger.info("Initialized AMR job repository for job storage")
 
 # Pydantic models for API
@@ -119,15 +151,17 @@ class WebProgressTracker(ProgressTracker):
     Web-specific progress tracker that updates job status.
     """
     
-    def __init__(self, job_id: str, total_steps: int = 100):
+    def __init__(self, job_id: str, total_steps: int = 100, expected_seconds: Optional[float] = None):
         """
         Initialize the web progress tracker.
         
         Args:
             job_id: The job ID to update
             total_steps: Total number of steps in the operation
+            expected_seconds: Expected duration of the job from the cost model
         """
-        super().__init__(total_steps=total_steps, callback=self._update_job_status)
+        super().__init__(total_steps=total_steps, callback=self._update_job_status,
+                         expected_seconds=expected_seconds)
         self.job_id = job_id
     
     def _update_job_status(self, tracker):
@@ -141,9 +175,13 @@ class WebProgressTracker(ProgressTracker):
                 "status": tracker.status
             }
             
-            # Add additional info if provided
-            if hasattr(tracker, 'additional_info') and tracker.additional_info:
-                job_repository.add_job_parameters(self.job_id, tracker.additional_info)
+            # Add additional info and the time left if available
+            additional_info = dict(getattr(tracker, 'additional_info', None) or {})
+            eta_seconds = tracker.eta_seconds
+            if eta_seconds is not None:
+                additional_info["eta_seconds"] = eta_seconds
+            if additional_info:
+                job_repository.add_job_parameters(self.job_id, additional_info)
             
             # Handle error case
             if tracker.error:
@@ -157,7 +195,8 @@ class WebProgressTracker(ProgressTracker):
 # Background task functions
 async def predict_task(job_id: str, fasta_path: str, model_name: str, batch_size: int,
                      segment_length: int, segment_overlap: int, use_cpu: bool,
-                     resistance_threshold: float, enable_sequence_aggregation: bool):
+                     resistance_threshold: float, enable_sequence_aggregation: bool,
+                     queued_at: Optional[float] = None, expected_seconds: Optional[float] = None):
     """
     Background task for running AMR prediction.
     
@@ -171,28 +210,36 @@ async def predict_task(job_id: str, fasta_path: str, model_name: str, batch_size
         use_cpu: Whether to force CPU inference instead of GPU
         resistance_threshold: Threshold for resistance classification (default: 0.5)
         enable_sequence_aggregation: Whether to enable sequence-level aggregation of results
+        queued_at: Submission time in epoch seconds, used to record queue wait
+        expected_seconds: Expected duration from the job cost model, used for the ETA
     """
+    set_correlation_id(job_id)
+    if queued_at is not None:
+        observe_queue_wait(time.time() - queued_at)
+    
     try:
         # Create output file path with CSV extension to match the actual content format
         output_file = os.path.join(RESULTS_DIR, f"amr_predictions_{job_id}.csv")
         
         # Initialize progress tracker
-        progress_tracker = WebProgressTracker(job_id=job_id)
+        progress_tracker = WebProgressTracker(job_id=job_id, expected_seconds=expected_seconds)
         
-        # Initialize pipeline
-        pipeline = PredictionPipeline(
-            model_name=model_name,
-            batch_size=batch_size,
-            segment_length=segment_length,
-            segment_overlap=segment_overlap,
-            device="cpu" if use_cpu else None,
-            progress_tracker=progress_tracker,
-            enable_sequence_aggregation=enable_sequence_aggregation,
-            resistance_threshold=resistance_threshold
-        )
-        
-        # Process the FASTA file
-        results = pipeline.process_fasta_file(fasta_path, output_file)
+        # Use the model shared by all jobs of this worker (and preloaded by
+        # the pre-forking server, if any) instead of loading it per job
+        with shared_model(model_name, device="cpu" if use_cpu else None,
+                          progress_tracker=progress_tracker) as model_manager:
+            pipeline = PredictionPipeline(
+                batch_size=batch_size,
+                segment_length=segment_length,
+                segment_overlap=segment_overlap,
+                progress_tracker=progress_tracker,
+                enable_sequence_aggregation=enable_sequence_aggregation,
+                resistance_threshold=resistance_threshold,
+                model_manager=model_manager
+            )
+            
+            # Process the FASTA file
+            results = pipeline.process_fasta_file(fasta_path, output_file)
         
         # Update job status
         if "error" in results and results["error"]:
@@ -202,6 +249,8 @@ async def predict_task(job_id: str, fasta_path: str, model_name: str, batch_size
                 error=results["error"]
             )
         else:
+            record_job_metrics(job_id, model_name, results)
+            
             # Get the aggregated file path from pipeline results if available
             aggregated_file = None
             if enable_sequence_aggregation:
@@ -252,7 +301,8 @@ async def predict_task(job_id: str, fasta_path: str, model_name: str, batch_size
         )
 
 
-async def aggregate_task(job_id: str, file_paths: List[str], model_suffix: str):
+async def aggregate_task(job_id: str, file_paths: List[str], model_suffix: str,
+                         queued_at: Optional[float] = None):
     """
     Background task for running AMR aggregation.
     
@@ -260,7 +310,12 @@ async def aggregate_task(job_id: str, file_paths: List[str], model_suffix: str):
         job_id: Job ID for tracking
         file_paths: List of prediction files to process
         model_suffix: Suffix to remove from filenames when extracting model names
+        queued_at: Submission time in epoch seconds, used to record queue wait
     """
+    set_correlation_id(job_id)
+    if queued_at is not None:
+        observe_queue_wait(time.time() - queued_at)
+    
     try:
         # Create output file path
         output_file = os.path.join(RESULTS_DIR, f"amr_aggregated_{job_id}.csv")
@@ -275,7 +330,7 @@ async def aggregate_task(job_id: str, file_paths: List[str], model_suffix: str):
         )
         
         # Process the prediction files
-        results = aggregator.process_prediction_files(file_paths, output_file)
+        results = aggregator.process_prediction_files(file_paths, RESULTS_DIR, model_suffix)
         
         # Update job status in the database
         if results.empty:
@@ -285,6 +340,17 @@ async def aggregate_task(job_id: str, file_paths: List[str], model_suffix: str):
                 error="Aggregation failed: no results generated"
             )
         else:
+            results.to_csv(output_file, index=False)
+            
+            # Record per-file timings for the job. Written before the job is
+            # completed, as finished jobs are cached by the API process.
+            job_repository.add_job_parameters(
+                job_id=job_id,
+                parameters={"file_timings": {
+                    os.path.basename(path): round(seconds, 4)
+                    for path, seconds in aggregator.file_timings.items()
+                }}
+            )
             job_repository.update_job_status(
                 job_id=job_id,
                 status="Completed",
@@ -301,7 +367,8 @@ async def aggregate_task(job_id: str, file_paths: List[str], model_suffix: str):
         )
 
 
-async def process_sequence_task(job_id: str, input_file: str, resistance_threshold: float):
+async def process_sequence_task(job_id: str, input_file: str, resistance_threshold: float,
+                                queued_at: Optional[float] = None):
     """
     Background task for running sequence processing.
     
@@ -309,7 +376,12 @@ async def process_sequence_task(job_id: str, input_file: str, resistance_thresho
         job_id: Job ID for tracking
         input_file: Path to the input prediction file
         resistance_threshold: Threshold for resistance classification
+        queued_at: Submission time in epoch seconds, used to record queue wait
     """
+    set_correlation_id(job_id)
+    if queued_at is not None:
+        observe_queue_wait(time.time() - queued_at)
+    
     try:
         # Create output file path
         output_file = os.path.join(RESULTS_DIR, f"amr_sequences_{job_id}.csv")
@@ -350,7 +422,8 @@ async def process_sequence_task(job_id: str, input_file: str, resistance_thresho
         )
 
 
-async def visualize_task(job_id: str, input_file: str, step_size: int):
+async def visualize_task(job_id: str, input_file: str, step_size: int,
+                         queued_at: Optional[float] = None):
     """
     Background task for running visualization.
     
@@ -358,7 +431,12 @@ async def visualize_task(job_id: str, input_file: str, step_size: int):
         job_id: Job ID for tracking
         input_file: Path to the input prediction file
         step_size: Step size in base pairs for WIG format
+        queued_at: Submission time in epoch seconds, used to record queue wait
     """
+    set_correlation_id(job_id)
+    if queued_at is not None:
+        observe_queue_wait(time.time() - queued_at)
+    
     try:
         # Create output file paths
         output_wig = os.path.join(RESULTS_DIR, f"amr_visualization_{job_id}.wig")
@@ -389,6 +467,13 @@ async def visualize_task(job_id: str, input_file: str, step_size: int):
                 error="Visualization failed: no WIG file generated"
             )
         else:
+            # Add additional info about processed file, before the job is
+            # completed and may be cached
+            job_repository.add_job_parameters(
+                job_id=job_id,
+                parameters={"processed_file": processed_file}
+            )
+            
             # Update job status
             job_repository.update_job_status(
                 job_id=job_id,
@@ -396,12 +481,6 @@ async def visualize_task(job_id: str, input_file: str, step_size: int):
                 progress=100.0,
                 result_file=wig_file
             )
-            
-            # Add additional info about processed file
-            job_repository.add_job_parameters(
-                job_id=job_id,
-                parameters={"processed_file": processed_file}
-            )
     
     except Exception as e:
         logger.error(f"Error in visualization task: {str(e)}")
@@ -414,6 +493,203 @@ async def visualize_task(job_id: str, input_file: str, step_size: int):
 
 # API endpoints
 
+# Task functions by the name used in the job queue
+TASK_HANDLERS = {
+    "predict": predict_task,
+    "aggregate": aggregate_task,
+    "sequence": process_sequence_task,
+    "visualize": visualize_task
+}
+
+# How submitted jobs are run: in this process or by queue workers
+JOB_QUEUE_BACKEND = get_job_queue_backend()
+
+
+def request_owner(request: Request) -> str:
+    """
+    Get the user submitting a request, for fair-share scheduling.
+    
+    Authenticated requests are owned by the user ID of their bearer token;
+    anonymous requests by their client address.
+    """
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        from ..auth.user_manager import decode_access_token
+        token_data = decode_access_token(authorization[7:].strip())
+        if token_data:
+            return str(token_data.user_id)
+    if request.client and request.client.host:
+        return f"{ANONYMOUS_OWNER}:{request.client.host}"
+    return ANONYMOUS_OWNER
+
+
+def _input_bytes(kwargs: Dict[str, Any]) -> Optional[int]:
+    """Get the total size of a task's input files on disk, which may be compressed"""
+    paths = list(kwargs.get("file_paths") or [])
+    paths += [kwargs[key] for key in ("fasta_path", "input_file") if kwargs.get(key)]
+    try:
+        return sum(os.path.getsize(path) for path in paths) if paths else None
+    except OSError:
+        return None
+
+
+def estimate_job(fasta_path: str, model_name: str, total_bases: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Estimate the duration of a prediction job from the job cost model.
+    
+    Args:
+        fasta_path: Path to the uploaded FASTA file
+        model_name: Model the job will run with
+        total_bases: Bases in the file if already known, otherwise the file is read
+        
+    Returns:
+        Dictionary with total_bases and expected_seconds, empty if no estimate is available
+    """
+    try:
+        if total_bases is None:
+            total_bases = get_fasta_info(fasta_path).get("total_length", 0)
+        return {
+            "total_bases": total_bases,
+            "expected_seconds": get_cost_model().estimate_seconds(model_name, total_bases)
+        }
+    except Exception as e:
+        logger.warning(f"Could not estimate the duration of {fasta_path}: {str(e)}")
+        return {}
+
+
+def record_job_metrics(job_id: str, model_name: str, results: Dict[str, Any]) -> None:
+    """Record the size and wall time of a finished prediction job for the cost model"""
+    try:
+        get_cost_model().record(JobMetrics(
+            job_id=job_id,
+            model_name=model_name,
+            engine=results.get("engine"),
+            device=str(results.get("device")) if results.get("device") else None,
+            total_bases=results.get("total_bases", 0),
+            segments=results.get("total_segments"),
+            tokens=results.get("tokens"),
+            wall_seconds=results.get("processing_time", 0.0)
+        ))
+    except Exception as e:
+        logger.warning(f"Could not record metrics of job {job_id}: {str(e)}")
+
+
+def dispatch_task(background_tasks: BackgroundTasks, task: str, owner: str = ANONYMOUS_OWNER,
+                  input_bytes: Optional[int] = None, **kwargs) -> None:
+    """
+    Run a job as a background task or add it to the durable job queue.
+    
+    Queued jobs are scheduled fairly across owners; small submissions are
+    queued in the interactive priority class, and shorter expected jobs
+    (the expected_seconds task argument) are claimed first.
+    
+    Args:
+        background_tasks: FastAPI background tasks
+        task: Name of the task in TASK_HANDLERS
+        owner: User submitting the job
+        input_bytes: Uncompressed size of the job's input (default: the size of its files on disk)
+        **kwargs: Task arguments, including job_id
+    """
+    if JOB_QUEUE_BACKEND == "postgres":
+        if input_bytes is None:
+            input_bytes = _input_bytes(kwargs)
+        priority_class = get_scheduler_config().classify(input_bytes)
+        get_job_queue().enqueue(kwargs["job_id"], task, kwargs, owner=owner, priority_class=priority_class,
+                                expected_seconds=kwargs.get("expected_seconds"))
+    else:
+        background_tasks.add_task(TASK_HANDLERS[task], **kwargs)
+
+
+def with_queue_info(job: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Add the queue position and ETA of a queued job to its additional_info"""
+    if not job or JOB_QUEUE_BACKEND != "postgres" or job.get("status") != "Submitted":
+        return job
+    try:
+        queue_info = get_job_queue().queue_position(job.get("job_id") or job.get("id"))
+    except Exception as e:
+        logger.warning(f"Could not get the queue position of job {job.get('job_id')}: {str(e)}")
+        return job
+    if queue_info:
+        job["additional_info"] = {**(job.get("additional_info") or {}), **queue_info}
+    return job
+
+
+def record_queue_failure(job_id: str, error: str) -> None:
+    """Mark a job as failed after its queue attempts ran out"""
+    job_repository.update_job_status(job_id, status="Error", error=f"Job failed after retries: {error}")
+
+
+async def receive_upload(file: UploadFile, job_id: str, validate_fasta: bool = False) -> UploadInfo:
+    """
+    Stream an uploaded file to the upload directory.
+    
+    gzip, bgzip and zstd uploads are accepted; FASTA uploads are stored
+    BGZF-compressed unless AMR_COMPRESS_UPLOADS is off, and indexed for
+    random access.
+    
+    Args:
+        file: Uploaded file
+        job_id: Job the file belongs to
+        validate_fasta: Whether to reject data that is not nucleotide FASTA
+        
+    Returns:
+        Saved upload with its size and SHA-256
+        
+    Raises:
+        HTTPException: 413 if the file exceeds the upload limit, 422 if it is not valid
+            FASTA or its compressed data is corrupt
+    """
+    path = upload_path(UPLOAD_DIR, job_id, file.filename)
+    try:
+        return await save_upload(file, path, max_bytes=MAX_UPLOAD_BYTES,
+                                 validator=FastaStreamValidator() if validate_fasta else None,
+                                 compress=validate_fasta and COMPRESS_UPLOADS,
+                                 indexer=FastaIndexBuilder() if validate_fasta else None)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (FastaValidationError, CompressionError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid file {file.filename}: {str(e)}")
+
+
+async def find_duplicate_job(upload: UploadInfo, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Find a completed job whose results can be reused for an upload.
+    
+    Args:
+        upload: Saved upload
+        parameters: additional_info values that change the results of the job
+        
+    Returns:
+        Completed job on identical input whose result file still exists, or None
+    """
+    job = await async_jobs.find_completed_job(upload.sha256, parameters)
+    if not job or not job.get("result_file") or not os.path.exists(job["result_file"]):
+        return None
+    return job
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Pipeline telemetry in the Prometheus text exposition format.
+    
+    Returns:
+        Metrics text for scraping
+    """
+    return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def queue_health() -> Dict[str, Any]:
+    """Get the job queue backend and, for the durable queue, its backlog"""
+    health = {"backend": JOB_QUEUE_BACKEND}
+    if JOB_QUEUE_BACKEND == "postgres":
+        try:
+            health.update(get_job_queue().stats())
+        except Exception as e:
+            health["error"] = str(e)
+    return health
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -426,10 +702,18 @@ async def health_check():
         "status": "ok",
         "timestamp": datetime.now().isoformat(),
         "environment": os.getenv('ENVIRONMENT', 'dev'),
-        "database": "PostgreSQL"
+        "database": "PostgreSQL",
+        "model": get_model_health(),
+        "memory": memory_report(),
+        "job_queue": await run_in_threadpool(queue_health),
+        "database_pool": async_jobs.pool.stats()
     }
+
+
 @app.post("/predict", response_model=JobResponse)
 async def predict(
+    request: Request,
+    response: Response,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     model_name: str = Form("alakob/DraGNOME-50m-v1"),
@@ -438,7 +722,8 @@ async def predict(
     segment_overlap: int = Form(0),
     use_cpu: bool = Form(False),
     resistance_threshold: float = Form(0.5),
-    enable_sequence_aggregation: bool = Form(True)
+    enable_sequence_aggregation: bool = Form(True),
+    reuse_results: bool = Form(True)
 ):
     # Create a params object
     params = PredictionRequest(
@@ -454,10 +739,18 @@ async def predict(
     """
     Predict antimicrobial resistance from a FASTA file.
     
+    The upload is streamed to disk and validated as it arrives. If the
+    same user already ran the same file with the same parameters and its
+    results are still available, that job is returned instead of starting
+    a new one (unless reuse_results is false), with an X-Duplicate-Of header.
+    
     Args:
+        request: Incoming request, identifying the submitting user
+        response: Response to set the X-Duplicate-Of header on
         background_tasks: FastAPI background tasks
         file: FASTA file upload
         params: Prediction parameters
+        reuse_results: Whether to return an earlier job on identical input
         
     Returns:
         Job response with ID and status
@@ -465,16 +758,34 @@ async def predict(
     # Generate job ID
     job_id = str(uuid.uuid4())
     
-    # Save uploaded file
-    file_path = os.path.join(UPLOAD_DIR, f"{job_id}_{file.filename}")
+    # Stream the uploaded file to disk, rejecting bad FASTA early
+    upload = await receive_upload(file, job_id, validate_fasta=True)
+    file_path = upload.path
     
-    with open(file_path, "wb") as f:
-        contents = await file.read()
-        f.write(contents)
+    # Reuse the results of an identical earlier job
+    owner = request_owner(request)
+    if reuse_results:
+        duplicate = await find_duplicate_job(upload, {
+            "owner": owner,
+            "model_name": params.model_name,
+            "segment_length": params.segment_length,
+            "segment_overlap": params.segment_overlap,
+            "resistance_threshold": params.resistance_threshold,
+            "enable_sequence_aggregation": params.enable_sequence_aggregation
+        })
+        if duplicate:
+            remove_upload(file_path)
+            logger.info(f"Upload {file.filename} matches completed job {duplicate['job_id']}, reusing its results")
+            response.headers["X-Duplicate-Of"] = duplicate["job_id"]
+            return duplicate
     
     # Initialize job in database
     additional_info = {
+        "owner": owner,
         "input_file": file.filename,
+        "input_sha256": upload.sha256,
+        "input_bytes": upload.uncompressed_size,
+        "sequence_count": upload.sequence_count,
         "model_name": params.model_name,
         "batch_size": params.batch_size,
         "segment_length": params.segment_length,
@@ -484,16 +795,25 @@ async def predict(
         "enable_sequence_aggregation": params.enable_sequence_aggregation
     }
     
+    # Expected duration from the throughput of earlier jobs with this model
+    estimate = await run_in_threadpool(estimate_job, file_path, params.model_name, upload.total_length)
+    if estimate:
+        additional_info.update(estimate, eta_seconds=estimate["expected_seconds"])
+    
     # Create the job in the repository
-    job_repository.create_job(
+    await async_jobs.create_job(
         job_id=job_id,
         initial_status="Submitted",
         additional_info=additional_info
     )
     
     # Add task to background tasks
-    background_tasks.add_task(
-        predict_task,
+    await run_in_threadpool(
+        dispatch_task,
+        background_tasks,
+        "predict",
+        owner=owner,
+        input_bytes=upload.uncompressed_size,
         job_id=job_id,
         fasta_path=file_path,
         model_name=params.model_name,
@@ -502,16 +822,19 @@ async def predict(
         segment_overlap=params.segment_overlap,
         use_cpu=params.use_cpu,
         resistance_threshold=params.resistance_threshold,
-        enable_sequence_aggregation=params.enable_sequence_aggregation
+        enable_sequence_aggregation=params.enable_sequence_aggregation,
+        queued_at=time.time(),
+        expected_seconds=estimate.get("expected_seconds")
     )
     
     # Retrieve the job data to return to client
-    job = job_repository.get_job(job_id)
-    return job
+    job = await async_jobs.get_job(job_id)
+    return await run_in_threadpool(with_queue_info, job)
 
 
 @app.post("/aggregate", response_model=JobResponse)
 async def aggregate(
+    request: Request,
     background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
     model_suffix: str = Form("_all_107_sequences_prediction"),
@@ -521,6 +844,7 @@ async def aggregate(
     Aggregate AMR prediction results from multiple files.
     
     Args:
+        request: Incoming request, identifying the submitting user
         background_tasks: FastAPI background tasks
         files: List of prediction files to process
         params: Aggregation parameters
@@ -534,45 +858,57 @@ async def aggregate(
     # Save uploaded files
     file_paths = []
     file_names = []
+    input_bytes = 0
     
-    for file in files:
-        file_path = os.path.join(UPLOAD_DIR, f"{job_id}_{file.filename}")
-        file_paths.append(file_path)
-        file_names.append(file.filename)
-        
-        with open(file_path, "wb") as f:
-            contents = await file.read()
-            f.write(contents)
+    try:
+        for file in files:
+            upload = await receive_upload(file, job_id)
+            file_paths.append(upload.path)
+            file_names.append(file.filename)
+            input_bytes += upload.uncompressed_size
+    except HTTPException:
+        # Do not keep the files saved before the rejected one
+        for path in file_paths:
+            os.remove(path)
+        raise
     
     # Initialize job in database
+    owner = request_owner(request)
     additional_info = {
+        "owner": owner,
         "input_files": file_names,
         "model_suffix": model_suffix,
         "file_pattern": file_pattern
     }
     
     # Create the job in the repository
-    job_repository.create_job(
+    await async_jobs.create_job(
         job_id=job_id,
         initial_status="Submitted",
         additional_info=additional_info
     )
     
     # Add task to background tasks
-    background_tasks.add_task(
-        aggregate_task,
+    await run_in_threadpool(
+        dispatch_task,
+        background_tasks,
+        "aggregate",
+        owner=owner,
+        input_bytes=input_bytes,
         job_id=job_id,
         file_paths=file_paths,
-        model_suffix=model_suffix
+        model_suffix=model_suffix,
+        queued_at=time.time()
     )
     
     # Retrieve the job data to return to client
-    job = job_repository.get_job(job_id)
-    return job
+    job = await async_jobs.get_job(job_id)
+    return await run_in_threadpool(with_queue_info, job)
 
 
 @app.post("/sequence", response_model=JobResponse)
 async def process_sequence(
+    request: Request,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     resistance_threshold: float = Form(0.5)
@@ -581,6 +917,7 @@ async def process_sequence(
     Process prediction results at the sequence level.
     
     Args:
+        request: Incoming request, identifying the submitting user
         background_tasks: FastAPI background tasks
         file: Prediction file to process
         params: Sequence processing parameters
@@ -591,41 +928,47 @@ async def process_sequence(
     # Generate job ID
     job_id = str(uuid.uuid4())
     
-    # Save uploaded file
-    file_path = os.path.join(UPLOAD_DIR, f"{job_id}_{file.filename}")
-    
-    with open(file_path, "wb") as f:
-        contents = await file.read()
-        f.write(contents)
+    # Stream the uploaded file to disk
+    upload = await receive_upload(file, job_id)
+    file_path = upload.path
     
     # Initialize job in database
+    owner = request_owner(request)
     additional_info = {
+        "owner": owner,
         "input_file": file.filename,
+        "input_sha256": upload.sha256,
         "resistance_threshold": resistance_threshold
     }
     
     # Create the job in the repository
-    job_repository.create_job(
+    await async_jobs.create_job(
         job_id=job_id,
         initial_status="Submitted",
         additional_info=additional_info
     )
     
     # Add task to background tasks
-    background_tasks.add_task(
-        process_sequence_task,
+    await run_in_threadpool(
+        dispatch_task,
+        background_tasks,
+        "sequence",
+        owner=owner,
+        input_bytes=upload.uncompressed_size,
         job_id=job_id,
         input_file=file_path,
-        resistance_threshold=resistance_threshold
+        resistance_threshold=resistance_threshold,
+        queued_at=time.time()
     )
     
     # Retrieve the job data to return to client
-    job = job_repository.get_job(job_id)
-    return job
+    job = await async_jobs.get_job(job_id)
+    return await run_in_threadpool(with_queue_info, job)
 
 
 @app.post("/visualize", response_model=JobResponse)
 async def visualize(
+    request: Request,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     step_size: int = Form(1200)
@@ -634,6 +977,7 @@ async def visualize(
     Convert prediction results to visualization formats.
     
     Args:
+        request: Incoming request, identifying the submitting user
         background_tasks: FastAPI background tasks
         file: Prediction file to process
         params: Visualization parameters
@@ -644,37 +988,42 @@ async def visualize(
     # Generate job ID
     job_id = str(uuid.uuid4())
     
-    # Save uploaded file
-    file_path = os.path.join(UPLOAD_DIR, f"{job_id}_{file.filename}")
-    
-    with open(file_path, "wb") as f:
-        contents = await file.read()
-        f.write(contents)
+    # Stream the uploaded file to disk
+    upload = await receive_upload(file, job_id)
+    file_path = upload.path
     
     # Initialize job in database
+    owner = request_owner(request)
     additional_info = {
+        "owner": owner,
         "input_file": file.filename,
+        "input_sha256": upload.sha256,
         "step_size": step_size
     }
     
     # Create the job in the repository
-    job_repository.create_job(
+    await async_jobs.create_job(
         job_id=job_id,
         initial_status="Submitted",
         additional_info=additional_info
     )
     
     # Add task to background tasks
-    background_tasks.add_task(
-        visualize_task,
+    await run_in_threadpool(
+        dispatch_task,
+        background_tasks,
+        "visualize",
+        owner=owner,
+        input_bytes=upload.uncompressed_size,
         job_id=job_id,
         input_file=file_path,
-        step_size=step_size
+        step_size=step_size,
+        queued_at=time.time()
     )
     
     # Retrieve the job data to return to client
-    job = job_repository.get_job(job_id)
-    return job
+    job = await async_jobs.get_job(job_id)
+    return await run_in_threadpool(with_queue_info, job)
 
 
 # SSE endpoint temporarily disabled
@@ -742,21 +1091,58 @@ async def visualize(
 #     
 #     return EventSourceResponse(event_generator())
 
+def job_etag(job: Dict[str, Any]) -> str:
+    """Get a strong ETag for the JSON representation of a job"""
+    body = json.dumps(job, sort_keys=True, default=str)
+    return '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """
+    Check the If-None-Match header of a request against a job's ETag.
+    
+    Conditional requests are answered by ETag only: a job can change
+    without a new end time (e.g. when it is archived), so its times cannot
+    back If-Modified-Since.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
 @app.get("/jobs/{job_id}", response_model=JobResponse)
-async def get_job_status(job_id: str = Path(..., description="Job ID to check")):
+async def get_job_status(
+    request: Request,
+    response: Response,
+    job_id: str = Path(..., description="Job ID to check")
+):
     """
     Get the status of a job.
     
+    Responses carry an ETag; a matching If-None-Match returns 304 Not
+    Modified without a body.
+    
     Args:
+        request: Request with optional conditional headers
+        response: Response to set the caching headers on
         job_id: Job ID to check
         
     Returns:
         Job response with current status
     """
     try:
-        job = job_repository.get_job(job_id)
+        job = await async_jobs.get_job(job_id)
         if not job:
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        job = await run_in_threadpool(with_queue_info, job)
+        
+        etag = job_etag(job)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
         return job
     except psycopg2.ProgrammingError as e:
         # Handle "connection already closed" error
@@ -767,18 +1153,57 @@ async def get_job_status(job_id: str = Path(..., description="Job ID to check"))
             # Create a fresh connection for this request
             from ..core.database_manager import AMRDatabaseManager
             fresh_db_manager = AMRDatabaseManager()
-            job = fresh_db_manager.get_job(job_id)
+            job = await run_in_threadpool(fresh_db_manager.get_job, job_id)
             if not job:
                 raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
             return job
         except Exception as inner_e:
             logger.error(f"Error with fresh connection: {str(inner_e)}")
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    except (HTTPException, DatabasePoolTimeout):
+        raise
     except Exception as e:
         logger.error(f"Unexpected error retrieving job {job_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving job: {str(e)}")
 
 
+@app.post("/jobs/{job_id}/archive", response_model=JobResponse)
+async def archive_job(job_id: str = Path(..., description="Job ID to archive")):
+    """
+    Archive a finished job.
+    
+    Args:
+        job_id: Job ID to archive
+        
+    Returns:
+        Archived job
+    """
+    job = await async_jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job.get("status") not in TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is still {job.get('status')}")
+    if not await async_jobs.archive_job(job_id):
+        raise HTTPException(status_code=500, detail=f"Could not archive job {job_id}")
+    return await async_jobs.get_job(job_id)
+
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(job_id: str = Path(..., description="Job ID to delete")):
+    """
+    Delete a job.
+    
+    Args:
+        job_id: Job ID to delete
+        
+    Returns:
+        Deleted job ID
+    """
+    if not await async_jobs.delete_job(job_id):
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return {"job_id": job_id, "deleted": True}
+
+
 @app.get("/jobs/{job_id}/download")
 async def download_result(
     job_id: str = Path(..., description="Job ID to download results for"),
@@ -797,7 +1222,7 @@ async def download_result(
     import zipfile
     import shutil
     
-    job = job_repository.get_job(job_id)
+    job = await async_jobs.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
@@ -853,19 +1278,52 @@ async def download_result(
 
 @app.get("/jobs")
 async def list_jobs(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter jobs by status"),
-    limit: int = Query(100, description="Maximum number of jobs to return"),
-    offset: int = Query(0, description="Pagination offset")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of jobs to return"),
+    offset: int = Query(0, ge=0, description="Pagination offset (deprecated, use cursor)"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page, from the X-Next-Cursor header"),
+    user: Optional[str] = Query(None, description="Filter jobs by the submitting user"),
+    since: Optional[datetime] = Query(None, description="Only jobs started at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only jobs started before this time")
 ):
     """
-    List all jobs with optional filtering and pagination.
+    List jobs, newest first, with optional filtering and cursor pagination.
+    
+    The body is the list of jobs on the page. The X-Next-Cursor header holds
+    the cursor of the next page (absent on the last page, also given as a
+    Link header with rel="next") and, on the first page, X-Total-Count an
+    approximate number of matching jobs from table statistics.
     
     Args:
+        response: Response whose pagination headers are set
         status: Filter jobs by status (optional)
         limit: Maximum number of jobs to return
-        offset: Pagination offset
+        offset: Pagination offset; only used without a cursor
+        cursor: Cursor of the page to return (default: first page)
+        user: Filter jobs by the submitting user (optional)
+        since: Only jobs started at or after this time (optional)
+        until: Only jobs started before this time (optional)
         
     Returns:
-        List of all jobs matching the criteria
+        List of jobs on the page
     """
-    return job_repository.get_jobs(status=status, limit=limit, offset=offset)
+    if offset and not cursor:
+        # Deep offsets scan and discard every earlier row; kept for old clients
+        return await async_jobs.get_jobs(status=status, limit=limit, offset=offset)
+    
+    try:
+        page = await async_jobs.get_jobs_page(limit=limit, cursor=cursor, status=status, owner=user,
+                                              since=since, until=until, include_total=cursor is None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+        query = {"limit": limit, "cursor": page["next_cursor"], "status": status, "user": user,
+                 "since": since.isoformat() if since else None, "until": until.isoformat() if until else None}
+        next_query = urlencode({key: value for key, value in query.items() if value is not None})
+        response.headers["Link"] = f'</jobs?{next_query}>; rel="next"'
+    if page["approximate_total"] is not None:
+        response.headers["X-Total-Count"] = str(page["approximate_total"])
+    return page["jobs"]
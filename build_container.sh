@@ -48,8 +48,10 @@ BEGIN
         RAISE EXCEPTION 'amr_jobs table not found';
     END IF;
     
-    IF NOT EXISTS (SELECT FROM pg_tables WHERE tablename = 'amr_job_parameters') THEN
-        RAISE EXCEPTION 'amr_job_parameters table not found';
+    -- Job parameters are stored in amr_jobs.additional_info
+    IF NOT EXISTS (SELECT FROM information_schema.columns
+                   WHERE table_name = 'amr_jobs' AND column_name = 'additional_info') THEN
+        RAISE EXCEPTION 'amr_jobs.additional_info column not found';
     END IF;
     
     IF NOT EXISTS (SELECT FROM pg_tables WHERE tablename = 'amr_antibiotic') THEN
@@ -33,17 +33,15 @@ CREATE TABLE IF NOT EXISTS amr_jobs (
     bakta_error TEXT
 );
 
--- Create amr_job_parameters table
-CREATE TABLE IF NOT EXISTS amr_job_parameters (
-    id SERIAL PRIMARY KEY,
-    job_id VARCHAR(255) REFERENCES amr_jobs(id) ON DELETE CASCADE,
-    param_name VARCHAR(255) NOT NULL,
-    param_value TEXT,
-    UNIQUE(job_id, param_name)
-);
+-- Job parameters are stored in amr_jobs.additional_info; databases created
+-- before this still have an amr_job_parameters table, which the API
+-- migrates into additional_info on startup
 
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_job_status ON amr_jobs(status);
-CREATE INDEX IF NOT EXISTS idx_job_parameters ON amr_job_parameters(job_id);
+CREATE INDEX IF NOT EXISTS idx_job_start_time_id ON amr_jobs(start_time DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_job_status_start_time_id ON amr_jobs(status, start_time DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_job_owner_start_time_id ON amr_jobs((additional_info ->> 'owner'), start_time DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_job_input_sha256 ON amr_jobs((additional_info ->> 'input_sha256')) WHERE status = 'Completed';
 CREATE INDEX IF NOT EXISTS idx_bakta_job_id ON amr_jobs(bakta_job_id);
 CREATE INDEX IF NOT EXISTS idx_bakta_status ON amr_jobs(bakta_status);
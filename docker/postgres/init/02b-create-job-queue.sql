@@ -0,0 +1,50 @@
+-- Durable job queue for AMR Predictor workers
+-- Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED; a claimed job
+-- holds a lease renewed by worker heartbeats and is reclaimed when it expires.
+-- The API creates the same table on first use (amr_predictor/core/job_queue.py).
+
+CREATE TABLE IF NOT EXISTS amr_job_queue (
+    id BIGSERIAL PRIMARY KEY,
+    job_id VARCHAR(255) NOT NULL,
+    task VARCHAR(50) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    enqueued_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    claimed_by VARCHAR(255),
+    claimed_at TIMESTAMPTZ,
+    lease_expires_at TIMESTAMPTZ,
+    heartbeat_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    last_error TEXT,
+    -- Fair-share scheduling: submitting user and priority class
+    owner VARCHAR(255) NOT NULL DEFAULT 'anonymous',
+    priority_class VARCHAR(20) NOT NULL DEFAULT 'batch',
+    -- Shortest expected job first, from the job cost model
+    expected_seconds DOUBLE PRECISION
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_queue_claim ON amr_job_queue (priority DESC, id) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_job_queue_lease ON amr_job_queue (lease_expires_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_job_queue_job_id ON amr_job_queue (job_id);
+CREATE INDEX IF NOT EXISTS idx_job_queue_owner_claimed ON amr_job_queue (owner, claimed_at);
+
+-- Size and wall time of finished jobs, fitted per model by the job cost model
+-- (amr_predictor/core/cost_model.py)
+CREATE TABLE IF NOT EXISTS amr_job_metrics (
+    id BIGSERIAL PRIMARY KEY,
+    job_id VARCHAR(255) NOT NULL,
+    model_name VARCHAR(255) NOT NULL,
+    engine VARCHAR(20),
+    device VARCHAR(20),
+    total_bases BIGINT NOT NULL,
+    segments INTEGER,
+    tokens BIGINT,
+    wall_seconds DOUBLE PRECISION NOT NULL,
+    recorded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_metrics_model ON amr_job_metrics (model_name, recorded_at DESC);
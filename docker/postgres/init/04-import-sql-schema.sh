@@ -13,6 +13,10 @@ for db in "${databases[@]}"; do
     echo "Importing AMR schema..."
     psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$db" -f /docker-entrypoint-initdb.d/02-init-amr-schema.sql
     
+    # Import the job queue schema
+    echo "Importing job queue schema..."
+    psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$db" -f /docker-entrypoint-initdb.d/02b-create-job-queue.sql
+    
     # Import Bakta schema (continue on error since it might already exist)
     echo "Importing Bakta schema..."
     psql --username "$POSTGRES_USER" --dbname "$db" -f /docker-entrypoint-initdb.d/02a-create-bakta-schema.sql || true
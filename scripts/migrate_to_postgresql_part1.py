@@ -232,20 +232,10 @@ def create_postgresql_schema(env='dev'):
         )
         """)
         
-        # Create amr_job_parameters table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS amr_job_parameters (
-            id SERIAL PRIMARY KEY,
-            job_id VARCHAR(255) REFERENCES amr_jobs(id) ON DELETE CASCADE,
-            param_name VARCHAR(255) NOT NULL,
-            param_value TEXT,
-            UNIQUE(job_id, param_name)
-        )
-        """)
+        # Job parameters are stored in amr_jobs.additional_info (see part 2)
         
         # Create indexes for better performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_status ON amr_jobs(status)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_parameters ON amr_job_parameters(job_id)")
         
         # Commit changes
         conn.commit()
@@ -105,7 +105,6 @@ def migrate_amr_jobs(sqlite_conn, pg_conn, batch_size=100):
     logger.info(f"Found {total_jobs} jobs to migrate")
     
     # Clear existing data if any (optional, comment out if you want to preserve data)
-    pg_cursor.execute("DELETE FROM amr_job_parameters")
     pg_cursor.execute("DELETE FROM amr_jobs")
     logger.info("Cleared existing data in PostgreSQL tables")
     
@@ -191,72 +190,56 @@ def migrate_amr_jobs(sqlite_conn, pg_conn, batch_size=100):
     logger.info(f"Successfully migrated all {migrated_count} jobs")
     return True
 
+def load_sqlite_parameters(sqlite_conn):
+    """Read the SQLite amr_job_parameters rows, grouped by job"""
+    sqlite_cursor = sqlite_conn.cursor()
+    sqlite_cursor.execute("SELECT job_id, param_name, param_value FROM amr_job_parameters ORDER BY job_id")
+    
+    parameters = {}
+    for job_id, param_name, param_value in sqlite_cursor:
+        # Convert SQLite NULL to Python None
+        if param_value == "NULL" or param_value == "":
+            param_value = None
+        # Values were stored as text; decode the ones that were stored as JSON
+        try:
+            value = json.loads(param_value) if param_value is not None else None
+        except (TypeError, ValueError):
+            value = param_value
+        parameters.setdefault(job_id, {})[param_name] = value
+    return parameters
+
 def migrate_job_parameters(sqlite_conn, pg_conn, batch_size=100):
-    """Migrate data from amr_job_parameters table"""
+    """Migrate data from the SQLite amr_job_parameters table into amr_jobs.additional_info"""
     logger.info("Migrating job parameters data...")
     
-    # Get SQLite cursor
-    sqlite_cursor = sqlite_conn.cursor()
-    
     # Get PostgreSQL cursor
     pg_cursor = pg_conn.cursor()
     
-    # Count total parameters to migrate
-    sqlite_cursor.execute("SELECT COUNT(*) FROM amr_job_parameters")
-    total_params = sqlite_cursor.fetchone()[0]
-    logger.info(f"Found {total_params} job parameters to migrate")
-    
-    # Fetch all parameters from SQLite
-    sqlite_cursor.execute("SELECT job_id, param_name, param_value FROM amr_job_parameters")
+    # PostgreSQL stores job parameters in the additional_info JSONB column
+    parameters = load_sqlite_parameters(sqlite_conn)
+    logger.info(f"Found parameters of {len(parameters)} jobs to migrate")
     
     # Process in batches
-    batch_count = 0
     migrated_count = 0
-    batch_data = []
-    
-    for row in sqlite_cursor:
-        job_id, param_name, param_value = row
-        
-        # Convert SQLite NULL to Python None
-        if param_value == "NULL" or param_value == "":
-            param_value = None
-        
-        # Prepare parameters
-        params = (job_id, param_name, param_value)
-        batch_data.append(params)
-        
-        # Execute in batches
-        if len(batch_data) >= batch_size:
-            try:
-                pg_cursor.executemany(
-                    "INSERT INTO amr_job_parameters (job_id, param_name, param_value) VALUES (%s, %s, %s)",
-                    batch_data
-                )
-                pg_conn.commit()
-                migrated_count += len(batch_data)
-                logger.info(f"Migrated {migrated_count}/{total_params} parameters")
-                batch_data = []
-            except Exception as e:
-                pg_conn.rollback()
-                logger.error(f"Error migrating parameter batch: {str(e)}")
-                return False
+    batch_data = [(json.dumps(params, default=str), job_id) for job_id, params in parameters.items()]
     
-    # Insert any remaining parameters
-    if batch_data:
+    for start in range(0, len(batch_data), batch_size):
+        batch = batch_data[start:start + batch_size]
         try:
             pg_cursor.executemany(
-                "INSERT INTO amr_job_parameters (job_id, param_name, param_value) VALUES (%s, %s, %s)",
-                batch_data
+                "UPDATE amr_jobs SET additional_info = COALESCE(additional_info, '{}'::jsonb) || %s::jsonb "
+                "WHERE id = %s",
+                batch
             )
             pg_conn.commit()
-            migrated_count += len(batch_data)
-            logger.info(f"Migrated {migrated_count}/{total_params} parameters")
+            migrated_count += len(batch)
+            logger.info(f"Migrated parameters of {migrated_count}/{len(batch_data)} jobs")
         except Exception as e:
             pg_conn.rollback()
-            logger.error(f"Error migrating final parameter batch: {str(e)}")
+            logger.error(f"Error migrating parameter batch: {str(e)}")
             return False
     
-    logger.info(f"Successfully migrated all {migrated_count} job parameters")
+    logger.info(f"Successfully migrated the parameters of all {migrated_count} jobs")
     return True
 
 def validate_migration(sqlite_conn, pg_conn):
@@ -278,16 +261,15 @@ def validate_migration(sqlite_conn, pg_conn):
         logger.error(f"Job count mismatch: SQLite ({sqlite_job_count}) vs PostgreSQL ({pg_job_count})")
         return False
     
-    # Validate parameter count
-    sqlite_cursor.execute("SELECT COUNT(*) FROM amr_job_parameters")
-    sqlite_param_count = sqlite_cursor.fetchone()[0]
-    
-    pg_cursor.execute("SELECT COUNT(*) FROM amr_job_parameters")
-    pg_param_count = pg_cursor.fetchone()[0]
-    
-    if sqlite_param_count != pg_param_count:
-        logger.error(f"Parameter count mismatch: SQLite ({sqlite_param_count}) vs PostgreSQL ({pg_param_count})")
-        return False
+    # Validate that every parameter is in additional_info
+    for job_id, params in load_sqlite_parameters(sqlite_conn).items():
+        pg_cursor.execute("SELECT additional_info FROM amr_jobs WHERE id = %s", (job_id,))
+        row = pg_cursor.fetchone()
+        additional_info = (row[0] if row else None) or {}
+        missing = set(params) - set(additional_info)
+        if missing:
+            logger.error(f"Parameters {sorted(missing)} of job {job_id} missing from additional_info in PostgreSQL")
+            return False
     
     # Validate specific job IDs (sample a few)
     sqlite_cursor.execute("SELECT id FROM amr_jobs LIMIT 5")
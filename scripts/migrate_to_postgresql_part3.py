@@ -7,6 +7,12 @@ This script:
 2. Implements proper connection pooling for improved performance and reliability
 3. Ensures consistent database connections for background tasks
 
+Legacy only: this rewrites database_manager.py with the original SQLite to
+PostgreSQL port, which stores job parameters in an amr_job_parameters
+table. The current database manager stores them in amr_jobs.additional_info
+and migrates any amr_job_parameters rows there on startup, so do not run
+this script against the current code.
+
 Prerequisites:
 - Parts 1 and 2 of the migration have been completed
 - PostgreSQL database is set up and data has been migrated
@@ -666,6 +672,8 @@ def update_api_imports():
 
 def main():
     logger.info("Starting PostgreSQL migration - Part 3 (Database Manager Update)")
+    logger.warning("This legacy script replaces the current database manager, which stores job "
+                   "parameters in amr_jobs.additional_info, with one using amr_job_parameters")
     
     # Step 1: Update requirements.txt with PostgreSQL dependencies
     logger.info("Step 1: Adding PostgreSQL dependencies to requirements.txt")
@@ -1094,6 +1094,46 @@ class AMRApiClient:
                 
             return mock_jobs
 
+    def get_jobs_page(self, status: Optional[str] = None, limit: int = 20,
+                      cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get one page of AMR prediction jobs, newest first.
+        
+        Args:
+            status: Optional status filter (e.g., "Completed", "Running", "Failed")
+            limit: Maximum number of jobs on the page
+            cursor: Cursor of the page, from the previous page's next_cursor
+            
+        Returns:
+            Dictionary with the page's jobs, next_cursor (None on the last page)
+            and approximate_total (None if unknown)
+        """
+        import streamlit as st
+        
+        if not st.session_state.get("using_real_amr_api", False):
+            jobs = self.get_jobs(status=status)
+            return {"jobs": jobs, "next_cursor": None, "approximate_total": len(jobs)}
+        
+        params = {"limit": limit}
+        if status:
+            params["status"] = status
+        if cursor:
+            params["cursor"] = cursor
+        
+        try:
+            response = requests.get(f"{self.base_url}/jobs", headers=self.headers, params=params, timeout=30)
+            response.raise_for_status()
+            jobs = response.json()
+            total = response.headers.get("X-Total-Count")
+            return {
+                "jobs": jobs if isinstance(jobs, list) else [],
+                "next_cursor": response.headers.get("X-Next-Cursor"),
+                "approximate_total": int(total) if total else None
+            }
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Error fetching jobs page from API: {str(e)}")
+            return {"jobs": [], "next_cursor": None, "approximate_total": None}
+    
     def _normalize_status(self, status: str) -> str:
         """
         Normalize job status to a consistent format.
@@ -47,16 +47,11 @@ def init_pagination_state():
     if "rows_per_page" not in st.session_state:
         st.session_state.rows_per_page = 10
 
-def collect_completed_job_files(db_manager=None) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
-    """
-    Collect job data, prediction files, and aggregated result files from the AMR API.
-    
-    Returns:
-        Tuple containing:
-        - List of job data dictionaries
-        - List of prediction file paths
-        - List of aggregated file paths
-    """
+# Completed jobs fetched per page of the history view
+HISTORY_PAGE_SIZE = 20
+
+def get_amr_api_client():
+    """Create an AMR API client for the configured API URL"""
     # Import the API client from the local directory
     try:
         from api_client import AMRApiClient
@@ -89,15 +84,73 @@ def collect_completed_job_files(db_manager=None) -> Tuple[List[Dict[str, Any]],
         # Use a default base URL as fallback
         api_client = AMRApiClient(base_url="http://amr_api:8000")
         logger.info("Using fallback URL for AMR API client: http://amr_api:8000")
+    return api_client
+
+def init_history_state():
+    """Initialize the incrementally loaded job history if it doesn't exist"""
+    if "history_jobs" not in st.session_state:
+        st.session_state.history_jobs = []
+        st.session_state.history_cursor = None
+        st.session_state.history_total = None
+        st.session_state.history_exhausted = False
+
+def reset_history_state():
+    """Forget the loaded job history so it is fetched again from the first page"""
+    for key in ("history_jobs", "history_cursor", "history_total", "history_exhausted"):
+        st.session_state.pop(key, None)
+
+def load_more_completed_jobs(api_client=None, page_size: int = HISTORY_PAGE_SIZE) -> int:
+    """
+    Fetch the next page of completed jobs into the session's job history.
+    
+    Args:
+        api_client: AMR API client (default: one for the configured API URL)
+        page_size: Number of jobs to fetch
+    
+    Returns:
+        Number of jobs fetched
+    """
+    init_history_state()
+    if st.session_state.history_exhausted:
+        return 0
+    
+    api_client = api_client or get_amr_api_client()
+    page = api_client.get_jobs_page(status="Completed", limit=page_size,
+                                    cursor=st.session_state.history_cursor)
+    
+    # Jobs are keyed by ID in case a page was fetched twice
+    known = {job.get("id") or job.get("job_id") for job in st.session_state.history_jobs}
+    new_jobs = [job for job in page["jobs"] if (job.get("id") or job.get("job_id")) not in known]
+    st.session_state.history_jobs.extend(new_jobs)
+    st.session_state.history_cursor = page["next_cursor"]
+    st.session_state.history_exhausted = page["next_cursor"] is None
+    if page["approximate_total"] is not None:
+        st.session_state.history_total = page["approximate_total"]
+    logger.info(f"Loaded {len(new_jobs)} more completed jobs ({len(st.session_state.history_jobs)} in total)")
+    return len(new_jobs)
+
+def collect_completed_job_files(db_manager=None) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+    """
+    Collect job data, prediction files, and aggregated result files from the AMR API.
     
+    Jobs are loaded incrementally: the first call fetches the newest page of
+    completed jobs, and load_more_completed_jobs() appends older pages.
+    
+    Returns:
+        Tuple containing:
+        - List of job data dictionaries
+        - List of prediction file paths
+        - List of aggregated file paths
+    """
     # Initialize lists to store data and file paths
     job_data_list = []
     prediction_files = []
     aggregated_files = []
     
     try:
-        # Get all jobs with Completed status
-        all_jobs = api_client.get_jobs(status="Completed")
+        init_history_state()
+        if not st.session_state.history_jobs and not st.session_state.history_exhausted:
+            load_more_completed_jobs()
         
         # Also fetch completed Bakta jobs if possible
         try:
@@ -108,12 +161,8 @@ def collect_completed_job_files(db_manager=None) -> Tuple[List[Dict[str, Any]],
         except Exception as e:
             logger.warning(f"Error fetching Bakta jobs: {str(e)}")
         
-        if not isinstance(all_jobs, list):
-            logger.error(f"Unexpected response format from API: {type(all_jobs)}")
-            return [], [], []
-        
         # Process each job to collect its files
-        for job in all_jobs:
+        for job in st.session_state.history_jobs:
             job_id = job.get("id") or job.get("job_id")
             
             if not job_id:
@@ -130,14 +179,12 @@ def collect_completed_job_files(db_manager=None) -> Tuple[List[Dict[str, Any]],
                 # use the Docker container paths directly without checking if they exist
                 # Both containers (API and Streamlit) share the same Docker volume mounted at /app/results/
                 prediction_files.append(result_file_path)
-                logger.info(f"Added prediction file path: {result_file_path}")
             
             # Check for aggregated file paths
             aggregated_file_path = job.get("aggregated_result_file")
             if aggregated_file_path:
                 # Same approach for aggregated files - use Docker paths directly
                 aggregated_files.append(aggregated_file_path)
-                logger.info(f"Added aggregated file path: {aggregated_file_path}")
         
         logger.info(f"Collected {len(job_data_list)} jobs, {len(prediction_files)} prediction files, and {len(aggregated_files)} aggregated files")
         
@@ -230,8 +277,23 @@ def display_consolidated_history(db_manager=None) -> None:
         st.info("No completed AMR prediction jobs found.")
         return
     
-    # Display a summary of available jobs
-    st.write(f"Found {len(job_data_list)} completed AMR prediction jobs")
+    # Display a summary of the loaded jobs; older jobs are loaded on request
+    total = st.session_state.get("history_total")
+    if st.session_state.get("history_exhausted"):
+        st.write(f"Found {len(job_data_list)} completed AMR prediction jobs")
+    else:
+        total_text = f" of about {max(total, len(job_data_list))}" if total is not None else ""
+        st.write(f"Showing the {len(job_data_list)} most recent{total_text} completed AMR prediction jobs")
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if not st.session_state.get("history_exhausted") and st.button("Load older jobs", key="history_load_more"):
+            load_more_completed_jobs()
+            st.rerun()
+    with col2:
+        if st.button("Refresh history", key="history_refresh"):
+            reset_history_state()
+            st.rerun()
     
     # Load and consolidate prediction data
     all_predictions = pd.DataFrame()
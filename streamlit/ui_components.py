@@ -595,7 +595,7 @@ def create_sequence_input_tab() -> None:
     with input_tab2:
         uploaded_file = st.file_uploader(
             "Upload FASTA or text file",
-            type=["fasta", "fa", "txt"],
+            type=["fasta", "fa", "txt", "gz", "bgz", "zst"],
             help="Upload a file containing your DNA sequence"
         )
         
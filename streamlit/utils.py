@@ -88,7 +88,7 @@ def get_sequence_statistics(sequence: str) -> Dict[str, Any]:
 
 def parse_fasta_file(file_data: bytes) -> Tuple[str, List[str]]:
     """
-    Parse a FASTA format file.
+    Parse a FASTA format file, plain or gzip/bgzip/zstd-compressed.
     
     Args:
         file_data: Raw bytes from uploaded file
@@ -98,7 +98,8 @@ def parse_fasta_file(file_data: bytes) -> Tuple[str, List[str]]:
         - The complete sequence as a string
         - List of sequence headers
     """
-    content = file_data.decode('utf-8')
+    from amr_predictor.core.compression import decompress_bytes
+    content = decompress_bytes(file_data).decode('utf-8')
     lines = content.strip().split('\n')
     
     headers = []
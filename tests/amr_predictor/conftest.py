@@ -1,12 +1,14 @@
 """Test fixtures for AMR database integration tests."""
 
 import os
+import sys
 import tempfile
 import pytest
 import sqlite3
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, Any, Callable, Optional
+from unittest.mock import MagicMock
 
 from amr_predictor.bakta.database import DatabaseManager
 from amr_predictor.bakta.database_extensions import extend_database_manager
@@ -257,3 +259,59 @@ def admin_auth_headers(user_manager, admin_user):
     """Create authentication headers for admin API requests."""
     token = user_manager.create_access_token(data={"sub": admin_user.username})
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def tiny_lora_model(tmp_path):
+    """Create a tiny local BERT base model with a LoRA adapter; returns the adapter directory."""
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    peft = pytest.importorskip("peft")
+
+    base_dir = tmp_path / "tiny-base"
+    adapter_dir = tmp_path / "tiny-adapter"
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "A", "C", "G", "T", "N"]
+    base_dir.mkdir()
+    (base_dir / "vocab.txt").write_text("\n".join(vocab) + "\n")
+
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=len(vocab), hidden_size=16, num_hidden_layers=1, num_attention_heads=2,
+        intermediate_size=32, max_position_embeddings=64, num_labels=2
+    )
+    transformers.BertForSequenceClassification(config).save_pretrained(str(base_dir))
+    transformers.BertTokenizer(str(base_dir / "vocab.txt")).save_pretrained(str(base_dir))
+
+    base_model = transformers.BertForSequenceClassification.from_pretrained(str(base_dir))
+    lora_config = peft.LoraConfig(task_type="SEQ_CLS", r=2, lora_alpha=4, target_modules=["query", "value"])
+    model = peft.get_peft_model(base_model, lora_config)
+    with torch.no_grad():
+        # LoRA B starts at zero; give the adapter a real effect
+        for name, param in model.named_parameters():
+            if "lora_B" in name:
+                param.normal_(std=0.5)
+    model.peft_config["default"].base_model_name_or_path = str(base_dir)
+    model.save_pretrained(str(adapter_dir))
+    return str(adapter_dir)
+
+
+@pytest.fixture
+def mock_pg_manager(monkeypatch):
+    """AMRDatabaseManager on a mock connection pool."""
+    modules = ("amr_predictor.core.database_manager", "amr_predictor.core.repository",
+               "amr_predictor.core.async_database")
+    imported = {name for name in modules if name in sys.modules}
+    pool = MagicMock()
+    monkeypatch.setattr("psycopg2.pool.ThreadedConnectionPool", lambda *args, **kwargs: pool)
+    from amr_predictor.core.database_manager import AMRDatabaseManager
+    monkeypatch.setattr(AMRDatabaseManager, "_pool", pool)
+
+    cursor = MagicMock()
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    pool.getconn.return_value = conn
+    yield AMRDatabaseManager(), conn, cursor
+
+    # Do not leave a manager on the mock pool to other tests
+    for name in set(modules) - imported:
+        sys.modules.pop(name, None)
@@ -0,0 +1,85 @@
+"""Tests for coarse-to-fine adaptive segmentation."""
+
+import csv
+
+import pytest
+
+pytest.importorskip("torch")
+
+from amr_predictor.benchmarks import StubModelManager, write_fasta
+from amr_predictor.core.prediction import PredictionPipeline
+from amr_predictor.core.sequence import tile_region, merge_regions
+
+
+class GeneManager(StubModelManager):
+    """Stub manager predicting resistance for segments containing a G."""
+
+    def __init__(self):
+        super().__init__()
+        self.predicted = []
+
+    def predict(self, sequences, max_length=1000, batch_size=8):
+        self.predicted.extend(sequences)
+        return [{"Resistant": 0.9 if "G" in seq else 0.1, "Susceptible": 0.1 if "G" in seq else 0.9}
+                for seq in sequences]
+
+
+def test_tile_region_and_merge_regions():
+    """Test tiling a region with overlapping windows and merging regions."""
+    assert tile_region(0, 100, 40, 20) == [(0, 40), (20, 60), (40, 80), (60, 100)]
+    assert tile_region(10, 95, 40, 20) == [(10, 50), (30, 70), (50, 90), (55, 95)]
+    assert tile_region(0, 30, 40, 20) == [(0, 30)]
+    assert merge_regions([(50, 80), (0, 20), (10, 30), (80, 90)]) == [(0, 30), (50, 90)]
+
+
+def test_refinement_around_hits(tmp_path):
+    """Test that only the neighbourhood of a resistant segment is re-predicted."""
+    gene_start, gene_end = 5100, 5200
+    contig = "A" * gene_start + "G" * (gene_end - gene_start) + "A" * (8000 - gene_end)
+    fasta_file = str(tmp_path / "genome.fasta")
+    write_fasta([("contig1", contig), ("contig2", "A" * 3000)], fasta_file)
+
+    manager = GeneManager()
+    pipeline = PredictionPipeline(segment_length=2000, segment_overlap=500, model_manager=manager,
+                                  refinement_passes=2, enable_sequence_aggregation=True)
+    output_file = str(tmp_path / "predictions.csv")
+    results = pipeline.process_fasta_file(fasta_file, output_file)
+
+    assert not results.get("error")
+    assert results["refinement"]["windows"] == [1000, 500]
+    # First pass without overlap: 4 + 2 segments
+    assert results["refinement"]["segments_per_pass"][0] == 6
+    assert len(manager.predicted) == sum(results["refinement"]["segments_per_pass"])
+
+    with open(output_file) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(manager.predicted)
+    assert [row["Sequence_ID"].split("_")[0] for row in rows] == sorted(row["Sequence_ID"].split("_")[0] for row in rows)
+
+    refined = [row for row in rows if row["Refinement_Pass"] != "0"]
+    assert refined and all(row["Sequence_ID"].startswith("contig1_segment_") for row in refined)
+    # Refined windows stay near the hit and the finest resistant window is 500 bp
+    assert all(3000 <= int(row["Start"]) - 1 and int(row["End"]) <= 7000 for row in refined)
+    finest_hits = [row for row in rows if row["Refinement_Pass"] == "2" and float(row["Resistant"]) > 0.5]
+    assert finest_hits and all(int(row["End"]) - int(row["Start"]) + 1 == 500 for row in finest_hits)
+    assert results["aggregated_output_file"]
+
+
+def test_sequence_aggregation_ignores_refinement_windows(tmp_path):
+    """Test that sequence-level calls do not depend on how the hits were refined."""
+    contig = "A" * 30000 + "G" * 100 + "A" * 29900
+    fasta_file = str(tmp_path / "genome.fasta")
+    write_fasta([("contig1", contig)], fasta_file)
+
+    aggregated = []
+    for refinement_passes in (0, 2):
+        pipeline = PredictionPipeline(segment_length=6000, model_manager=GeneManager(),
+                                      refinement_passes=refinement_passes, enable_sequence_aggregation=True)
+        results = pipeline.process_fasta_file(fasta_file, str(tmp_path / f"predictions_{refinement_passes}.csv"))
+        with open(results["aggregated_output_file"]) as f:
+            aggregated.append(list(csv.DictReader(f)))
+
+    unrefined, refined = aggregated
+    assert len(refined) == 1 and refined[0]["segment_count"] == "10"
+    for field in ("segment_count", "majority_vote_count", "any_resistance_count", "avg_resistance_prob"):
+        assert refined[0][field] == unrefined[0][field]
@@ -0,0 +1,98 @@
+"""Tests for the async connection pool of the AMR job tables."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def test_pool_waits_for_a_free_connection_and_times_out(mock_pg_manager):
+    """Test that callers queue for a connection and give up after the acquire timeout."""
+    from amr_predictor.core.async_database import AsyncConnectionPool, DatabasePoolTimeout
+
+    pg_pool = MagicMock()
+    pool = AsyncConnectionPool(size=1, acquire_timeout=0.05, connection_factory=lambda: pg_pool)
+    release = threading.Event()
+
+    def slow_query():
+        conn = pool.getconn()
+        release.wait(5)
+        pool.putconn(conn)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(pool.run(slow_query))
+        await asyncio.sleep(0.01)
+        assert pool.stats()["in_use"] == 1
+        with pytest.raises(DatabasePoolTimeout):
+            await pool.run(slow_query)
+        release.set()
+        assert await first == "done"
+        return await pool.run(lambda: threading.current_thread().name)
+
+    thread_name = asyncio.run(main())
+    assert thread_name.startswith("amr-db-async")
+    stats = pool.stats()
+    assert (stats["in_use"], stats["waiting"], stats["acquired"], stats["timeouts"]) == (0, 0, 2, 1)
+    assert pg_pool.getconn.call_count == pg_pool.putconn.call_count == 1
+    pool.close()
+    pg_pool.closeall.assert_called_once()
+
+
+def test_async_repository_queries_on_its_own_pool(mock_pg_manager):
+    """Test that the async repository runs the job queries on the async pool's connections."""
+    from amr_predictor.core.async_database import AsyncConnectionPool, AsyncAMRJobRepository
+    from amr_predictor.core.repository import TerminalJobCache
+
+    manager, shared_conn, shared_cursor = mock_pg_manager
+    cursor = MagicMock()
+    cursor.fetchone.return_value = {"id": "job-1", "status": "Running", "additional_info": {}}
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    pg_pool = MagicMock()
+    pg_pool.getconn.return_value = conn
+
+    jobs = AsyncAMRJobRepository(AsyncConnectionPool(size=2, connection_factory=lambda: pg_pool))
+    jobs.repository.job_cache = TerminalJobCache()
+    job = asyncio.run(jobs.get_job("job-1"))
+
+    assert job["job_id"] == "job-1"
+    cursor.execute.assert_called_once()
+    pg_pool.putconn.assert_called_once_with(conn)
+    shared_cursor.execute.assert_not_called()
+    assert jobs.pool.stats()["in_use"] == 0
+    jobs.close()
+
+
+def test_pool_queries_run_in_the_callers_context(mock_pg_manager):
+    """Test that pooled queries keep the correlation ID and count as DB time of the calling operation."""
+    from amr_predictor.core.async_database import AsyncConnectionPool
+    from amr_predictor.monitoring.metrics import (
+        track_operation, get_correlation_id, correlation_context, get_metrics_tracker
+    )
+
+    pool = AsyncConnectionPool(size=1, connection_factory=MagicMock)
+    seen = {}
+
+    @track_operation("test_pool_db_call", category="db")
+    def db_call():
+        seen["correlation_id"] = get_correlation_id()
+        time.sleep(0.02)
+
+    @track_operation("test_pool_endpoint")
+    async def endpoint():
+        await pool.run(db_call)
+
+    async def main():
+        with correlation_context("request-1"):
+            await endpoint()
+
+    asyncio.run(main())
+    pool.close()
+
+    assert seen["correlation_id"] == "request-1"
+    metric = [m for m in get_metrics_tracker().metrics if m.operation_name == "test_pool_endpoint"][-1]
+    assert metric.correlation_id == "request-1"
+    assert metric.db_time_ms >= 20.0
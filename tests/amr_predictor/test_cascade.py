@@ -0,0 +1,76 @@
+"""Tests for the two-stage screening cascade."""
+
+import csv
+
+import pytest
+
+pytest.importorskip("torch")
+
+from amr_predictor.benchmarks import StubModelManager, write_fasta
+from amr_predictor.core.prediction import PredictionPipeline
+
+
+class FixedManager(StubModelManager):
+    """Stub manager predicting a fixed Resistant probability per sequence."""
+
+    def __init__(self, name, probabilities):
+        super().__init__()
+        self.model_name = name
+        self.probabilities = probabilities
+        self.predicted = []
+
+    def predict(self, sequences, max_length=1000, batch_size=8):
+        self.predicted.extend(sequences)
+        return [{"Resistant": self.probabilities[seq], "Susceptible": 1 - self.probabilities[seq]}
+                for seq in sequences]
+
+
+@pytest.fixture
+def genome(tmp_path):
+    """FASTA file with one confidently susceptible, one uncertain and one resistant contig."""
+    records = [("sus", "A" * 50), ("unsure", "C" * 50), ("res", "G" * 50)]
+    fasta_file = str(tmp_path / "genome.fasta")
+    write_fasta(records, fasta_file)
+    return fasta_file
+
+
+def test_cascade_escalates_uncertain_segments(tmp_path, genome):
+    """Test that only segments in the uncertainty band reach the main model."""
+    screening = FixedManager("small", {"A" * 50: 0.01, "C" * 50: 0.5, "G" * 50: 0.99})
+    main = FixedManager("large", {"C" * 50: 0.8})
+    pipeline = PredictionPipeline(segment_length=0, model_manager=main, screening_model_manager=screening,
+                                  uncertainty_band=(0.1, 0.9), enable_sequence_aggregation=False)
+
+    output_file = str(tmp_path / "predictions.csv")
+    results = pipeline.process_fasta_file(genome, output_file)
+
+    assert not results.get("error")
+    assert main.predicted == ["C" * 50]
+    assert results["cascade"]["escalated_segments"] == 1
+    assert results["cascade"]["screened_segments"] == 3
+
+    with open(output_file) as f:
+        rows = {row["Sequence_ID"]: row for row in csv.DictReader(f)}
+    assert rows["unsure"]["Model"] == "large"
+    assert float(rows["unsure"]["Resistant"]) == pytest.approx(0.8)
+    assert rows["sus"]["Model"] == rows["res"]["Model"] == "small"
+
+
+def test_cascade_skips_main_model_when_screening_is_confident(tmp_path, genome):
+    """Test that the main model is not loaded when no segment is uncertain."""
+    screening = FixedManager("small", {"A" * 50: 0.01, "C" * 50: 0.02, "G" * 50: 0.99})
+    main = FixedManager("large", {})
+    pipeline = PredictionPipeline(segment_length=0, model_manager=main, screening_model_manager=screening,
+                                  enable_sequence_aggregation=False)
+
+    results = pipeline.process_fasta_file(genome, str(tmp_path / "predictions.csv"))
+
+    assert not results.get("error")
+    assert main.model is None
+    assert results["cascade"]["escalated_segments"] == 0
+
+
+def test_invalid_uncertainty_band():
+    """Test that an inverted uncertainty band is rejected."""
+    with pytest.raises(ValueError):
+        PredictionPipeline(model_manager=StubModelManager(), uncertainty_band=(0.9, 0.1))
@@ -0,0 +1,122 @@
+"""Tests for reading and storing compressed FASTA files."""
+
+import asyncio
+import gzip
+import hashlib
+import io
+
+import pytest
+
+from amr_predictor.core.compression import (
+    BgzfWriter, CompressionError, StreamDecompressor, decompress_bytes, detect_compression,
+    open_maybe_compressed, strip_compression_suffix, BGZF_BLOCK_SIZE, ZSTD_AVAILABLE
+)
+from amr_predictor.core.sequence import load_fasta, get_fasta_info, FastaStreamValidator
+from amr_predictor.core.uploads import save_upload, UploadTooLargeError
+from amr_predictor.core.utils import get_default_output_path
+
+FASTA = b">contig1 sample\n" + b"ACGTTGCA" * 20000 + b"\n>contig2\nGGGCCCAAAT\n"
+
+
+class ChunkedUpload:
+    """Upload returning its data in small reads."""
+
+    def __init__(self, data: bytes):
+        self.stream = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.stream.read(size)
+
+
+def bgzip(data: bytes) -> bytes:
+    buffer = io.BytesIO()
+    writer = BgzfWriter(buffer)
+    writer.write(data)
+    writer.close()
+    return buffer.getvalue()
+
+
+def test_bgzf_output_is_readable_gzip():
+    """Test that BGZF blocks are detected and readable by any gzip reader."""
+    compressed = bgzip(FASTA)
+    assert detect_compression(compressed[:16]) == "bgzip"
+    assert detect_compression(gzip.compress(FASTA)[:16]) == "gzip"
+    assert detect_compression(FASTA[:16]) is None
+    assert gzip.decompress(compressed) == FASTA
+    assert len(FASTA) // BGZF_BLOCK_SIZE + 1 < compressed.count(b"\x1f\x8b\x08\x04") <= len(FASTA) // BGZF_BLOCK_SIZE + 2
+
+    assert decompress_bytes(compressed) == FASTA
+    with pytest.raises(CompressionError):
+        decompress_bytes(gzip.compress(FASTA)[:-20])
+
+
+@pytest.mark.parametrize("compress", [lambda data: data, gzip.compress, bgzip])
+def test_readers_decompress_transparently(tmp_path, compress):
+    """Test that FASTA readers give the same results for plain and compressed files."""
+    path = tmp_path / "genome.fa.gz"
+    path.write_bytes(compress(FASTA))
+
+    sequences = load_fasta(str(path))
+    assert [seq_id for seq_id, _ in sequences] == ["contig1", "contig2"]
+    assert len(sequences[0][1]) == 160000
+    info = get_fasta_info(str(path))
+    assert (info["sequence_count"], info["total_length"]) == (2, 160010)
+    with open_maybe_compressed(path, "rb") as handle:
+        assert handle.read() == FASTA
+
+
+def test_compressed_upload_is_validated_and_stored_as_bgzf(tmp_path):
+    """Test that compressed uploads are checked on their content and stored as BGZF."""
+    info = asyncio.run(save_upload(ChunkedUpload(gzip.compress(FASTA)), str(tmp_path / "job_genome.fa.gz"),
+                                   validator=FastaStreamValidator(), chunk_size=1000, compress=True))
+
+    assert info.path == str(tmp_path / "job_genome.fa.gz")
+    assert info.compression == "gzip"
+    assert info.sha256 == hashlib.sha256(FASTA).hexdigest()
+    assert (info.sequence_count, info.total_length) == (2, 160010)
+    stored = open(info.path, "rb").read()
+    assert detect_compression(stored[:16]) == "bgzip" and gzip.decompress(stored) == FASTA
+    assert info.stored_size < len(FASTA) // 10
+    assert info.uncompressed_size == len(FASTA) and info.size == len(gzip.compress(FASTA))
+
+    # Plain uploads are compressed on the way to disk
+    info = asyncio.run(save_upload(ChunkedUpload(FASTA), str(tmp_path / "job_plain.fasta"), compress=True))
+    assert info.path.endswith("job_plain.fasta.gz") and info.sha256 == hashlib.sha256(FASTA).hexdigest()
+
+    with pytest.raises(CompressionError):
+        asyncio.run(save_upload(ChunkedUpload(gzip.compress(FASTA)[:-20]), str(tmp_path / "cut.fa.gz")))
+    assert not (tmp_path / "cut.fa.gz").exists()
+
+
+@pytest.mark.parametrize("compression", ["gzip", pytest.param("zstd", marks=pytest.mark.skipif(
+    not ZSTD_AVAILABLE, reason="requires zstandard"))])
+def test_decompression_is_bounded(tmp_path, compression):
+    """Test that highly compressed data expands in bounded pieces and is capped as it does."""
+    data = b"\0" * (64 * 1024 * 1024)
+    if compression == "gzip":
+        compressed = gzip.compress(data) + gzip.compress(FASTA)
+    else:
+        import zstandard
+        compressed = zstandard.ZstdCompressor().compress(data) + zstandard.ZstdCompressor().compress(FASTA)
+    assert len(compressed) < 1024 * 1024
+
+    decompressor = StreamDecompressor(compression, piece_size=4096)
+    pieces = []
+    decompressor.decompress_to(compressed, lambda piece: pieces.append(len(piece)))
+    decompressor.flush()
+    assert max(pieces) <= 4096 and sum(pieces) == len(data) + len(FASTA)
+
+    with pytest.raises(CompressionError, match="Truncated"):
+        decompressor = StreamDecompressor(compression)
+        decompressor.decompress_to(compressed[:-20], lambda piece: None)
+        decompressor.flush()
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(save_upload(ChunkedUpload(compressed), str(tmp_path / "bomb.fa.gz"), max_bytes=1024 * 1024))
+    assert not (tmp_path / "bomb.fa.gz").exists()
+
+
+def test_output_names_drop_compression_suffix():
+    """Test that output names are derived from the uncompressed file name."""
+    assert strip_compression_suffix("genome.fna.zst") == "genome.fna"
+    assert get_default_output_path("amr", "tsv", "/uploads/job_genome.fa.gz").startswith("job_genome_amr_")
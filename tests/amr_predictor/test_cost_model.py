@@ -0,0 +1,88 @@
+"""Tests for the job cost model and ETA estimates."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from amr_predictor.core.cost_model import (
+    JobCostModel, JobMetrics, DEFAULT_THROUGHPUT, fit_throughput, estimate_remaining_seconds
+)
+from amr_predictor.core.job_queue import CLAIM_QUERY
+from amr_predictor.core.utils import ProgressTracker
+
+
+def test_fit_throughput():
+    """Test fitting overhead and time per base from finished jobs."""
+    model = fit_throughput([(1_000_000, 30.0), (2_000_000, 50.0), (4_000_000, 90.0)])
+    assert model.overhead_seconds == pytest.approx(10.0)
+    assert model.bases_per_second == pytest.approx(50_000)
+    assert model.predict(3_000_000) == pytest.approx(70.0)
+
+    # A negative intercept falls back to a rate through the origin
+    model = fit_throughput([(1_000_000, 5.0), (2_000_000, 20.0)])
+    assert model.overhead_seconds == 0.0
+    assert model.predict(3_000_000) == pytest.approx(25.0)
+
+    assert fit_throughput([(2_000, 4.0)]).predict(1_000) == pytest.approx(2.0)
+    assert fit_throughput([]) is None
+
+
+def test_estimate_remaining_seconds():
+    """Test the ETA of a running job."""
+    assert estimate_remaining_seconds(None, 5.0) is None
+    assert estimate_remaining_seconds(100.0, 30.0) == 70.0
+    assert estimate_remaining_seconds(100.0, 130.0) == 0.0
+    # Prediction running slower than expected: the observed rate wins
+    assert estimate_remaining_seconds(100.0, 50.0, processed=10, total=40, stage_elapsed=40.0) == 120.0
+    assert estimate_remaining_seconds(None, 50.0, processed=10, total=40, stage_elapsed=40.0) == 120.0
+
+
+def test_progress_tracker_eta(monkeypatch):
+    """Test that the progress tracker follows the rate of each prediction stage."""
+    clock = [1000.0]
+    monkeypatch.setattr("amr_predictor.core.utils.time.time", lambda: clock[0])
+    tracker = ProgressTracker(expected_seconds=60.0)
+
+    clock[0] += 10
+    assert tracker.eta_seconds == 50.0
+    tracker.update(additional_info={"processed": 0, "total": 100})
+    clock[0] += 20
+    tracker.update(additional_info={"processed": 50, "total": 100})
+    assert tracker.eta_seconds == 30.0
+    # A new stage restarts the rate
+    tracker.update(additional_info={"processed": 0, "total": 10})
+    clock[0] += 10
+    tracker.update(additional_info={"processed": 5, "total": 10})
+    assert tracker.eta_seconds == 20.0
+    tracker.update(step=100)
+    assert tracker.get_state()["eta_seconds"] == 0.0
+
+
+def test_cost_model_records_and_fits_history():
+    """Test recording finished jobs and fitting the per-model history."""
+    cursor = MagicMock()
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    db_manager = MagicMock()
+    db_manager.get_connection.return_value = conn
+    cost_model = JobCostModel(db_manager)
+
+    cursor.fetchall.return_value = []
+    assert cost_model.fit("model-a") == DEFAULT_THROUGHPUT
+
+    cost_model.record(JobMetrics("job-1", "model-a", "torch", "cpu", 1_000_000, 170, 250_000, 30.0))
+    params = cursor.execute.call_args[0][1]
+    assert params["total_bases"] == 1_000_000 and params["engine"] == "torch"
+
+    # Recording invalidates the cached fit
+    cursor.fetchall.return_value = [(1_000_000, 30.0), (2_000_000, 50.0)]
+    assert cost_model.estimate_seconds("model-a", 3_000_000) == 70.0
+    executed = cursor.execute.call_count
+    cost_model.estimate_seconds("model-a", 1_000)
+    assert cursor.execute.call_count == executed
+
+
+def test_claim_prefers_shorter_jobs():
+    """Test that the claim orders by expected run time after the fair share."""
+    order = CLAIM_QUERY.split("ORDER BY")[1]
+    assert order.index("u.seconds") < order.index("q.expected_seconds NULLS LAST") < order.index("q.id")
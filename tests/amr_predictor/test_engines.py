@@ -0,0 +1,151 @@
+"""Tests for pluggable inference engines and pipelined tokenization."""
+
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from amr_predictor.core.engines import InferenceEngine
+
+
+class ConstantEngine(InferenceEngine):
+    """Engine returning fixed probabilities for numpy inputs."""
+
+    name = "constant"
+    tensor_type = "np"
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_proba(self, inputs):
+        self.batches.append(inputs["input_ids"].shape)
+        return np.tile(np.array([[0.25, 0.75]], dtype=np.float32), (len(inputs["input_ids"]), 1))
+
+
+def test_predict_runs_through_engine(tmp_path, tiny_lora_model):
+    """Test that prediction uses the engine with the tokenizer output it asks for."""
+    from amr_predictor.core.models import ModelManager
+
+    manager = ModelManager(model_name=tiny_lora_model, device="cpu", cache_dir=str(tmp_path / "cache"), offline=True)
+    manager.load()
+    manager.engine = ConstantEngine()
+
+    predictions = manager.predict(["ACGT", "ACGTACGT", "TTT"], max_length=16, batch_size=2)
+
+    assert predictions == [{"Susceptible": 0.25, "Resistant": 0.75}] * 3
+    assert [shape[0] for shape in manager.engine.batches] == [2, 1]
+    assert manager.get_model_metadata()["engine"] == "constant"
+
+
+def test_onnx_engine_falls_back_without_export(tmp_path, tiny_lora_model):
+    """Test that the ONNX engine falls back to PyTorch when there is no export."""
+    from amr_predictor.core.models import ModelManager, get_model_health
+
+    manager = ModelManager(model_name=tiny_lora_model, device="cpu", cache_dir=str(tmp_path / "cache"),
+                           offline=True, engine="onnx")
+    manager.load()
+
+    assert manager.engine_name == "torch"
+    assert len(manager.predict(["ACGTACGT"], max_length=16)) == 1
+    loaded = get_model_health()["loaded_models"]
+    assert any(model["model_name"] == tiny_lora_model and model["engine"] == "torch" for model in loaded)
+
+    manager.unload()
+    assert not any(model["model_name"] == tiny_lora_model for model in get_model_health()["loaded_models"])
+
+    with pytest.raises(ValueError):
+        ModelManager(model_name=tiny_lora_model, engine="tensorrt")
+
+
+def test_onnx_export_matches_torch(tmp_path, tiny_lora_model):
+    """Test that the ONNX Runtime engine predicts like PyTorch."""
+    # CI sets AMR_REQUIRE_ONNX so that missing packages fail instead of skipping
+    if not os.getenv("AMR_REQUIRE_ONNX"):
+        pytest.importorskip("onnx")
+        pytest.importorskip("onnxruntime")
+    from amr_predictor.core.models import ModelManager
+
+    sequences = ["ACGTACGTAC", "GGGTTTAAAC", "ACGN"]
+    cache_dir = str(tmp_path / "cache")
+    torch_manager = ModelManager(model_name=tiny_lora_model, device="cpu", cache_dir=cache_dir, offline=True)
+    torch_manager.load()
+    expected = torch_manager.predict(sequences, max_length=16)
+    torch_manager.export_onnx()
+
+    onnx_manager = ModelManager(model_name=tiny_lora_model, device="cpu", cache_dir=cache_dir, offline=True,
+                                engine="onnx", intra_op_threads=1)
+    onnx_manager.load()
+
+    assert onnx_manager.get_model_metadata()["engine"] == "onnx"
+    for expected_row, row in zip(expected, onnx_manager.predict(sequences, max_length=16)):
+        assert row["Resistant"] == pytest.approx(expected_row["Resistant"], abs=1e-4)
+
+
+class SlowTokenizer:
+    """Tokenizer that takes a fixed time per batch and records its thread."""
+
+    def __init__(self, seconds, fail_at=None):
+        self.seconds = seconds
+        self.fail_at = fail_at
+        self.threads = set()
+
+    def __call__(self, batch, return_tensors="np", padding=True, truncation=True, max_length=None):
+        self.threads.add(threading.current_thread().name)
+        if self.fail_at is not None and batch[0] == self.fail_at:
+            raise ValueError("bad sequence")
+        time.sleep(self.seconds)
+        ids = np.array([[len(sequence)] for sequence in batch])
+        return {"input_ids": ids, "attention_mask": np.ones_like(ids)}
+
+
+class SlowEngine(InferenceEngine):
+    """Engine that takes a fixed time per batch; P(resistant) encodes the sequence length."""
+
+    name = "slow"
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def predict_proba(self, inputs):
+        time.sleep(self.seconds)
+        resistant = inputs["input_ids"][:, 0] / 100.0
+        return np.stack([1 - resistant, resistant], axis=1)
+
+
+@pytest.mark.parametrize("prefetch_batches", [0, 2])
+def test_prefetched_tokenization_preserves_order(prefetch_batches):
+    """Test that prefetching tokenizes off the main thread and keeps results in order."""
+    from amr_predictor.core.models import ModelManager
+
+    manager = ModelManager(model_name="org/model", device="cpu", prefetch_batches=prefetch_batches)
+    manager.tokenizer = SlowTokenizer(0.02)
+    manager.engine = SlowEngine(0.02)
+    sequences = ["A" * n for n in range(1, 21)]
+
+    predictions = manager.predict(sequences, batch_size=2)
+
+    assert [round(p["Resistant"] * 100) for p in predictions] == list(range(1, 21))
+    assert ("tokenize-prefetch" in manager.tokenizer.threads) == (prefetch_batches > 0)
+
+
+def test_prefetched_tokenization_overlaps_inference_and_propagates_errors():
+    """Test that tokenization overlaps inference, and tokenizer errors fail the prediction."""
+    from amr_predictor.core.models import ModelManager
+
+    sequences = ["A" * n for n in range(1, 21)]
+    timings = {}
+    for prefetch_batches in (0, 2):
+        manager = ModelManager(model_name="org/model", device="cpu", prefetch_batches=prefetch_batches)
+        manager.tokenizer = SlowTokenizer(0.03)
+        manager.engine = SlowEngine(0.03)
+        start = time.time()
+        manager.predict(sequences, batch_size=2)
+        timings[prefetch_batches] = time.time() - start
+
+    # 10 batches: about 0.6s sequentially and 0.33s with the tokenizer off the critical path
+    assert timings[2] < timings[0] * 0.8
+
+    manager.tokenizer = SlowTokenizer(0.0, fail_at="A" * 7)
+    assert manager.predict(sequences, batch_size=2) == []
@@ -0,0 +1,166 @@
+"""Tests for the FASTA index and random access to records and segments."""
+
+import asyncio
+import gzip
+import io
+import os
+import random
+
+import pytest
+
+from amr_predictor.core.compression import BgzfWriter
+from amr_predictor.core.fasta_index import (
+    FastaIndex, FastaIndexBuilder, FastaIndexError, get_fasta_index, read_bgzf_blocks
+)
+from amr_predictor.core.sequence import get_fasta_info
+from amr_predictor.core.uploads import save_upload, remove_upload
+
+
+def make_fasta(records, width=60, newline=b"\n"):
+    lines = []
+    for name, sequence in records:
+        lines.append(b">" + name.encode() + b" description")
+        lines.extend(sequence[i:i + width].encode() for i in range(0, len(sequence), width))
+    return newline.join(lines) + newline
+
+
+def random_records():
+    rng = random.Random(7)
+    return [(f"seq{i}", "".join(rng.choice("ACGT") for _ in range(length)))
+            for i, length in enumerate([0, 1, 59, 60, 61, 150000, 1234])]
+
+
+class ChunkedUpload:
+    """Upload returning its data in small reads."""
+
+    def __init__(self, data: bytes):
+        self.stream = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.stream.read(size)
+
+
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n"])
+def test_index_matches_samtools_layout(tmp_path, newline):
+    """Test that records are indexed with samtools' offsets and line layout, in any chunking."""
+    data = make_fasta([("a", "ACGT" * 30), ("b", "GGCC")], newline=newline)
+    path = tmp_path / "input.fasta"
+    path.write_bytes(data)
+
+    index = FastaIndex.build(str(path))
+    index.save()
+    width = 60 + len(newline)
+    header = len(b">a description") + len(newline)
+    second = header + 2 * width
+    assert (tmp_path / "input.fasta.fai").read_text().splitlines() == [
+        f"a\t120\t{header}\t60\t{width}",
+        f"b\t4\t{second + len(b'>b description') + len(newline)}\t4\t{4 + len(newline)}",
+    ]
+
+    builder = FastaIndexBuilder()
+    for i in range(0, len(data), 7):
+        builder.feed(data[i:i + 7])
+    assert builder.finish() == list(index.records.values())
+
+
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n"])
+def test_index_unwrapped_records_in_small_chunks(newline):
+    """Test that single-line records are indexed from chunks splitting them anywhere."""
+    sequence = "ACGT" * 250000
+    data = make_fasta([("long", sequence), ("short", "GG")], width=len(sequence), newline=newline)
+
+    builder = FastaIndexBuilder()
+    for i in range(0, len(data), 1000):
+        builder.feed(data[i:i + 1000])
+    long_record, short_record = builder.finish()
+    assert (long_record.length, long_record.line_bases) == (len(sequence), len(sequence))
+    assert long_record.line_width == len(sequence) + len(newline)
+    assert short_record.offset == long_record.offset + long_record.line_width + len(b">short description") + len(newline)
+
+
+def test_index_rejects_irregular_lines():
+    """Test that records whose lines differ in length cannot be indexed."""
+    builder = FastaIndexBuilder()
+    with pytest.raises(FastaIndexError, match="different lengths"):
+        builder.feed(b">a\nACGT\nAC\nACGT\n")
+    with pytest.raises(FastaIndexError, match="header"):
+        FastaIndexBuilder().feed(b"ACGT\n")
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "bgzip"])
+def test_fetch_segments(tmp_path, compression):
+    """Test that any segment is read back exactly, from plain and compressed files."""
+    records = random_records()
+    data = make_fasta(records)
+    path = str(tmp_path / "input.fasta")
+    if compression == "gzip":
+        data = gzip.compress(data)
+    elif compression == "bgzip":
+        with open(path, "wb") as handle:
+            writer = BgzfWriter(handle)
+            writer.write(data)
+            writer.close()
+        assert len(read_bgzf_blocks(path)) > 1
+    if compression != "bgzip":
+        with open(path, "wb") as handle:
+            handle.write(data)
+
+    get_fasta_index(path)
+    index = get_fasta_index(path, create=False)
+    assert index.names == [name for name, _ in records]
+    assert (index.blocks is not None) == (compression == "bgzip")
+
+    for name, sequence in records:
+        assert index.fetch(name) == sequence
+    sequence = dict(records)["seq5"]
+    for start, end in [(0, 1), (59, 61), (60, 120), (65000, 140000), (149999, 150000)]:
+        assert index.fetch("seq5", start, end) == sequence[start:end]
+    with pytest.raises(FastaIndexError):
+        index.fetch("seq5", 10, 150001)
+    with pytest.raises(FastaIndexError):
+        index.fetch("missing")
+
+
+def test_partition_covers_every_base(tmp_path):
+    """Test that slices for parallel workers are balanced and cover the file once."""
+    records = random_records()
+    path = tmp_path / "input.fasta"
+    path.write_bytes(make_fasta(records))
+    index = FastaIndex.build(str(path))
+
+    slices = index.partition(4)
+    assert len(slices) == 4
+    total = sum(len(sequence) for _, sequence in records)
+    assert all(sum(end - start for _, start, end in regions) <= -(-total // 4) for regions in slices)
+    joined = {}
+    for regions in slices:
+        for name, start, end in regions:
+            joined[name] = joined.get(name, "") + index.fetch(name, start, end)
+    assert joined == {name: sequence for name, sequence in records if sequence}
+
+
+def test_uploads_are_indexed_while_streaming(tmp_path):
+    """Test that stored uploads get an index and file statistics come from it."""
+    records = random_records()
+    data = make_fasta(records)
+    path = str(tmp_path / "job_input.fasta")
+    info = asyncio.run(save_upload(ChunkedUpload(gzip.compress(data)), path, chunk_size=1000,
+                                   compress=True, indexer=FastaIndexBuilder()))
+    assert info.indexed and info.path == path + ".gz"
+    assert os.path.exists(info.path + ".fai") and os.path.exists(info.path + ".gzi")
+
+    index = FastaIndex.load(info.path)
+    assert index.fetch("seq5", 70000, 70100) == dict(records)["seq5"][70000:70100]
+
+    stats = get_fasta_info(info.path)
+    assert stats["indexed"]
+    assert stats["sequence_count"] == len(records)
+    assert stats["total_length"] == sum(len(sequence) for _, sequence in records)
+    assert stats["min_sequence_length"] == 1
+
+    remove_upload(info.path)
+    assert os.listdir(tmp_path) == []
+
+    # Irregular files are still stored, without an index
+    info = asyncio.run(save_upload(ChunkedUpload(b">a\nACGT\nAC\nACGT\n"), path, indexer=FastaIndexBuilder()))
+    assert not info.indexed and not os.path.exists(path + ".fai")
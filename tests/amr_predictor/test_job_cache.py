@@ -0,0 +1,82 @@
+"""Tests for the cache of finished jobs and conditional job status requests."""
+
+from unittest.mock import MagicMock
+
+
+def test_terminal_job_cache(mock_pg_manager, monkeypatch):
+    """Test that only finished jobs are cached, in LRU order and until they expire."""
+    from amr_predictor.core.repository import TerminalJobCache
+
+    clock = [100.0]
+    monkeypatch.setattr("amr_predictor.core.repository.time.monotonic", lambda: clock[0])
+    cache = TerminalJobCache(max_size=2, ttl=60)
+
+    cache.put({"job_id": "running", "status": "Running"})
+    assert cache.get("running") is None
+
+    cache.put({"job_id": "a", "status": "Completed", "additional_info": {"n": 1}})
+    cache.put({"job_id": "b", "status": "Error"})
+    cached = cache.get("a")
+    cached["additional_info"]["n"] = 2
+    assert cache.get("a")["additional_info"] == {"n": 1}
+
+    # "b" is the least recently used
+    cache.put({"job_id": "c", "status": "Archived"})
+    assert cache.get("b") is None and cache.get("c") is not None
+
+    cache.invalidate("c")
+    assert cache.get("c") is None
+    clock[0] += 61
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_repository_serves_finished_jobs_from_cache(mock_pg_manager):
+    """Test that finished jobs are read once and invalidated by writes."""
+    from amr_predictor.core.repository import AMRJobRepository, TerminalJobCache
+
+    repository = AMRJobRepository()
+    repository.db_manager = MagicMock()
+    repository.job_cache = TerminalJobCache()
+    repository.db_manager.get_job.return_value = {"job_id": "job-1", "status": "Completed"}
+
+    assert repository.get_job("job-1")["status"] == "Completed"
+    assert repository.get_job("job-1")["status"] == "Completed"
+    assert repository.db_manager.get_job.call_count == 1
+
+    repository.archive_job("job-1")
+    repository.db_manager.update_job_status.assert_called_once()
+    assert repository.db_manager.update_job_status.call_args[1]["status"] == "Archived"
+    repository.db_manager.get_job.return_value = {"job_id": "job-1", "status": "Archived"}
+    assert repository.get_job("job-1")["status"] == "Archived"
+
+    repository.delete_job("job-1")
+    repository.db_manager.get_job.return_value = None
+    assert repository.get_job("job-1") is None
+
+    # Running jobs are always read from the database
+    repository.db_manager.get_job.return_value = {"job_id": "job-2", "status": "Running"}
+    repository.get_job("job-2")
+    repository.get_job("job-2")
+    assert repository.db_manager.get_job.call_count == 5
+
+
+def test_cached_jobs_leave_out_bakta_links(mock_pg_manager):
+    """Test that Bakta links, written outside the repository, are not served from the cache."""
+    from amr_predictor.core.repository import AMRJobRepository, TerminalJobCache
+
+    repository = AMRJobRepository()
+    repository.db_manager = MagicMock()
+    repository.job_cache = TerminalJobCache()
+    repository.db_manager.get_job.return_value = {
+        "job_id": "job-1", "status": "Completed", "bakta_job_id": None, "bakta_status": None
+    }
+    first = repository.get_job("job-1")
+
+    # The Streamlit client links a Bakta job directly in the database
+    repository.db_manager.get_job.return_value = {
+        "job_id": "job-1", "status": "Completed", "bakta_job_id": "bakta-1", "bakta_status": "RUNNING"
+    }
+    assert repository.get_job("job-1") == first == {"job_id": "job-1", "status": "Completed"}
+    repository.job_cache.clear()
+    assert repository.get_job("job-1") == first
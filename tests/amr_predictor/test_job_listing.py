@@ -0,0 +1,50 @@
+"""Tests for the keyset-paginated job listing."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+
+def test_page_cursor_round_trip(mock_pg_manager):
+    """Test encoding and decoding page cursors."""
+    from amr_predictor.core.repository import encode_job_cursor, decode_job_cursor
+
+    start_time = datetime(2025, 4, 5, 12, 30, 15, 123456)
+    cursor = encode_job_cursor(start_time, "job-1")
+    assert "=" not in cursor
+    assert decode_job_cursor(cursor) == (start_time, "job-1")
+    with pytest.raises(ValueError):
+        decode_job_cursor("not-a-cursor")
+
+
+def test_get_jobs_page_continues_after_last_row(mock_pg_manager):
+    """Test that pages are fetched after the (start_time, id) of the previous page."""
+    manager, conn, cursor = mock_pg_manager
+    times = [datetime(2025, 4, 5, 12, minute) for minute in (5, 4, 3)]
+    cursor.fetchall.return_value = [{"id": f"job-{i}", "start_time": t, "additional_info": {}}
+                                    for i, t in enumerate(times)]
+
+    jobs, next_key = manager.get_jobs_page(limit=2, after=(datetime(2025, 4, 5, 13), "job-x"),
+                                           status="Completed", owner="alice")
+
+    query, params = cursor.execute.call_args[0]
+    assert "(start_time, id) < (%s, %s)" in query and "OFFSET" not in query
+    assert "ORDER BY start_time DESC, id DESC LIMIT %s" in query
+    assert params == ["Completed", "alice", datetime(2025, 4, 5, 13), "job-x", 3]
+    assert [job["job_id"] for job in jobs] == ["job-0", "job-1"]
+    assert next_key == (times[1], "job-1")
+
+    cursor.fetchall.return_value = cursor.fetchall.return_value[:1]
+    assert manager.get_jobs_page(limit=2)[1] is None
+
+
+def test_estimate_job_count_uses_planner_statistics(mock_pg_manager):
+    """Test that the total is estimated from the query plan instead of counted."""
+    manager, conn, cursor = mock_pg_manager
+    cursor.fetchone.return_value = (json.dumps([{"Plan": {"Plan Rows": 123456}}]),)
+
+    assert manager.estimate_job_count(status="Completed", since=datetime(2025, 1, 1)) == 123456
+    query, params = cursor.execute.call_args[0]
+    assert query.startswith("EXPLAIN (FORMAT JSON) SELECT 1 FROM amr_jobs WHERE status = %s AND start_time >= %s")
+    assert "count(" not in query
@@ -0,0 +1,59 @@
+"""Tests for job parameters stored in amr_jobs.additional_info."""
+
+import json
+
+
+def test_add_job_parameters_merges_in_one_update(mock_pg_manager):
+    """Test that parameters are merged into additional_info with one statement."""
+    manager, conn, cursor = mock_pg_manager
+    cursor.rowcount = 1
+
+    assert manager.add_job_parameters("job-1", {"total_sequences": 3, "status_note": "ok"}) is True
+    cursor.execute.assert_called_once()
+    query, params = cursor.execute.call_args[0]
+    assert "additional_info = COALESCE(additional_info, '{}'::jsonb) || %s::jsonb" in query
+    assert json.loads(params[0]) == {"total_sequences": 3, "status_note": "ok"}
+    conn.commit.assert_called_once()
+
+    cursor.rowcount = 0
+    assert manager.add_job_parameter("missing", "key", 1) is False
+
+
+def test_get_job_uses_one_query(mock_pg_manager):
+    """Test that a job and its parameters are fetched with a single query."""
+    manager, conn, cursor = mock_pg_manager
+    cursor.fetchone.return_value = {"id": "job-1", "status": "Running",
+                                    "additional_info": {"model_name": "m", "total_sequences": 3}}
+
+    job = manager.get_job("job-1")
+
+    cursor.execute.assert_called_once()
+    assert job["job_id"] == "job-1"
+    assert job["additional_info"] == {"model_name": "m", "total_sequences": 3}
+
+
+def test_save_job_stores_extra_fields_in_additional_info(mock_pg_manager):
+    """Test that saving a job upserts it with flat additional_info."""
+    manager, conn, cursor = mock_pg_manager
+
+    assert manager.save_job({"job_id": "job-1", "id": "job-1", "status": "Submitted",
+                             "additional_info": {"model_name": "m"}, "owner": "alice"})
+    query, params = cursor.execute.call_args[0]
+    assert "ON CONFLICT (id) DO UPDATE" in query
+    assert json.loads(params[-1]) == {"model_name": "m", "owner": "alice"}
+
+
+def test_migrate_job_parameters(mock_pg_manager):
+    """Test that legacy parameter rows are decoded and merged per job."""
+    manager, conn, cursor = mock_pg_manager
+    cursor.fetchone.return_value = (True,)
+    cursor.fetchall.return_value = [("job-1", "total_sequences", "3"), ("job-1", "input_file", "a.fasta"),
+                                    ("job-2", "use_cpu", "true")]
+
+    assert manager.migrate_job_parameters() == 2
+    merges = [call[0][1] for call in cursor.execute.call_args_list if "|| %s::jsonb" in call[0][0]]
+    assert [(json.loads(params), job_id) for params, job_id in merges] == [
+        ({"total_sequences": 3, "input_file": "a.fasta"}, "job-1"),
+        ({"use_cpu": True}, "job-2")
+    ]
+    assert cursor.execute.call_args[0][0] == "DELETE FROM amr_job_parameters"
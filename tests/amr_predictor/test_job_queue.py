@@ -0,0 +1,167 @@
+"""Tests for the durable job queue and its worker."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from amr_predictor.config.scheduler_config import SchedulerConfig
+from amr_predictor.core.job_queue import CLAIM_QUERY, PostgresJobQueue, QueuedJob, estimate_queue_position
+from amr_predictor.core.job_worker import JobWorker
+
+
+class MemoryQueue:
+    """In-memory stand-in for PostgresJobQueue with the same retry rules."""
+
+    def __init__(self):
+        self.jobs = []
+        self.done = []
+        self.failed = []
+        self.next_id = 1
+
+    def enqueue(self, job_id, task, payload, max_attempts=3):
+        self.jobs.append(QueuedJob(self.next_id, job_id, task, payload, 0, max_attempts))
+        self.next_id += 1
+
+    def reap_expired(self):
+        return []
+
+    def claim(self, worker_id, lease_seconds, tasks=None):
+        for job in self.jobs:
+            if tasks is None or job.task in tasks:
+                self.jobs.remove(job)
+                job.attempts += 1
+                return job
+        return None
+
+    def heartbeat(self, queue_id, worker_id, lease_seconds):
+        return True
+
+    def complete(self, queue_id, worker_id):
+        self.done.append(queue_id)
+        return True
+
+    def fail(self, job, worker_id, error):
+        if job.attempts < job.max_attempts:
+            self.jobs.append(job)
+            return True
+        self.failed.append((job.job_id, error))
+        return False
+
+
+@pytest.fixture
+def mock_db_manager():
+    """Database manager returning a mock connection."""
+    cursor = MagicMock()
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    db_manager = MagicMock()
+    db_manager.get_connection.return_value = conn
+    return db_manager, conn, cursor
+
+
+def test_claim_skips_locked_rows(mock_db_manager, tmp_path):
+    """Test that claiming uses SKIP LOCKED, passes fair-share settings and returns the claimed job."""
+    db_manager, conn, cursor = mock_db_manager
+    cursor.fetchone.return_value = (7, "job-1", "predict", json.dumps({"job_id": "job-1"}), 1, 3)
+    config_file = tmp_path / "scheduler.yml"
+    config_file.write_text("users:\n  alice:\n    weight: 3\n    max_running: 5\n")
+
+    queue = PostgresJobQueue(db_manager, scheduler_config=SchedulerConfig(str(config_file)))
+    job = queue.claim("worker-a", lease_seconds=30, tasks=["predict"])
+
+    query, params = cursor.execute.call_args[0]
+    assert "FOR UPDATE OF q SKIP LOCKED" in query
+    assert params["worker_id"] == "worker-a" and params["lease_seconds"] == 30
+    assert params["tasks"] == ["predict"]
+    assert params["max_running"] == 2
+    assert (params["share_owners"], params["share_weights"], params["share_caps"]) == (["alice"], [3.0], [5])
+    assert job == QueuedJob(7, "job-1", "predict", {"job_id": "job-1"}, 1, 3)
+    conn.commit.assert_called_once()
+    db_manager.release_connection.assert_called_once_with(conn)
+
+
+def test_claim_cap_is_work_conserving():
+    """Test that users at their cap are ordered last rather than filtered out."""
+    where, order = CLAIM_QUERY.split("ORDER BY")
+    cap = "COALESCE(r.jobs, 0) >= COALESCE(s.max_running, %(max_running)s)"
+    assert "max_running" not in where.split("WHERE id = (")[1]
+    assert order.index(cap) < order.index("q.priority DESC") < order.index("u.seconds")
+
+
+def test_fail_requeues_until_attempts_run_out(mock_db_manager):
+    """Test that failed attempts are requeued until max_attempts."""
+    db_manager, conn, cursor = mock_db_manager
+    queue = PostgresJobQueue(db_manager)
+
+    assert queue.fail(QueuedJob(1, "job-1", "predict", {}, 1, 3), "worker-a", "boom") is True
+    assert cursor.execute.call_args[0][1][0] == "queued"
+    assert queue.fail(QueuedJob(1, "job-1", "predict", {}, 3, 3), "worker-a", "boom") is False
+    assert cursor.execute.call_args[0][1][0] == "failed"
+
+
+def test_worker_runs_sync_and_async_handlers():
+    """Test that the worker runs handlers with the job payload and completes the jobs."""
+    queue = MemoryQueue()
+    calls = []
+
+    async def predict(job_id, value):
+        calls.append(("predict", job_id, value))
+
+    def aggregate(job_id):
+        calls.append(("aggregate", job_id))
+
+    queue.enqueue("job-1", "predict", {"job_id": "job-1", "value": 3})
+    queue.enqueue("job-2", "aggregate", {"job_id": "job-2"})
+    worker = JobWorker(queue, {"predict": predict, "aggregate": aggregate}, worker_id="w", poll_interval=0.01)
+
+    assert worker.run(max_jobs=2) == 2
+    assert calls == [("predict", "job-1", 3), ("aggregate", "job-2")]
+    assert queue.done == [1, 2]
+
+
+def test_worker_retries_and_reports_permanent_failures():
+    """Test that handler errors are retried and reported once attempts run out."""
+    queue = MemoryQueue()
+    attempts = []
+    failures = []
+
+    def flaky(job_id):
+        attempts.append(job_id)
+        raise RuntimeError("worker crashed")
+
+    queue.enqueue("job-1", "predict", {"job_id": "job-1"}, max_attempts=2)
+    worker = JobWorker(queue, {"predict": flaky}, worker_id="w",
+                       on_failure=lambda job_id, error: failures.append((job_id, error)))
+
+    assert worker.run_once() and worker.run_once()
+    assert worker.run_once() is False
+    assert attempts == ["job-1", "job-1"]
+    assert failures == [("job-1", "RuntimeError: worker crashed")]
+    assert queue.done == []
+
+
+def test_priority_classes():
+    """Test that small submissions are interactive and claimed first."""
+    config = SchedulerConfig()
+    assert config.classify(10_000) == "interactive"
+    assert config.classify(50 * 1024 * 1024) == "batch"
+    assert config.classify(None) == "batch"
+    assert config.get_priority("interactive") > config.get_priority("batch")
+
+
+def test_estimate_queue_position_shares_turns_between_users():
+    """Test queue position estimates under weighted fair sharing."""
+    # A heavy user with 500 queued jobs only delays a light user's first job by one turn
+    ahead = {"heavy": {"higher": 0, "same_earlier": 500, "same": 500}}
+    assert estimate_queue_position("light", ahead, {}) == 1
+
+    # The heavy user's own last job waits behind all of its earlier jobs and the light user's
+    ahead = {"heavy": {"higher": 0, "same_earlier": 499, "same": 499},
+             "light": {"higher": 0, "same_earlier": 2, "same": 2}}
+    assert estimate_queue_position("heavy", ahead, {}) == 501
+
+    # Interactive jobs go first; a user with twice the weight gets twice the turns
+    ahead = {"other": {"higher": 3, "same_earlier": 10, "same": 10},
+             "me": {"higher": 0, "same_earlier": 1, "same": 1}}
+    assert estimate_queue_position("me", ahead, {"other": 2.0, "me": 1.0}) == 3 + 1 + 4
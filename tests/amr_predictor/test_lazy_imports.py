@@ -0,0 +1,50 @@
+"""Tests for lazy loading of the ML stack and import-time budgets."""
+
+from amr_predictor.core.utils import LazyImport
+from amr_predictor.benchmarks.importtime import (
+    ImportBudget,
+    check_import_budgets,
+    parse_importtime
+)
+
+
+def test_lazy_import_defers_until_use():
+    """Test that a LazyImport proxy imports on first attribute access."""
+    proxy = LazyImport("json")
+    dumps = LazyImport("json", "dumps")
+
+    assert not proxy.is_loaded
+    assert proxy.loads("[1]") == [1]
+    assert proxy.is_loaded
+    assert dumps({"a": 1}) == '{"a": 1}'
+
+
+def test_parse_importtime():
+    """Test parsing of -X importtime output."""
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   json.decoder",
+        "import time:       300 |       1500 | json",
+        "Traceback (most recent call last):"
+    ])
+
+    assert parse_importtime(output) == {"json.decoder": 0.00012, "json": 0.0015}
+
+
+def test_entry_points_do_not_import_ml_stack():
+    """Test that CLI, processing and Bakta imports do not pull in torch."""
+    budgets = [
+        ImportBudget(module, max_seconds=float("inf"))
+        for module in (
+            "amr_predictor.cli.commands",
+            "amr_predictor.processing.aggregation",
+            "amr_predictor.bakta"
+        )
+    ]
+
+    results = check_import_budgets(budgets)
+
+    for result in results:
+        assert result.error is None, result.module
+        assert result.forbidden_imported == [], result.module
+        assert result.ok
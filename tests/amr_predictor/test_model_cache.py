@@ -0,0 +1,119 @@
+"""Tests for offline-first model resolution."""
+
+import json
+import os
+import pytest
+
+from amr_predictor.core.model_cache import (
+    ModelResolver,
+    ModelNotCachedError,
+    ModelIntegrityError
+)
+
+
+class FakeHubResolver(ModelResolver):
+    """Resolver that "downloads" from an in-memory hub."""
+
+    HUB = {
+        "org/adapter": {"adapter_config.json": json.dumps({"base_model_name_or_path": "org/base"}),
+                        "adapter_model.safetensors": "adapter-weights"},
+        "org/base": {"config.json": "{}", "model.safetensors": "base-weights", "vocab.txt": "AAAAAA"}
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.downloads = []
+
+    def _download(self, repo_id, revision, target_dir):
+        self.downloads.append((repo_id, revision))
+        for name, content in self.HUB[repo_id].items():
+            with open(os.path.join(target_dir, name), "w") as f:
+                f.write(content)
+        return f"{repo_id.split('/')[-1]}-commit-1"
+
+
+def test_resolve_snapshots_once_then_works_offline(tmp_path):
+    """Test that models are downloaded once and then resolved offline."""
+    resolver = FakeHubResolver(cache_dir=str(tmp_path), offline=False)
+    resolved = resolver.resolve("org/adapter")
+
+    assert resolver.downloads == [("org/adapter", "main"), ("org/base", "main")]
+    assert resolved.to_metadata() == {
+        "model_name": "org/adapter",
+        "model_revision": "adapter-commit-1",
+        "base_model": "org/base",
+        "base_model_revision": "base-commit-1"
+    }
+    assert os.path.isfile(os.path.join(resolved.tokenizer_path, "vocab.txt"))
+
+    offline = FakeHubResolver(cache_dir=str(tmp_path), offline=True)
+    assert offline.resolve("org/adapter") == resolved
+    assert offline.resolve("org/adapter", revision="adapter-commit-1") == resolved
+    assert offline.downloads == []
+    assert [s["repo_id"] for s in offline.list_snapshots()] == ["org/adapter", "org/base"]
+
+
+def test_offline_resolution_of_uncached_model_fails(tmp_path):
+    """Test that an uncached model is not downloaded in offline mode."""
+    resolver = FakeHubResolver(cache_dir=str(tmp_path), offline=True)
+
+    with pytest.raises(ModelNotCachedError):
+        resolver.resolve("org/adapter")
+    assert resolver.downloads == []
+
+
+def test_tampered_snapshot_is_rejected(tmp_path):
+    """Test integrity verification of cached snapshots."""
+    resolver = FakeHubResolver(cache_dir=str(tmp_path), offline=False)
+    resolved = resolver.resolve("org/adapter")
+
+    with open(os.path.join(resolved.base_path, "model.safetensors"), "w") as f:
+        f.write("tampered-weights")
+
+    with pytest.raises(ModelIntegrityError):
+        FakeHubResolver(cache_dir=str(tmp_path), offline=True).resolve("org/adapter")
+
+
+def test_local_directories_are_used_as_is(tmp_path):
+    """Test resolving a local adapter directory with a local base model."""
+    base_dir = tmp_path / "base"
+    adapter_dir = tmp_path / "adapter"
+    base_dir.mkdir()
+    adapter_dir.mkdir()
+    (adapter_dir / "adapter_config.json").write_text(json.dumps({"base_model_name_or_path": str(base_dir)}))
+
+    resolved = ModelResolver(cache_dir=str(tmp_path / "cache"), offline=True).resolve(str(adapter_dir))
+
+    assert resolved.revision == "local"
+    assert resolved.adapter_path == str(adapter_dir)
+    assert resolved.base_path == str(base_dir)
+
+
+def test_merged_adapter_matches_adapter_predictions(tmp_path, tiny_lora_model):
+    """Test that pre-merged weights are used on load and predict like the adapter."""
+    from amr_predictor.core.models import ModelManager
+
+    sequences = ["ACGTACGTAC", "GGGTTTAAAC", "ACGN"]
+    cache_dir = str(tmp_path / "cache")
+
+    adapter_manager = ModelManager(model_name=tiny_lora_model, device="cpu", cache_dir=cache_dir, offline=True)
+    adapter_manager.load()
+    assert adapter_manager.weights_format == "adapter"
+    expected = adapter_manager.predict(sequences, max_length=16)
+
+    merged_path = adapter_manager.merge_adapter()
+    assert os.path.isfile(os.path.join(merged_path, "model.safetensors"))
+
+    merged_manager = ModelManager(model_name=tiny_lora_model, device="cpu", cache_dir=cache_dir, offline=True)
+    merged_manager.load()
+    assert merged_manager.weights_format == "merged"
+    assert merged_manager.get_model_metadata()["weights_format"] == "merged"
+    assert "lora" not in type(merged_manager.model).__name__.lower()
+
+    for expected_row, merged_row in zip(expected, merged_manager.predict(sequences, max_length=16)):
+        assert merged_row["Susceptible"] == pytest.approx(expected_row["Susceptible"], abs=1e-5)
+
+    # Merged weights built from an older adapter are ignored
+    with open(os.path.join(tiny_lora_model, "adapter_config.json"), "a") as f:
+        f.write("\n")
+    assert ModelResolver(cache_dir=cache_dir, offline=True).find_merged(merged_manager.resolved_model) is None
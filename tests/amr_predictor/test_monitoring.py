@@ -2,14 +2,18 @@
 
 import pytest
 import time
+import asyncio
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
 from amr_predictor.monitoring.metrics import (
     MetricsTracker, 
     OperationMetric, 
+    QuantileSketch,
     track_operation,
     get_metrics_tracker,
+    get_correlation_id,
+    correlation_context,
     MetricsReport
 )
 
@@ -333,3 +337,133 @@ def test_metrics_report_error_operations():
         assert len(error_ops) == 1
         assert error_ops[0].operation_name == "error_op"
         assert error_ops[0].error_message == "Test error"
+
+
+def test_quantile_sketch_accuracy():
+    """Test streaming quantiles stay within the relative accuracy."""
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    values = list(range(1, 10001))
+    for value in reversed(values):
+        sketch.add(float(value))
+    
+    assert sketch.count == 10000
+    for q in (0.5, 0.95, 0.99):
+        expected = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(expected, rel=0.01)
+    
+    # Merged sketches answer like a single sketch over both inputs
+    other = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        other.add(float(value))
+    other.merge(sketch)
+    assert other.quantile(0.5) == pytest.approx(sketch.quantile(0.5), rel=0.01)
+    
+    with pytest.raises(ValueError):
+        other.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_aggregates_outlive_sample_history():
+    """Test that aggregates cover operations evicted from the ring buffers."""
+    tracker = MetricsTracker(max_history=10)
+    for i in range(100):
+        tracker.record_operation("op_a", float(i + 1), success=i % 10 != 0)
+    tracker.record_operation("op_b", 5.0)
+    
+    assert len(tracker.metrics) == 10
+    assert len(tracker.get_metrics("op_a")) == 10
+    assert tracker.get_metrics("op_b")[0].duration_ms == 5.0
+    
+    assert tracker.get_operation_counts() == {"op_a": 100, "op_b": 1}
+    assert tracker.get_average_duration("op_a") == pytest.approx(50.5)
+    assert tracker.get_error_rate("op_a") == pytest.approx(10.0)
+    
+    percentiles = tracker.get_percentiles("op_a")
+    assert set(percentiles) == {"p50", "p95", "p99"}
+    assert percentiles["p95"] == pytest.approx(95.0, rel=0.02)
+    
+    # Windowed aggregates come from the time-bucketed rollups
+    recent = datetime.now() - timedelta(minutes=5)
+    assert tracker.get_operation_counts(since=recent) == {"op_a": 100, "op_b": 1}
+    assert tracker.get_operation_counts(since=datetime.now() + timedelta(minutes=5)) == {}
+    assert tracker.get_percentiles("missing_op") == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+
+def test_track_operation_async_measures_awaited_work():
+    """Test that coroutine functions are timed until they complete."""
+    tracker = MetricsTracker()
+    
+    @track_operation("db_lookup", category="db")
+    def db_lookup():
+        time.sleep(0.02)
+        return "row"
+    
+    @track_operation("async_endpoint")
+    async def async_endpoint():
+        await asyncio.sleep(0.05)
+        return db_lookup()
+    
+    async def run():
+        with correlation_context("request-123"):
+            return await async_endpoint()
+    
+    with patch('amr_predictor.monitoring.metrics.get_metrics_tracker', return_value=tracker):
+        assert asyncio.run(run()) == "row"
+    
+    endpoint = tracker.get_metrics("async_endpoint")[0]
+    assert endpoint.duration_ms >= 70.0
+    assert endpoint.db_time_ms >= 20.0
+    # Time suspended in asyncio.sleep and blocked in time.sleep is not CPU time
+    assert endpoint.cpu_time_ms < endpoint.duration_ms - 40.0
+    assert endpoint.correlation_id == "request-123"
+    assert tracker.get_metrics("db_lookup")[0].correlation_id == "request-123"
+    assert get_correlation_id() is None
+
+
+def test_track_operation_async_generator_and_errors():
+    """Test tracking async generators and failing coroutines."""
+    tracker = MetricsTracker()
+    
+    @track_operation("stream_rows")
+    async def stream_rows():
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield i
+    
+    @track_operation("failing_endpoint")
+    async def failing_endpoint():
+        await asyncio.sleep(0)
+        raise ValueError("Test error")
+    
+    async def run():
+        rows = [row async for row in stream_rows()]
+        with pytest.raises(ValueError):
+            await failing_endpoint()
+        return rows
+    
+    with patch('amr_predictor.monitoring.metrics.get_metrics_tracker', return_value=tracker):
+        assert asyncio.run(run()) == [0, 1, 2]
+    
+    assert tracker.get_operation_counts() == {"stream_rows": 1, "failing_endpoint": 1}
+    failed = tracker.get_metrics("failing_endpoint")[0]
+    assert failed.success is False
+    assert failed.error_message == "Test error"
+
+
+def test_track_operation_records_cancelled_coroutines():
+    """Test that a cancelled coroutine is recorded as a failed operation."""
+    tracker = MetricsTracker()
+    
+    @track_operation("slow_endpoint")
+    async def slow_endpoint():
+        await asyncio.sleep(10)
+    
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(slow_endpoint(), timeout=0.01)
+    
+    with patch('amr_predictor.monitoring.metrics.get_metrics_tracker', return_value=tracker):
+        asyncio.run(run())
+    
+    [cancelled] = tracker.get_metrics("slow_endpoint")
+    assert cancelled.success is False
+    assert cancelled.error_message == "CancelledError"
@@ -0,0 +1,61 @@
+"""Tests for data-parallel CPU inference."""
+
+import pytest
+
+pytest.importorskip("torch")
+
+from amr_predictor.benchmarks import StubModelManager, generate_synthetic_genome, write_fasta
+from amr_predictor.core.parallel import choose_num_workers, parallel_supported, predict_parallel
+from amr_predictor.core.prediction import PredictionPipeline
+
+
+def test_choose_num_workers():
+    """Test choosing workers from available CPUs and the amount of work."""
+    assert choose_num_workers(1000, 8, threads_per_worker=4, cpus=64) == 16
+    assert choose_num_workers(1000, 8, threads_per_worker=2, cpus=64) == 32
+    assert choose_num_workers(20, 8, threads_per_worker=4, cpus=64) == 3
+    assert choose_num_workers(1000, 8, threads_per_worker=4, cpus=2) == 1
+
+
+@pytest.mark.skipif(not parallel_supported(), reason="requires the fork start method")
+def test_parallel_predictions_match_in_process(tmp_path):
+    """Test that sharded predictions are merged back in input order."""
+    manager = StubModelManager()
+    manager.load()
+    sequences = [seq for _, seq in generate_synthetic_genome(num_contigs=37, contig_length=300, seed=3)]
+
+    expected = manager.predict(sequences, batch_size=4)
+    tokens = manager.tokens_processed
+    progress = []
+    predictions = predict_parallel(manager, sequences, batch_size=4, num_workers=3, threads_per_worker=1,
+                                   progress_callback=progress.append)
+
+    assert predictions == expected
+    assert manager.tokens_processed == 2 * tokens > 0
+    assert progress[-1] == len(sequences)
+    assert progress == sorted(progress)
+
+
+@pytest.mark.skipif(not parallel_supported(), reason="requires the fork start method")
+def test_pipeline_with_workers_writes_same_results(tmp_path):
+    """Test the pipeline with in-process and multi-process inference."""
+    fasta_file = str(tmp_path / "genome.fasta")
+    write_fasta(generate_synthetic_genome(num_contigs=3, contig_length=5000, seed=1), fasta_file)
+
+    outputs, tokens = {}, {}
+    for num_workers in (1, 2):
+        manager = StubModelManager()
+        manager.load()
+        pipeline = PredictionPipeline(batch_size=2, segment_length=1000, model_manager=manager,
+                                      num_workers=num_workers, threads_per_worker=1,
+                                      enable_sequence_aggregation=False)
+        output_file = str(tmp_path / f"predictions_{num_workers}.csv")
+        results = pipeline.process_fasta_file(fasta_file, output_file)
+        assert not results.get("error")
+        tokens[num_workers] = results["tokens"]
+        with open(output_file) as f:
+            outputs[num_workers] = f.read()
+
+    assert results["num_workers"] == 2
+    assert outputs[1] == outputs[2]
+    assert tokens[2] == tokens[1] > 0
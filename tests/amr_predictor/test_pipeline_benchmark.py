@@ -0,0 +1,97 @@
+"""Tests for the prediction pipeline benchmark suite."""
+
+import json
+import pytest
+
+pytest.importorskip("torch")
+
+from amr_predictor.benchmarks import (
+    BenchmarkConfig,
+    StubModelManager,
+    StubTokenizer,
+    generate_synthetic_genome,
+    run_pipeline_benchmark,
+    save_benchmark_results,
+    load_benchmark_results,
+    compare_benchmarks
+)
+
+
+def test_synthetic_genome_is_reproducible():
+    """Test that the synthetic genome depends only on the seed."""
+    first = generate_synthetic_genome(num_contigs=3, contig_length=500, seed=42)
+    second = generate_synthetic_genome(num_contigs=3, contig_length=500, seed=42)
+    other = generate_synthetic_genome(num_contigs=3, contig_length=500, seed=7)
+
+    assert first == second
+    assert first != other
+    assert all(len(seq) == 500 for _, seq in first)
+    assert set("".join(seq for _, seq in first)) <= set("ACGT")
+
+
+def test_stub_tokenizer_kmers():
+    """Test stub tokenization into non-overlapping k-mers."""
+    tokenizer = StubTokenizer(kmer=6)
+
+    ids = tokenizer.encode("AAAAAAAAAAAC")
+    assert ids[0] == StubTokenizer.CLS_ID
+    assert len(ids) == 3
+    assert tokenizer.encode("NNNNNN")[1] == StubTokenizer.UNK_ID
+    assert len(tokenizer.encode("A" * 600, max_length=10)) == 10
+
+
+def test_stub_model_is_deterministic_across_batches():
+    """Test that stub predictions do not depend on batch composition."""
+    manager = StubModelManager()
+    manager.load()
+    sequences = [seq for _, seq in generate_synthetic_genome(num_contigs=5, contig_length=300, seed=1)]
+
+    batched = manager.predict(sequences, batch_size=4)
+    single = [manager.predict([seq], batch_size=1)[0] for seq in sequences]
+
+    assert len(batched) == 5
+    for left, right in zip(batched, single):
+        assert left["Resistant"] == pytest.approx(right["Resistant"], abs=1e-6)
+        assert left["Resistant"] + left["Susceptible"] == pytest.approx(1.0)
+
+
+def test_stub_model_manager_has_model_manager_state():
+    """Test that the stub is initialized like a ModelManager, without environment setup."""
+    from amr_predictor.core.models import ModelManager
+
+    manager = StubModelManager()
+    reference = ModelManager(model_name=manager.model_name, device="cpu", load_environment=False)
+    assert set(vars(reference)) <= set(vars(manager))
+    assert (manager.precision, manager.engine_name, manager.hf_token) == ("fp32", "torch", None)
+
+
+def test_run_pipeline_benchmark(tmp_path):
+    """Test a small benchmark run end to end."""
+    config = BenchmarkConfig(num_contigs=2, contig_length=2000, segment_length=500, batch_size=4)
+    results = run_pipeline_benchmark(config, work_dir=str(tmp_path))
+
+    expected_stages = {
+        "load_fasta", "split_sequence", "tokenize", "predict",
+        "write_results", "sequence_aggregation", "wig_export", "end_to_end"
+    }
+    assert set(results["stages"]) == expected_stages
+    assert results["stages"]["split_sequence"]["items"] == 8
+    assert results["stages"]["predict"]["extra"]["tokens"] > 0
+    assert all(stage["peak_rss_mb"] > 0 for stage in results["stages"].values())
+
+    output_file = tmp_path / "benchmark.json"
+    save_benchmark_results(results, str(output_file))
+    assert load_benchmark_results(str(output_file)) == json.loads(output_file.read_text())
+
+
+def test_compare_benchmarks_flags_regressions():
+    """Test regression detection between two benchmark results."""
+    baseline = {"stages": {"predict": {"seconds": 1.0}, "tokenize": {"seconds": 0.5}}}
+    current = {"stages": {"predict": {"seconds": 1.5}, "tokenize": {"seconds": 0.5}, "new_stage": {"seconds": 1.0}}}
+
+    comparison = compare_benchmarks(baseline, current, tolerance=0.1)
+
+    assert comparison["predict"]["regression"] is True
+    assert comparison["predict"]["change"] == pytest.approx(0.5)
+    assert comparison["tokenize"]["regression"] is False
+    assert "new_stage" not in comparison
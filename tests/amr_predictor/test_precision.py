@@ -0,0 +1,111 @@
+"""Tests for selectable inference precision and the accuracy check."""
+
+import functools
+import pytest
+
+from amr_predictor.config.model_registry import ModelRegistry
+from amr_predictor.benchmarks.precision import check_precision_accuracy
+
+
+def test_registry_precision_overrides(tmp_path):
+    """Test per-model precision with defaults and file overrides."""
+    config_path = tmp_path / "registry.yml"
+    config_path.write_text(
+        "models:\n"
+        "  org/quantized:\n"
+        "    precision: int8\n"
+        "  org/typo:\n"
+        "    precision: fp8\n"
+    )
+    registry = ModelRegistry(str(config_path))
+
+    assert registry.get_precision("org/quantized") == "int8"
+    assert registry.get_precision("org/typo") == "fp32"
+    assert registry.get_precision("org/unknown") == "fp32"
+    assert registry.get_precision("alakob/DraGNOME-2.5b-v1") == "fp32"
+
+
+def test_accuracy_check_reports_deviation_and_flips(tmp_path, tiny_lora_model):
+    """Test comparing bf16 and int8 predictions with fp32."""
+    from amr_predictor.core.models import ModelManager
+
+    fasta_file = tmp_path / "reference.fasta"
+    fasta_file.write_text(">seq1\nACGTACGTACGTACGT\n>seq2\nGGGGTTTTAAAACCCC\n>seq3\nACGNACGNTTGA\n")
+    factory = functools.partial(ModelManager, cache_dir=str(tmp_path / "cache"), offline=True)
+
+    report = check_precision_accuracy(
+        str(fasta_file),
+        model_name=tiny_lora_model,
+        precisions=["bf16", "int8"],
+        resistance_threshold=0.5,
+        max_length=32,
+        manager_factory=factory
+    )
+
+    assert report["num_sequences"] == 3
+    assert [result["precision"] for result in report["results"]] == ["fp32", "bf16", "int8"]
+    for result in report["results"]:
+        assert result["sequences_per_second"] > 0
+        assert 0.0 <= result["max_abs_deviation"] < 0.1
+        assert result["flip_count"] == len(result["flips"])
+    assert report["results"][0]["max_abs_deviation"] == 0.0
+    assert report["results"][2]["mean_abs_deviation"] <= report["results"][2]["max_abs_deviation"]
+
+
+class ShiftedManager:
+    """Model manager whose resistance probabilities shift with precision."""
+
+    SHIFT = {"fp32": 0.0, "bf16": 0.005, "int8": 0.02}
+
+    def __init__(self, model_name=None, device="cpu", precision="fp32"):
+        self.model_name = model_name
+        self.precision = precision
+
+    def load(self):
+        pass
+
+    def unload(self):
+        pass
+
+    def predict(self, sequences, max_length=1000, batch_size=8):
+        resistant = [0.3, 0.49, 0.7][:len(sequences)]
+        return [{"Susceptible": 1 - (r + self.SHIFT[self.precision]), "Resistant": r + self.SHIFT[self.precision]}
+                for r in resistant]
+
+    def get_model_metadata(self):
+        return {"model_name": self.model_name, "precision": self.precision}
+
+
+def test_accuracy_check_counts_flips_at_threshold(tmp_path):
+    """Test that classification flips are reported at the resistance threshold."""
+    fasta_file = tmp_path / "reference.fasta"
+    fasta_file.write_text(">a\nACGT\n>b\nACGT\n>c\nACGT\n")
+
+    report = check_precision_accuracy(str(fasta_file), model_name="org/model", resistance_threshold=0.5,
+                                      manager_factory=ShiftedManager)
+    results = {result["precision"]: result for result in report["results"]}
+
+    assert results["bf16"]["flip_count"] == 0
+    assert results["bf16"]["max_abs_deviation"] == pytest.approx(0.005)
+    assert results["int8"]["flip_count"] == 1
+    assert results["int8"]["flips"][0]["sequence_id"] == "b"
+    assert results["int8"]["flips"][0]["int8"] == pytest.approx(0.51)
+
+
+def test_int8_quantizes_linear_layers(tmp_path, tiny_lora_model):
+    """Test that int8 precision replaces Linear layers with dynamically quantized ones."""
+    torch = pytest.importorskip("torch")
+    from amr_predictor.core.models import ModelManager
+
+    manager = ModelManager(model_name=tiny_lora_model, device="cpu", cache_dir=str(tmp_path / "cache"),
+                           offline=True, precision="int8")
+    manager.load()
+
+    assert manager.get_model_metadata()["precision"] == "int8"
+    assert not any(type(module) is torch.nn.Linear for module in manager.model.modules())
+    predictions = manager.predict(["ACGTACGT", "TTTTGGGG"], max_length=16)
+    assert len(predictions) == 2
+    assert predictions[0]["Resistant"] + predictions[0]["Susceptible"] == pytest.approx(1.0, abs=1e-5)
+
+    with pytest.raises(ValueError):
+        ModelManager(model_name=tiny_lora_model, precision="fp8")
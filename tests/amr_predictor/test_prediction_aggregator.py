@@ -0,0 +1,112 @@
+"""Tests for parallel multi-file aggregation in PredictionAggregator."""
+
+import pytest
+import pandas as pd
+
+from amr_predictor.processing.aggregation import (
+    PredictionAggregator,
+    aggregate_prediction_file
+)
+
+
+@pytest.fixture
+def prediction_files(tmp_path):
+    """Create a set of prediction files for testing."""
+    files = []
+    for index, rows in enumerate([
+        [("genomeA:contig1", 0.9, 0.1), ("genomeA:contig2", 0.8, 0.2), ("genomeA:contig3", 0.2, 0.8)],
+        [("genomeB:contig1", 0.1, 0.9), ("genomeB:contig2", 0.3, 0.7)],
+        [("genomeC:contig1", 0.6, 0.4), ("no_colon_id", 0.9, 0.1)],
+    ]):
+        path = tmp_path / f"model{index}_prediction.csv"
+        pd.DataFrame(rows, columns=["Sequence_ID", "Resistant", "Susceptible"]).to_csv(path, index=False)
+        files.append(str(path))
+    return files
+
+
+def test_aggregate_prediction_file(prediction_files):
+    """Test aggregating a single prediction file."""
+    grouped, stats = aggregate_prediction_file(prediction_files[0], resistance_threshold=0.5)
+
+    assert list(grouped.columns) == [
+        "sequence_count", "any_resistance", "any_susceptible", "majority_vote",
+        "avg_resistant", "avg_susceptible", "avg_classification", "methods_agree"
+    ]
+    row = grouped.loc["genomeA"]
+    assert row["sequence_count"] == 3
+    assert bool(row["any_resistance"]) is True
+    assert row["majority_vote"] == "Resistant"
+    assert row["avg_resistant"] == pytest.approx((0.9 + 0.8 + 0.2) / 3)
+    assert row["avg_classification"] == "Resistant"
+    assert bool(row["methods_agree"]) is True
+
+    assert stats["total_sequences"] == 3
+    assert stats["resistant_sequences"] == 2
+    assert stats["processing_time"] >= 0
+
+
+def test_sequences_without_genomic_id_are_dropped(prediction_files):
+    """Test that sequence IDs without a genomic prefix are not grouped."""
+    grouped, stats = aggregate_prediction_file(prediction_files[2])
+
+    assert list(grouped.index) == ["genomeC"]
+    assert stats["total_sequences"] == 2
+
+
+def test_refinement_windows_are_not_aggregated(tmp_path):
+    """Test that refinement windows do not count toward the genomic statistics."""
+    path = tmp_path / "refined_prediction.csv"
+    pd.DataFrame([("genomeA:contig1", 0.9, 0.1, 0), ("genomeA:contig2", 0.1, 0.9, 0),
+                  ("genomeA:contig3", 0.2, 0.8, 0), ("genomeA:contig1", 0.9, 0.1, 1),
+                  ("genomeA:contig1", 0.9, 0.1, 1)],
+                 columns=["Sequence_ID", "Resistant", "Susceptible", "Refinement_Pass"]).to_csv(path, index=False)
+
+    grouped, stats = aggregate_prediction_file(str(path))
+    assert grouped.loc["genomeA", "sequence_count"] == 3
+    assert grouped.loc["genomeA", "majority_vote"] == "Susceptible"
+    assert stats["resistant_sequences"] == 1
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_process_prediction_files(prediction_files, max_workers):
+    """Test serial and parallel aggregation produce the same results."""
+    aggregator = PredictionAggregator()
+    results = aggregator.process_prediction_files(prediction_files, max_workers=max_workers)
+
+    results = results.sort_values("genomic_id").reset_index(drop=True)
+    assert list(results["genomic_id"]) == ["genomeA", "genomeB", "genomeC"]
+    assert list(results["majority_vote"]) == ["Resistant", "Susceptible", "Resistant"]
+    assert set(aggregator.file_timings) == set(prediction_files)
+
+
+def test_parallel_aggregation_keeps_input_order(prediction_files):
+    """Test that parallel results come back in input order, whichever worker finishes first."""
+    aggregator = PredictionAggregator()
+    input_files = prediction_files[::-1]
+
+    partial = list(aggregator.iter_prediction_files(input_files, max_workers=3))
+    assert [file_path for file_path, _, _ in partial] == input_files
+
+    results = aggregator.process_prediction_files(input_files, max_workers=3)
+    assert list(results["genomic_id"]) == ["genomeC", "genomeB", "genomeA"]
+
+
+def test_invalid_files_are_skipped(prediction_files, tmp_path):
+    """Test that files missing required columns are skipped."""
+    bad_file = tmp_path / "bad_prediction.csv"
+    bad_file.write_text("a,b\n1,2\n")
+
+    aggregator = PredictionAggregator()
+    results = aggregator.process_prediction_files(prediction_files + [str(bad_file)], max_workers=1)
+
+    assert len(results) == 3
+    assert str(bad_file) not in aggregator.file_timings
+
+
+def test_iter_prediction_files_streams_partial_results(prediction_files):
+    """Test that partial results are yielded per file."""
+    aggregator = PredictionAggregator()
+    partial = list(aggregator.iter_prediction_files(prediction_files, max_workers=1))
+
+    assert [file_path for file_path, _, _ in partial] == prediction_files
+    assert all(isinstance(grouped, pd.DataFrame) for _, grouped, _ in partial)
@@ -0,0 +1,95 @@
+"""Tests for models shared across jobs and forked worker processes."""
+
+import os
+import gc
+import json
+
+import pytest
+
+pytest.importorskip("torch")
+
+from amr_predictor.core import shared_models
+from amr_predictor.core.parallel import parallel_supported
+
+
+@pytest.fixture
+def empty_pool(monkeypatch):
+    """Start each test with no shared models."""
+    monkeypatch.setattr(shared_models, "_shared_managers", {})
+    monkeypatch.setattr(shared_models, "_inherited_keys", set())
+    monkeypatch.setattr(shared_models, "_preloaded_by", None)
+
+
+def test_shared_model_loaded_once(tmp_path, tiny_lora_model, empty_pool):
+    """Test that jobs reuse one loaded model manager."""
+    kwargs = {"cache_dir": str(tmp_path / "cache"), "offline": True}
+    first = shared_models.get_shared_model(tiny_lora_model, "cpu", **kwargs)
+    tracker = object()
+
+    with shared_models.shared_model(tiny_lora_model, "cpu", progress_tracker=tracker, **kwargs) as manager:
+        assert manager is first
+        assert manager.progress_tracker is tracker
+    assert first.progress_tracker is None
+
+    report = shared_models.memory_report()
+    assert len(report["models"]) == 1
+    assert report["models"][0]["parameter_mb"] == pytest.approx(shared_models._model_parameter_mb(first), abs=0.05)
+    assert report["models"][0]["shared_from_parent"] is False
+
+
+@pytest.mark.skipif(not parallel_supported(), reason="requires os.fork")
+def test_forked_worker_shares_preloaded_model(tmp_path, tiny_lora_model, empty_pool):
+    """Test that a forked worker uses the parent's preloaded model without loading it."""
+    kwargs = {"cache_dir": str(tmp_path / "cache"), "offline": True}
+    try:
+        [parent_manager] = shared_models.preload_models([tiny_lora_model], **kwargs)
+    finally:
+        gc.unfreeze()
+    expected = parent_manager.predict(["ACGTACGTAC"], max_length=16)
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            manager = shared_models.get_shared_model(tiny_lora_model, "cpu", **kwargs)
+            report = shared_models.memory_report()
+            result = {
+                "same": manager is parent_manager,
+                "predictions": manager.predict(["ACGTACGTAC"], max_length=16),
+                "shared": report["models"][0]["shared_from_parent"],
+                "preloaded_by": report["preloaded_by"]
+            }
+            os.write(write_fd, json.dumps(result).encode())
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        result = json.loads(f.read())
+    os.waitpid(pid, 0)
+
+    assert result["same"] is True
+    assert result["shared"] is True
+    assert result["preloaded_by"] == os.getpid()
+    assert result["predictions"][0]["Susceptible"] == pytest.approx(expected[0]["Susceptible"])
+
+
+def test_default_job_reuses_preloaded_model(tmp_path, tiny_lora_model, empty_pool, monkeypatch):
+    """Test that a job on the default device in a forked worker uses the model preloaded on the CPU."""
+    kwargs = {"cache_dir": str(tmp_path / "cache"), "offline": True}
+    try:
+        [preloaded] = shared_models.preload_models([tiny_lora_model], **kwargs)
+    finally:
+        gc.unfreeze()
+    assert preloaded.device == "cpu"
+
+    # A worker forked from the preloading parent, on a host with a GPU
+    monkeypatch.setattr(shared_models, "_preloaded_by", os.getpid())
+    monkeypatch.setattr(shared_models.ModelManager, "_get_default_device", staticmethod(lambda: "cuda"))
+
+    # predict_task passes device=None unless the job asks for the CPU
+    with shared_models.shared_model(tiny_lora_model, device=None, **kwargs) as manager:
+        assert manager is preloaded
+    assert shared_models._key(tiny_lora_model, "auto") == (tiny_lora_model, "cpu")
+    assert len(shared_models._shared_managers) == 1
@@ -0,0 +1,95 @@
+"""Tests for the Prometheus pipeline telemetry."""
+
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+from amr_predictor.monitoring.telemetry import (
+    TelemetryRegistry,
+    get_telemetry_registry,
+    observe_stage,
+    observe_operation,
+    record_cache_access,
+    render_prometheus
+)
+from amr_predictor.monitoring.metrics import track_operation
+from amr_predictor.core.utils import timer
+
+
+def test_counter_and_gauge_render():
+    """Test rendering counters and gauges with labels."""
+    registry = TelemetryRegistry()
+    counter = registry.counter("test_requests_total", "Requests", ["result"])
+    counter.inc(result="hit")
+    counter.inc(2, result="miss")
+    registry.gauge("test_rate", "Rate").set(1.5)
+
+    text = registry.render()
+
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{result="hit"} 1' in text
+    assert 'test_requests_total{result="miss"} 2' in text
+    assert "test_rate 1.5" in text
+    assert registry.counter("test_requests_total", "Requests", ["result"]) is counter
+
+    with pytest.raises(ValueError):
+        counter.inc(-1, result="hit")
+    with pytest.raises(ValueError):
+        counter.inc(wrong="label")
+    with pytest.raises(ValueError):
+        registry.gauge("test_requests_total", "Requests")
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test histogram bucket counts, sum and count."""
+    registry = TelemetryRegistry()
+    histogram = registry.histogram("test_latency_seconds", "Latency", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, stage="predict")
+
+    samples = {
+        (sample.name, sample.labels.get("le")): sample.value
+        for family in text_string_to_metric_families(registry.render())
+        for sample in family.samples
+        if sample.labels.get("stage") == "predict"
+    }
+
+    assert samples[("test_latency_seconds_bucket", "0.1")] == 2
+    assert samples[("test_latency_seconds_bucket", "1.0")] == 3
+    assert samples[("test_latency_seconds_bucket", "+Inf")] == 4
+    assert samples[("test_latency_seconds_count", None)] == 4
+    assert histogram.get_count(stage="predict") == 4
+    assert histogram.get_sum(stage="predict") == pytest.approx(2.65)
+
+
+def test_instrumentation_points_feed_global_registry():
+    """Test that timer, track_operation and cache helpers record telemetry."""
+    registry = get_telemetry_registry()
+    registry.clear()
+
+    with timer("test_stage"):
+        pass
+    observe_stage("test_stage", 0.5)
+
+    @track_operation("test_db_call", category="db")
+    def db_call():
+        return 1
+
+    @track_operation("test_failing_call")
+    def failing_call():
+        raise RuntimeError("boom")
+
+    db_call()
+    with pytest.raises(RuntimeError):
+        failing_call()
+    record_cache_access("test_cache", hit=True)
+    record_cache_access("test_cache", hit=False)
+
+    stages = registry.get("amr_pipeline_stage_duration_seconds")
+    assert stages.get_count(stage="test_stage") == 2
+    assert registry.get("amr_db_call_duration_seconds").get_count(operation="test_db_call") == 1
+    assert registry.get("amr_operation_errors_total").get(operation="test_failing_call") == 1
+
+    text = render_prometheus()
+    assert 'amr_cache_requests_total{cache="test_cache",result="hit"} 1' in text
+    assert 'amr_cache_requests_total{cache="test_cache",result="miss"} 1' in text
+    registry.clear()
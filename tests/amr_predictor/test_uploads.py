@@ -0,0 +1,105 @@
+"""Tests for streaming uploads with FASTA validation and hashing."""
+
+import asyncio
+import hashlib
+import io
+import json
+
+import pytest
+
+from amr_predictor.core.sequence import FastaStreamValidator, FastaValidationError
+from amr_predictor.core.uploads import save_upload, upload_path, UploadTooLargeError
+
+
+class ChunkedUpload:
+    """Upload returning its data in small reads, like a spooled UploadFile."""
+
+    def __init__(self, data: bytes):
+        self.stream = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.stream.read(size)
+
+
+def test_validator_accepts_fasta_split_anywhere():
+    """Test that lines split across chunks are validated as whole lines."""
+    data = b">seq1 sample\nACGTNRY\nacgt\r\n>seq2\nGGGG-CC\n"
+    for chunk_size in (1, 3, len(data)):
+        validator = FastaStreamValidator()
+        for start in range(0, len(data), chunk_size):
+            validator.feed(data[start:start + chunk_size])
+        assert validator.finish() == {"sequence_count": 2, "total_length": 18}
+
+
+def test_validator_accepts_unwrapped_sequences():
+    """Test that sequence lines of any length are checked without being buffered."""
+    validator = FastaStreamValidator(max_header_length=100)
+    validator.feed(b">contig1\n")
+    for _ in range(40):
+        validator.feed(b"ACGT" * 16384)
+        assert len(validator._partial) == 0
+    validator.feed(b" \r\n>contig2\nGG")
+    assert validator.finish() == {"sequence_count": 2, "total_length": 40 * 65536 + 2}
+
+    validator = FastaStreamValidator(max_header_length=100)
+    validator.feed(b">contig1\n" + b"A" * 1000)
+    with pytest.raises(FastaValidationError, match="Invalid characters ' '"):
+        validator.feed(b"  CC\n")
+    with pytest.raises(FastaValidationError, match="Header on line 1 is longer than 100"):
+        FastaStreamValidator(max_header_length=100).feed(b">" + b"x" * 200)
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"ACGT\n>seq1\nACGT\n", "must start with a '>' header"),
+    (b">seq1\nACGT\n>\nACGT\n", "has no sequence ID"),
+    (b">seq1\nACGTQEIL\n", "Invalid characters 'EILQ'"),
+    (b">seq1\n>seq2\nACGT\n", "Sequence seq1 is empty"),
+    (b">seq1\nAC\xffGT\n", "not plain text"),
+    (b"", "No sequences found"),
+])
+def test_validator_rejects_bad_fasta(data, message):
+    """Test that malformed FASTA is rejected with the reason."""
+    validator = FastaStreamValidator()
+    with pytest.raises(FastaValidationError, match=message):
+        validator.feed(data)
+        validator.finish()
+
+
+def test_save_upload_hashes_and_validates_while_streaming(tmp_path):
+    """Test that uploads are copied in chunks with their hash and FASTA statistics."""
+    data = b">seq1\n" + b"ACGT" * 1000 + b"\n>seq2\nGGCC\n"
+    path = str(tmp_path / "upload.fasta")
+
+    info = asyncio.run(save_upload(ChunkedUpload(data), path, validator=FastaStreamValidator(), chunk_size=100))
+
+    assert open(path, "rb").read() == data
+    assert info.size == len(data) and info.sha256 == hashlib.sha256(data).hexdigest()
+    assert (info.sequence_count, info.total_length) == (2, 4004)
+
+
+def test_save_upload_removes_rejected_files(tmp_path):
+    """Test that oversized or invalid uploads are stopped and removed."""
+    path = tmp_path / "upload.fasta"
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(save_upload(ChunkedUpload(b">s\n" + b"A" * 500), str(path), max_bytes=100, chunk_size=64))
+    assert not path.exists()
+
+    with pytest.raises(FastaValidationError):
+        asyncio.run(save_upload(ChunkedUpload(b">s\nACGT\nHELLO\n" + b"A" * 500), str(path),
+                                validator=FastaStreamValidator(), chunk_size=16))
+    assert not path.exists()
+
+    assert upload_path("/uploads", "job-1", "../../etc/passwd") == "/uploads/job-1_passwd"
+
+
+def test_find_completed_job_matches_input_hash_and_parameters(mock_pg_manager):
+    """Test that duplicate uploads are looked up by input hash and parameters."""
+    manager, conn, cursor = mock_pg_manager
+    cursor.fetchone.return_value = {"id": "job-1", "status": "Completed", "additional_info": {}}
+
+    job = manager.find_completed_job("abc123", {"owner": "alice", "model_name": "m"})
+
+    query, params = cursor.execute.call_args[0]
+    assert "additional_info ->> 'input_sha256' = %s AND status = 'Completed'" in query
+    assert params[0] == "abc123" and json.loads(params[1]) == {"owner": "alice", "model_name": "m"}
+    assert job["job_id"] == "job-1"